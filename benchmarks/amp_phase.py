@@ -0,0 +1,72 @@
+"""
+Benchmark for the conversion between complex data and AMP8I_PHS8I format data,
+comparing :class:`sarpy.io.complex.sicd.AmpPhaseCodec` with the previous
+per-pixel implementations (reproduced here for reference).
+
+>>> python benchmarks/amp_phase.py --rows 4096 --cols 4096 --repeat 3
+
+"""
+
+import argparse
+import time
+
+import numpy
+
+from sarpy.io.complex.sicd import AmpPhaseCodec
+
+__classification__ = "UNCLASSIFIED"
+
+
+def _reference_decode(lookup_table, data):
+    out = numpy.zeros((data.shape[0], data.shape[1], int(data.shape[2]/2)), dtype=numpy.complex64)
+    amp = lookup_table[data[:, :, 0::2]]
+    theta = data[:, :, 1::2]*(2*numpy.pi/256)
+    out.real = amp*numpy.cos(theta)
+    out.imag = amp*numpy.sin(theta)
+    return out
+
+
+def _reference_encode(lookup_table, data):
+    out = numpy.zeros((data.shape[0], data.shape[1], 2), dtype=numpy.uint8)
+    out[:, :, 0] = numpy.digitize(numpy.abs(data).ravel(), lookup_table, right=False).reshape(data.shape)
+    out[:, :, 1] = numpy.arctan2(data.real, data.imag)*(256/(2*numpy.pi))
+    return out
+
+
+def _time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        function()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(rows=2048, cols=2048, repeat=3):
+    numpy.random.seed(0)
+    data = ((numpy.random.randn(rows, cols) + 1j*numpy.random.randn(rows, cols))*100).astype('complex64')
+    tables = (
+        ('uniform', numpy.arange(256, dtype='float64')*2.),
+        ('nonuniform', numpy.arange(256, dtype='float64')**1.5/8.))
+
+    print('{} x {} pixels, best of {}'.format(rows, cols, repeat))
+    print('{:<25} {:>15} {:>15} {:>10}'.format('case', 'previous (s)', 'codec (s)', 'speedup'))
+    for name, lookup_table in tables:
+        codec = AmpPhaseCodec(lookup_table)
+        encoded = codec.encode(data)
+        for operation, reference, new in [
+                ('encode', lambda: _reference_encode(lookup_table, data), lambda: codec.encode(data)),
+                ('decode', lambda: _reference_decode(lookup_table, encoded), lambda: codec.decode(encoded))]:
+            previous = _time(reference, repeat)
+            current = _time(new, repeat)
+            print('{:<25} {:>15.3f} {:>15.3f} {:>10.2f}'.format(
+                '{} {}'.format(operation, name), previous, current, previous/current))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark AMP8I_PHS8I conversion.")
+    parser.add_argument('--rows', default=2048, type=int, help='The number of rows.')
+    parser.add_argument('--cols', default=2048, type=int, help='The number of columns.')
+    parser.add_argument('--repeat', default=3, type=int, help='The number of runs for each case.')
+    args = parser.parse_args()
+    main(rows=args.rows, cols=args.cols, repeat=args.repeat)
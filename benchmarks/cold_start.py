@@ -0,0 +1,74 @@
+"""
+Benchmark for the cold start time of sarpy, as experienced by short-lived
+processes. Each case is run in a fresh python interpreter, and the wall clock
+time for the full process is reported, along with the number of sarpy modules
+imported.
+
+>>> python benchmarks/cold_start.py --repeat 10
+
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+__classification__ = "UNCLASSIFIED"
+
+
+_REPORT = "import sys; print(len([name for name in sys.modules if name.startswith('sarpy')]))"
+
+_CASES = (
+    ('import sarpy', 'import sarpy'),
+    ('import sarpy.utils.convert_to_sicd', 'import sarpy.utils.convert_to_sicd'),
+    ('open_complex(tiny sio)', 'from sarpy.io.complex.converter import open_complex; open_complex({file_name!r})'),
+    ('open_general(tiny sio)',
+     'from sarpy.io.general.converter import open_general\n'
+     'try:\n    open_general({file_name!r})\nexcept Exception:\n    pass'),
+)
+
+
+def _write_tiny_sio(directory, rows=16, cols=16):
+    # a little endian complex float SIO file, without user data
+    file_name = os.path.join(directory, 'tiny.sio')
+    with open(file_name, 'wb') as fi:
+        fi.write(struct.pack('<5I', 0xFE7F01FF, rows, cols, 13, 8))
+        fi.write(b'\x00'*(rows*cols*8))
+    return file_name
+
+
+def _run_case(code, repeat):
+    times = []
+    module_count = None
+    for _ in range(repeat):
+        start = time.time()
+        output = subprocess.check_output([sys.executable, '-c', code + '\n' + _REPORT])
+        times.append(time.time() - start)
+        module_count = int(output.decode('utf-8').strip().splitlines()[-1])
+    times.sort()
+    return times[0], times[len(times)//2], module_count
+
+
+def main(repeat=5):
+    directory = tempfile.mkdtemp()
+    try:
+        file_name = _write_tiny_sio(directory)
+        baseline, _, _ = _run_case('pass', repeat)
+        print('python interpreter start: {:.3f} s'.format(baseline))
+        print('{:<40} {:>10} {:>10} {:>15}'.format('case', 'min (s)', 'median (s)', 'sarpy modules'))
+        for name, code in _CASES:
+            minimum, median, module_count = _run_case(code.format(file_name=file_name), repeat)
+            print('{:<40} {:>10.3f} {:>10.3f} {:>15}'.format(name, minimum, median, module_count))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark sarpy cold start time.")
+    parser.add_argument('--repeat', default=5, type=int, help='The number of runs for each case.')
+    args = parser.parse_args()
+    main(repeat=args.repeat)
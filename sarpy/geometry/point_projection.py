@@ -77,6 +77,7 @@ from types import MethodType  # for binding a method dynamically to a class
 import numpy
 
 from sarpy.compliance import string_types, int_func
+from sarpy.geometry import projection_pool
 from sarpy.geometry.geocoords import ecf_to_geodetic, geodetic_to_ecf, wgs_84_norm
 from sarpy.io.complex.sicd_elements.blocks import Poly2DType, XYZPolyType
 from sarpy.io.DEM.DEM import DEMInterpolator
@@ -282,7 +283,7 @@ def _get_sicd_type_specific_projection(sicd):
     def plane_projection():
         SCP = sicd.GeoData.SCP.ECF.get_array()
         uRow = sicd.Grid.Row.UVectECF.get_array()
-        uCol = sicd.Grid.Row.UVectECF.get_array()
+        uCol = sicd.Grid.Col.UVectECF.get_array()
 
         # noinspection PyUnusedLocal, PyIncorrectDocstring
         def method_projection(instance, row_transform, col_transform, time_coa, arp_coa, varp_coa):
@@ -692,6 +693,26 @@ def _get_coa_projection(structure, use_structure_coa, **coa_args):
         raise ValueError('Got unhandled type {}'.format(type(structure)))
 
 
+def _get_coa_parameters(coa_proj):
+    """
+    Gets the ECF frame adjustable parameters of the COA projection, for
+    reconstructing the COA projection in a worker process.
+
+    Parameters
+    ----------
+    coa_proj : COAProjection
+
+    Returns
+    -------
+    dict
+    """
+
+    # noinspection PyProtectedMember
+    return {
+        'delta_arp': coa_proj._delta_arp, 'delta_varp': coa_proj._delta_varp,
+        'range_bias': coa_proj._range_bias}
+
+
 ###############
 # General helper methods for extracting params from the sicd or sidd
 
@@ -877,45 +898,51 @@ def _ground_to_image(coords, coa_proj, uGPN,
 
     Returns
     -------
-    Tuple[numpy.ndarray, float, int]
+    Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
         * `image_points` - the determined image point array, of size `N x 2`. Following SICD convention,
            the upper-left pixel is [0, 0].
-        * `delta_gpn` - residual ground plane displacement (m).
-        * `iterations` - the number of iterations performed.
+        * `delta_gpn` - residual ground plane displacement (m), of size `N`.
+        * `iterations` - the number of iterations performed for each point, of size `N`.
     """
     g_n = coords.copy()
     im_points = numpy.zeros((coords.shape[0], 2), dtype='float64')
     delta_gpn = numpy.zeros((coords.shape[0],), dtype='float64')
-    cont = True
+    iterations = numpy.zeros((coords.shape[0],), dtype='int16')
+    # the indices of the points which have not yet converged
+    active = numpy.arange(coords.shape[0])
     iteration = 0
 
     matrix_transform = numpy.dot(row_col_transform, ipp_transform)
     # (3 x 2)*(2 x 2) = (3 x 2)
 
-    while cont:
+    while active.size > 0 and iteration < max_iterations:
         # project ground plane to image plane iteration
         iteration += 1
-        dist_n = numpy.dot(ref_point - g_n, uIPN)/sf  # (N, )
-        i_n = g_n + numpy.outer(dist_n, uProj)  # (N, 3)
-        delta_ipp = i_n - ref_point  # (N, 3)
-        ip_iter = numpy.dot(delta_ipp, matrix_transform)  # (N, 2)
-        im_points[:, 0] = ip_iter[:, 0]/row_ss + ref_pixel[0]
-        im_points[:, 1] = ip_iter[:, 1]/col_ss + ref_pixel[1]
+        g_active = g_n[active]
+        dist_n = numpy.dot(ref_point - g_active, uIPN)/sf  # (M, )
+        i_n = g_active + numpy.outer(dist_n, uProj)  # (M, 3)
+        delta_ipp = i_n - ref_point  # (M, 3)
+        ip_iter = numpy.dot(delta_ipp, matrix_transform)  # (M, 2)
+        im_active = numpy.empty((active.size, 2), dtype='float64')
+        im_active[:, 0] = ip_iter[:, 0]/row_ss + ref_pixel[0]
+        im_active[:, 1] = ip_iter[:, 1]/col_ss + ref_pixel[1]
+        im_points[active] = im_active
         # transform to ground plane containing the scene points and check how it compares
-        p_n = _image_to_ground_plane(im_points, coa_proj, g_n, uGPN)
+        p_n = _image_to_ground_plane(im_active, coa_proj, g_active, uGPN)
         # compute displacement between scene point and this new projected point
-        diff_n = coords - p_n
-        delta_gpn[:] = numpy.linalg.norm(diff_n, axis=1)
-        g_n += diff_n
+        diff_n = coords[active] - p_n
+        delta_active = numpy.linalg.norm(diff_n, axis=1)
+        delta_gpn[active] = delta_active
+        g_n[active] = g_active + diff_n
+        iterations[active] = iteration
+        # only the unconverged points continue (NB: nan values are dropped)
+        active = active[delta_active > tolerance]
 
-        # should we continue iterating?
-        cont = numpy.any(delta_gpn > tolerance) and (iteration < max_iterations)
-
-    return im_points, delta_gpn, iteration
+    return im_points, delta_gpn, iterations
 
 
 def ground_to_image(coords, structure, tolerance=1e-2, max_iterations=10, block_size=50000,
-                    use_structure_coa=True, **coa_args):
+                    use_structure_coa=True, surrogate=None, max_workers=1, max_worker_memory=None, **coa_args):
     """
     Transforms a 3D ECF point to pixel (row/column) coordinates. This is
     implemented in accordance with the SICD Image Projections Description Document.
@@ -935,19 +962,36 @@ def ground_to_image(coords, structure, tolerance=1e-2, max_iterations=10, block_
         size of blocks of coordinates to transform at a time
     use_structure_coa : bool
         If sicd.coa_projection is populated, use that one **ignoring the COAProjection parameters.**
+    surrogate : None|sarpy.geometry.projection_surrogate.ProjectionSurrogate
+        If provided, the fitted surrogate is evaluated in place of the rigorous
+        projection, and the residual displacement and iterations are all zero.
+    max_workers : None|int
+        The number of worker processes. For more than one, the blocks are
+        projected in a process pool. See :mod:`sarpy.geometry.projection_pool`.
+    max_worker_memory : None|int|float
+        The approximate maximum working memory for each worker process, in MB,
+        which limits the block size when using a process pool.
     coa_args
         The keyword arguments from the COAProjection.from_sicd class method.
 
     Returns
     -------
-    Tuple[numpy.ndarray, float, int]
+    Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
         * `image_points` - the determined image point array, of size `N x 2`. Following
           the SICD convention, he upper-left pixel is [0, 0].
-        * `delta_gpn` - residual ground plane displacement (m).
-        * `iterations` - the number of iterations performed.
+        * `delta_gpn` - residual ground plane displacement (m), for each point.
+        * `iterations` - the number of iterations performed, for each point. Each
+          point is only iterated until its displacement is within tolerance.
     """
 
     coords, orig_shape = _validate_coords(coords)
+    if surrogate is not None:
+        image_points = surrogate.ground_to_image(coords)
+        delta_gpn = numpy.zeros(image_points.shape[:-1], dtype='float64')
+        iters = numpy.zeros(image_points.shape[:-1], dtype='int16')
+        if len(orig_shape) == 1:
+            image_points = numpy.reshape(image_points, (-1,))
+        return image_points, delta_gpn, iters
     coa_proj = _get_coa_projection(structure, use_structure_coa, **coa_args)
 
     ref_point, ref_pixel, row_ss, col_ss, uRow, uCol, \
@@ -971,15 +1015,28 @@ def ground_to_image(coords, structure, tolerance=1e-2, max_iterations=10, block_
             'minimum allowed tolerance is 1e-12 meters, resetting from {}'.format(tolerance))
         tolerance = 1e-12
 
+    max_iterations = int(max_iterations)
+    if max_iterations < 1:
+        logging.error('max_iterations must be a positive integer, resetting to 1 from {}'.format(max_iterations))
+        max_iterations = 1
+
     # prepare the work space
     coords_view = numpy.reshape(coords, (-1, 3))  # possibly or make 2-d flatten
     num_points = coords_view.shape[0]
-    if block_size is None or num_points <= block_size:
+    if projection_pool.can_use_pool(num_points, block_size, max_workers):
+        image_points = numpy.empty((num_points, 2), dtype='float64')
+        delta_gpn = numpy.empty((num_points, ), dtype='float64')
+        iters = numpy.empty((num_points, ), dtype='int16')
+        projection_pool.project_in_pool(
+            ground_to_image, coords_view, structure, _get_coa_parameters(coa_proj),
+            (image_points, delta_gpn, iters), block_size=block_size,
+            max_workers=max_workers, max_worker_memory=max_worker_memory,
+            tolerance=tolerance, max_iterations=max_iterations)
+    elif block_size is None or num_points <= block_size:
         image_points, delta_gpn, iters = _ground_to_image(
             coords_view, coa_proj, uGPN,
             ref_point, ref_pixel, uIPN, sf, row_ss, col_ss, uSPN,
             row_col_transform, ipp_transform, tolerance, max_iterations)
-        iters = numpy.full((num_points, ), iters)
     else:
         image_points = numpy.zeros((num_points, 2), dtype='float64')
         delta_gpn = numpy.zeros((num_points, ), dtype='float64')
@@ -1225,7 +1282,7 @@ def _image_to_ground_plane(im_points, coa_projection, gref, uZ):
 
 def image_to_ground_plane(
         im_points, structure, block_size=50000, gref=None, ugpn=None,
-        use_structure_coa=True, **coa_args):
+        use_structure_coa=True, surrogate=None, **coa_args):
     """
     Transforms image coordinates to ground plane ECF coordinate via the algorithm(s)
     described in SICD Image Projections document.
@@ -1245,6 +1302,9 @@ def image_to_ground_plane(
         Vector normal to the plane to which we are projecting.
     use_structure_coa : bool
         If structure.coa_projection is populated, use that one **ignoring the COAProjection parameters.**
+    surrogate : None|sarpy.geometry.projection_surrogate.ProjectionSurrogate
+        If provided, the fitted surrogate is evaluated in place of the rigorous
+        projection.
     coa_args
         keyword arguments for COAProjection.from_sicd class method.
 
@@ -1255,7 +1315,6 @@ def image_to_ground_plane(
     """
 
     im_points, orig_shape = _validate_im_points(im_points)
-    coa_proj = _get_coa_projection(structure, use_structure_coa, **coa_args)
 
     # method parameter validation
     if gref is None:
@@ -1277,6 +1336,10 @@ def image_to_ground_plane(
         ugpn = numpy.reshape(ugpn, (3, ))
     uZ = ugpn/numpy.linalg.norm(ugpn)
 
+    if surrogate is not None:
+        return numpy.reshape(surrogate.image_to_ground_plane(im_points, gref, uZ), orig_shape[:-1] + (3, ))
+    coa_proj = _get_coa_projection(structure, use_structure_coa, **coa_args)
+
     # prepare workspace
     im_points_view = numpy.reshape(im_points, (-1, 2))  # possibly or make 2-d flatten
     num_points = im_points_view.shape[0]
@@ -1316,7 +1379,8 @@ def _image_to_ground_hae_perform(
     varp_coa : numpy.ndarray
     ref_point : numpy.ndarray
     ugpn : numpy.ndarray
-    hae0 : float
+    hae0 : float|numpy.ndarray
+        The HAE value, or an array of HAE values for each point.
     tolerance : float
     max_iterations : int
     ref_hae : float
@@ -1328,23 +1392,28 @@ def _image_to_ground_hae_perform(
 
     # Compute the geodetic ground plane normal at the ref_point.
     look = numpy.sign(numpy.sum(numpy.cross(arp_coa, varp_coa)*(ref_point - arp_coa), axis=1))
-    gref = ref_point - (ref_hae - hae0)*ugpn
+    num_points = r_tgt_coa.shape[0]
+    hae0 = numpy.broadcast_to(numpy.asarray(hae0, dtype='float64'), (num_points, ))
+    gref = ref_point - (ref_hae - hae0)[:, numpy.newaxis]*ugpn
     # iteration variables
-    gpp = None
-    delta_hae = None
-    cont = True
+    gpp = numpy.zeros((num_points, 3), dtype='float64')
+    delta_hae = numpy.zeros((num_points, ), dtype='float64')
+    # the indices of the points which have not yet converged
+    active = numpy.arange(num_points)
     iters = 0
-    while cont:
+    while active.size > 0 and iters < max_iterations:
         iters += 1
         # Compute the precise projection along the R/Rdot contour to Ground Plane.
-        gpp = _image_to_ground_plane_perform(r_tgt_coa, r_dot_tgt_coa, arp_coa, varp_coa, gref, ugpn)
+        gpp_active = _image_to_ground_plane_perform(
+            r_tgt_coa[active], r_dot_tgt_coa[active], arp_coa[active], varp_coa[active], gref[active], ugpn)
         # check our hae value versus hae0
-        gpp_llh = ecf_to_geodetic(gpp)
-        delta_hae = gpp_llh[:, 2] - hae0
-        max_abs_delta_hae = numpy.max(numpy.abs(delta_hae))
-        gref = gpp - (delta_hae[:, numpy.newaxis] * ugpn)
-        # should we stop our iteration?
-        cont = (max_abs_delta_hae > tolerance) and (iters < max_iterations)
+        gpp_llh = ecf_to_geodetic(gpp_active)
+        delta_active = gpp_llh[:, 2] - hae0[active]
+        gpp[active] = gpp_active
+        delta_hae[active] = delta_active
+        gref[active] = gpp_active - (delta_active[:, numpy.newaxis] * ugpn)
+        # only the unconverged points continue (NB: nan values are dropped)
+        active = active[numpy.abs(delta_active) > tolerance]
 
     # Compute the unit slant plane normal vector, uspn, that is tangent to the R/Rdot contour at point gpp
     uspn = numpy.cross(varp_coa, (gpp - arp_coa))*look[:, numpy.newaxis]
@@ -1392,7 +1461,8 @@ def _image_to_ground_hae(
 
 
 def image_to_ground_hae(im_points, structure, block_size=50000,
-                        hae0=None, tolerance=1e-3, max_iterations=10, use_structure_coa=True, **coa_args):
+                        hae0=None, tolerance=1e-3, max_iterations=10, use_structure_coa=True,
+                        surrogate=None, max_workers=1, max_worker_memory=None, **coa_args):
     """
     Transforms image coordinates to ground plane ECF coordinate via the algorithm(s)
     described in SICD Image Projections document.
@@ -1415,6 +1485,15 @@ def image_to_ground_hae(im_points, structure, block_size=50000,
         Maximum number of iterations allowed for constant hae computation.
     use_structure_coa : bool
         If structure.coa_projection is populated, use that one **ignoring the COAProjection parameters.**
+    surrogate : None|sarpy.geometry.projection_surrogate.ProjectionSurrogate
+        If provided, the fitted surrogate is evaluated in place of the rigorous
+        projection.
+    max_workers : None|int
+        The number of worker processes. For more than one, the blocks are
+        projected in a process pool. See :mod:`sarpy.geometry.projection_pool`.
+    max_worker_memory : None|int|float
+        The approximate maximum working memory for each worker process, in MB,
+        which limits the block size when using a process pool.
     coa_args
         keyword arguments for COAProjection.from_sicd class method.
 
@@ -1427,6 +1506,10 @@ def image_to_ground_hae(im_points, structure, block_size=50000,
 
     # coa projection creation
     im_points, orig_shape = _validate_im_points(im_points)
+    if surrogate is not None:
+        if hae0 is None:
+            hae0 = float(ecf_to_geodetic(_get_reference_point(structure))[2])
+        return numpy.reshape(surrogate.image_to_ground_hae(im_points, hae0), orig_shape[:-1] + (3, ))
     coa_proj = _get_coa_projection(structure, use_structure_coa, **coa_args)
 
     tolerance = float(tolerance)
@@ -1453,7 +1536,14 @@ def image_to_ground_hae(im_points, structure, block_size=50000,
     # prepare workspace
     im_points_view = numpy.reshape(im_points, (-1, 2))  # possibly or make 2-d flatten
     num_points = im_points_view.shape[0]
-    if block_size is None or num_points <= block_size:
+    if projection_pool.can_use_pool(num_points, block_size, max_workers):
+        coords = numpy.empty((num_points, 3), dtype='float64')
+        projection_pool.project_in_pool(
+            image_to_ground_hae, im_points_view, structure, _get_coa_parameters(coa_proj),
+            (coords, ), block_size=block_size, max_workers=max_workers,
+            max_worker_memory=max_worker_memory, hae0=hae0, tolerance=tolerance,
+            max_iterations=max_iterations)
+    elif block_size is None or num_points <= block_size:
         coords = _image_to_ground_hae(im_points_view, coa_proj, hae0, tolerance, max_iterations, ref_hae, ref_point)
     else:
         coords = numpy.zeros((num_points, 3), dtype='float64')
@@ -1475,20 +1565,123 @@ def image_to_ground_hae(im_points, structure, block_size=50000,
 #####
 # Image-to-DEM
 
-def _do_dem_iteration(previous_ecf, previous_diff, this_ecf, this_diff):
-    mask = (this_diff < 0)
-    if numpy.any(mask):
-        d0 = (previous_diff[mask])
-        d1 = numpy.abs(this_diff[mask])
-        return mask, (d1[:, numpy.newaxis]*previous_ecf[mask] + d0[:, numpy.newaxis]*this_ecf[mask])/((d0+d1)[:, numpy.newaxis])
-    else:
-        return None
+class _DEMMaxPyramid(object):
+    """
+    Hierarchical maximum DEM HAE values over a regular grid of latitude/longitude
+    cells, for bounding the DEM over arbitrary latitude/longitude boxes. Each
+    level halves the resolution of the previous level, so that any box is covered
+    by at most two cells in each direction at some level.
+    """
+
+    __slots__ = ('_origin', '_cell_size', '_levels', '_global_max')
+
+    def __init__(self, dem_interpolator, lat_lon_box, global_max, cells=32, margin=10.):
+        """
+
+        Parameters
+        ----------
+        dem_interpolator : DEMInterpolator
+        lat_lon_box : numpy.ndarray
+            Of the form `[lat min, lat max, lon min, lon max]`.
+        global_max : float
+            The maximum DEM HAE, used for boxes outside of `lat_lon_box`.
+        cells : int
+            The number of cells in each direction at the finest level.
+        margin : float
+            Added to each maximum value, accommodating geoid variation.
+        """
+
+        self._origin = numpy.array([lat_lon_box[0], lat_lon_box[2]], dtype='float64')
+        self._cell_size = numpy.array(
+            [(lat_lon_box[1] - lat_lon_box[0])/float(cells), (lat_lon_box[3] - lat_lon_box[2])/float(cells)],
+            dtype='float64')
+        self._global_max = float(global_max)
+        # NB: the interpolated value in a cell depends on the posts outside of the
+        #   cell, so each cell is padded by the interpolation support
+        padding, overshoot = dem_interpolator.get_interpolation_support()
+        if padding is None:
+            padding = self._cell_size  # unknown, so use the neighboring cells
+        maxes = numpy.full((cells, cells), self._global_max, dtype='float64')
+        for i in range(cells):
+            lat_min = self._origin[0] + i*self._cell_size[0]
+            for j in range(cells):
+                lon_min = self._origin[1] + j*self._cell_size[1]
+                box = [
+                    lat_min - padding[0], lat_min + self._cell_size[0] + padding[0],
+                    lon_min - padding[1], lon_min + self._cell_size[1] + padding[1]]
+                try:
+                    max_value = dem_interpolator.get_max_hae(box)
+                    if overshoot > 0:
+                        max_value += overshoot*(max_value - dem_interpolator.get_min_hae(box))
+                except ValueError:
+                    continue  # i.e. no DEM coverage, so use the global maximum
+                maxes[i, j] = max_value + margin
+        self._levels = [maxes, ]
+        while maxes.shape[0] > 1 or maxes.shape[1] > 1:
+            if maxes.shape[0] % 2 == 1:
+                maxes = numpy.vstack([maxes, maxes[-1:, :]])
+            if maxes.shape[1] % 2 == 1:
+                maxes = numpy.hstack([maxes, maxes[:, -1:]])
+            maxes = numpy.maximum(
+                numpy.maximum(maxes[0::2, 0::2], maxes[1::2, 0::2]),
+                numpy.maximum(maxes[0::2, 1::2], maxes[1::2, 1::2]))
+            self._levels.append(maxes)
+
+    def get_max(self, lats, lons):
+        """
+        Gets an upper bound for the DEM HAE over the boxes bounding the given
+        latitude/longitude values.
+
+        Parameters
+        ----------
+        lats : numpy.ndarray
+            Of shape `(N, M)`, where each row is bounded by one box.
+        lons : numpy.ndarray
+            Of shape `(N, M)`.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        shape = self._levels[0].shape
+        row_min = numpy.floor((numpy.min(lats, axis=1) - self._origin[0])/self._cell_size[0])
+        row_max = numpy.floor((numpy.max(lats, axis=1) - self._origin[0])/self._cell_size[0])
+        col_min = numpy.floor((numpy.min(lons, axis=1) - self._origin[1])/self._cell_size[1])
+        col_max = numpy.floor((numpy.max(lons, axis=1) - self._origin[1])/self._cell_size[1])
+        out = numpy.full(row_min.shape, self._global_max, dtype='float64')
+        inside = (row_min >= 0) & (row_max < shape[0]) & (col_min >= 0) & (col_max < shape[1])
+        if not numpy.any(inside):
+            return out
+        row_min, row_max = row_min[inside].astype('int64'), row_max[inside].astype('int64')
+        col_min, col_max = col_min[inside].astype('int64'), col_max[inside].astype('int64')
+        # at this level, the box is covered by at most two cells in each direction
+        span = numpy.maximum(row_max - row_min, col_max - col_min)
+        level = numpy.minimum(
+            numpy.ceil(numpy.log2(span + 1)).astype('int64'), len(self._levels) - 1)
+        values = numpy.empty(span.shape, dtype='float64')
+        for this_level in numpy.unique(level):
+            mask = (level == this_level)
+            maxes = self._levels[this_level]
+            r0, r1 = row_min[mask] >> this_level, row_max[mask] >> this_level
+            c0, c1 = col_min[mask] >> this_level, col_max[mask] >> this_level
+            values[mask] = numpy.maximum(
+                numpy.maximum(maxes[r0, c0], maxes[r1, c0]), numpy.maximum(maxes[r0, c1], maxes[r1, c1]))
+        out[inside] = values
+        return out
 
 
 def _image_to_ground_dem(
         im_points, coa_projection, dem_interpolator, min_dem, max_dem,
-        vertical_step_size, ref_hae, ref_point):
+        vertical_step_size, ref_hae, ref_point, dem_pyramid=None):
     """
+    Find the first intersection, from above, of the R/Rdot contour with the DEM.
+
+    Each point marches down from `max_dem` with its own step. The step is
+    doubled while the DEM bound over the segment of the contour is below the
+    segment, and halved (to `vertical_step_size`) otherwise. The DEM is only
+    evaluated for steps of `vertical_step_size`, and the first bracketed
+    intersection is refined using the Illinois (modified regula falsi) method.
 
     Parameters
     ----------
@@ -1500,56 +1693,136 @@ def _image_to_ground_dem(
     vertical_step_size : float|int
     ref_hae: float
     ref_point : numpy.ndarray
+    dem_pyramid : None|_DEMMaxPyramid
+        The DEM bounds. If `None`, no segment can be skipped.
 
     Returns
     -------
     numpy.ndarray
     """
 
+    def project(indices, hae):
+        coords = _image_to_ground_hae_perform(
+            r_tgt_coa[indices], r_dot_tgt_coa[indices], arp_coa[indices], varp_coa[indices],
+            ref_point, ugpn, hae, tolerance, max_iterations, ref_hae)
+        return coords, ecf_to_geodetic(coords)
+
+    def get_diff(llh):
+        return llh[:, 2] - dem_interpolator.get_elevation_hae(llh[:, 0], llh[:, 1])
+
     # get (image formation specific) projection parameters
     r_tgt_coa, r_dot_tgt_coa, time_coa, arp_coa, varp_coa = coa_projection.projection(im_points)
     ugpn = wgs_84_norm(ref_point)
     tolerance = 1e-3
     max_iterations = 10
+    dem_tolerance = 1e-2
 
     # if max_dem - min_dem is sufficiently small, then pretend it's flat
     if max_dem - min_dem < vertical_step_size:
         return _image_to_ground_hae_perform(
             r_tgt_coa, r_dot_tgt_coa, arp_coa, varp_coa, ref_point, ugpn, max_dem,
             tolerance, max_iterations, ref_hae)
+
     # set up workspace
-    out = numpy.zeros((im_points.shape[0], 3), dtype='float64')
-    cont_mask = numpy.ones((im_points.shape[0], ), dtype='bool')
-    cont = True
-    this_hae = max_dem
-    previous_coords = _image_to_ground_hae_perform(
-        r_tgt_coa, r_dot_tgt_coa, arp_coa, varp_coa, ref_point, ugpn, max_dem,
-        tolerance, max_iterations, ref_hae)
-    previous_llh = ecf_to_geodetic(previous_coords)
-    previous_diff = previous_llh[:, 2] - dem_interpolator.get_elevation_hae(
-        previous_llh[:, 0], previous_llh[:, 1])
-
-    while cont:
-        this_hae -= vertical_step_size
-        this_coords = _image_to_ground_hae_perform(
-            r_tgt_coa[cont_mask], r_dot_tgt_coa[cont_mask], arp_coa[cont_mask], varp_coa[cont_mask],
-            ref_point, ugpn, this_hae, tolerance, max_iterations, ref_hae)
-        this_llh = ecf_to_geodetic(this_coords)
-        this_diff = this_llh[:, 2] - dem_interpolator.get_elevation_hae(this_llh[:, 0], this_llh[:, 1])
-        result = _do_dem_iteration(previous_coords, previous_diff, this_coords, this_diff)
-        if result is not None:
-            this_mask, this_result = result
-            temp_mask = numpy.zeros((im_points.shape[0], ), dtype='bool')
-            temp_mask[cont_mask] = this_mask
-            out[temp_mask, :] = this_result
-            cont_mask[temp_mask] = False
-            cont = numpy.any(cont_mask)
-            if cont:
-                previous_coords = this_coords[~this_mask, :]
-                previous_diff = this_diff[~this_mask]
+    num_points = im_points.shape[0]
+    out = numpy.full((num_points, 3), numpy.nan, dtype='float64')
+    hae_floor = min_dem - vertical_step_size
+    hae_high = numpy.full((num_points, ), max_dem, dtype='float64')
+    coords_high, llh_high = project(numpy.arange(num_points), max_dem)
+    diff_high = numpy.full((num_points, ), numpy.nan, dtype='float64')  # evaluated lazily
+    step = numpy.full((num_points, ), max_dem - min_dem, dtype='float64')
+    hae_low = numpy.zeros((num_points, ), dtype='float64')
+    diff_low = numpy.zeros((num_points, ), dtype='float64')
+    coords_low = numpy.zeros((num_points, 3), dtype='float64')
+
+    # march down each R/Rdot contour, bracketing the first intersection
+    active = numpy.arange(num_points)[numpy.all(numpy.isfinite(coords_high), axis=1)]
+    bracketed = []
+    while active.size > 0:
+        # the points which have passed the bottom are done, with no intersection
+        done = (hae_high[active] <= hae_floor)
+        out[active[done]] = coords_high[active[done]]
+        active = active[~done]
+        if active.size == 0:
+            break
+        this_hae = numpy.maximum(hae_high[active] - step[active], hae_floor)
+        this_coords, this_llh = project(active, this_hae)
+        finite = numpy.all(numpy.isfinite(this_coords), axis=1)
+        active, this_hae, this_coords, this_llh = \
+            active[finite], this_hae[finite], this_coords[finite], this_llh[finite]
+        if dem_pyramid is None:
+            safe = numpy.zeros(active.shape, dtype='bool')
         else:
-            previous_coords = this_coords
-            previous_diff = this_diff
+            # the lat/lon box for the contour segment, padded for contour curvature
+            lats = numpy.stack([llh_high[active, 0], this_llh[:, 0]], axis=1)
+            lons = numpy.stack([llh_high[active, 1], this_llh[:, 1]], axis=1)
+            lat_pad = 0.25*numpy.abs(lats[:, 1] - lats[:, 0])[:, numpy.newaxis]
+            lon_pad = 0.25*numpy.abs(lons[:, 1] - lons[:, 0])[:, numpy.newaxis]
+            bound = dem_pyramid.get_max(
+                numpy.hstack([lats - lat_pad, lats + lat_pad]), numpy.hstack([lons - lon_pad, lons + lon_pad]))
+            safe = (bound < this_hae)
+        fine = ~safe & (step[active] <= vertical_step_size*(1 + 1e-9))
+        # the fine steps are where the DEM is evaluated
+        fine_indices = numpy.nonzero(fine)[0]
+        crossed = numpy.zeros(active.shape, dtype='bool')
+        if fine_indices.size > 0:
+            this_diff = get_diff(this_llh[fine_indices])
+            crossed[fine_indices] = (this_diff < 0)
+            cross_points = active[fine_indices[this_diff < 0]]
+            hae_low[cross_points] = this_hae[fine_indices[this_diff < 0]]
+            diff_low[cross_points] = this_diff[this_diff < 0]
+            coords_low[cross_points] = this_coords[fine_indices[this_diff < 0]]
+            bracketed.append(cross_points)
+            # no intersection in this segment, so proceed without changing the step
+            keep = (this_diff >= 0)
+            diff_high[active[fine_indices[keep]]] = this_diff[keep]
+        # the segment is entirely above the DEM, so proceed and grow the step
+        move = safe | (fine & ~crossed)
+        moving = active[move]
+        hae_high[moving] = this_hae[move]
+        coords_high[moving] = this_coords[move]
+        llh_high[moving] = this_llh[move]
+        diff_high[active[safe]] = numpy.nan
+        step[active[safe]] *= 2
+        # the segment may intersect the DEM, so shrink the step and try again
+        shrink = active[~safe & ~fine]
+        step[shrink] = numpy.maximum(0.5*step[shrink], vertical_step_size)
+        active = active[~crossed]
+
+    if len(bracketed) == 0:
+        return out
+    # refine the bracketed intersections with the Illinois method
+    active = numpy.concatenate(bracketed)
+    unknown = active[numpy.isnan(diff_high[active])]
+    if unknown.size > 0:
+        diff_high[unknown] = get_diff(llh_high[unknown])
+    out[active] = coords_low[active]
+    exact = (diff_high[active] <= 0)
+    out[active[exact]] = coords_high[active[exact]]
+    active = active[~exact]
+    side = numpy.zeros((num_points, ), dtype='int8')
+    iterations = 0
+    while active.size > 0 and iterations < 50:
+        iterations += 1
+        d_high, d_low = diff_high[active], diff_low[active]
+        this_hae = (hae_high[active]*d_low - hae_low[active]*d_high)/(d_low - d_high)
+        this_coords, this_llh = project(active, this_hae)
+        this_diff = get_diff(this_llh)
+        out[active] = this_coords
+        converged = (numpy.abs(this_diff) < dem_tolerance) | \
+            (hae_high[active] - hae_low[active] < dem_tolerance) | ~numpy.isfinite(this_diff)
+        above = (this_diff >= 0)
+        high_points, low_points = active[above], active[~above]
+        hae_high[high_points] = this_hae[above]
+        diff_high[high_points] = this_diff[above]
+        hae_low[low_points] = this_hae[~above]
+        diff_low[low_points] = this_diff[~above]
+        # halve the retained end point value, when the same end point is retained twice
+        diff_low[high_points[side[high_points] == 1]] *= 0.5
+        diff_high[low_points[side[low_points] == -1]] *= 0.5
+        side[high_points] = 1
+        side[low_points] = -1
+        active = active[~converged]
     return out
 
 
@@ -1584,15 +1857,24 @@ def _image_to_ground_dem_block(
     padded_box = numpy.array([
         max(-90, lat_lon_box[0] - 0.5*lat_pad), min(lat_lon_box[1] + 0.5*lat_pad, 90),
         max(-180, lat_lon_box[2] - 0.5*lon_pad), min(lat_lon_box[3] + 0.5*lon_pad, 180)], dtype='float64')
-    min_dem = dem_interpolator.get_min_hae(padded_box) - 10
-    max_dem = dem_interpolator.get_max_hae(padded_box) + 10
+    padding, overshoot = dem_interpolator.get_interpolation_support()
+    if padding is not None:
+        padded_box += numpy.array([-padding[0], padding[0], -padding[1], padding[1]])
+    min_dem = dem_interpolator.get_min_hae(padded_box)
+    max_dem = dem_interpolator.get_max_hae(padded_box)
+    # accommodate interpolation overshoot and geoid variation
+    excess = overshoot*(max_dem - min_dem) + 10
+    min_dem, max_dem = min_dem - excess, max_dem + excess
+    dem_pyramid = None
+    if max_dem - min_dem >= horizontal_step:
+        dem_pyramid = _DEMMaxPyramid(dem_interpolator, padded_box, max_dem)
 
     # prepare workspace
     num_points = im_points.shape[0]
     if block_size is None or num_points <= block_size:
         coords = _image_to_ground_dem(
             im_points, coa_projection, dem_interpolator, min_dem, max_dem,
-            horizontal_step, ref_hae, ref_ecf)
+            horizontal_step, ref_hae, ref_ecf, dem_pyramid=dem_pyramid)
     else:
         coords = numpy.zeros((num_points, 3), dtype='float64')
         # proceed with block processing
@@ -1601,7 +1883,7 @@ def _image_to_ground_dem_block(
             end_block = min(start_block + block_size, num_points)
             coords[start_block:end_block, :] = _image_to_ground_dem(
                 im_points[start_block:end_block, :], coa_projection, dem_interpolator,
-                min_dem, max_dem, horizontal_step, ref_hae, ref_ecf)
+                min_dem, max_dem, horizontal_step, ref_hae, ref_ecf, dem_pyramid=dem_pyramid)
             start_block = end_block
     return coords
 
@@ -1609,7 +1891,7 @@ def _image_to_ground_dem_block(
 def image_to_ground_dem(
         im_points, structure, block_size=50000, dem_interpolator=None,
         dem_type=None, geoid_file=None, pad_value=0.2,
-        vertical_step_size=10, use_structure_coa=True, **coa_args):
+        vertical_step_size=10, use_structure_coa=True, max_workers=1, max_worker_memory=None, **coa_args):
     """
     Transforms image coordinates to ground plane ECF coordinate via the algorithm(s)
     described in SICD Image Projections document.
@@ -1642,6 +1924,13 @@ def image_to_ground_dem(
         `[0.1, 100]` will be enforced by replacement.
     use_structure_coa : bool
         If structure.coa_projection is populated, use that one **ignoring the COAProjection parameters.**
+    max_workers : None|int
+        The number of worker processes. For more than one, the blocks are
+        projected in a process pool, and `dem_interpolator` is passed to each
+        worker, so it is best provided as the search path.
+    max_worker_memory : None|int|float
+        The approximate maximum working memory for each worker process, in MB,
+        which limits the block size when using a process pool.
     coa_args
         keyword arguments for COAProjection.from_sicd class method.
 
@@ -1666,6 +1955,19 @@ def image_to_ground_dem(
     # coa projection creation
     im_points, orig_shape = _validate_im_points(im_points)
     coa_proj = _get_coa_projection(structure, use_structure_coa, **coa_args)
+    im_points_view = numpy.reshape(im_points, (-1, 2))  # possibly or make 2-d flatten
+    if projection_pool.can_use_pool(im_points_view.shape[0], block_size, max_workers):
+        coords = numpy.empty((im_points_view.shape[0], 3), dtype='float64')
+        projection_pool.project_in_pool(
+            image_to_ground_dem, im_points_view, structure, _get_coa_parameters(coa_proj),
+            (coords, ), block_size=block_size, max_workers=max_workers,
+            max_worker_memory=max_worker_memory, dem_interpolator=dem_interpolator,
+            dem_type=dem_type, geoid_file=geoid_file, pad_value=pad_value,
+            vertical_step_size=vertical_step_size)
+        if len(orig_shape) == 1:
+            return numpy.reshape(coords, (-1,))
+        return numpy.reshape(coords, orig_shape[:-1] + (3,))
+
     vertical_step_size = float(vertical_step_size)
     if vertical_step_size < 0.1:
         vertical_step_size = 0.1
@@ -1691,7 +1993,6 @@ def image_to_ground_dem(
         raise TypeError('dem_interpolator is of unsupported type {}'.format(type(dem_interpolator)))
 
     # perform a projection to reference point hae for approximate lat/lon values
-    im_points_view = numpy.reshape(im_points, (-1, 2))  # possibly or make 2-d flatten
     r_tgt_coa, r_dot_tgt_coa, time_coa, arp_coa, varp_coa = coa_proj.projection(im_points_view)
     ugpn = wgs_84_norm(ref_ecf)
     tolerance = 1e-3
@@ -1714,8 +2015,8 @@ def image_to_ground_dem(
         append_grid_elements(lon_min, lon_max, lat_lon_grids)
 
     if len(lat_lon_grids) == 1:
-        return _image_to_ground_dem_block(
-            im_points, coa_proj, dem_interpolator, vertical_step_size,
+        coords = _image_to_ground_dem_block(
+            im_points_view, coa_proj, dem_interpolator, vertical_step_size,
             lat_lon_grids[0], block_size, lat_grid_size, lon_grid_size)
     else:
         num_points = im_points_view.shape[0]
@@ -1725,7 +2026,7 @@ def image_to_ground_dem(
                     (llh_rough[:, 1] >= entry[2]) & (llh_rough[:, 1] <= entry[3]))
             if numpy.any(mask):
                 coords[mask, :] = _image_to_ground_dem_block(
-                    im_points[mask, :], coa_proj, dem_interpolator, vertical_step_size,
+                    im_points_view[mask, :], coa_proj, dem_interpolator, vertical_step_size,
                     entry, block_size, lat_grid_size, lon_grid_size)
     if len(orig_shape) == 1:
         coords = numpy.reshape(coords, (-1,))
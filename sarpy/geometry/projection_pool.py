@@ -0,0 +1,210 @@
+"""
+Multi-process execution of the point projection methods, for very large point
+sets (i.e. the ortho-rectification mesh for a large image).
+
+The input points are written once to a temporary memory mapped (`.npy`) file,
+and the points are split into chunks which are farmed out to a process pool.
+The SICD/SIDD structure, the COA projection adjustable parameters, and the
+remaining arguments are written once to a temporary state file, which each worker
+loads once and uses to construct its own COA projection, so nothing is pickled
+per chunk except for the state file name and chunk bounds. The results for each
+chunk are written directly into the caller's output arrays as each chunk completes.
+
+This is generally accessed through the `max_workers` argument of the
+:mod:`sarpy.geometry.point_projection` methods.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy
+
+from sarpy.compliance import int_func
+
+
+# the approximate working memory per point for the point projection methods
+_BYTES_PER_POINT = 2048
+# the state loaded in this (worker) process, by state file name
+_STATES = {}
+
+
+def _get_state(state_file):
+    """
+    Gets the projection state from the given state file, loading it once per process.
+
+    Parameters
+    ----------
+    state_file : str
+
+    Returns
+    -------
+    tuple
+        Of the form `(function, structure, inputs, kwargs)`, where `inputs` is
+        the memory mapped array of input points.
+    """
+
+    state = _STATES.get(state_file, None)
+    if state is None:
+        with open(state_file, 'rb') as fi:
+            function, structure, coa_parameters, input_file, kwargs = pickle.load(fi)
+        # NB: the COA projection is not serialized with the structure, so define it here once
+        structure.define_coa_projection(adj_params_frame='ECF', overide=True, **coa_parameters)
+        state = (function, structure, numpy.load(input_file, mmap_mode='r'), kwargs)
+        _STATES[state_file] = state
+    return state
+
+
+def _project_chunk(task):
+    """
+    Project the given chunk of points in the worker process.
+
+    Parameters
+    ----------
+    task : Tuple[str, int, int]
+        The state file name, and the chunk start and stop.
+
+    Returns
+    -------
+    Tuple[int, int, tuple]
+        The chunk start and stop, and the projection results for the chunk.
+    """
+
+    state_file, start, stop = task
+    function, structure, inputs, kwargs = _get_state(state_file)
+    result = function(
+        numpy.array(inputs[start:stop]), structure, use_structure_coa=True, max_workers=1, **kwargs)
+    if not isinstance(result, tuple):
+        result = (result, )
+    return start, stop, result
+
+
+def get_chunk_size(num_points, block_size, max_workers, max_worker_memory=None):
+    """
+    Gets the number of points for each chunk of work.
+
+    Parameters
+    ----------
+    num_points : int
+    block_size : None|int
+        The requested block size.
+    max_workers : int
+    max_worker_memory : None|int|float
+        The approximate maximum working memory for each worker, in MB.
+
+    Returns
+    -------
+    int
+    """
+
+    if block_size is None:
+        chunk_size = int_func(numpy.ceil(num_points/float(max_workers)))
+    else:
+        chunk_size = int_func(block_size)
+    if max_worker_memory is not None:
+        chunk_size = min(chunk_size, int_func(max_worker_memory*1024*1024)//_BYTES_PER_POINT)
+    return max(1, chunk_size)
+
+
+def can_use_pool(num_points, block_size, max_workers):
+    """
+    Should the points be processed using a process pool?
+
+    Parameters
+    ----------
+    num_points : int
+    block_size : None|int
+    max_workers : None|int
+
+    Returns
+    -------
+    bool
+    """
+
+    if max_workers is None or int_func(max_workers) < 2:
+        return False
+    if block_size is not None and num_points <= block_size:
+        return False
+    return True
+
+
+def project_in_pool(
+        function, points, structure, coa_parameters, outputs, block_size=50000,
+        max_workers=2, max_worker_memory=None, **kwargs):
+    """
+    Perform the point projection for the array of points using a process pool,
+    writing the results into the provided output arrays.
+
+    Parameters
+    ----------
+    function : callable
+        The module level point projection method, with signature
+        `function(points, structure, use_structure_coa=True, max_workers=1, **kwargs)`.
+    points : numpy.ndarray
+        The two-dimensional array of input points.
+    structure : sarpy.io.complex.sicd_elements.SICD.SICDType|sarpy.io.product.sidd2_elements.SIDD.SIDDType|sarpy.io.product.sidd1_elements.SIDD.SIDDType
+        The SICD or SIDD structure.
+    coa_parameters : dict
+        The `delta_arp`, `delta_varp`, and `range_bias` ECF frame adjustable
+        parameters for the COA projection.
+    outputs : List[numpy.ndarray]|Tuple[numpy.ndarray]
+        The array for each output of `function`, with first dimension matching
+        the number of points.
+    block_size : None|int
+        The number of points in each chunk.
+    max_workers : int
+        The number of worker processes.
+    max_worker_memory : None|int|float
+        The approximate maximum working memory for each worker, in MB, which
+        limits the chunk size.
+    kwargs
+        The remaining keyword arguments for `function`.
+
+    Returns
+    -------
+    None
+    """
+
+    num_points = points.shape[0]
+    for array in outputs:
+        if array.shape[0] != num_points:
+            raise ValueError(
+                'Each output array must have first dimension {}, got shape {}'.format(num_points, array.shape))
+    chunk_size = get_chunk_size(num_points, block_size, max_workers, max_worker_memory=max_worker_memory)
+    chunks = [(start, min(start + chunk_size, num_points)) for start in range(0, num_points, chunk_size)]
+    max_workers = min(int_func(max_workers), len(chunks))
+    kwargs['block_size'] = block_size
+
+    directory = tempfile.mkdtemp()
+    try:
+        input_file = os.path.join(directory, 'points.npy')
+        numpy.save(input_file, points)
+        state_file = os.path.join(directory, 'state.pkl')
+        with open(state_file, 'wb') as fi:
+            pickle.dump((function, structure, coa_parameters, input_file, kwargs), fi, pickle.HIGHEST_PROTOCOL)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # keep a bounded number of chunks in flight, so the completed results
+            #   are written out as they arrive, rather than accumulating
+            tasks = iter(chunks)
+            pending = set()
+            while True:
+                for start, stop in tasks:
+                    pending.add(executor.submit(_project_chunk, (state_file, start, stop)))
+                    if len(pending) >= 2*max_workers:
+                        break
+                if len(pending) == 0:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, stop, result = future.result()
+                    for array, value in zip(outputs, result):
+                        array[start:stop] = value
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
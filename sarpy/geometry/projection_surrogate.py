@@ -0,0 +1,518 @@
+"""
+A fitted surrogate for the rigorous image to ground and ground to image
+projections, for use when many repeated projections are required (i.e.
+ortho-rectification).
+
+The surrogate consists of a pair of rational polynomial (RPC) models, each the
+ratio of two cubic polynomials in normalized coordinates, in the manner of the
+RPC00B model. One maps `(latitude, longitude, HAE)` to `(row, column)`, and the
+other maps `(row, column, HAE)` to `(latitude, longitude)`. Both are fitted once,
+by least squares, from the rigorous projection of a regular grid over the image
+and a range of HAE values. The fit errors are evaluated against the rigorous
+projection at a held-out grid of check points, offset from the fit grid by half
+the spacing, and a fit whose errors exceed the given tolerances is rejected.
+
+Projection to a HAE surface or to a plane (via iteration on the HAE) may be
+replaced by the surrogate, but projection to a DEM is always rigorous.
+
+The surrogate serializes to a small json sidecar file, so it can be reused
+across processes.
+
+Examples
+--------
+.. code-block:: python
+
+    from sarpy.geometry.projection_surrogate import ProjectionSurrogate
+
+    surrogate = ProjectionSurrogate.from_structure(sicd, hae_range=(-100, 500))
+    print(surrogate.errors)
+    surrogate.to_file('<sidecar file name>')
+    # the surrogate is an opt-in fast path for the point_projection methods
+    image_points, _, _ = sicd.project_ground_to_image(coords, surrogate=surrogate)
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import json
+
+import numpy
+
+from sarpy.compliance import int_func
+from sarpy.geometry.geocoords import ecf_to_geodetic, geodetic_to_ecf
+
+
+def _get_cubic_terms(coords):
+    """
+    Gets the 20 cubic monomials, in the RPC00B ordering, for normalized coordinates.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Of shape `(N, 3)`, where the columns are the RPC `(L, P, H)`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Of shape `(N, 20)`.
+    """
+
+    l, p, h = coords[:, 0], coords[:, 1], coords[:, 2]
+    return numpy.stack([
+        numpy.ones(l.shape), l, p, h, l*p, l*h, p*h, l*l, p*p, h*h,
+        p*l*h, l*l*l, l*p*p, l*h*h, l*l*p, p*p*p, p*h*h, l*l*h, p*p*h, h*h*h], axis=1)
+
+
+class RationalPolynomialModel(object):
+    """
+    A mapping from three input coordinates to two output coordinates, where each
+    output is the ratio of two cubic polynomials in the normalized inputs.
+    """
+
+    __slots__ = ('_input_offset', '_input_scale', '_output_offset', '_output_scale', '_numerator', '_denominator')
+
+    def __init__(self, input_offset, input_scale, output_offset, output_scale, numerator, denominator):
+        """
+
+        Parameters
+        ----------
+        input_offset : numpy.ndarray|list|tuple
+            Of length 3.
+        input_scale : numpy.ndarray|list|tuple
+            Of length 3.
+        output_offset : numpy.ndarray|list|tuple
+            Of length 2.
+        output_scale : numpy.ndarray|list|tuple
+            Of length 2.
+        numerator : numpy.ndarray|list|tuple
+            The numerator coefficients, of shape `(2, 20)`.
+        denominator : numpy.ndarray|list|tuple
+            The denominator coefficients, of shape `(2, 20)`.
+        """
+
+        self._input_offset = numpy.array(input_offset, dtype='float64').reshape((3, ))
+        self._input_scale = numpy.array(input_scale, dtype='float64').reshape((3, ))
+        self._output_offset = numpy.array(output_offset, dtype='float64').reshape((2, ))
+        self._output_scale = numpy.array(output_scale, dtype='float64').reshape((2, ))
+        self._numerator = numpy.array(numerator, dtype='float64').reshape((2, 20))
+        self._denominator = numpy.array(denominator, dtype='float64').reshape((2, 20))
+
+    @classmethod
+    def fit(cls, inputs, outputs, rational=True):
+        """
+        Fit the model by linear least squares.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Of shape `(N, 3)`.
+        outputs : numpy.ndarray
+            Of shape `(N, 2)`.
+        rational : bool
+            Fit the denominator? Otherwise, the denominator is 1.
+
+        Returns
+        -------
+        RationalPolynomialModel
+        """
+
+        input_offset = 0.5*(numpy.min(inputs, axis=0) + numpy.max(inputs, axis=0))
+        input_scale = 0.5*(numpy.max(inputs, axis=0) - numpy.min(inputs, axis=0))
+        input_scale[input_scale == 0] = 1
+        output_offset = 0.5*(numpy.min(outputs, axis=0) + numpy.max(outputs, axis=0))
+        output_scale = 0.5*(numpy.max(outputs, axis=0) - numpy.min(outputs, axis=0))
+        output_scale[output_scale == 0] = 1
+
+        terms = _get_cubic_terms((inputs - input_offset)/input_scale)
+        normalized = (outputs - output_offset)/output_scale
+        numerator = numpy.zeros((2, 20), dtype='float64')
+        denominator = numpy.zeros((2, 20), dtype='float64')
+        denominator[:, 0] = 1
+        for i in range(2):
+            if rational:
+                # y*(1 + sum(b_j*t_j)) = sum(a_j*t_j) is linear in a and b
+                matrix = numpy.hstack([terms, -normalized[:, i:i+1]*terms[:, 1:]])
+                solution = numpy.linalg.lstsq(matrix, normalized[:, i], rcond=None)[0]
+                numerator[i, :] = solution[:20]
+                denominator[i, 1:] = solution[20:]
+            else:
+                numerator[i, :] = numpy.linalg.lstsq(terms, normalized[:, i], rcond=None)[0]
+        return cls(input_offset, input_scale, output_offset, output_scale, numerator, denominator)
+
+    def __call__(self, inputs):
+        """
+        Evaluate the model.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Of shape `(N, 3)`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Of shape `(N, 2)`.
+        """
+
+        terms = _get_cubic_terms((inputs - self._input_offset)/self._input_scale)
+        normalized = terms.dot(self._numerator.T)/terms.dot(self._denominator.T)
+        return normalized*self._output_scale + self._output_offset
+
+    def to_dict(self):
+        """
+        Serialize to a json compatible dictionary.
+
+        Returns
+        -------
+        dict
+        """
+
+        return {
+            'input_offset': self._input_offset.tolist(), 'input_scale': self._input_scale.tolist(),
+            'output_offset': self._output_offset.tolist(), 'output_scale': self._output_scale.tolist(),
+            'numerator': self._numerator.tolist(), 'denominator': self._denominator.tolist()}
+
+    @classmethod
+    def from_dict(cls, input_dict):
+        """
+        Deserialize from a dictionary.
+
+        Parameters
+        ----------
+        input_dict : dict
+
+        Returns
+        -------
+        RationalPolynomialModel
+        """
+
+        return cls(
+            input_dict['input_offset'], input_dict['input_scale'], input_dict['output_offset'],
+            input_dict['output_scale'], input_dict['numerator'], input_dict['denominator'])
+
+
+def _get_image_size(structure):
+    """
+    Gets the (rows, columns) size of the image for the SICD or SIDD structure.
+
+    Parameters
+    ----------
+    structure
+
+    Returns
+    -------
+    Tuple[int, int]
+    """
+
+    from sarpy.io.complex.sicd_elements.SICD import SICDType
+
+    if isinstance(structure, SICDType):
+        return structure.ImageData.NumRows, structure.ImageData.NumCols
+    footprint = structure.Measurement.PixelFootprint
+    return footprint.Row, footprint.Col
+
+
+class ProjectionSurrogate(object):
+    """
+    The fitted surrogate for the rigorous projection, valid over the image
+    extent and the range of HAE values for which it was fitted.
+    """
+
+    __slots__ = ('_ground_to_image_model', '_image_to_ground_model', '_longitude_reference', '_errors')
+
+    def __init__(self, ground_to_image_model, image_to_ground_model, longitude_reference=0., errors=None):
+        """
+
+        Parameters
+        ----------
+        ground_to_image_model : RationalPolynomialModel
+            The mapping from `(latitude, longitude, HAE)` to `(row, column)`.
+        image_to_ground_model : RationalPolynomialModel
+            The mapping from `(row, column, HAE)` to `(latitude, longitude)`.
+        longitude_reference : float
+            Longitudes are unwrapped to within 180 degrees of this value.
+        errors : None|dict
+            The fit errors against the rigorous projection.
+        """
+
+        self._ground_to_image_model = ground_to_image_model
+        self._image_to_ground_model = image_to_ground_model
+        self._longitude_reference = float(longitude_reference)
+        self._errors = {} if errors is None else dict(errors)
+
+    @property
+    def errors(self):
+        """
+        dict: The fit errors against the rigorous projection, at the check points.
+        The `ground_to_image` errors are given in pixels, and the `image_to_ground`
+        errors are given in meters.
+        """
+
+        return dict(self._errors)
+
+    @classmethod
+    def from_structure(cls, structure, hae_range=None, grid_size=(15, 15, 5), margin=0.05, rational=True,
+                       max_image_error=0.1, max_ground_error=1.):
+        """
+        Fit the surrogate from the rigorous projection for the given structure.
+
+        Parameters
+        ----------
+        structure : sarpy.io.complex.sicd_elements.SICD.SICDType|sarpy.io.product.sidd2_elements.SIDD.SIDDType|sarpy.io.product.sidd1_elements.SIDD.SIDDType
+            The SICD or SIDD structure.
+        hae_range : None|Tuple[float, float]
+            The range of HAE values. The default is 500 meters on either side of
+            the reference point HAE.
+        grid_size : Tuple[int, int, int]
+            The number of (row, column, HAE) samples for the fit.
+        margin : float
+            The fraction of the image size by which the fit region extends past
+            each edge of the image.
+        rational : bool
+            Fit a rational, as opposed to polynomial, model?
+        max_image_error : None|float
+            The maximum permitted ground to image error at the check points, in
+            pixels. This is not checked if `None`.
+        max_ground_error : None|float
+            The maximum permitted image to ground error at the check points, in
+            meters. This is not checked if `None`.
+
+        Returns
+        -------
+        ProjectionSurrogate
+
+        Raises
+        ------
+        ValueError
+            If the fit errors at the check points exceed the tolerances.
+        """
+
+        from sarpy.geometry import point_projection
+
+        # noinspection PyProtectedMember
+        ref_llh = ecf_to_geodetic(point_projection._get_reference_point(structure))
+        if hae_range is None:
+            hae_range = (ref_llh[2] - 500., ref_llh[2] + 500.)
+        grid_size = tuple(max(2, int_func(entry)) for entry in grid_size)
+        rows, cols = _get_image_size(structure)
+        bounds = (-margin*rows, (1 + margin)*rows, -margin*cols, (1 + margin)*cols,
+                  float(hae_range[0]), float(hae_range[1]))
+
+        def sample(offset):
+            # the rigorous projection of the grid, offset by the given fraction of the spacing
+            axes = []
+            for i, size in enumerate(grid_size):
+                spacing = (bounds[2*i+1] - bounds[2*i])/float(size - 1)
+                count = size if offset == 0 else size - 1
+                axes.append(bounds[2*i] + (numpy.arange(count) + offset)*spacing)
+            image_points = numpy.stack(numpy.meshgrid(axes[0], axes[1], indexing='ij'), axis=-1).reshape((-1, 2))
+            llh = []
+            for hae in axes[2]:
+                llh.append(ecf_to_geodetic(
+                    point_projection.image_to_ground_hae(image_points, structure, hae0=hae)))
+            llh = numpy.concatenate(llh, axis=0)
+            image_points = numpy.tile(image_points, (axes[2].size, 1))
+            valid = numpy.all(numpy.isfinite(llh), axis=1)
+            return image_points[valid], llh[valid]
+
+        surrogate = cls(None, None, longitude_reference=ref_llh[1])
+        fit_points, fit_llh = sample(0)
+        if fit_points.shape[0] < 40:
+            raise ValueError('Too few valid projected points to fit the surrogate')
+        fit_llh[:, 1] = surrogate._unwrap_longitude(fit_llh[:, 1])
+        surrogate._ground_to_image_model = RationalPolynomialModel.fit(fit_llh, fit_points, rational=rational)
+        surrogate._image_to_ground_model = RationalPolynomialModel.fit(
+            numpy.hstack([fit_points, fit_llh[:, 2:]]), fit_llh[:, :2], rational=rational)
+
+        check_points, check_llh = sample(0.5)
+        image_errors = numpy.linalg.norm(surrogate.ground_to_image_geo(check_llh) - check_points, axis=1)
+        ground_errors = numpy.linalg.norm(
+            surrogate.image_to_ground_hae(check_points, check_llh[:, 2]) - geodetic_to_ecf(check_llh), axis=1)
+        surrogate._errors = {
+            'ground_to_image_rms': float(numpy.sqrt(numpy.mean(image_errors*image_errors))),
+            'ground_to_image_max': float(numpy.max(image_errors)),
+            'image_to_ground_rms': float(numpy.sqrt(numpy.mean(ground_errors*ground_errors))),
+            'image_to_ground_max': float(numpy.max(ground_errors)),
+            'check_points': int_func(check_points.shape[0])}
+        if max_image_error is not None and surrogate._errors['ground_to_image_max'] > max_image_error:
+            raise ValueError(
+                'The maximum ground to image error of the surrogate is {} pixels, which exceeds '
+                'the tolerance of {} pixels'.format(surrogate._errors['ground_to_image_max'], max_image_error))
+        if max_ground_error is not None and surrogate._errors['image_to_ground_max'] > max_ground_error:
+            raise ValueError(
+                'The maximum image to ground error of the surrogate is {} meters, which exceeds '
+                'the tolerance of {} meters'.format(surrogate._errors['image_to_ground_max'], max_ground_error))
+        return surrogate
+
+    def _unwrap_longitude(self, longitude):
+        return numpy.mod(longitude - self._longitude_reference + 180., 360.) + self._longitude_reference - 180.
+
+    def ground_to_image_geo(self, llh_coords):
+        """
+        Transforms `(latitude, longitude, HAE)` coordinates to pixel (row/column)
+        coordinates.
+
+        Parameters
+        ----------
+        llh_coords : numpy.ndarray|list|tuple
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        llh_coords = numpy.array(llh_coords, dtype='float64')
+        orig_shape = llh_coords.shape
+        llh_coords = numpy.reshape(llh_coords, (-1, 3))
+        llh_coords[:, 1] = self._unwrap_longitude(llh_coords[:, 1])
+        return numpy.reshape(self._ground_to_image_model(llh_coords), orig_shape[:-1] + (2, ))
+
+    def ground_to_image(self, coords):
+        """
+        Transforms ECF coordinates to pixel (row/column) coordinates.
+
+        Parameters
+        ----------
+        coords : numpy.ndarray|list|tuple
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        return self.ground_to_image_geo(ecf_to_geodetic(coords))
+
+    def image_to_ground_hae(self, im_points, hae0):
+        """
+        Transforms image coordinates to ECF coordinates on the given HAE surface.
+
+        Parameters
+        ----------
+        im_points : numpy.ndarray|list|tuple
+        hae0 : float|numpy.ndarray
+            The HAE value, or an array of HAE values for each point.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        im_points = numpy.array(im_points, dtype='float64')
+        orig_shape = im_points.shape
+        im_points = numpy.reshape(im_points, (-1, 2))
+        hae = numpy.broadcast_to(numpy.reshape(numpy.asarray(hae0, dtype='float64'), (-1, )), (im_points.shape[0], ))
+        llh = numpy.empty((im_points.shape[0], 3), dtype='float64')
+        llh[:, :2] = self._image_to_ground_model(numpy.hstack([im_points, hae[:, numpy.newaxis]]))
+        llh[:, 2] = hae
+        return numpy.reshape(geodetic_to_ecf(llh), orig_shape[:-1] + (3, ))
+
+    def image_to_ground_plane(self, im_points, gref, ugpn, tolerance=1e-3, max_iterations=10):
+        """
+        Transforms image coordinates to ECF coordinates on the given plane, by
+        Newton iteration on the HAE of the surrogate projection.
+
+        Parameters
+        ----------
+        im_points : numpy.ndarray|list|tuple
+        gref : numpy.ndarray|list|tuple
+            The plane reference point ECF coordinates.
+        ugpn : numpy.ndarray|list|tuple
+            The vector normal to the plane.
+        tolerance : float
+            The distance from the plane for convergence (m).
+        max_iterations : int
+            The maximum number of iterations.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        gref = numpy.reshape(numpy.array(gref, dtype='float64'), (3, ))
+        ugpn = numpy.reshape(numpy.array(ugpn, dtype='float64'), (3, ))
+        ugpn = ugpn/numpy.linalg.norm(ugpn)
+        im_points = numpy.array(im_points, dtype='float64')
+        orig_shape = im_points.shape
+        im_points = numpy.reshape(im_points, (-1, 2))
+
+        hae = numpy.full((im_points.shape[0], ), ecf_to_geodetic(gref)[2], dtype='float64')
+        coords = self.image_to_ground_hae(im_points, hae)
+        distance = (coords - gref).dot(ugpn)
+        for _ in range(max(1, int_func(max_iterations))):
+            if numpy.all(numpy.abs(distance) < tolerance):
+                break
+            # the rate of change of the distance from the plane with HAE
+            slope = (self.image_to_ground_hae(im_points, hae + 1.) - coords).dot(ugpn)
+            hae -= distance/slope
+            coords = self.image_to_ground_hae(im_points, hae)
+            distance = (coords - gref).dot(ugpn)
+        return numpy.reshape(coords, orig_shape[:-1] + (3, ))
+
+    def to_dict(self):
+        """
+        Serialize to a json compatible dictionary.
+
+        Returns
+        -------
+        dict
+        """
+
+        return {
+            'ground_to_image': self._ground_to_image_model.to_dict(),
+            'image_to_ground': self._image_to_ground_model.to_dict(),
+            'longitude_reference': self._longitude_reference,
+            'errors': self._errors}
+
+    @classmethod
+    def from_dict(cls, input_dict):
+        """
+        Deserialize from a dictionary.
+
+        Parameters
+        ----------
+        input_dict : dict
+
+        Returns
+        -------
+        ProjectionSurrogate
+        """
+
+        return cls(
+            RationalPolynomialModel.from_dict(input_dict['ground_to_image']),
+            RationalPolynomialModel.from_dict(input_dict['image_to_ground']),
+            longitude_reference=input_dict.get('longitude_reference', 0.),
+            errors=input_dict.get('errors', None))
+
+    def to_file(self, file_name):
+        """
+        Write the json sidecar file.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Returns
+        -------
+        None
+        """
+
+        with open(file_name, 'w') as fi:
+            json.dump(self.to_dict(), fi, indent=1)
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        Read from a json sidecar file.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Returns
+        -------
+        ProjectionSurrogate
+        """
+
+        with open(file_name, 'r') as fi:
+            return cls.from_dict(json.load(fi))
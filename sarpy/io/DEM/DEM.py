@@ -130,6 +130,23 @@ class DEMInterpolator(object):
 
         raise NotImplementedError
 
+    def get_interpolation_support(self):
+        """
+        Gets the extent of the DEM posts which influence the interpolated value at
+        a point, and the possible overshoot of the interpolated value beyond the
+        range of those posts. An upper bound for the interpolated values over a
+        box is then given by `get_max_hae` over the box padded by this extent, plus
+        the overshoot times the range of values over that padded box.
+
+        Returns
+        -------
+        (None|numpy.ndarray, float)
+            The `[latitude, longitude]` padding in degrees, or `None` if unknown,
+            and the overshoot as a fraction of the range of the post values.
+        """
+
+        return None, 0.0
+
 
 class DEMList(object):
     """
@@ -1,5 +1,13 @@
 """
 Classes and methods for parsing and using digital elevation models in DTED format.
+
+Each DTED tile is decoded once into a native-endian float32 array, with the
+void and complemented values repaired, and the decoded tiles are maintained in a
+shared least recently used cache. The size of this cache is set using
+:func:`set_tile_cache_size`. A `DTEDInterpolator` may optionally pin the decoded
+tiles for its files, so that a scene spanning more tiles than fit in the cache
+does not repeatedly decode them, at the cost of holding those tiles outside of
+the cache budget for the lifetime of the interpolator.
 """
 
 import logging
@@ -12,7 +20,7 @@ from sarpy.compliance import integer_types, string_types
 from sarpy.io.DEM.DEM import DEMList, DEMInterpolator
 from sarpy.io.DEM.utils import argument_validation
 from sarpy.io.DEM.geoid import GeoidHeight
-from sarpy.io.general.base import SarpyIOError
+from sarpy.io.general.base import SarpyIOError, BlockCache
 
 __classification__ = "UNCLASSIFIED"
 __author__ = "Thomas McCullough"
@@ -26,6 +34,40 @@ _SUPPORTED_DTED_FILE_TYPES = {
     'SRTM1': {'fext': '.dt1'},
     'SRTM2': {'fext': '.dt2'},
     'SRTM2F': {'fext': '.dt2'}}
+# the decoded DTED tiles, shared by all readers - a DTED2 tile is about 50 MB
+_TILE_CACHE = BlockCache(max_bytes=268435456)
+
+
+def get_tile_cache():
+    """
+    Gets the cache of decoded DTED tiles shared by all readers.
+
+    Returns
+    -------
+    BlockCache
+    """
+
+    return _TILE_CACHE
+
+
+def set_tile_cache_size(max_bytes):
+    """
+    Sets the size of the cache of decoded DTED tiles shared by all readers, which
+    is 256 MB by default. A DTED2 tile is about 50 MB, and a DTED1 tile is about
+    6 MB. Any tiles currently cached (and not pinned by a reader) are discarded.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The maximum size, in bytes, of the cached tiles.
+
+    Returns
+    -------
+    None
+    """
+
+    global _TILE_CACHE
+    _TILE_CACHE = BlockCache(max_bytes=max_bytes)
 
 
 def get_default_prioritization():
@@ -256,10 +298,22 @@ class DTEDReader(object):
     and not user convenience.
     """
 
-    __slots__ = ('_file_name', '_origin', '_spacing', '_bounding_box', '_shape', '_mem_map')
+    __slots__ = ('_file_name', '_origin', '_spacing', '_bounding_box', '_shape', '_mem_map', '_pin', '_tile')
+
+    def __init__(self, file_name, pin=False):
+        """
+
+        Parameters
+        ----------
+        file_name : str
+        pin : bool
+            Should this reader hold its decoded tile, once decoded, regardless of
+            eviction from the shared cache?
+        """
 
-    def __init__(self, file_name):
         self._file_name = file_name
+        self._pin = bool(pin)
+        self._tile = None
 
         with open(self._file_name, 'rb') as fi:
             # NB: DTED is always big-endian
@@ -302,6 +356,29 @@ class DTEDReader(object):
 
         return numpy.copy(self._origin)
 
+    @property
+    def pin(self):
+        """
+        bool: Does this reader hold its decoded tile, once decoded, regardless of
+        eviction from the shared cache?
+        """
+
+        return self._pin
+
+    @pin.setter
+    def pin(self, value):
+        self._pin = bool(value)
+        if not self._pin:
+            self._tile = None
+
+    @property
+    def spacing(self):
+        """
+        numpy.ndarray: The post spacing in degrees, of the form `[longitude, latitude]`.
+        """
+
+        return numpy.copy(self._spacing)
+
     @property
     def bounding_box(self):
         """
@@ -369,24 +446,90 @@ class DTEDReader(object):
         elevations[pos_voids] = 32768 - elevations[pos_voids]
         return elevations
 
+    def _decode_tile(self):
+        """
+        Decode the full tile, excluding the record header and checksum entries,
+        as a native-endian float32 array with the values repaired.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        tile = numpy.array(self._mem_map[:, 4:-2], dtype='float32')
+        # the same repair as _repair_values, but without the int16 round trip
+        neg_voids = (tile < -15000)
+        tile[neg_voids] = -tile[neg_voids] - 32768
+        pos_voids = (tile > 15000)
+        tile[pos_voids] = 32768 - tile[pos_voids]
+        return tile
+
+    def get_tile(self):
+        """
+        Gets the decoded elevation values for the full tile, which is indexed
+        as `[longitude index, latitude index]`. This is decoded once, and
+        maintained in a cache shared by all readers, and also held by this
+        reader if pinned.
+
+        Returns
+        -------
+        numpy.ndarray
+            The read only float32 array.
+        """
+
+        tile = self._tile
+        if tile is not None:
+            return tile
+        key = os.path.abspath(self._file_name)
+        tile = _TILE_CACHE.get(key)
+        if tile is None:
+            tile = _TILE_CACHE.put(key, self._decode_tile())
+        if self._pin:
+            self._tile = tile
+        return tile
+
+    def _clip_indices(self, ix, iy):
+        # type: (numpy.ndarray, numpy.ndarray) -> (numpy.ndarray, numpy.ndarray)
+        return numpy.clip(ix, 0, self._shape[0] - 1), numpy.clip(iy, 0, self._shape[1] - 1)
+
     def _linear(self, ix, dx, iy, dy):
         # type: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray) -> numpy.ndarray
-        a = (1 - dx) * self._lookup_elevation(ix, iy) + dx * self._lookup_elevation(ix + 1, iy)
-        b = (1 - dx) * self._lookup_elevation(ix, iy+1) + dx * self._lookup_elevation(ix+1, iy+1)
-        return (1 - dy) * a + dy * b
+        flat = numpy.reshape(self.get_tile(), (-1, ))
+        stride = int(self._shape[1])
+        # shift the edge cells inward, so that every neighbor is in the tile
+        t_ix = numpy.clip(ix, 0, self._shape[0] - 2)
+        t_iy = numpy.clip(iy, 0, self._shape[1] - 2)
+        dx = dx + (ix - t_ix)
+        dy = dy + (iy - t_iy)
+        index = t_ix*stride + t_iy
+        a = (1 - dx)*flat[index] + dx*flat[index + stride]
+        b = (1 - dx)*flat[index + 1] + dx*flat[index + stride + 1]
+        return (1 - dy)*a + dy*b
+
+    def _cubic(self, ix, dx, iy, dy):
+        # type: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray) -> numpy.ndarray
+
+        def weights(d):
+            # the Keys cubic convolution kernel, with a = -0.5
+            d2, d3 = d*d, d*d*d
+            return (-0.5*d3 + d2 - 0.5*d, 1.5*d3 - 2.5*d2 + 1, -1.5*d3 + 2*d2 + 0.5*d, 0.5*d3 - 0.5*d2)
+
+        flat = numpy.reshape(self.get_tile(), (-1, ))
+        stride = int(self._shape[1])
+        x_weights = weights(dx)
+        y_weights = weights(dy)
+        out = numpy.zeros(ix.shape, dtype='float64')
+        for j, y_weight in enumerate(y_weights):
+            t_iy = numpy.clip(iy + j - 1, 0, self._shape[1] - 1)
+            for i, x_weight in enumerate(x_weights):
+                t_ix = numpy.clip(ix + i - 1, 0, self._shape[0] - 1)
+                out += x_weight*y_weight*flat[t_ix*stride + t_iy]
+        return out
 
     def _lookup_elevation(self, ix, iy):
         # type: (numpy.ndarray, numpy.ndarray) -> numpy.ndarray
-        t_ix = numpy.copy(ix)
-        t_ix[t_ix >= self._shape[0]] = self._shape[0] - 1
-        t_ix[t_ix < 0] = 0
-
-        # adjust iy to account for 8 extra bytes at the beginning of each column
-        t_iy = iy + 4
-        t_iy[t_iy >= self._shape[1]+4] = self._shape[1] + 3
-        t_iy[t_iy < 4] = 4
-
-        return self._repair_values(self._mem_map[t_ix, t_iy])
+        t_ix, t_iy = self._clip_indices(ix, iy)
+        return self.get_tile()[t_ix, t_iy]
 
     def in_bounds(self, lat, lon):
         """
@@ -406,8 +549,8 @@ class DTEDReader(object):
         return (lon >= self._bounding_box[0]) & (lon <= self._bounding_box[1]) & \
                (lat >= self._bounding_box[2]) & (lat <= self._bounding_box[3])
 
-    def _get_elevation(self, lat, lon):
-        # type: (numpy.ndarray, numpy.ndarray) -> numpy.ndarray
+    def _get_elevation(self, lat, lon, cubic=False):
+        # type: (numpy.ndarray, numpy.ndarray, bool) -> numpy.ndarray
 
         # we implicitly require that lat/lon make sense and are contained in this DTED
 
@@ -418,9 +561,11 @@ class DTEDReader(object):
         # get integer indices via floor
         ix = numpy.cast[numpy.int32](numpy.floor(fx))
         iy = numpy.cast[numpy.int32](numpy.floor(fy))
+        if cubic:
+            return self._cubic(ix, fx-ix, iy, fy-iy)
         return self._linear(ix, fx-ix, iy, fy-iy)
 
-    def get_elevation(self, lat, lon, block_size=50000):
+    def get_elevation(self, lat, lon, block_size=50000, cubic=False):
         """
         Interpolate the elevation values for lat/lon. This is relative to the EGM96
         geoid by DTED specification.
@@ -434,6 +579,8 @@ class DTEDReader(object):
             Otherwise, block processing using blocks of the given size will be used.
             The minimum value used for this is 50,000, and any smaller value will be
             replaced with 50,000. Default is 50,000.
+        cubic : bool
+            Use cubic convolution interpolation, otherwise bilinear interpolation.
 
         Returns
         -------
@@ -447,7 +594,7 @@ class DTEDReader(object):
         if block_size is None:
             boolc = self.in_bounds(lat, lon)
             if numpy.any(boolc):
-                out[boolc] = self._get_elevation(lat[boolc], lon[boolc])
+                out[boolc] = self._get_elevation(lat[boolc], lon[boolc], cubic=cubic)
         else:
             block_size = min(50000, int(block_size))
             start_block = 0
@@ -457,7 +604,7 @@ class DTEDReader(object):
                 lon1 = lon[start_block:end_block]
                 boolc = self.in_bounds(lat1, lon1)
                 out1 = numpy.full(lat1.shape, numpy.nan, dtype=numpy.float64)
-                out1[boolc] = self._get_elevation(lat1[boolc], lon[boolc])
+                out1[boolc] = self._get_elevation(lat1[boolc], lon1[boolc], cubic=cubic)
                 out[start_block:end_block] = out1
                 start_block = end_block
 
@@ -516,7 +663,7 @@ class DTEDReader(object):
         arg = self._find_overlap(lat_lon_box)
         if arg is None:
             return None
-        return numpy.max(self.__getitem__(arg))
+        return numpy.max(self.get_tile()[arg])
 
     def get_min(self, lat_lon_box=None):
         """
@@ -536,7 +683,7 @@ class DTEDReader(object):
         arg = self._find_overlap(lat_lon_box)
         if arg is None:
             return None
-        return numpy.min(self.__getitem__(arg))
+        return numpy.min(self.get_tile()[arg])
 
 
 class DTEDInterpolator(DEMInterpolator):
@@ -544,13 +691,45 @@ class DTEDInterpolator(DEMInterpolator):
     DEM Interpolator using DTED/SRTM files for the DEM information.
     """
 
-    __slots__ = ('_readers', '_geoid', '_ref_geoid')
+    __slots__ = ('_readers', '_geoid', '_ref_geoid', '_tile_index', '_cubic')
+
+    def __init__(self, files, geoid_file, lat_lon_box=None, cubic=False, pin_tiles=False):
+        """
+
+        Parameters
+        ----------
+        files : str|List[str]
+            The DTED file name(s), in order of priority.
+        geoid_file : str|GeoidHeight
+            The `GeoidHeight` object, an egm file name, or root directory containing
+            one of the egm files in the sub-directory "geoid".
+        lat_lon_box : None|numpy.ndarray|list|tuple
+            Of the form `[lat min, lat max, lon min, lon max]`.
+        cubic : bool
+            Use cubic convolution interpolation of the DTED values, otherwise
+            bilinear interpolation.
+        pin_tiles : bool
+            Hold the decoded tiles for these files, once decoded, for the lifetime
+            of this interpolator? Otherwise, the decoded tiles are only maintained
+            in the shared cache, which may be too small for the given files.
+            Note that pinned tiles are held regardless of the cache size, and a
+            DTED2 tile is about 50 MB.
+        """
 
-    def __init__(self, files, geoid_file, lat_lon_box=None):
         if isinstance(files, str):
             files = [files, ]
         # get a reader object for each file
-        self._readers = [DTEDReader(fil) for fil in files]
+        self._readers = [DTEDReader(fil, pin=pin_tiles) for fil in files]
+        self._cubic = bool(cubic)
+        # the index of the one degree tiles, keyed by the lower left corner
+        self._tile_index = {}
+        for reader in self._readers:
+            origin = reader.origin
+            corner = numpy.round(origin)
+            if numpy.all(numpy.abs(origin - corner) < 1e-9):
+                key = self._get_tile_key(corner[1], corner[0])
+                if key not in self._tile_index:
+                    self._tile_index[key] = reader
 
         # get the geoid object - we should prefer egm96 .pgm files, since that's the DTED spec
         #   in reality, it makes very little difference, though
@@ -577,8 +756,29 @@ class DTEDInterpolator(DEMInterpolator):
         self._max_geoid = None
         self._min_geoid = None
 
+    @staticmethod
+    def _get_tile_key(lat, lon):
+        """
+        Gets the integer key for the one degree tile containing the given point(s).
+
+        Parameters
+        ----------
+        lat : numpy.ndarray|float
+        lon : numpy.ndarray|float
+
+        Returns
+        -------
+        numpy.ndarray|int
+        """
+
+        key = (numpy.floor(lat) + 90)*360 + numpy.floor(lon) + 180
+        if isinstance(key, numpy.ndarray):
+            return key.astype('int64')
+        return int(key)
+
     @classmethod
-    def from_coords_and_list(cls, lat_lon_box, dted_list, dem_type=None, geoid_file=None):
+    def from_coords_and_list(
+            cls, lat_lon_box, dted_list, dem_type=None, geoid_file=None, cubic=False, pin_tiles=False):
         """
         Construct a `DTEDInterpolator` from a coordinate collection and `DTEDList` object.
 
@@ -597,6 +797,11 @@ class DTEDInterpolator(DEMInterpolator):
             The `GeoidHeight` object, an egm file name, or root directory containing
             one of the egm files in the sub-directory "geoid". If `None`, then default
             to the root directory of `dted_list`.
+        cubic : bool
+            Use cubic convolution interpolation, otherwise bilinear interpolation.
+        pin_tiles : bool
+            Hold the decoded tiles, once decoded, for the lifetime of the interpolator,
+            regardless of the cache size?
 
         Returns
         -------
@@ -613,10 +818,13 @@ class DTEDInterpolator(DEMInterpolator):
         if geoid_file is None:
             geoid_file = dted_list.root_dir
 
-        return cls(dted_list.get_file_list(lat_lon_box, dem_type=dem_type), geoid_file, lat_lon_box=lat_lon_box)
+        return cls(
+            dted_list.get_file_list(lat_lon_box, dem_type=dem_type), geoid_file,
+            lat_lon_box=lat_lon_box, cubic=cubic, pin_tiles=pin_tiles)
 
     @classmethod
-    def from_reference_point(cls, ref_point, dted_list, dem_type=None, geoid_file=None, pad_value=0.1):
+    def from_reference_point(
+            cls, ref_point, dted_list, dem_type=None, geoid_file=None, pad_value=0.1, cubic=False, pin_tiles=False):
         """
         Construct a DTEDInterpolator object by padding around the reference point by
         `pad_value` latitude degrees (1 degree ~ 111 km or 69 miles).
@@ -639,6 +847,11 @@ class DTEDInterpolator(DEMInterpolator):
             to the root directory of `dted_list`.
         pad_value : float
             The degree value to pad by.
+        cubic : bool
+            Use cubic convolution interpolation, otherwise bilinear interpolation.
+        pin_tiles : bool
+            Hold the decoded tiles, once decoded, for the lifetime of the interpolator,
+            regardless of the cache size?
 
         Returns
         -------
@@ -663,7 +876,8 @@ class DTEDInterpolator(DEMInterpolator):
             lon_min += 360
 
         return cls.from_coords_and_list(
-            [lat_min, lat_max, lon_min, lon_max], dted_list, dem_type=dem_type, geoid_file=geoid_file)
+            [lat_min, lat_max, lon_min, lon_max], dted_list, dem_type=dem_type, geoid_file=geoid_file,
+            cubic=cubic, pin_tiles=pin_tiles)
 
     @property
     def geoid(self):  # type: () -> GeoidHeight
@@ -678,12 +892,37 @@ class DTEDInterpolator(DEMInterpolator):
         values = numpy.full(lat.shape, numpy.nan, dtype=numpy.float64)
         if numpy.any(mask):
             # noinspection PyProtectedMember
-            values[mask] = reader._get_elevation(lat[mask], lon[mask])
+            values[mask] = reader._get_elevation(lat[mask], lon[mask], cubic=self._cubic)
         return mask, values
 
+    def _get_elevation_geoid_from_tiles(self, lat, lon, out, remaining):
+        """
+        Populate the elevation values for the points in the indexed tiles, by
+        bucketing the points by tile in one pass. Arrays `out` and `remaining`
+        are modified in place.
+        """
+
+        keys = self._get_tile_key(lat, lon)
+        order = numpy.argsort(keys, kind='mergesort')
+        unique_keys, starts = numpy.unique(keys[order], return_index=True)
+        stops = numpy.append(starts[1:], keys.size)
+        for key, start, stop in zip(unique_keys, starts, stops):
+            reader = self._tile_index.get(int(key), None)
+            if reader is None:
+                continue
+            indices = order[start:stop]
+            indices = indices[reader.in_bounds(lat[indices], lon[indices])]
+            if indices.size > 0:
+                # noinspection PyProtectedMember
+                out[indices] = reader._get_elevation(lat[indices], lon[indices], cubic=self._cubic)
+                remaining[indices] = False
+
     def _get_elevation_geoid(self, lat, lon):
         out = numpy.full(lat.shape, numpy.nan, dtype=numpy.float64)
-        remaining = numpy.ones(lat.shape, dtype=numpy.bool)
+        remaining = numpy.ones(lat.shape, dtype='bool')
+        if len(self._tile_index) > 0 and lat.size > 0:
+            self._get_elevation_geoid_from_tiles(lat, lon, out, remaining)
+        # the points not in an indexed tile (i.e. on the far edge of the extent)
         for reader in self._readers:
             if not numpy.any(remaining):
                 break
@@ -772,6 +1011,17 @@ class DTEDInterpolator(DEMInterpolator):
         else:
             return float(self._geoid.get(lat_lon_box[0], lat_lon_box[2]))
 
+    def get_interpolation_support(self):
+        if len(self._readers) < 1:
+            return None, 0.0
+        # NB: the reader spacing is [longitude, latitude]
+        spacing = numpy.max([reader.spacing[::-1] for reader in self._readers], axis=0)
+        if self._cubic:
+            # the cubic convolution kernel reaches the second post in each direction,
+            #   and its negative lobes total at most 2*(1/8)*(9/8) = 0.28125
+            return 2*spacing, 0.28125
+        return spacing, 0.0
+
     def get_max_hae(self, lat_lon_box=None):
         return self.get_max_geoid(lat_lon_box=lat_lon_box) + self._get_ref_geoid(lat_lon_box)
 
@@ -7,6 +7,10 @@ __classification__ = "UNCLASSIFIED"
 __author__ = "Thomas McCullough"
 
 import os
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Union, Tuple, BinaryIO
 import numpy
 import warnings
@@ -171,30 +175,274 @@ class FlatSICDReader(FlatReader, SICDTypeReader):
         SICDTypeReader.__init__(self, sicd_meta)
 
 
+def reorder_h5_range(the_range):
+    """
+    Hdf5 datasets do not support slicing with negative step, so convert the range
+    to the equivalent positive step range covering the same elements.
+
+    Parameters
+    ----------
+    the_range : Tuple[int, int, int]
+        Of the form `(start, stop, step)`.
+
+    Returns
+    -------
+    Tuple[int, int, int], bool
+        The positive step range, and whether the result must be reversed.
+    """
+
+    start, stop, step = the_range
+    if step > 0:
+        return the_range, False
+    step = -step
+    count = int(numpy.ceil((start - stop)/float(step)))
+    return (start - (count - 1)*step, start + 1, step), True
+
+
+class H5HandlePool(object):
+    """
+    A thread-safe pool of open (read only) hdf5 file handles, with least recently
+    used eviction once more than `max_open_files` files are open. This permits
+    repeated chip reads from the same hdf5 file without paying the cost of
+    opening the file and walking the hdf5 b-tree for every read.
+
+    Handles which are in use are never closed by eviction, so the number of open
+    files may temporarily exceed `max_open_files` under heavy concurrent use.
+    """
+
+    __slots__ = ('_max_open_files', '_file_kwargs', '_handles', '_lock')
+
+    def __init__(self, max_open_files=16, rdcc_nbytes=None, rdcc_nslots=None, rdcc_w0=None):
+        """
+
+        Parameters
+        ----------
+        max_open_files : int
+            The maximum number of idle files to keep open.
+        rdcc_nbytes : None|int
+            The h5py raw data chunk cache size (in bytes) for each file. The
+            h5py default is used if not provided.
+        rdcc_nslots : None|int
+            The number of chunk slots in the h5py raw data chunk cache for each
+            file. This should be a prime number, roughly 100 times the number
+            of chunks which fit in `rdcc_nbytes`. The h5py default is used if
+            not provided.
+        rdcc_w0 : None|float
+            The h5py chunk preemption policy, in the range [0, 1]. The h5py
+            default is used if not provided.
+        """
+
+        self._max_open_files = 16
+        self._handles = OrderedDict()
+        self._lock = threading.RLock()
+        self._file_kwargs = {}
+        for key, value in [('rdcc_nbytes', rdcc_nbytes), ('rdcc_nslots', rdcc_nslots), ('rdcc_w0', rdcc_w0)]:
+            if value is not None:
+                self._file_kwargs[key] = value
+        self.max_open_files = max_open_files
+
+    @property
+    def max_open_files(self):
+        """
+        int: The maximum number of idle files to keep open.
+        """
+
+        return self._max_open_files
+
+    @max_open_files.setter
+    def max_open_files(self, value):
+        value = int(value)
+        if value < 1:
+            raise ValueError('max_open_files must be a positive integer, got {}'.format(value))
+        with self._lock:
+            self._max_open_files = value
+            self._evict()
+
+    @property
+    def open_count(self):
+        """
+        int: The number of files currently open.
+        """
+
+        with self._lock:
+            return len(self._handles)
+
+    @staticmethod
+    def _get_key(file_name):
+        return os.path.abspath(os.path.expanduser(file_name))
+
+    def _evict(self):
+        # NB: the lock must be held
+        if len(self._handles) <= self._max_open_files:
+            return
+        for key in list(self._handles.keys()):
+            if len(self._handles) <= self._max_open_files:
+                break
+            entry = self._handles[key]
+            if entry[1] == 0:
+                del self._handles[key]
+                self._close_handle(key, entry[0])
+
+    @staticmethod
+    def _close_handle(key, handle):
+        # noinspection PyBroadException
+        try:
+            handle.close()
+        except Exception as e:
+            logging.error('Failed closing hdf5 file {} with error {}'.format(key, e))
+
+    @contextmanager
+    def open_file(self, file_name):
+        """
+        Context manager yielding an open (read only) `h5py.File` object for the
+        given file. The file remains open in the pool after use, subject to
+        eviction.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Yields
+        ------
+        h5py.File
+        """
+
+        if h5py is None:
+            raise ImportError("Can't read hdf5 files, because the h5py dependency is missing.")
+
+        key = self._get_key(file_name)
+        with self._lock:
+            entry = self._handles.pop(key, None)
+            if entry is None:
+                # entry is [handle, usage count, retired state]
+                entry = [h5py.File(key, 'r', **self._file_kwargs), 0, False]
+            entry[1] += 1
+            self._handles[key] = entry  # most recently used is last
+            self._evict()
+        try:
+            yield entry[0]
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    if entry[2]:
+                        self._close_handle(key, entry[0])
+                    else:
+                        self._evict()
+
+    def release(self, file_name):
+        """
+        Close the handle for the given file, if open. If the handle is currently
+        in use, then it will be closed once no longer in use.
+
+        Parameters
+        ----------
+        file_name : str
+
+        Returns
+        -------
+        None
+        """
+
+        key = self._get_key(file_name)
+        with self._lock:
+            entry = self._handles.pop(key, None)
+            if entry is None:
+                return
+            if entry[1] == 0:
+                self._close_handle(key, entry[0])
+            else:
+                entry[2] = True
+
+    def close(self):
+        """
+        Close all open handles (or mark those in use for closing).
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            for key in list(self._handles.keys()):
+                self.release(key)
+
+
+_DEFAULT_H5_POOL = None
+
+
+def get_default_h5_pool():
+    """
+    Gets the shared hdf5 handle pool used by hdf5 based chippers, when no
+    specific pool is provided.
+
+    Returns
+    -------
+    H5HandlePool
+    """
+
+    global _DEFAULT_H5_POOL
+    if _DEFAULT_H5_POOL is None:
+        _DEFAULT_H5_POOL = H5HandlePool()
+    return _DEFAULT_H5_POOL
+
+
+def set_default_h5_pool(pool):
+    """
+    Sets the shared hdf5 handle pool used by hdf5 based chippers, when no
+    specific pool is provided. Any previous default pool is closed.
+
+    Parameters
+    ----------
+    pool : H5HandlePool
+
+    Returns
+    -------
+    None
+    """
+
+    global _DEFAULT_H5_POOL
+    if not isinstance(pool, H5HandlePool):
+        raise TypeError('pool must be an H5HandlePool instance, got type {}'.format(type(pool)))
+    if _DEFAULT_H5_POOL is not None and _DEFAULT_H5_POOL is not pool:
+        _DEFAULT_H5_POOL.close()
+    _DEFAULT_H5_POOL = pool
+
+
 class H5Chipper(BaseChipper):
-    __slots__ = ('_file_name', '_band_name')
+    __slots__ = ('_file_name', '_band_name', '_h5_pool')
+
+    def __init__(self, file_name, band_name, data_size, symmetry, transform_data='COMPLEX', h5_pool=None):
+        """
+
+        Parameters
+        ----------
+        file_name : str
+        band_name : str
+            The path of the image dataset in the hdf5 file.
+        data_size : tuple
+        symmetry : tuple
+        transform_data : None|str|Callable
+        h5_pool : None|H5HandlePool
+            The pool of hdf5 file handles. The shared default pool will be used
+            if not provided.
+        """
 
-    def __init__(self, file_name, band_name, data_size, symmetry, transform_data='COMPLEX'):
         if h5py is None:
             raise ImportError("Can't read hdf5 files, because the h5py dependency is missing.")
         self._file_name = file_name
         self._band_name = band_name
+        self._h5_pool = get_default_h5_pool() if h5_pool is None else h5_pool
         super(H5Chipper, self).__init__(data_size, symmetry=symmetry, transform_data=transform_data)
 
-    def _read_raw_fun(self, range1, range2):
-        def reorder(tr):
-            if tr[2] > 0:
-                return tr, False
-            else:
-                if tr[1] == -1 and tr[2] < 0:
-                    return (0, tr[0]+1, -tr[2]), True
-                else:
-                    return (tr[1], tr[0], -tr[2]), True
+    def close(self):
+        self._h5_pool.release(self._file_name)
 
+    def _read_raw_fun(self, range1, range2):
         r1, r2 = self._reorder_arguments(range1, range2)
-        r1, rev1 = reorder(r1)
-        r2, rev2 = reorder(r2)
-        with h5py.File(self._file_name, 'r') as hf:
+        r1, rev1 = reorder_h5_range(r1)
+        r2, rev2 = reorder_h5_range(r2)
+        with self._h5_pool.open_file(self._file_name) as hf:
             gp = hf[self._band_name]
             if not isinstance(gp, h5py.Dataset):
                 raise ValueError(
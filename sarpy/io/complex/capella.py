@@ -17,7 +17,7 @@ import numpy
 
 from sarpy.compliance import string_types
 from sarpy.io.general.base import BaseReader, SarpyIOError
-from sarpy.io.general.tiff import TiffDetails, NativeTiffChipper
+from sarpy.io.general.tiff import TiffDetails, create_tiff_chipper
 from sarpy.io.general.utils import parse_timestring, get_seconds, is_file_like
 from sarpy.io.complex.base import SICDTypeReader
 from sarpy.io.complex.utils import fit_position_xvalidation
@@ -98,9 +98,9 @@ class CapellaDetails(object):
         except Exception as e:
             logging.error('Failed deserializing the ImageDescription tag as json with error {}'.format(e))
             raise e
-        # verify the file is not compressed
+        # verify the compression scheme is supported
         self._tiff_details.check_compression()
-        # verify the file is not tiled
+        # verify the tile or strip organization
         self._tiff_details.check_tiled()
 
     @property
@@ -409,7 +409,7 @@ class CapellaReader(BaseReader, SICDTypeReader):
                             'filename or CapellaDetails object')
         self._capella_details = capella_details
         sicd = self.capella_details.get_sicd()
-        chipper = NativeTiffChipper(self.capella_details.tiff_details, symmetry=self.capella_details.get_symmetry())
+        chipper = create_tiff_chipper(self.capella_details.tiff_details, symmetry=self.capella_details.get_symmetry())
 
         SICDTypeReader.__init__(self, sicd)
         BaseReader.__init__(self, chipper, reader_type="SICD")
@@ -4,19 +4,16 @@ read to SICD or SIO format. The same conversion utility can be used to subset da
 """
 
 import os
-import sys
-import pkgutil
-from importlib import import_module
 import numpy
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union, List, Tuple
 
 from sarpy.compliance import int_func
 from sarpy.io.general.base import BaseReader, SarpyIOError
 from sarpy.io.general.utils import is_file_like
-from sarpy.io.complex.sicd import SICDWriter
-from sarpy.io.complex.sio import SIOWriter
-from sarpy.io.complex.sicd_elements.SICD import SICDType
+from sarpy.io.general import format_detection
 
 
 __classification__ = "UNCLASSIFIED"
@@ -25,12 +22,50 @@ __author__ = ("Wade Schwartzkopf", "Thomas McCullough")
 
 ###########
 # Module variables
-_writer_types = {'SICD': SICDWriter, 'SIO': SIOWriter}
 _openers = []
+_opener_format_types = {}
 _parsed_openers = False
+# The static registry of opener entry points, in priority order, and the
+#   plausible format types (see sarpy.io.general.format_detection) for each.
+#   The module is only imported if the opener is attempted.
+_opener_registry = (
+    ('sarpy.io.complex.capella', 'is_a', (format_detection.TIFF, )),
+    ('sarpy.io.complex.csk', 'is_a', (format_detection.HDF5, )),
+    ('sarpy.io.complex.iceye', 'is_a', (format_detection.HDF5, )),
+    ('sarpy.io.complex.nisar', 'is_a', (format_detection.HDF5, )),
+    ('sarpy.io.complex.palsar2', 'is_a', (format_detection.CEOS, )),
+    ('sarpy.io.complex.radarsat', 'is_a', (format_detection.RADARSAT_PRODUCT, )),
+    ('sarpy.io.complex.sentinel', 'is_a', (format_detection.SAFE_MANIFEST, )),
+    ('sarpy.io.complex.sicd', 'is_a', (format_detection.NITF, )),
+    ('sarpy.io.complex.sio', 'is_a', (format_detection.SIO, )),
+    ('sarpy.io.complex.tsx', 'is_a', (format_detection.TSX_PRODUCT, )))
+_final_attempt_registry = (
+    ('sarpy.io.complex.other_nitf', 'final_attempt', (format_detection.NITF, )), )
+
+
+def _get_writer_type(output_format):
+    """
+    Gets the writer class for the given output format.
+
+    Parameters
+    ----------
+    output_format : str
+
+    Returns
+    -------
+    Type
+    """
 
+    if output_format == 'SICD':
+        from sarpy.io.complex.sicd import SICDWriter
+        return SICDWriter
+    elif output_format == 'SIO':
+        from sarpy.io.complex.sio import SIOWriter
+        return SIOWriter
+    raise ValueError('Got unexpected output_format {}'.format(output_format))
 
-def register_opener(open_func):
+
+def register_opener(open_func, format_types=None):
     """
     Provide a new opener.
 
@@ -40,6 +75,9 @@ def register_opener(open_func):
         This is required to be a function which takes a single argument (file name).
         This function should return a sarpy.io.complex.base.BaseReader instance
         if the referenced file is viable for the underlying type, and None otherwise.
+    format_types : None|Tuple[str, ...]
+        The format types (see :mod:`sarpy.io.general.format_detection`) for
+        which this opener is plausible. If `None`, the opener is always attempted.
 
     Returns
     -------
@@ -50,15 +88,17 @@ def register_opener(open_func):
         raise TypeError('open_func must be a callable')
     if open_func not in _openers:
         _openers.append(open_func)
+        _opener_format_types[open_func] = None if format_types is None else tuple(format_types)
 
 
 def parse_openers():
     """
-    Automatically find the viable openers (i.e. :func:`is_a`) in the various modules.
+    Register the openers from the static registry of entry points. Note that
+    the format modules are not imported until the given opener is attempted.
 
     Returns
     -------
-
+    None
     """
 
     global _parsed_openers
@@ -66,44 +106,29 @@ def parse_openers():
         return
     _parsed_openers = True
 
-    def check_module(mod_name):
-        # import the module
-        import_module(mod_name)
-        # fetch the module from the modules dict
-        module = sys.modules[mod_name]
-        # see if it has an is_a function, if so, register it
-        if hasattr(module, 'is_a'):
-            register_opener(module.is_a)
-
-        # walk down any subpackages
-        path, fil = os.path.split(module.__file__)
-        if not fil.startswith('__init__.py'):
-            # there are no subpackages
-            return
-        for sub_module in pkgutil.walk_packages([path, ]):
-            _, sub_module_name, _ = sub_module
-            sub_name = "{}.{}".format(mod_name, sub_module_name)
-            check_module(sub_name)
-
-    check_module('sarpy.io.complex')
+    for module_name, function_name, format_types in _opener_registry:
+        register_opener(format_detection.LazyOpener(module_name, function_name), format_types=format_types)
 
 
 def _define_final_attempt_openers():
     """
-    Gets the prioritized list of openers to attempt after regular openers.
+    Gets the prioritized list of openers (and format types) to attempt after
+    regular openers.
 
     Returns
     -------
-    list
+    List[Tuple[Callable, Tuple[str, ...]]]
     """
 
-    from sarpy.io.complex.other_nitf import final_attempt
-    return [final_attempt, ]
+    return [(format_detection.LazyOpener(module_name, function_name), format_types)
+            for module_name, function_name, format_types in _final_attempt_registry]
 
 
 def open_complex(file_name):
     """
-    Given a file, try to find and return the appropriate reader object.
+    Given a file, try to find and return the appropriate reader object. Only
+    the openers plausible for the format detected from the file header (see
+    :func:`sarpy.io.general.format_detection.detect_format_types`) are attempted.
 
     Parameters
     ----------
@@ -122,16 +147,12 @@ def open_complex(file_name):
         raise SarpyIOError('File {} does not exist.'.format(file_name))
     # parse openers, if not already done
     parse_openers()
-    # see if we can find a reader though trial and error
-    for opener in _openers:
-        reader = opener(file_name)
-        if reader is not None:
-            return reader
-    # check the final attempt openers
-    for opener in _define_final_attempt_openers():
-        reader = opener(file_name)
-        if reader is not None:
-            return reader
+    # see if we can find a reader though trial and error, including the final attempt openers
+    openers = [(opener, _opener_format_types[opener]) for opener in _openers]
+    openers.extend(_define_final_attempt_openers())
+    reader = format_detection.probe_openers(file_name, openers)
+    if reader is not None:
+        return reader
 
     # If for loop completes, no matching file format was found.
     raise SarpyIOError('Unable to determine complex image format.')
@@ -186,9 +207,7 @@ class Converter(object):
         if output_format is None:
             output_format = 'SICD'
         output_format = output_format.upper()
-        if output_format not in ['SICD', 'SIO']:
-            raise ValueError('Got unexpected output_format {}'.format(output_format))
-        writer_type = _writer_types[output_format]
+        writer_type = _get_writer_type(output_format)
 
         if isinstance(reader, BaseReader):
             self._reader = reader  # type: BaseReader
@@ -262,16 +281,37 @@ class Converter(object):
         """SICDWriter|SIOWriter: The writer instance."""
         return self._writer
 
-    def write_data(self, max_block_size=None):
+    def _read_block(self, block_start, block_end):
+        return self._reader[block_start:block_end, self._col_limits[0]:self._col_limits[1], self._frame]
+
+    def _write_block(self, data, block_start, block_end):
+        self._writer.write_chip(data, start_indices=(block_start - self._row_limits[0], 0))
+        logging.info('Done writing block {}-{} to file {}'.format(block_start, block_end, self._file_name))
+
+    def write_data(self, max_block_size=None, read_workers=0, blocks_in_flight=None):
         r"""
         Assuming that the desired changes have been made to the writer instance
         nitf header tags, write the data.
 
+        In the pipelined mode (`read_workers > 0`), upcoming row blocks are read
+        (and converted) by a pool of reader threads, while the calling thread
+        writes each block in order. At most `blocks_in_flight` blocks are
+        read ahead of the writer, which bounds the memory usage to
+        roughly `blocks_in_flight*max_block_size`.
+        Readers which are not memory mapped are safe here, since reads through
+        a shared file object are serialized.
+
         Parameters
         ----------
         max_block_size : None|int
             (nominal) maximum block size in bytes. Minimum value is :math:`2^{20} = 1~\text{MB}`.
             Default value is :math:`2^{26} = 64~\text{MB}`.
+        read_workers : int
+            The number of reader threads. If `0`, then blocks are read and
+            written strictly in sequence.
+        blocks_in_flight : None|int
+            The maximum number of blocks read ahead of the writer, in the pipelined
+            mode. Defaults to `read_workers + 1`.
 
         Returns
         -------
@@ -285,16 +325,44 @@ class Converter(object):
             max_block_size = int_func(max_block_size)
             if max_block_size < 2**20:
                 max_block_size = 2**20
+        read_workers = int_func(read_workers)
+        if read_workers < 0:
+            raise ValueError('read_workers must be non-negative, got {}'.format(read_workers))
+        if blocks_in_flight is None:
+            blocks_in_flight = read_workers + 1
+        else:
+            blocks_in_flight = int_func(blocks_in_flight)
+            if blocks_in_flight < 1:
+                raise ValueError('blocks_in_flight must be a positive integer, got {}'.format(blocks_in_flight))
 
-        # now, write the data
+        # define the blocks
         rows_per_block = self._get_rows_per_block(max_block_size)
-        block_start = self._row_limits[0]
-        while block_start < self._row_limits[1]:
-            block_end = min(block_start + rows_per_block, self._row_limits[1])
-            data = self._reader[block_start:block_end, self._col_limits[0]:self._col_limits[1], self._frame]
-            self._writer.write_chip(data, start_indices=(block_start - self._row_limits[0], 0))
-            logging.info('Done writing block {}-{} to file {}'.format(block_start, block_end, self._file_name))
-            block_start = block_end
+        blocks = [
+            (block_start, min(block_start + rows_per_block, self._row_limits[1]))
+            for block_start in range(self._row_limits[0], self._row_limits[1], rows_per_block)]
+
+        # now, write the data
+        if read_workers == 0 or len(blocks) < 2:
+            for block_start, block_end in blocks:
+                self._write_block(self._read_block(block_start, block_end), block_start, block_end)
+            return
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=read_workers) as executor:
+            try:
+                for block_start, block_end in blocks:
+                    pending.append(
+                        (executor.submit(self._read_block, block_start, block_end), block_start, block_end))
+                    if len(pending) >= blocks_in_flight:
+                        future, t_start, t_end = pending.popleft()
+                        self._write_block(future.result(), t_start, t_end)
+                while len(pending) > 0:
+                    future, t_start, t_end = pending.popleft()
+                    self._write_block(future.result(), t_start, t_end)
+            finally:
+                # don't bother reading any blocks which remain after an exception
+                for future, _, _ in pending:
+                    future.cancel()
 
     def __del__(self):
         if hasattr(self, '_writer'):
@@ -316,7 +384,8 @@ class Converter(object):
 
 def conversion_utility(
         input_file, output_directory, output_files=None, frames=None, output_format='SICD',
-        row_limits=None, column_limits=None, max_block_size=None, check_older_version=False):
+        row_limits=None, column_limits=None, max_block_size=None, check_older_version=False,
+        frame_workers=1, read_workers=0, blocks_in_flight=None):
     """
     Copy SAR complex data to a file of the specified format.
 
@@ -341,12 +410,29 @@ def conversion_utility(
         (nominal) maximum block size in bytes. Passed through to the Converter class.
     check_older_version : bool
         Try to use a less recent version of SICD (1.1), for possible application compliance issues?
+    frame_workers : int
+        The number of frames to convert concurrently, each in its own thread.
+    read_workers : int
+        The number of reader threads for each frame. Passed through to
+        :meth:`Converter.write_data`.
+    blocks_in_flight : None|int
+        The maximum number of blocks read ahead of the writer for each frame.
+        Passed through to :meth:`Converter.write_data`.
 
     Returns
     -------
     None
     """
 
+    def convert_frame(o_file, frame, row_lims, col_lims):
+        logging.info('Converting frame {} from file {} to file {}'.format(frame, input_file, o_file))
+        with Converter(
+                reader, output_directory, output_file=o_file, frame=frame,
+                row_limits=row_lims, col_limits=col_lims, output_format=output_format,
+                check_older_version=check_older_version) as converter:
+            converter.write_data(
+                max_block_size=max_block_size, read_workers=read_workers, blocks_in_flight=blocks_in_flight)
+
     def validate_lims(lims, typ):
         # type: (Union[None, tuple, list, numpy.ndarray], str) -> Tuple[Tuple[int, int], ...]
         def validate_entry(st, ed, shap, i_fr):
@@ -451,10 +537,15 @@ def conversion_utility(
     row_limits = validate_lims(row_limits, 'row')
     column_limits = validate_lims(column_limits, 'column')
 
-    for o_file, frame, row_lims, col_lims in zip(output_files, frames, row_limits, column_limits):
-        logging.info('Converting frame {} from file {} to file {}'.format(frame, input_file, o_file))
-        with Converter(
-                reader, output_directory, output_file=o_file, frame=frame,
-                row_limits=row_lims, col_limits=col_lims, output_format=output_format,
-                check_older_version=check_older_version) as converter:
-            converter.write_data(max_block_size=max_block_size)
+    frame_workers = int_func(frame_workers)
+    if frame_workers < 1:
+        raise ValueError('frame_workers must be a positive integer, got {}'.format(frame_workers))
+    arguments = list(zip(output_files, frames, row_limits, column_limits))
+    if frame_workers == 1 or len(arguments) < 2:
+        for entry in arguments:
+            convert_frame(*entry)
+    else:
+        with ThreadPoolExecutor(max_workers=min(frame_workers, len(arguments))) as executor:
+            futures = [executor.submit(convert_frame, *entry) for entry in arguments]
+            for future in futures:
+                future.result()  # raises any exception encountered converting the frame
@@ -678,13 +678,16 @@ class CSKReader(BaseReader, SICDTypeReader):
 
     __slots__ = ('_csk_details', )
 
-    def __init__(self, csk_details):
+    def __init__(self, csk_details, h5_pool=None):
         """
 
         Parameters
         ----------
         csk_details : str|CSKDetails
             file name or CSKDetails object
+        h5_pool : None|sarpy.io.complex.base.H5HandlePool
+            The pool of hdf5 file handles used for reading. The shared default
+            pool will be used if not provided.
         """
 
         if isinstance(csk_details, string_types):
@@ -705,7 +708,8 @@ class CSKReader(BaseReader, SICDTypeReader):
                 raise ValueError('Unhandled mission id {}'.format(self._csk_details.mission_id))
 
             sicds.append(sicd_data[band_name])
-            chippers.append(H5Chipper(csk_details.file_name, the_band, shape_dict[band_name], symmetry))
+            chippers.append(H5Chipper(csk_details.file_name, the_band, shape_dict[band_name], symmetry,
+                                      h5_pool=h5_pool))
 
         SICDTypeReader.__init__(self, tuple(sicds))
         BaseReader.__init__(self, tuple(chippers), reader_type="SICD")
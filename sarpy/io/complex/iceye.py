@@ -15,7 +15,8 @@ from scipy.constants import speed_of_light
 
 from sarpy.io.complex.nisar import _stringify
 from sarpy.compliance import string_types, int_func
-from sarpy.io.complex.base import SICDTypeReader, h5py, is_hdf5
+from sarpy.io.complex.base import SICDTypeReader, h5py, is_hdf5, get_default_h5_pool, \
+    reorder_h5_range
 from sarpy.io.complex.sicd_elements.blocks import Poly2DType, Poly1DType
 from sarpy.io.complex.sicd_elements.SICD import SICDType
 from sarpy.io.complex.sicd_elements.CollectionInfo import CollectionInfoType, RadarModeType
@@ -459,14 +460,34 @@ class ICEYEDetails(object):
 
 
 class ICEYEChipper(BaseChipper):
-    __slots__ = ('_file_name', '_real_group', '_imaginary_group')
+    __slots__ = ('_file_name', '_real_group', '_imaginary_group', '_h5_pool')
+
+    def __init__(self, file_name, data_size, symmetry, transform_data='COMPLEX',
+                 real_group='s_i', imaginary_group='s_q', h5_pool=None):
+        """
+
+        Parameters
+        ----------
+        file_name : str
+        data_size : tuple
+        symmetry : tuple
+        transform_data : None|str|Callable
+        real_group : str
+        imaginary_group : str
+        h5_pool : None|sarpy.io.complex.base.H5HandlePool
+            The pool of hdf5 file handles. The shared default pool will be used
+            if not provided.
+        """
 
-    def __init__(self, file_name, data_size, symmetry, transform_data='COMPLEX', real_group='s_i', imaginary_group='s_q'):
         self._file_name = file_name
         self._real_group = real_group
         self._imaginary_group = imaginary_group
+        self._h5_pool = get_default_h5_pool() if h5_pool is None else h5_pool
         super(ICEYEChipper, self).__init__(data_size, symmetry=symmetry, transform_data=transform_data)
 
+    def close(self):
+        self._h5_pool.release(self._file_name)
+
     def _read_raw_fun(self, range1, range2):
         def validate_gp(gp, name):
             if not isinstance(gp, h5py.Dataset):
@@ -475,19 +496,10 @@ class ICEYEChipper(BaseChipper):
             if len(gp.shape) != 2:
                 raise ValueError('Dataset {} has unexpected shape {}'.format(name, gp.shape))
 
-        def reorder(tr):
-            if tr[2] > 0:
-                return tr, False
-            else:
-                if tr[1] == -1 and tr[2] < 0:
-                    return (0, tr[0]+1, -tr[2]), True
-                else:
-                    return (tr[1], tr[0], -tr[2]), True
-
         r1, r2 = self._reorder_arguments(range1, range2)
-        r1, rev1 = reorder(r1)
-        r2, rev2 = reorder(r2)
-        with h5py.File(self._file_name, 'r') as hf:
+        r1, rev1 = reorder_h5_range(r1)
+        r2, rev2 = reorder_h5_range(r2)
+        with self._h5_pool.open_file(self._file_name) as hf:
             real_gp = hf[self._real_group]
             imag_gp = hf[self._imaginary_group]
             validate_gp(real_gp, self._real_group)
@@ -516,13 +528,16 @@ class ICEYEReader(BaseReader, SICDTypeReader):
 
     __slots__ = ('_iceye_details', )
 
-    def __init__(self, iceye_details):
+    def __init__(self, iceye_details, h5_pool=None):
         """
 
         Parameters
         ----------
         iceye_details : str|ICEYEDetails
             file name or ICEYEDetails object
+        h5_pool : None|sarpy.io.complex.base.H5HandlePool
+            The pool of hdf5 file handles used for reading. The shared default
+            pool will be used if not provided.
         """
 
         if isinstance(iceye_details, string_types):
@@ -532,7 +547,7 @@ class ICEYEReader(BaseReader, SICDTypeReader):
                             'filename or ICEYEDetails object')
         self._iceye_details = iceye_details
         sicd, data_size, symmetry = iceye_details.get_sicd()
-        chipper = ICEYEChipper(iceye_details.file_name, data_size, symmetry)
+        chipper = ICEYEChipper(iceye_details.file_name, data_size, symmetry, h5_pool=h5_pool)
 
         SICDTypeReader.__init__(self, sicd)
         BaseReader.__init__(self, chipper, reader_type="SICD")
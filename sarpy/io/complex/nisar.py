@@ -686,13 +686,16 @@ class NISARReader(BaseReader, SICDTypeReader):
 
     __slots__ = ('_nisar_details', )
 
-    def __init__(self, nisar_details):
+    def __init__(self, nisar_details, h5_pool=None):
         """
 
         Parameters
         ----------
         nisar_details : str|NISARDetails
             file name or NISARDetails object
+        h5_pool : None|sarpy.io.complex.base.H5HandlePool
+            The pool of hdf5 file handles used for reading. The shared default
+            pool will be used if not provided.
         """
 
         if isinstance(nisar_details, string_types):
@@ -706,7 +709,8 @@ class NISARReader(BaseReader, SICDTypeReader):
         sicds = []
         for band_name in sicd_data:
             sicds.append(sicd_data[band_name])
-            chippers.append(H5Chipper(nisar_details.file_name, band_name, shape_dict[band_name], symmetry))
+            chippers.append(H5Chipper(nisar_details.file_name, band_name, shape_dict[band_name], symmetry,
+                                      h5_pool=h5_pool))
 
         SICDTypeReader.__init__(self, tuple(sicds))
         BaseReader.__init__(self, tuple(chippers), reader_type="SICD")
@@ -302,22 +302,189 @@ def _validate_lookup(lookup_table):
                          'got shape {}'.format(lookup_table.shape))
 
 
-def amp_phase_to_complex(lookup_table):
+def _get_octant_phase_table():
     """
-    This constructs the function to convert from AMP8I_PHS8I format data to complex64 data.
-
-    Parameters
-    ----------
-    lookup_table : numpy.ndarray
+    Gets the table of AMP8I_PHS8I phase values, given octant and index `k` for
+    the phase in the first octant.
 
     Returns
     -------
-    callable
+    numpy.ndarray
+    """
+
+    out = numpy.zeros((8, 33), dtype=numpy.uint8)
+    for octant in range(8):
+        for k in range(33):
+            value = (64 - k) if octant & 1 else k
+            value = (128 - value) if octant & 2 else value
+            value = (256 - value) if octant & 4 else value
+            out[octant, k] = value & 255
+    return out.ravel()
+
+
+class _BinnedSearch(object):
     """
+    Equivalent to :code:`numpy.searchsorted(thresholds, values, side='right')`
+    for sorted non-negative thresholds and non-negative values. A uniform
+    binning of the values provides a starting index, which is corrected with
+    a small fixed number of vectorized comparisons, instead of a binary search
+    for each value.
+    """
+
+    __slots__ = ('_thresholds', '_extended', '_starts', '_scale', '_passes')
+
+    def __init__(self, thresholds, max_bins=65536, max_passes=4):
+        """
+
+        Parameters
+        ----------
+        thresholds : numpy.ndarray
+        max_bins : int
+        max_passes : int
+        """
+
+        self._thresholds = numpy.asarray(thresholds, dtype='float64')
+        self._extended = numpy.hstack((self._thresholds, numpy.inf))
+        self._starts = None
+        self._scale = None
+        self._passes = None
+
+        upper = self._thresholds[-1]
+        if not (self._thresholds[0] >= 0 and upper > 0 and numpy.isfinite(upper)):
+            return  # just use searchsorted
+
+        bins = 256
+        while bins <= max_bins:
+            edges = numpy.arange(bins + 1)*(upper/bins)
+            # conservative, to account for rounding in the bin determination
+            starts = numpy.searchsorted(self._thresholds, edges[:-1]*(1 - 1e-6), side='left')
+            ends = numpy.searchsorted(self._thresholds, edges[1:]*(1 + 1e-6), side='right')
+            passes = int(numpy.max(ends - starts))
+            if passes <= max_passes:
+                self._starts = starts
+                self._scale = bins/upper
+                self._passes = passes
+                return
+            bins *= 4
+
+    def __call__(self, values, buffer=None):
+        """
+        Find the number of thresholds less than or equal to each value.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+        buffer : None|numpy.ndarray
+            Optional floating point work array of the same shape as `values`.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        if self._passes is None:
+            return numpy.searchsorted(self._thresholds, values, side='right')
+
+        if buffer is None:
+            buffer = numpy.empty(values.shape, dtype=values.dtype)
+        numpy.multiply(values, self._scale, out=buffer)
+        numpy.fmin(buffer, self._starts.size - 1, out=buffer)
+        index = self._starts[buffer.astype(numpy.intp)]
+        for _ in range(self._passes):
+            index += self._extended[index] <= values
+        return index
+
+
+class AmpPhaseCodec(object):
+    """
+    Conversion between complex data and AMP8I_PHS8I format data, for a given
+    amplitude lookup table. This is constructed once per lookup table, and
+    may be safely used from multiple threads.
+
+    Decoding uses a precomputed table of the complex value for each of the
+    256x256 amplitude/phase pairs. Encoding chooses the amplitude table entry
+    nearest in value, using the directly computed bin for a uniformly spaced
+    table and a binned search of the sorted midpoint thresholds otherwise. The
+    nearest phase value is found from the ratio of the smaller to larger of the
+    absolute real and imaginary parts, and the signs, avoiding `arctan2`. The
+    conversion proceeds in chunks of rows, to bound the size of the temporary
+    arrays.
+    """
+
+    __slots__ = ('_lookup_table', '_decode_table', '_amplitude_search', '_order', '_step', '_chunk_size')
+
+    # for the phase in the first octant, the midpoints between phase values
+    #   k*2*pi/256 for k=0, ..., 32, given as tangent
+    _phase_search = _BinnedSearch(numpy.tan((numpy.arange(32) + 0.5)*(2*numpy.pi/256)))
+    # the phase value for index 33*octant + k, where the octant bits are
+    #   (imaginary < 0, real < 0, |imaginary| > |real|)
+    _phase_table = _get_octant_phase_table()
+
+    def __init__(self, lookup_table, chunk_size=1048576):
+        """
+
+        Parameters
+        ----------
+        lookup_table : numpy.ndarray
+            The float64 amplitude lookup table of length 256.
+        chunk_size : int
+            The approximate number of pixels converted at once.
+        """
+
+        _validate_lookup(lookup_table)
+        self._lookup_table = lookup_table.copy()
+        self._chunk_size = max(1, int(chunk_size))
+
+        # the decoding table, indexed by 256*amplitude + phase
+        theta = numpy.arange(256)*(2*numpy.pi/256)
+        amp = self._lookup_table[:, numpy.newaxis]
+        decode_table = numpy.empty((256, 256), dtype=numpy.complex64)
+        decode_table.real = amp*numpy.cos(theta)
+        decode_table.imag = amp*numpy.sin(theta)
+        self._decode_table = decode_table.ravel()
+
+        # the encoding parameters
+        self._step = None
+        self._order = None
+        self._amplitude_search = None
+        step = self._lookup_table[1] - self._lookup_table[0]
+        if step > 0 and numpy.allclose(
+                self._lookup_table, self._lookup_table[0] + step*numpy.arange(256), rtol=0, atol=1e-6*step):
+            self._step = step
+        else:
+            the_table = self._lookup_table
+            if numpy.any(numpy.diff(the_table) < 0):
+                self._order = numpy.argsort(the_table, kind='mergesort')
+                the_table = the_table[self._order]
+            self._amplitude_search = _BinnedSearch(0.5*(the_table[:-1] + the_table[1:]))
 
-    _validate_lookup(lookup_table)
+    @property
+    def lookup_table(self):
+        """
+        numpy.ndarray: The amplitude lookup table.
+        """
+
+        return self._lookup_table
+
+    def _rows_per_chunk(self, row_size):
+        return max(1, self._chunk_size//max(1, row_size))
+
+    def decode(self, data):
+        """
+        Convert from AMP8I_PHS8I format data to complex64 data.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The uint8 data of shape `(rows, cols, 2*bands)`, with amplitude and
+            phase alternating in the last dimension.
+
+        Returns
+        -------
+        numpy.ndarray
+            The complex64 data of shape `(rows, cols, bands)`.
+        """
 
-    def converter(data):
         if not isinstance(data, numpy.ndarray):
             raise ValueError('requires a numpy.ndarray, got {}'.format(type(data)))
 
@@ -328,13 +495,96 @@ def amp_phase_to_complex(lookup_table):
             raise ValueError('Requires a three-dimensional numpy.ndarray (with band '
                              'in the last dimension), got shape {}'.format(data.shape))
 
-        out = numpy.zeros((data.shape[0], data.shape[1], int(data.shape[2]/2)), dtype=numpy.complex64)
-        amp = lookup_table[data[:, :, 0::2]]
-        theta = data[:, :, 1::2]*(2*numpy.pi/256)
-        out.real = amp*numpy.cos(theta)
-        out.imag = amp*numpy.sin(theta)
+        out = numpy.empty((data.shape[0], data.shape[1], int(data.shape[2]/2)), dtype=numpy.complex64)
+        if out.size == 0:
+            return out
+        amp = data[:, :, 0:2*out.shape[2]:2]
+        phase = data[:, :, 1:2*out.shape[2]:2]
+        row_size = out.shape[1]*out.shape[2]
+        rows_per_chunk = self._rows_per_chunk(row_size)
+        index_buffer = numpy.empty((min(rows_per_chunk, out.shape[0])*row_size, ), dtype=numpy.uint16)
+        for start in range(0, out.shape[0], rows_per_chunk):
+            stop = min(start + rows_per_chunk, out.shape[0])
+            index = numpy.reshape(index_buffer[:(stop - start)*row_size], (stop - start, ) + out.shape[1:])
+            index[:] = amp[start:stop]
+            index <<= 8
+            index |= phase[start:stop]
+            numpy.take(self._decode_table, index, out=out[start:stop])
         return out
-    return converter
+
+    def encode(self, data):
+        """
+        Convert from complex64 or complex128 data to AMP8I_PHS8I format data.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The two-dimensional complex data.
+
+        Returns
+        -------
+        numpy.ndarray
+            The uint8 data of shape `(rows, cols, 2)`.
+        """
+
+        new_shape = _validate_input(data)
+        out = numpy.empty(new_shape, dtype=numpy.uint8)
+        if data.size == 0:
+            return out
+        rows_per_chunk = self._rows_per_chunk(data.shape[1])
+        buffer_size = min(rows_per_chunk, data.shape[0])*data.shape[1]
+        buffers = [numpy.empty((buffer_size, ), dtype=data.real.dtype) for _ in range(3)]
+        swapped = numpy.empty((buffer_size, ), dtype='bool')
+        for start in range(0, data.shape[0], rows_per_chunk):
+            stop = min(start + rows_per_chunk, data.shape[0])
+            chunk = data[start:stop]
+            work, larger, smaller = [numpy.reshape(entry[:chunk.size], chunk.shape) for entry in buffers]
+            swap = numpy.reshape(swapped[:chunk.size], chunk.shape)
+
+            # the amplitude
+            numpy.abs(chunk, out=work)
+            if self._step is not None:
+                work -= self._lookup_table[0]
+                work *= 1./self._step
+                numpy.rint(work, out=work)
+                numpy.clip(work, 0, 255, out=work)
+                out[start:stop, :, 0] = work
+            else:
+                index = self._amplitude_search(work, buffer=larger)
+                if self._order is not None:
+                    index = self._order[index]
+                out[start:stop, :, 0] = index
+
+            # the phase, determined in the first octant, then unfolded
+            numpy.abs(chunk.real, out=larger)
+            numpy.abs(chunk.imag, out=smaller)
+            numpy.greater(smaller, larger, out=swap)
+            numpy.minimum(larger, smaller, out=work)
+            numpy.maximum(larger, smaller, out=larger)
+            numpy.divide(work, larger, out=work, where=(larger > 0))
+            index = self._phase_search(work, buffer=smaller)
+            octant = numpy.less(chunk.imag, 0).view(numpy.uint8)*numpy.uint8(4)
+            octant += numpy.less(chunk.real, 0).view(numpy.uint8)*numpy.uint8(2)
+            octant += swap.view(numpy.uint8)
+            index += octant*33
+            numpy.take(self._phase_table, index, out=out[start:stop, :, 1])
+        return out
+
+
+def amp_phase_to_complex(lookup_table):
+    """
+    This constructs the function to convert from AMP8I_PHS8I format data to complex64 data.
+
+    Parameters
+    ----------
+    lookup_table : numpy.ndarray
+
+    Returns
+    -------
+    callable
+    """
+
+    return AmpPhaseCodec(lookup_table).decode
 
 
 class SICDReader(NITFReader, SICDTypeReader):
@@ -485,18 +735,7 @@ def complex_to_amp_phase(lookup_table):
     callable
     """
 
-    _validate_lookup(lookup_table)
-
-    def converter(data):
-        new_shape = _validate_input(data)
-        out = numpy.zeros(new_shape, dtype=numpy.uint8)
-        # NB: for numpy before 1.10, digitize requires 1-d
-        out[:, :, 0] = numpy.digitize(numpy.abs(data).ravel(), lookup_table, right=False).reshape(data.shape)
-        out[:, :, 1] = numpy.arctan2(data.real, data.imag)*(256/(2*numpy.pi))
-        # truncation takes care of properly rolling negative to positive
-        return out
-
-    return converter
+    return AmpPhaseCodec(lookup_table).encode
 
 
 def complex_to_int(data):
@@ -575,7 +814,9 @@ class SICDWriter(NITFWriter):
 
         Parameters
         ----------
-        file_name : str
+        file_name : str|BinaryIO
+            The output file name, or a writable (not necessarily seekable) file like
+            object, to which the file is emitted sequentially. See :class:`NITFWriter`.
         sicd_meta : sarpy.io.complex.sicd_elements.SICD.SICDType
         check_older_version : bool
             Try to create a version 1.1 sicd, if possible?
@@ -7,6 +7,11 @@ __author__ = "Thomas McCullough"
 
 import os
 import logging
+import threading
+import weakref
+from collections import OrderedDict
+from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union, Tuple, BinaryIO, Callable
 
 import numpy
@@ -60,6 +65,63 @@ def validate_transform_data(transform_data):
         raise ValueError('transform_data must be None, a string, or callable')
 
 
+def _range_length(the_range):
+    """
+    The number of elements in the validated range `(start, stop, step)`.
+
+    Parameters
+    ----------
+    the_range : Tuple[int, int, int]
+
+    Returns
+    -------
+    int
+    """
+
+    return max(0, int_func(numpy.ceil((the_range[1] - the_range[0])/float(the_range[2]))))
+
+
+def interleaved_to_complex(data, out=None):
+    """
+    Converts data with real/imaginary components stored in adjacent bands to
+    complex64, in a single pass. Any required byte swapping (i.e. for big-endian
+    file data) is performed as part of the same pass.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Three-dimensional array of shape `(rows, cols, 2*bands)`.
+    out : None|numpy.ndarray
+        The output array of shape `(rows, cols, bands)`. This is allocated as
+        complex64, if not provided.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    if data.ndim != 3 or (data.shape[2] % 2) != 0:
+        raise ValueError(
+            'Complex transformation requires three-dimensional data with an even number of '
+            'bands, got shape {}'.format(data.shape))
+    shape = (data.shape[0], data.shape[1], int_func(data.shape[2]/2))
+    if out is None:
+        out = numpy.empty(shape, dtype=numpy.complex64)
+    elif out.shape != shape:
+        raise ValueError('Output array has shape {}, but expected shape {}'.format(out.shape, shape))
+
+    if out.dtype.name == 'complex64':
+        # the memory layout of complex64 is interleaved float32, so this is one copy
+        try:
+            numpy.copyto(out.view(numpy.float32), data, casting='unsafe')
+            return out
+        except ValueError:
+            pass  # the output is not contiguous in the final axis
+    out.real = data[:, :, 0::2]
+    out.imag = data[:, :, 1::2]
+    return out
+
+
 class BaseChipper(object):
     """
     Base class defining basic functionality for the literal extraction of data
@@ -82,7 +144,7 @@ class BaseChipper(object):
     the default provided in the `_transform_data_method` method.
     """
 
-    __slots__ = ('_data_size', '_transform_data', '_symmetry')
+    __slots__ = ('_data_size', '_transform_data', '_symmetry', '_return_views')
 
     def __init__(self, data_size, symmetry=(False, False, False), transform_data=False):
         """
@@ -103,6 +165,7 @@ class BaseChipper(object):
         """
 
         self._transform_data = validate_transform_data(transform_data)
+        self._return_views = False
 
         if not isinstance(symmetry, tuple):
             symmetry = tuple(symmetry)
@@ -150,7 +213,22 @@ class BaseChipper(object):
 
         return self._data_size
 
-    def __call__(self, range1, range2):
+    @property
+    def return_views(self):
+        """
+        bool: Permit the return of (read only) views into the underlying data
+        source (i.e. memory map), instead of copies, in the event that no
+        transformation or reordering of the data is required. This is only
+        possible for some chippers, and defaults to `False`.
+        """
+
+        return self._return_views
+
+    @return_views.setter
+    def return_views(self, value):
+        self._return_views = bool(value)
+
+    def __call__(self, range1, range2, out=None):
         """
         Reads and fetches data. Note that :code:`chipper(range1, range2)` is an alias
         for :code:`chipper.read_chip(range1, range2)`.
@@ -159,6 +237,9 @@ class BaseChipper(object):
         ----------
         range1 : None|int|tuple
         range2 : none|int|tuple
+        out : None|numpy.ndarray
+            If provided, the data will be written into this array, which must
+            have the appropriate shape, and this array will be returned.
 
         Returns
         -------
@@ -166,6 +247,10 @@ class BaseChipper(object):
         """
 
         data = self._read_raw_fun(range1, range2)
+        if out is not None:
+            return self._transform_into(data, out)
+
+        is_view = self._is_source_view(data)
         data = self._transform_data_method(data)
 
         # make a one band image flat
@@ -173,8 +258,89 @@ class BaseChipper(object):
             data = numpy.reshape(data, data.shape[:-1])
 
         data = self._reorder_data(data)
+        if is_view and not self._return_views and self._is_source_view(data):
+            data = numpy.array(data)
         return data
 
+    def _transform_into(self, data, out):
+        """
+        Performs the data transformation and reordering, writing the result into
+        the provided output array.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The raw data.
+        out : numpy.ndarray
+            The output array, in the expected (analysis) order.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        if not isinstance(out, numpy.ndarray):
+            raise TypeError('out must be a numpy.ndarray, got type {}'.format(type(out)))
+        if out.ndim not in (2, 3):
+            raise ValueError('out must be two or three-dimensional, got shape {}'.format(out.shape))
+        # the target is a view of out in raw order, so the reordering is free
+        target = numpy.swapaxes(out, 0, 1) if self._symmetry[2] else out
+        if target.ndim == 2:
+            target = target[:, :, numpy.newaxis]
+        self._transform_data_method(data, out=target)
+        return out
+
+    def _is_source_view(self, data):
+        """
+        Is the provided array a view into the underlying data source? This is
+        used to ensure that such views are not returned, except when permitted
+        by `return_views`.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+
+        Returns
+        -------
+        bool
+        """
+
+        return False
+
+    def _get_read_pieces(self, range1, range2):
+        """
+        Partition a read into independent pieces, for use in parallel reading.
+        Each piece is of the form `(chipper, piece_range1, piece_range2, out_start1, out_start2)`,
+        where `chipper(piece_range1, piece_range2)` yields the data to be placed in
+        the output starting at index `(out_start1, out_start2)`. The default is the
+        single piece consisting of the entire read.
+
+        Parameters
+        ----------
+        range1 : Tuple[int, int, int]
+            The validated range for the first axis, in output coordinates.
+        range2 : Tuple[int, int, int]
+            The validated range for the second axis, in output coordinates.
+
+        Returns
+        -------
+        List[Tuple[BaseChipper, tuple, tuple, int, int]]
+        """
+
+        return [(self, range1, range2, 0, 0), ]
+
+    def close(self):
+        """
+        Release any resources (file handles, memory maps, etc.) held by the chipper.
+        The default implementation does nothing.
+
+        Returns
+        -------
+        None
+        """
+
+        pass
+
     def __getitem__(self, item):
         """
         Reads and returns data using more traditional to python slice functionality.
@@ -270,22 +436,30 @@ class BaseChipper(object):
 
         return real_arg1, real_arg2
 
-    def _transform_data_method(self, data):
-        # type: (numpy.ndarray) -> numpy.ndarray
+    def _transform_data_method(self, data, out=None):
+        # type: (numpy.ndarray, Union[None, numpy.ndarray]) -> numpy.ndarray
         if self._transform_data is None:
             # nothing to be done
-            return data
+            result = data
         elif callable(self._transform_data):
-            return self._transform_data(data)
-        elif isinstance(self._transform_data, string_types):
-            if self._transform_data == 'COMPLEX':
-                if numpy.iscomplexobj(data):
-                    return data
-                out = numpy.zeros((data.shape[0], data.shape[1], int_func(data.shape[2]/2)), dtype=numpy.complex64)
-                out.real = data[:, :, 0::2]
-                out.imag = data[:, :, 1::2]
-                return out
-        raise ValueError('Unsupported transform_data value {}'.format(self._transform_data))
+            result = self._transform_data(data)
+        elif isinstance(self._transform_data, string_types) and self._transform_data == 'COMPLEX':
+            if numpy.iscomplexobj(data):
+                result = data
+            else:
+                return interleaved_to_complex(data, out=out)
+        else:
+            raise ValueError('Unsupported transform_data value {}'.format(self._transform_data))
+
+        if out is None:
+            return result
+        if result.ndim == 2 and out.ndim == 3 and out.shape[2] == 1:
+            out = out[:, :, 0]
+        if result.shape != out.shape:
+            raise ValueError(
+                'Output array has shape {}, but expected shape {}'.format(out.shape, result.shape))
+        out[:] = result
+        return out
 
     def _reorder_data(self, data):
         # type: (numpy.ndarray) -> numpy.ndarray
@@ -390,6 +564,13 @@ class SubsetChipper(BaseChipper):
         arange1, arange2 = self._reformat_bounds(range1, range2)
         return self.parent_chipper.__call__(arange1, arange2)
 
+    def __call__(self, range1, range2, out=None):
+        if out is None:
+            return super(SubsetChipper, self).__call__(range1, range2)
+        # there is no transformation or reordering at this level
+        arange1, arange2 = self._reformat_bounds(range1, range2)
+        return self.parent_chipper.__call__(arange1, arange2, out=out)
+
 
 class AggregateChipper(BaseChipper):
     """
@@ -490,16 +671,18 @@ class AggregateChipper(BaseChipper):
         """
 
         if rng[2] > 0:
-            if rng[1] < start_ind or rng[0] >= stop_ind:
+            if rng[1] <= start_ind or rng[0] >= stop_ind:
                 # there is no overlap
                 return None, None
             # find smallest element rng[0] + mult*rng[2] which is >= start_ind
             mult1 = 0 if start_ind <= rng[0] else int_func(numpy.ceil((start_ind - rng[0]) / rng[2]))
             ind1 = rng[0] + mult1 * rng[2]
-            # find largest element rng[0] + mult*rng[2] which is <= min(stop_ind, rng[1])
+            # find the number of elements rng[0] + mult*rng[2] which are < min(stop_ind, rng[1])
             max_ind = min(rng[1], stop_ind)
-            mult2 = int_func(numpy.floor((max_ind - rng[0]) / rng[2]))
-            ind2 = rng[0] + mult2 * rng[2]
+            if ind1 >= max_ind:
+                return None, None
+            mult2 = int_func(numpy.ceil((max_ind - rng[0]) / rng[2]))
+            ind2 = min(rng[0] + mult2 * rng[2], stop_ind)
         else:
             if rng[0] < start_ind or rng[1] >= stop_ind:
                 return None, None
@@ -512,18 +695,8 @@ class AggregateChipper(BaseChipper):
             ind2 = rng[0] + mult2*rng[2]
         return (ind1-start_ind, ind2-start_ind, rng[2]), (mult1, mult2)
 
-    def _read_raw_fun(self, range1, range2):
-        range1, range2 = self._reorder_arguments(range1, range2)
-        rows_size = int_func((range1[1]-range1[0])/range1[2])
-        cols_size = int_func((range2[1]-range2[0])/range2[2])
-
-        if self._output_bands == 1:
-            out = numpy.zeros((rows_size, cols_size), dtype=self._dtype)
-        else:
-            out = numpy.zeros((rows_size, cols_size, self._output_bands), dtype=self._dtype)
-            # TODO: missing/unmapped data will appear as zeros.
-            #   Does this make sense in all cases? should it be nan for floating point?
-
+    def _get_read_pieces(self, range1, range2):
+        pieces = []
         for entry, child_chipper in zip(self._bounds, self._child_chippers):
             row_start, row_end, col_start, col_end = entry
             # find row overlap for chipper - it's rectangular
@@ -535,15 +708,727 @@ class AggregateChipper(BaseChipper):
             crange2, cinds2 = self._subset(range2, col_start, col_end)
             if crange2 is None:
                 continue  # there is no column overlap for this chipper
+            pieces.append((child_chipper, crange1, crange2, cinds1[0], cinds2[0]))
+        return pieces
+
+    def _read_raw_fun(self, range1, range2):
+        range1, range2 = self._reorder_arguments(range1, range2)
+        rows_size = _range_length(range1)
+        cols_size = _range_length(range2)
+
+        if self._output_bands == 1:
+            out = numpy.zeros((rows_size, cols_size), dtype=self._dtype)
+        else:
+            out = numpy.zeros((rows_size, cols_size, self._output_bands), dtype=self._dtype)
+            # TODO: missing/unmapped data will appear as zeros.
+            #   Does this make sense in all cases? should it be nan for floating point?
+
+        for child_chipper, crange1, crange2, start1, start2 in self._get_read_pieces(range1, range2):
+            data = child_chipper[crange1[0]:crange1[1]:crange1[2], crange2[0]:crange2[1]:crange2[2]]
+            out[start1:start1+data.shape[0], start2:start2+data.shape[1]] = data
+        return out
+
+    def __call__(self, range1, range2, out=None):
+        if out is None:
+            return super(AggregateChipper, self).__call__(range1, range2)
+
+        # there is no transformation or reordering at this level, so each
+        #   child chipper reads directly into the appropriate section of out
+        range1, range2 = self._reorder_arguments(range1, range2)
+        shape = (_range_length(range1), _range_length(range2))
+        if self._output_bands != 1:
+            shape += (self._output_bands, )
+        if not isinstance(out, numpy.ndarray) or out.shape != shape:
+            raise ValueError('out must be a numpy.ndarray of shape {}'.format(shape))
+        pieces = self._get_read_pieces(range1, range2)
+        covered = sum(_range_length(entry[1])*_range_length(entry[2]) for entry in pieces)
+        if covered < shape[0]*shape[1]:
+            out[:] = 0
+        for child_chipper, crange1, crange2, start1, start2 in pieces:
+            child_chipper(
+                crange1, crange2,
+                out=out[start1:start1+_range_length(crange1), start2:start2+_range_length(crange2)])
+        return out
+
+    def close(self):
+        for child_chipper in self._child_chippers:
+            child_chipper.close()
+
+
+class ParallelChipper(BaseChipper):
+    """
+    Wraps a chipper, and splits large reads into pieces which are read concurrently
+    on a thread pool and assembled into a single output array. For an
+    :class:`AggregateChipper`, the pieces follow the child chippers, and any
+    large piece is further split into row bands.
+
+    Reading from memory maps, files, and most file formats releases the GIL,
+    so this can provide substantial speed-up for large reads on a multi-core
+    machine. Small reads are performed directly by the wrapped chipper.
+    """
+
+    __slots__ = (
+        '_data_size', '_transform_data', '_symmetry', 'parent_chipper',
+        '_max_workers', '_band_rows', '_min_parallel_pixels', '_executor')
+
+    def __init__(self, parent_chipper, max_workers=None, band_rows=None, min_parallel_pixels=1048576):
+        """
+
+        Parameters
+        ----------
+        parent_chipper : BaseChipper
+        max_workers : None|int
+            The number of worker threads. Defaults to the cpu count.
+        band_rows : None|int
+            The number of rows in each read band. By default, the read is split
+            into roughly four bands per worker, with at least 64 rows per band.
+        min_parallel_pixels : int
+            Reads with fewer than this number of pixels are performed serially.
+        """
+
+        if not isinstance(parent_chipper, BaseChipper):
+            raise TypeError('parent_chipper is required to be an instance of BaseChipper, '
+                            'got type {}'.format(type(parent_chipper)))
+        self.parent_chipper = parent_chipper
+        if max_workers is None:
+            max_workers = cpu_count()
+        max_workers = int_func(max_workers)
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer, got {}'.format(max_workers))
+        self._max_workers = max_workers
+        if band_rows is not None:
+            band_rows = int_func(band_rows)
+            if band_rows < 1:
+                raise ValueError('band_rows must be a positive integer, got {}'.format(band_rows))
+        self._band_rows = band_rows
+        self._min_parallel_pixels = int_func(min_parallel_pixels)
+        self._executor = None
+        super(ParallelChipper, self).__init__(
+            parent_chipper.data_size, symmetry=(False, False, False), transform_data=None)
+
+    @property
+    def max_workers(self):
+        """
+        int: The number of worker threads.
+        """
+
+        return self._max_workers
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def _split_piece(self, piece, band_rows):
+        chipper, crange1, crange2, start1, start2 = piece
+        count = _range_length(crange1)
+        if crange1[2] < 0 or count <= band_rows:
+            return [piece, ]
+        out = []
+        for band_start in range(0, count, band_rows):
+            band_end = min(count, band_start + band_rows)
+            band_range = (crange1[0] + band_start*crange1[2], crange1[0] + band_end*crange1[2], crange1[2])
+            if band_end == count:
+                band_range = (band_range[0], crange1[1], crange1[2])
+            out.append((chipper, band_range, crange2, start1 + band_start, start2))
+        return out
+
+    def _read_raw_fun(self, range1, range2):
+        range1, range2 = self._reorder_arguments(range1, range2)
+        return self._read_parallel(range1, range2)
+
+    def __call__(self, range1, range2, out=None):
+        if out is None:
+            return super(ParallelChipper, self).__call__(range1, range2)
+        # there is no transformation or reordering at this level
+        range1, range2 = self._reorder_arguments(range1, range2)
+        return self._read_parallel(range1, range2, out=out)
+
+    def _read_parallel(self, range1, range2, out=None):
+        rows_size = _range_length(range1)
+        cols_size = _range_length(range2)
+        if self._max_workers < 2 or rows_size*cols_size < self._min_parallel_pixels:
+            return self.parent_chipper(range1, range2, out=out)
+
+        # noinspection PyProtectedMember
+        pieces = self.parent_chipper._get_read_pieces(range1, range2)
+        if self._band_rows is None:
+            band_rows = max(64, int_func(numpy.ceil(rows_size/float(4*self._max_workers))))
+        else:
+            band_rows = self._band_rows
+        split_pieces = []
+        for piece in pieces:
+            split_pieces.extend(self._split_piece(piece, band_rows))
+        if len(split_pieces) < 2:
+            return self.parent_chipper(range1, range2, out=out)
+
+        if out is not None:
+            if isinstance(self.parent_chipper, AggregateChipper):
+                covered = sum(_range_length(entry[1])*_range_length(entry[2]) for entry in split_pieces)
+                if covered < rows_size*cols_size:
+                    out[:] = 0
+
+            def read_piece(the_piece):
+                chipper, crange1, crange2, start1, start2 = the_piece
+                chipper(
+                    crange1, crange2,
+                    out=out[start1:start1+_range_length(crange1), start2:start2+_range_length(crange2)])
+            self._execute(read_piece, split_pieces)
+            return out
+
+        # the output is allocated once the first piece has been read
+        state = {'out': None}
+        lock = threading.Lock()
+
+        def get_output(data):
+            with lock:
+                if state['out'] is None:
+                    if isinstance(self.parent_chipper, AggregateChipper):
+                        # noinspection PyProtectedMember
+                        bands = self.parent_chipper._output_bands
+                        shape = (rows_size, cols_size) if bands == 1 else (rows_size, cols_size, bands)
+                        state['out'] = numpy.zeros(shape, dtype=self.parent_chipper._dtype)
+                    else:
+                        state['out'] = numpy.empty((rows_size, cols_size) + data.shape[2:], dtype=data.dtype)
+                return state['out']
+
+        def read_piece(the_piece):
+            chipper, crange1, crange2, start1, start2 = the_piece
+            data = chipper(crange1, crange2)
+            if data.ndim == 1:
+                data = numpy.reshape(data, (_range_length(crange1), _range_length(crange2)))
+            out = get_output(data)
+            out[start1:start1+data.shape[0], start2:start2+data.shape[1]] = data
+
+        self._execute(read_piece, split_pieces)
+        if state['out'] is None:
+            return self.parent_chipper(range1, range2)
+        return state['out']
+
+    def _execute(self, function, pieces):
+        executor = self._get_executor()
+        futures = [executor.submit(function, piece) for piece in pieces]
+        for future in futures:
+            future.result()  # raises any exception encountered in the worker
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.parent_chipper.close()
+
+
+class BlockCache(object):
+    """
+    A thread-safe least recently used cache of (read only) numpy arrays, with
+    the total size limited by a byte budget. This is intended for caching
+    decoded data blocks or tiles.
+    """
+
+    __slots__ = ('_max_bytes', '_entries', '_cached_bytes', '_hits', '_misses', '_lock')
+
+    def __init__(self, max_bytes=268435456):
+        """
+
+        Parameters
+        ----------
+        max_bytes : int
+            The maximum size, in bytes, of the cached arrays.
+        """
+
+        max_bytes = int_func(max_bytes)
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be a positive integer, got {}'.format(max_bytes))
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._cached_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+    @property
+    def max_bytes(self):
+        """
+        int: The maximum size, in bytes, of the cached arrays.
+        """
+
+        return self._max_bytes
+
+    @property
+    def hits(self):
+        """
+        int: The number of requests satisfied from the cache.
+        """
+
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        int: The number of requests not satisfied from the cache.
+        """
+
+        return self._misses
+
+    @property
+    def cached_bytes(self):
+        """
+        int: The current size, in bytes, of the cached arrays.
+        """
+
+        return self._cached_bytes
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key):
+        """
+        Gets the cached array for the given key, if present.
+
+        Parameters
+        ----------
+        key
+
+        Returns
+        -------
+        None|numpy.ndarray
+        """
+
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries[key] = value  # most recently used is last
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Insert the array into the cache, evicting the least recently used arrays
+        as necessary. The most recently inserted array is always retained. The
+        array is marked read only, and the memory it references must not be
+        modified elsewhere.
+
+        Parameters
+        ----------
+        key
+        value : numpy.ndarray
+
+        Returns
+        -------
+        numpy.ndarray
+            The cached array, which will be a previously cached value for the
+            key, if present.
+        """
+
+        value.setflags(write=False)
+        with self._lock:
+            current = self._entries.get(key, None)
+            if current is not None:
+                return current
+            self._entries[key] = value
+            self._cached_bytes += value.nbytes
+            while self._cached_bytes > self._max_bytes and len(self._entries) > 1:
+                _, old_value = self._entries.popitem(last=False)
+                self._cached_bytes -= old_value.nbytes
+        return value
+
+    def clear(self):
+        """
+        Discard all cached arrays, and reset the hit and miss counters.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._cached_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+
+class TileCacheChipper(BaseChipper):
+    """
+    Wraps a chipper, and maintains a least recently used cache of decoded data
+    tiles. The tiles are of fixed size, aligned to the origin, and in the
+    chipper (i.e. analysis) coordinates, after any data transformation and
+    reordering by the wrapped chipper. Each read is assembled from the
+    collection of overlapping tiles, and only missing tiles are read from the
+    wrapped chipper.
+
+    This is intended for usage patterns with many repeated or overlapping
+    reads, like an interactive viewer or a chip server. Reads which would
+    require more tiles than fit in the cache are performed directly by the
+    wrapped chipper, and not cached.
+    """
+
+    __slots__ = (
+        '_data_size', '_transform_data', '_symmetry', 'parent_chipper',
+        '_tile_shape', '_cache', '_tile_item_bytes')
+
+    def __init__(self, parent_chipper, max_bytes=268435456, tile_shape=(512, 512)):
+        """
+
+        Parameters
+        ----------
+        parent_chipper : BaseChipper
+        max_bytes : int
+            The maximum size, in bytes, of the cached tiles.
+        tile_shape : int|Tuple[int, int]
+            The shape of each tile, in the chipper coordinates.
+        """
+
+        if not isinstance(parent_chipper, BaseChipper):
+            raise TypeError('parent_chipper is required to be an instance of BaseChipper, '
+                            'got type {}'.format(type(parent_chipper)))
+        self.parent_chipper = parent_chipper
+        self._cache = BlockCache(max_bytes=max_bytes)
+        if isinstance(tile_shape, integer_types):
+            tile_shape = (tile_shape, tile_shape)
+        tile_shape = tuple(int_func(entry) for entry in tile_shape)
+        if len(tile_shape) != 2 or tile_shape[0] < 1 or tile_shape[1] < 1:
+            raise ValueError('tile_shape must be a pair of positive integers, got {}'.format(tile_shape))
+        self._tile_shape = tile_shape
+        self._tile_item_bytes = None
+        super(TileCacheChipper, self).__init__(
+            parent_chipper.data_size, symmetry=(False, False, False), transform_data=None)
+
+    @property
+    def max_bytes(self):
+        """
+        int: The maximum size, in bytes, of the cached tiles.
+        """
+
+        return self._cache.max_bytes
+
+    @property
+    def tile_shape(self):
+        """
+        Tuple[int, int]: The shape of each tile.
+        """
+
+        return self._tile_shape
+
+    @property
+    def hits(self):
+        """
+        int: The number of tile requests satisfied from the cache.
+        """
+
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        """
+        int: The number of tile requests which required a read.
+        """
+
+        return self._cache.misses
+
+    @property
+    def cached_bytes(self):
+        """
+        int: The current size, in bytes, of the cached tiles.
+        """
+
+        return self._cache.cached_bytes
+
+    @property
+    def tile_count(self):
+        """
+        int: The current number of cached tiles.
+        """
+
+        return len(self._cache)
+
+    def clear_cache(self):
+        """
+        Discard all cached tiles, and reset the hit and miss counters.
+
+        Returns
+        -------
+        None
+        """
+
+        self._cache.clear()
+
+    @staticmethod
+    def _group_indices(indices, tile_size):
+        """
+        Partition the (monotonic) collection of indices by tile.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+        tile_size : int
+
+        Returns
+        -------
+        List[Tuple[int, int, int, int]]
+            Entries of the form `(tile index, output start, output stop, tile start index)`.
+        """
+
+        tiles = indices//tile_size
+        boundaries = numpy.flatnonzero(numpy.diff(tiles)) + 1
+        starts = numpy.concatenate([[0, ], boundaries])
+        stops = numpy.concatenate([boundaries, [indices.size, ]])
+        return [
+            (int_func(tiles[start]), int_func(start), int_func(stop),
+             int_func(indices[start] - tiles[start]*tile_size)) for start, stop in zip(starts, stops)]
+
+    def _get_tile(self, tile_row, tile_col):
+        key = (tile_row, tile_col)
+        tile = self._cache.get(key)
+        if tile is not None:
+            return tile
+
+        # read the tile outside of the lock
+        row_start = tile_row*self._tile_shape[0]
+        row_end = min(row_start + self._tile_shape[0], self._data_size[0])
+        col_start = tile_col*self._tile_shape[1]
+        col_end = min(col_start + self._tile_shape[1], self._data_size[1])
+        tile = self.parent_chipper((row_start, row_end, 1), (col_start, col_end, 1))
+        if tile.ndim == 1:
+            tile = numpy.reshape(tile, (row_end - row_start, col_end - col_start))
+        if not tile.flags.owndata:
+            tile = numpy.array(tile)
+        if self._tile_item_bytes is None:
+            self._tile_item_bytes = int_func(tile.nbytes//(tile.shape[0]*tile.shape[1]))
+        return self._cache.put(key, tile)
+
+    def _read_raw_fun(self, range1, range2):
+        range1, range2 = self._reorder_arguments(range1, range2)
+        return self._read_cached(range1, range2)
+
+    def __call__(self, range1, range2, out=None):
+        # there is no transformation or reordering at this level
+        range1, range2 = self._reorder_arguments(range1, range2)
+        return self._read_cached(range1, range2, out=out)
+
+    def _read_cached(self, range1, range2, out=None):
+        rows = numpy.arange(range1[0], range1[1], range1[2], dtype=numpy.int64)
+        cols = numpy.arange(range2[0], range2[1], range2[2], dtype=numpy.int64)
+        if rows.size == 0 or cols.size == 0:
+            return self.parent_chipper(range1, range2, out=out)
+
+        row_groups = self._group_indices(rows, self._tile_shape[0])
+        col_groups = self._group_indices(cols, self._tile_shape[1])
+        item_bytes = 8 if self._tile_item_bytes is None else self._tile_item_bytes
+        required_bytes = len(row_groups)*len(col_groups)*self._tile_shape[0]*self._tile_shape[1]*item_bytes
+        if required_bytes > self._cache.max_bytes:
+            out = self.parent_chipper(range1, range2, out=out)
+            if self._tile_item_bytes is None:
+                self._tile_item_bytes = int_func(out.nbytes//out.size)*(1 if out.ndim < 3 else out.shape[2])
+            return out
+
+        for tile_row, out_row_start, out_row_end, tile_row_start in row_groups:
+            for tile_col, out_col_start, out_col_end, tile_col_start in col_groups:
+                tile = self._get_tile(tile_row, tile_col)
+                if out is None:
+                    out = numpy.empty((rows.size, cols.size) + tile.shape[2:], dtype=tile.dtype)
+                elif out.shape[:2] != (rows.size, cols.size):
+                    raise ValueError(
+                        'out must be of shape {}, got {}'.format((rows.size, cols.size), out.shape))
+                # NB: slicing as [start::step][:count] is correct for negative step
+                out[out_row_start:out_row_end, out_col_start:out_col_end] = \
+                    tile[tile_row_start::range1[2]][:out_row_end-out_row_start,
+                                                    tile_col_start::range2[2]][:, :out_col_end-out_col_start]
+        return out
+
+    def close(self):
+        self.clear_cache()
+        self.parent_chipper.close()
+
+
+class BlockDecodingChipper(BaseChipper):
+    """
+    Abstract chipper for data stored as a regular grid of independently encoded
+    (i.e. compressed) blocks, like tiled or stripped tiff files and blocked
+    compressed NITF image segments. Only the blocks which intersect a requested
+    window are read and decoded, and the decoded blocks are maintained in a
+    least recently used :class:`BlockCache`. The decoding of multiple blocks for
+    a given read may optionally be performed on a thread pool.
+
+    **Extension Requirement:** This provides the basic implementation for
+    assembling the data from the decoded blocks, but it is **required** that any
+    extension provide concrete implementations of `_read_block_bytes` and
+    `_decode_block`.
+    """
+
+    __slots__ = (
+        '_block_shape', '_blocks_across', '_raw_dtype', '_raw_bands', '_limit_to_raw_bands',
+        '_cache', '_max_workers', '_executor')
+
+    def __init__(self, data_size, block_shape, raw_dtype, raw_bands, symmetry=(False, False, False),
+                 transform_data=None, max_bytes=67108864, max_workers=1, limit_to_raw_bands=None):
+        """
+
+        Parameters
+        ----------
+        data_size : tuple
+            The `(rows, columns)` of the raw data.
+        block_shape : tuple
+            The `(rows, columns)` of each block, in the raw data coordinates.
+        raw_dtype : str|numpy.dtype|numpy.number
+            The data type of the decoded blocks.
+        raw_bands : int
+            The number of bands in the decoded blocks.
+        symmetry : tuple
+            Describes any required data transformation. See the `symmetry` property.
+        transform_data : None|str|Callable
+            For data transformation after reading.
+        max_bytes : int
+            The maximum size, in bytes, of the decoded block cache.
+        max_workers : None|int
+            The number of threads used for decoding blocks. `None` uses the cpu count,
+            and `1` decodes serially.
+        limit_to_raw_bands : None|int|numpy.ndarray|list|tuple
+            The collection of raw bands to which to read. `None` is all bands.
+        """
+
+        block_shape = tuple(int_func(entry) for entry in block_shape)
+        if len(block_shape) != 2 or block_shape[0] < 1 or block_shape[1] < 1:
+            raise ValueError('block_shape must be a pair of positive integers, got {}'.format(block_shape))
+        self._block_shape = block_shape
+        self._blocks_across = int_func(numpy.ceil(float(data_size[1])/block_shape[1]))
+        self._raw_dtype = numpy.dtype(raw_dtype)
+        self._raw_bands = int_func(raw_bands)
+        self._limit_to_raw_bands = _validate_limit_to_raw_bands(limit_to_raw_bands, self._raw_bands)
+        self._cache = BlockCache(max_bytes=max_bytes)
+        if max_workers is None:
+            max_workers = cpu_count()
+        max_workers = int_func(max_workers)
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer, got {}'.format(max_workers))
+        self._max_workers = max_workers
+        self._executor = None
+        super(BlockDecodingChipper, self).__init__(data_size, symmetry=symmetry, transform_data=transform_data)
+
+    @property
+    def block_shape(self):
+        """
+        Tuple[int, int]: The shape of each block, in the raw data coordinates.
+        """
+
+        return self._block_shape
+
+    @property
+    def cache(self):
+        """
+        BlockCache: The decoded block cache.
+        """
+
+        return self._cache
+
+    def _read_block_bytes(self, block_indices):
+        """
+        Read the encoded bytes for the given blocks. Block indices are enumerated
+        in row major order.
+
+        Parameters
+        ----------
+        block_indices : List[int]
+
+        Returns
+        -------
+        List[None|bytes]
+            The encoded bytes for each block, where `None` indicates a missing
+            (i.e. masked) block.
+        """
+
+        raise NotImplementedError
+
+    def _decode_block(self, block_index, data):
+        """
+        Decode the given block.
+
+        Parameters
+        ----------
+        block_index : int
+        data : None|bytes
+
+        Returns
+        -------
+        numpy.ndarray
+            Of shape `(rows, columns, raw bands)`, where the rows and columns
+            must cover the valid portion of the block.
+        """
+
+        raise NotImplementedError
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def _get_blocks(self, block_indices):
+        """
+        Gets the decoded blocks, from the cache where possible.
+
+        Parameters
+        ----------
+        block_indices : List[int]
+
+        Returns
+        -------
+        dict
+        """
+
+        blocks = {}
+        missing = []
+        for block_index in block_indices:
+            block = self._cache.get(block_index)
+            if block is None:
+                missing.append(block_index)
+            else:
+                blocks[block_index] = block
+        if len(missing) == 0:
+            return blocks
+
+        the_bytes = self._read_block_bytes(missing)
+        if self._max_workers > 1 and len(missing) > 1:
+            decoded = list(self._get_executor().map(self._decode_block, missing, the_bytes))
+        else:
+            decoded = [self._decode_block(block_index, data) for block_index, data in zip(missing, the_bytes)]
+        for block_index, block in zip(missing, decoded):
+            blocks[block_index] = self._cache.put(block_index, block)
+        return blocks
 
-            if self._output_bands == 1:
-                out[cinds1[0]:cinds1[1], cinds2[0]:cinds2[1]] = \
-                    child_chipper[crange1[0]:crange1[1]:crange1[2], crange2[0]:crange2[1]:crange2[2]]
-            else:
-                out[cinds1[0]:cinds1[1], cinds2[0]:cinds2[1], :] = \
-                    child_chipper[crange1[0]:crange1[1]:crange1[2], crange2[0]:crange2[1]:crange2[2]]
+    def _read_raw_fun(self, range1, range2):
+        range1, range2 = self._reorder_arguments(range1, range2)
+        rows = numpy.arange(range1[0], range1[1], range1[2], dtype=numpy.int64)
+        cols = numpy.arange(range2[0], range2[1], range2[2], dtype=numpy.int64)
+        bands = self._raw_bands if self._limit_to_raw_bands is None else self._limit_to_raw_bands.size
+        out = numpy.empty((rows.size, cols.size, bands), dtype=self._raw_dtype)
+        if rows.size == 0 or cols.size == 0:
+            return out
+
+        row_groups = TileCacheChipper._group_indices(rows, self._block_shape[0])
+        col_groups = TileCacheChipper._group_indices(cols, self._block_shape[1])
+        blocks = self._get_blocks(
+            [block_row*self._blocks_across + block_col for block_row, _, _, _ in row_groups
+             for block_col, _, _, _ in col_groups])
+        for block_row, out_row_start, out_row_end, block_row_start in row_groups:
+            for block_col, out_col_start, out_col_end, block_col_start in col_groups:
+                block = blocks[block_row*self._blocks_across + block_col]
+                # NB: slicing as [start::step][:count] is correct for negative step
+                piece = block[block_row_start::range1[2]][:out_row_end-out_row_start,
+                                                          block_col_start::range2[2]][:, :out_col_end-out_col_start]
+                if self._limit_to_raw_bands is not None:
+                    piece = piece[:, :, self._limit_to_raw_bands]
+                out[out_row_start:out_row_end, out_col_start:out_col_end] = piece
         return out
 
+    def close(self):
+        self._cache.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
 
 #################
 # Base Reader definition
@@ -673,7 +1558,7 @@ class BaseReader(object):
                 return item[:2], index
         return item, 0
 
-    def __call__(self, range1, range2, index=0):
+    def __call__(self, range1, range2, index=0, out=None):
         """
         Reads and fetches data.
 
@@ -686,6 +1571,10 @@ class BaseReader(object):
             The column data selection of the form `[start, [stop, [stride]]]`, and
             `None` defaults to all rows (i.e. `(0, NumCols, 1)`)
         index : None|int
+        out : None|numpy.ndarray
+            If provided, the data will be written into this array (which must
+            be of the appropriate shape), and it will be returned. This permits
+            reuse of output buffers.
 
         Returns
         -------
@@ -722,9 +1611,9 @@ class BaseReader(object):
 
         if isinstance(self._chipper, tuple):
             index = self._validate_index(index)
-            return self._chipper[index](range1, range2)
+            return self._chipper[index](range1, range2, out=out)
         else:
-            return self._chipper(range1, range2)
+            return self._chipper(range1, range2, out=out)
 
     def __getitem__(self, item):
         """
@@ -759,7 +1648,7 @@ class BaseReader(object):
         else:
             return self._chipper.__getitem__(item)
 
-    def read_chip(self, dim1range, dim2range, index=None):
+    def read_chip(self, dim1range, dim2range, index=None, out=None):
         """
         Read the given section of data as an array. Note that
         :code:`reader.read_chip(range1, range2, index)` is an alias for
@@ -776,6 +1665,9 @@ class BaseReader(object):
         index : int|None
             Relative to which sicd/chipper, and only used in the event of multiple
             sicd/chippers. Defaults to `0`, if not provided.
+        out : None|numpy.ndarray
+            If provided, the data will be written into this array (which must
+            be of the appropriate shape), and it will be returned.
 
         Returns
         -------
@@ -816,7 +1708,166 @@ class BaseReader(object):
             data = reader[:stop1:stride1, :stop2:stride2]
         """
 
-        return self.__call__(dim1range, dim2range, index=index)
+        return self.__call__(dim1range, dim2range, index=index, out=out)
+
+    def enable_parallel_read(self, max_workers=None, band_rows=None, min_parallel_pixels=1048576):
+        """
+        Enable the parallel reading mode, in which large reads are split into
+        row bands (and child chipper pieces for multi-segment data) which are
+        read concurrently on a thread pool. See :class:`ParallelChipper`.
+
+        Parameters
+        ----------
+        max_workers : None|int
+            The number of worker threads. Defaults to the cpu count.
+        band_rows : None|int
+            The number of rows for each read band.
+        min_parallel_pixels : int
+            Reads with fewer than this number of pixels are performed serially.
+
+        Returns
+        -------
+        None
+        """
+
+        def wrap(the_chipper):
+            return ParallelChipper(
+                the_chipper, max_workers=max_workers, band_rows=band_rows,
+                min_parallel_pixels=min_parallel_pixels)
+
+        self.disable_parallel_read()
+        chippers = []
+        for chipper in self._get_chippers_as_tuple():
+            if isinstance(chipper, TileCacheChipper):
+                # tile reads pass through the parallel chipper
+                chipper.parent_chipper = wrap(chipper.parent_chipper)
+            else:
+                chipper = wrap(chipper)
+            chippers.append(chipper)
+        self._set_chippers(chippers)
+
+    def disable_parallel_read(self):
+        """
+        Disable the parallel reading mode, if enabled.
+
+        Returns
+        -------
+        None
+        """
+
+        def unwrap(the_chipper):
+            if isinstance(the_chipper, ParallelChipper):
+                # noinspection PyProtectedMember
+                if the_chipper._executor is not None:
+                    the_chipper._executor.shutdown(wait=True)
+                    the_chipper._executor = None
+                return the_chipper.parent_chipper
+            return the_chipper
+
+        chippers = []
+        for chipper in self._get_chippers_as_tuple():
+            if isinstance(chipper, TileCacheChipper):
+                chipper.parent_chipper = unwrap(chipper.parent_chipper)
+            else:
+                chipper = unwrap(chipper)
+            chippers.append(chipper)
+        self._set_chippers(chippers)
+
+    def enable_tile_cache(self, max_bytes=268435456, tile_shape=(512, 512)):
+        """
+        Enable caching of decoded data tiles, so that repeated or overlapping
+        reads are assembled from memory. See :class:`TileCacheChipper`. Each
+        chipper receives its own cache of the given size.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The maximum size, in bytes, of the cached tiles for each chipper.
+        tile_shape : int|Tuple[int, int]
+            The shape of each tile.
+
+        Returns
+        -------
+        None
+        """
+
+        self.disable_tile_cache()
+        self._set_chippers(
+            [TileCacheChipper(chipper, max_bytes=max_bytes, tile_shape=tile_shape)
+             for chipper in self._get_chippers_as_tuple()])
+
+    def disable_tile_cache(self):
+        """
+        Disable the tile cache, if enabled, and discard the cached tiles.
+
+        Returns
+        -------
+        None
+        """
+
+        chippers = []
+        for chipper in self._get_chippers_as_tuple():
+            if isinstance(chipper, TileCacheChipper):
+                chipper.clear_cache()
+                chipper = chipper.parent_chipper
+            chippers.append(chipper)
+        self._set_chippers(chippers)
+
+    def get_tile_cache_statistics(self):
+        """
+        Gets the tile cache statistics, summed over all chippers.
+
+        Returns
+        -------
+        None|dict
+            `None` if the tile cache is not enabled, otherwise a dictionary
+            with keys `'hits'`, `'misses'`, `'tiles'`, and `'bytes'`.
+        """
+
+        caches = [entry for entry in self._get_chippers_as_tuple() if isinstance(entry, TileCacheChipper)]
+        if len(caches) == 0:
+            return None
+        return {
+            'hits': sum(entry.hits for entry in caches),
+            'misses': sum(entry.misses for entry in caches),
+            'tiles': sum(entry.tile_count for entry in caches),
+            'bytes': sum(entry.cached_bytes for entry in caches)}
+
+    def _set_chippers(self, chippers):
+        """
+        Replace the chipper collection, maintaining the current structure.
+
+        Parameters
+        ----------
+        chippers : List[BaseChipper]
+
+        Returns
+        -------
+        None
+        """
+
+        self._chipper = tuple(chippers) if isinstance(self._chipper, tuple) else chippers[0]
+
+    def close(self):
+        """
+        Release any resources (i.e. open file handles) held by the chipper(s).
+        The reader should not be used after this has been called.
+
+        Returns
+        -------
+        None
+        """
+
+        if not hasattr(self, '_chipper'):
+            return
+        for chipper in self._get_chippers_as_tuple():
+            chipper.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
 
 
 class SubsetReader(BaseReader):
@@ -845,6 +1896,10 @@ class SubsetReader(BaseReader):
     def file_name(self):
         return self._parent_reader.file_name
 
+    def close(self):
+        # the chipper belongs to the parent reader, so leave it alone
+        pass
+
 
 class AggregateReader(BaseReader):
     """
@@ -1010,11 +2065,13 @@ class AbstractWriter(object):
 
         Parameters
         ----------
-        file_name : str
+        file_name : str|BinaryIO
+            The output file name, or a writable file like object for writers
+            which support streaming output.
         """
 
         self._file_name = file_name
-        if not os.path.exists(self._file_name):
+        if isinstance(self._file_name, string_types) and not os.path.exists(self._file_name):
             with open(self._file_name, 'wb') as fi:
                 fi.write(b'')
 
@@ -1102,6 +2159,41 @@ def _validate_limit_to_raw_bands(limit_to_raw_bands, raw_bands):
     return limit_to_raw_bands
 
 
+# the locks which serialize seek and read on file objects, which may be shared by chippers
+_FILE_LOCKS = weakref.WeakKeyDictionary()
+# for file objects which do not permit weak references, where a reused id merely shares a lock
+_FILE_LOCKS_BY_ID = {}
+_FILE_LOCKS_LOCK = threading.Lock()
+
+
+def get_file_lock(file_object):
+    """
+    Gets the lock which serializes positioned reads on the given file object,
+    which is shared by all chippers reading from that file object. This permits
+    concurrent reading (i.e. using a :class:`ParallelChipper` or thread pool)
+    through one file handle.
+
+    Parameters
+    ----------
+    file_object : BinaryIO
+
+    Returns
+    -------
+    threading.RLock
+    """
+
+    with _FILE_LOCKS_LOCK:
+        try:
+            lock = _FILE_LOCKS.get(file_object, None)
+            if lock is None:
+                lock = threading.RLock()
+                _FILE_LOCKS[file_object] = lock
+        except TypeError:
+            # the file object does not permit weak references, so key by identity
+            lock = _FILE_LOCKS_BY_ID.setdefault(id(file_object), threading.RLock())
+    return lock
+
+
 class BIPChipper(BaseChipper):
     """
     Band interleaved format file chipper.
@@ -1111,6 +2203,7 @@ class BIPChipper(BaseChipper):
         '_file_name', '_file_object', '_data_offset', '_shape',
         '_raw_bands', '_raw_dtype', '_output_bands', '_output_dtype',
         '_limit_to_raw_bands', '_memory_map', '_close_after')
+    _READ_BUFFER_BYTES = 67108864  # bounds the temporary memory when reading without a memory map
 
     def __init__(self, data_input, raw_dtype, data_size, raw_bands, output_bands, output_dtype,
                  symmetry=(False, False, False), transform_data=None,
@@ -1245,46 +2338,32 @@ class BIPChipper(BaseChipper):
         if self._memory_map is not None:
             return self._read_memory_map(t_range1, t_range2)
         else:
-            return self._read_file(t_range1, t_range2)
+            # NB: the seek and read on the (possibly shared) file object must not interleave
+            with get_file_lock(self._file_object):
+                return self._read_file(t_range1, t_range2)
+
+    def _is_source_view(self, data):
+        return self._memory_map is not None and numpy.may_share_memory(data, self._memory_map)
 
     def _read_memory_map(self, range1, range2):
-        if (range1[1] == -1 and range1[2] < 0) and (range2[1] == -1 and range2[2] < 0):
-            if self._limit_to_raw_bands is None:
-                out = numpy.array(
-                    self._memory_map[range1[0]::range1[2], range2[0]::range2[2]],
-                    dtype=self._raw_dtype)
-            else:
-                out = numpy.array(
-                    self._memory_map[range1[0]::range1[2], range2[0]::range2[2], self._limit_to_raw_bands],
-                    dtype=self._raw_dtype)
-        elif range1[1] == -1 and range1[2] < 0:
-            if self._limit_to_raw_bands is None:
-                out = numpy.array(
-                    self._memory_map[range1[0]::range1[2], range2[0]:range2[1]:range2[2]],
-                    dtype=self._raw_dtype)
-            else:
-                out = numpy.array(
-                    self._memory_map[range1[0]::range1[2], range2[0]:range2[1]:range2[2], self._limit_to_raw_bands],
-                    dtype=self._raw_dtype)
-        elif range2[1] == -1 and range2[2] < 0:
-            if self._limit_to_raw_bands is None:
-                out = numpy.array(
-                    self._memory_map[range1[0]:range1[1]:range1[2], range2[0]::range2[2]],
-                    dtype=self._raw_dtype)
-            else:
-                out = numpy.array(
-                    self._memory_map[range1[0]:range1[1]:range1[2], range2[0]::range2[2], self._limit_to_raw_bands],
-                    dtype=self._raw_dtype)
+        # NB: this yields a view into the memory map, where possible, and any
+        #   copy is deferred to after the data transformation
+        slice1 = slice(range1[0], None, range1[2]) if (range1[1] == -1 and range1[2] < 0) else slice(*range1)
+        slice2 = slice(range2[0], None, range2[2]) if (range2[1] == -1 and range2[2] < 0) else slice(*range2)
+        if self._limit_to_raw_bands is None:
+            return numpy.asarray(self._memory_map[slice1, slice2])
         else:
-            if self._limit_to_raw_bands is None:
-                out = numpy.array(
-                    self._memory_map[range1[0]:range1[1]:range1[2], range2[0]:range2[1]:range2[2]],
-                    dtype=self._raw_dtype)
-            else:
-                out = numpy.array(
-                    self._memory_map[range1[0]:range1[1]:range1[2], range2[0]:range2[1]:range2[2], self._limit_to_raw_bands],
-                    dtype=self._raw_dtype)
-        return out
+            return numpy.asarray(self._memory_map[slice1, slice2, self._limit_to_raw_bands])
+
+    def _read_bytes(self, location, size):
+        self._file_object.seek(location, os.SEEK_SET)
+        data = self._file_object.read(size)
+        if len(data) != size:
+            raise ValueError(
+                'Tried to read {} bytes of data, but received {}.\n'
+                'The most likely reason for this is a malformed chipper, \n'
+                'which attempts to read more data than the file contains'.format(size, len(data)))
+        return data
 
     def _read_file(self, range1, range2):
         if self._limit_to_raw_bands is None:
@@ -1299,29 +2378,36 @@ class BIPChipper(BaseChipper):
         # let's determine the specific row/column arrays that we are going to read
         dim1array = numpy.arange(*range1)
         dim2array = numpy.arange(*range2)
-        # determine the contiguous chunk to read
-        start_row = min(dim1array[0], dim1array[-1])
-        rows = abs(range1[1] - range1[0])
         # allocate our output array
         out = numpy.empty((len(dim1array), len(dim2array), len(band_collection)), dtype=self._raw_dtype)
-
-        # seek to the proper start location
-        start_loc = self._data_offset + start_row*stride
-        self._file_object.seek(start_loc, os.SEEK_SET)
-        # read our data
-        total_entries = int_func(rows)*self._shape[1]*self._raw_bands
-        total_size = int_func(rows)*stride
-        data = self._file_object.read(total_size)
-        if len(data) != total_size:
-            raise ValueError(
-                'Tried to read {} bytes of data, but received {}.\n'
-                'The most likely reason for this is a malformed chipper, \n'
-                'which attempts to read more data than the file contains'.format(total_size, len(data)))
-        # cast and shape
-        data = numpy.frombuffer(data, self._raw_dtype, total_entries)
-        data = numpy.reshape(data, (rows, self._shape[1], self._raw_bands))
-        # reduce, as necessary
-        out[:, :] = data[range1[0]-start_row:range1[1]-start_row:range1[2], range2[0]:range2[1]:range2[2], band_collection]
+        if out.size == 0:
+            return out
+
+        col_start = int_func(dim2array.min())
+        span = int_func(dim2array.max()) + 1 - col_start
+        if 2*span*element_size <= stride:
+            # a narrow window, so read only the column span of each required row
+            column_indices = dim2array - col_start
+            for i, row in enumerate(dim1array):
+                data = self._read_bytes(
+                    self._data_offset + int_func(row)*stride + col_start*element_size, span*element_size)
+                data = numpy.reshape(
+                    numpy.frombuffer(data, self._raw_dtype, span*self._raw_bands), (span, self._raw_bands))
+                out[i] = data[numpy.ix_(column_indices, band_collection)]
+        else:
+            # read contiguous bands of full rows, bounding the temporary memory
+            band_rows = max(1, int_func(self._READ_BUFFER_BYTES//stride))
+            start_row, end_row = int_func(dim1array.min()), int_func(dim1array.max()) + 1
+            for band_start in range(start_row, end_row, band_rows):
+                band_end = min(end_row, band_start + band_rows)
+                mask = (dim1array >= band_start) & (dim1array < band_end)
+                if not numpy.any(mask):
+                    continue
+                data = self._read_bytes(self._data_offset + band_start*stride, (band_end - band_start)*stride)
+                data = numpy.reshape(
+                    numpy.frombuffer(data, self._raw_dtype, (band_end - band_start)*self._shape[1]*self._raw_bands),
+                    (band_end - band_start, self._shape[1], self._raw_bands))
+                out[mask] = data[numpy.ix_(dim1array[mask] - band_start, dim2array, band_collection)]
         self._file_object.seek(init_location, os.SEEK_SET)
         return out
 
@@ -1403,6 +2489,10 @@ class BSQChipper(BaseChipper):
                     child_chipper[range1[0]:range1[1]:range1[2], range2[0]:range2[1]:range2[2]]
         return out
 
+    def close(self):
+        for child_chipper in self._child_chippers:
+            child_chipper.close()
+
 
 class BIRChipper(BaseChipper):
     """
@@ -1541,7 +2631,8 @@ class BIRChipper(BaseChipper):
         if self._memory_map is not None:
             out = self._read_memory_map(t_range1, t_range2)
         else:
-            out = self._read_file(t_range1, t_range2)
+            with get_file_lock(self._file_object):
+                out = self._read_file(t_range1, t_range2)
         return numpy.copy(numpy.transpose(out, (0, 2, 1)))
 
     def _read_memory_map(self, range1, range2):
@@ -1628,9 +2719,11 @@ class BIPWriter(AbstractWriter):
 
     __slots__ = (
         '_raw_dtype', '_transform_data', '_data_offset',
-        '_shape', '_memory_map', '_fid')
+        '_shape', '_memory_map', '_fid', '_lock',
+        '_max_buffer_bytes', '_band_rows', '_buffer', '_buffered_bytes')
 
-    def __init__(self, file_name, data_size, raw_dtype, output_bands, transform_data, data_offset=0):
+    def __init__(self, file_name, data_size, raw_dtype, output_bands, transform_data, data_offset=0,
+                 max_buffer_bytes=67108864):
         """
         For writing the SICD data into the NITF container. This is abstracted generally
         because an array of these writers is used for multi-image segment NITF files.
@@ -1663,6 +2756,11 @@ class BIPWriter(AbstractWriter):
               match `raw_dtype`.
         data_offset : int
             byte offset from the start of the file at which the data actually starts
+        max_buffer_bytes : int
+            Only used if memory mapping the file fails. Partial width chips are
+            gathered into full width bands of rows in memory, and written with
+            large sequential writes. This is the maximum size, in bytes, of these
+            buffered bands.
         """
 
         super(BIPWriter, self).__init__(file_name)
@@ -1700,6 +2798,24 @@ class BIPWriter(AbstractWriter):
 
         self._memory_map = None
         self._fid = None
+        self._lock = threading.Lock()
+        self._max_buffer_bytes = int_func(max_buffer_bytes)
+        row_size = self._raw_dtype.itemsize*self._shape[1]*self._shape[2]
+        self._band_rows = int_func(min(self._shape[0], max(1, (self._max_buffer_bytes//4)//row_size)))
+        self._buffer = OrderedDict()
+        self._buffered_bytes = 0
+        self._open_file()
+
+    def _open_file(self):
+        """
+        Set up the memory map, or the file object in the event that memory
+        mapping fails.
+
+        Returns
+        -------
+        None
+        """
+
         try:
             self._memory_map = numpy.memmap(self._file_name,
                                             dtype=self._raw_dtype,
@@ -1774,25 +2890,128 @@ class BIPWriter(AbstractWriter):
                 self._memory_map[start1:stop1, start2:stop2] = data
             return
 
-        # we have to fall-back to manually write
-        element_size = int_func(self._raw_dtype.itemsize)
-        if len(self._shape) == 3:
-            element_size *= int_func(self._shape[2])
-        stride = element_size*int_func(self._shape[0])
-        # go to the appropriate spot in the file for first entry
-        self._fid.seek(self._data_offset + stride*start1 + element_size*start2, os.SEEK_SET)
-        if start1 == 0 and stop1 == self._shape[0]:
-            # we can write the block all at once
-            data.astype(self._raw_dtype).tofile(self._fid)
+        # we have to fall-back to manually write, so gather partial width chips
+        #   into full width bands of rows, for large sequential writes
+        data = numpy.ascontiguousarray(data, dtype=self._raw_dtype)
+        if data.ndim == 2:
+            data = data[:, :, numpy.newaxis]
+        row_size = int_func(self._raw_dtype.itemsize)*self._shape[1]*self._shape[2]
+        with self._lock:
+            first_band, last_band = start1//self._band_rows, (stop1 - 1)//self._band_rows
+            if start2 == 0 and stop2 == self._shape[1] and \
+                    not any(first_band <= entry <= last_band for entry in self._buffer):
+                # the rows are complete, so we can write the block all at once
+                self._write_bytes(data.tobytes(), self._data_offset + row_size*start1)
+                return
+
+            for band_index in range(first_band, last_band + 1):
+                band_start = band_index*self._band_rows
+                band_end = min(self._shape[0], band_start + self._band_rows)
+                entry = self._buffer.get(band_index, None)
+                if entry is None:
+                    entry = [numpy.zeros((band_end - band_start, ) + self._shape[1:], dtype=self._raw_dtype),
+                             numpy.zeros((band_end - band_start, self._shape[1]), dtype='bool'), 0]
+                    self._buffer[band_index] = entry
+                    self._buffered_bytes += entry[0].nbytes + entry[1].nbytes
+                else:
+                    self._buffer[band_index] = self._buffer.pop(band_index)
+                row_start, row_end = max(start1, band_start), min(stop1, band_end)
+                entry[0][row_start-band_start:row_end-band_start, start2:stop2] = data[row_start-start1:row_end-start1]
+                mask = entry[1][row_start-band_start:row_end-band_start, start2:stop2]
+                entry[2] += int_func(mask.size - numpy.count_nonzero(mask))
+                mask[:] = True
+                if entry[2] >= entry[1].size:
+                    self._flush_band(band_index)
+            # respect the memory cap, flushing the least recently used band(s)
+            while self._buffered_bytes > self._max_buffer_bytes and len(self._buffer) > 0:
+                self._flush_band(next(iter(self._buffer)))
+
+    def _flush_band(self, band_index):
+        """
+        Write the buffered band of rows to the file, and remove it from the buffer.
+        A partially populated band is merged with the present file contents.
+
+        Parameters
+        ----------
+        band_index : int
+
+        Returns
+        -------
+        None
+        """
+
+        data, mask, count = self._buffer.pop(band_index)
+        self._buffered_bytes -= data.nbytes + mask.nbytes
+        location = self._data_offset + band_index*self._band_rows*data[0].nbytes
+        if count < mask.size:
+            existing = self._read_bytes(location, data.nbytes)
+            existing = numpy.reshape(
+                numpy.frombuffer(existing + b'\x00'*(data.nbytes - len(existing)), dtype=self._raw_dtype),
+                data.shape)
+            data = numpy.where(mask[:, :, numpy.newaxis], data, existing)
+        self._write_bytes(data.tobytes(), location)
+
+    def _read_bytes(self, location, size):
+        """
+        Read bytes at the given location of the file, which may be fewer than
+        requested if the file is not yet fully populated.
+
+        Parameters
+        ----------
+        location : int
+        size : int
+
+        Returns
+        -------
+        bytes
+        """
+
+        if hasattr(os, 'pread'):
+            return os.pread(self._fid.fileno(), size, location)
+        self._fid.seek(location, os.SEEK_SET)
+        return self._fid.read(size)
+
+    def _write_bytes(self, the_bytes, location):
+        """
+        Write the bytes at the given location of the file, using positional
+        writes where available.
+
+        Parameters
+        ----------
+        the_bytes : bytes
+        location : int
+
+        Returns
+        -------
+        None
+        """
+
+        if hasattr(os, 'pwrite'):
+            view = memoryview(the_bytes)
+            while len(view) > 0:
+                count = os.pwrite(self._fid.fileno(), view, location)
+                view = view[count:]
+                location += count
         else:
-            # have to write one row at a time
-            bytes_to_skip_per_row = element_size*(self._shape[0]-(stop1-start1))
-            for i, row in enumerate(data):
-                # we the row, and then skip to where the next row starts
-                row.astype(self._raw_dtype).tofile(self._fid)
-                if i < len(data) - 1:
-                    # don't seek on last entry (avoid segfault, or whatever)
-                    self._fid.seek(bytes_to_skip_per_row, os.SEEK_CUR)
+            self._fid.seek(location, os.SEEK_SET)
+            self._fid.write(the_bytes)
+            self._fid.flush()
+
+    def flush(self):
+        """
+        Write any buffered data to the file. This is only relevant if memory
+        mapping the file failed, and is called on :func:`close`.
+
+        Returns
+        -------
+        None
+        """
+
+        if not hasattr(self, '_buffer') or self._buffer is None:
+            return
+        with self._lock:
+            for band_index in sorted(self._buffer.keys()):
+                self._flush_band(band_index)
 
     def close(self):
         """
@@ -1806,6 +3025,7 @@ class BIPWriter(AbstractWriter):
 
         if hasattr(self, '_fid') and self._fid is not None and \
                 hasattr(self._fid, 'closed') and not self._fid.closed:
+            self.flush()
             self._fid.close()
 
     def __del__(self):
@@ -1823,3 +3043,152 @@ class BIPWriter(AbstractWriter):
                 'only partially generated and corrupt.'.format(self.__class__.__name__, self._file_name))
             # The exception will be reraised.
             # It's unclear how any exception could be caught.
+
+
+class StreamingBIPWriter(BIPWriter):
+    """
+    For writing band interleaved by pixel data sequentially to a writable file
+    like object, which need not be seekable (i.e. a pipe or object store upload
+    stream). The data is emitted in row major order. Chips may arrive somewhat
+    out of order, in which case rows are held in memory until they can be
+    emitted in order, subject to `max_buffer_bytes`.
+    """
+
+    __slots__ = ('_next_row', '_pending', '_pending_bytes', '_active')
+
+    def __init__(self, stream, data_size, raw_dtype, output_bands, transform_data,
+                 max_buffer_bytes=268435456, active=True):
+        """
+
+        Parameters
+        ----------
+        stream : BinaryIO
+            The writable file like object. Data is written at the current position.
+        data_size : tuple
+            the shape of the form (rows, cols)
+        raw_dtype : str|numpy.dtype|numpy.number
+            the underlying data type of the output data. Specify endianess here if necessary.
+        output_bands : int
+            The number of output bands written to the file.
+        transform_data : callable|str
+            For complex type handling, see :class:`BIPWriter`.
+        max_buffer_bytes : int
+            The maximum size, in bytes, of the rows held awaiting emission. A
+            ValueError is raised if this is exceeded.
+        active : bool
+            Should the data be emitted to the stream? If not, all data is held
+            until :func:`activate` is called, which permits other content
+            (i.e. headers) to be written to the stream before this data.
+        """
+
+        if not callable(getattr(stream, 'write', None)):
+            raise TypeError('stream must be a writable file like object, got type {}'.format(type(stream)))
+        self._next_row = 0
+        self._pending = {}
+        self._pending_bytes = 0
+        self._active = bool(active)
+        super(StreamingBIPWriter, self).__init__(
+            stream, data_size, raw_dtype, output_bands, transform_data, data_offset=0,
+            max_buffer_bytes=max_buffer_bytes)
+
+    def _open_file(self):
+        self._fid = self._file_name
+
+    @property
+    def rows_written(self):
+        """
+        int: The number of rows emitted to the stream.
+        """
+
+        return self._next_row
+
+    @property
+    def complete(self):
+        """
+        bool: Have all rows been emitted to the stream?
+        """
+
+        return self._next_row >= self._shape[0]
+
+    def activate(self):
+        """
+        Begin emitting data to the stream, starting with any held rows.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            self._active = True
+            self._emit_pending()
+
+    def _emit_pending(self):
+        # emit the consecutive complete rows with a single write
+        rows = []
+        while self._next_row in self._pending and \
+                self._pending[self._next_row][1] >= self._shape[1]:
+            row = self._pending.pop(self._next_row)[0]
+            self._pending_bytes -= row.nbytes
+            rows.append(row.tobytes())
+            self._next_row += 1
+        if len(rows) > 0:
+            self._fid.write(b''.join(rows))
+
+    def _call(self, start1, stop1, start2, stop2, data):
+        data = numpy.ascontiguousarray(data, dtype=self._raw_dtype)
+        if data.ndim == 2:
+            data = data[:, :, numpy.newaxis]
+        with self._lock:
+            if start1 < self._next_row:
+                raise ValueError(
+                    'Rows prior to {} have already been written to the stream, and got '
+                    'data beginning at row {}'.format(self._next_row, start1))
+            if self._active and start1 == self._next_row and start2 == 0 and \
+                    stop2 == self._shape[1] and start1 not in self._pending:
+                # complete rows in order, so write directly
+                self._fid.write(data.tobytes())
+                self._next_row = stop1
+                self._emit_pending()
+                return
+
+            for i, row_index in enumerate(range(start1, stop1)):
+                entry = self._pending.get(row_index, None)
+                if entry is None:
+                    entry = [numpy.zeros(self._shape[1:], dtype=self._raw_dtype), 0]
+                    self._pending[row_index] = entry
+                    self._pending_bytes += entry[0].nbytes
+                entry[0][start2:stop2] = data[i]
+                entry[1] += stop2 - start2
+            if self._active:
+                self._emit_pending()
+            if self._pending_bytes > self._max_buffer_bytes:
+                raise ValueError(
+                    'The {} bytes held awaiting row {} exceeds max_buffer_bytes {}. For '
+                    'streaming output, the data must be provided in approximately row '
+                    'major order.'.format(self._pending_bytes, self._next_row, self._max_buffer_bytes))
+
+    def flush(self):
+        """
+        This is a no-op, since rows can only be emitted in order.
+
+        Returns
+        -------
+        None
+        """
+
+        pass
+
+    def close(self):
+        """
+        Check that all rows have been emitted. The stream is not closed, since
+        it belongs to the caller.
+
+        Returns
+        -------
+        None
+        """
+
+        if hasattr(self, '_next_row') and self._next_row < self._shape[0]:
+            logging.error(
+                'The streaming writer has emitted only {} of {} rows.'.format(self._next_row, self._shape[0]))
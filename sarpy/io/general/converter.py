@@ -4,10 +4,8 @@ opened by the sicd, sidd, cphd, or other_image reader collections.
 """
 
 import os
-import sys
-import pkgutil
-from importlib import import_module
 from sarpy.io.general.base import SarpyIOError
+from sarpy.io.general import format_detection
 
 __classification__ = "UNCLASSIFIED"
 __author__ = "Thomas McCullough"
@@ -16,10 +14,17 @@ __author__ = "Thomas McCullough"
 ###########
 # Module variables
 _openers = []
+_opener_format_types = {}
 _parsed_openers = False
+# The static registry of opener entry points, in priority order, and the
+#   plausible format types (see sarpy.io.general.format_detection) for each.
+#   The module is only imported if the opener is attempted.
+_opener_registry = (
+    ('sarpy.io.general.nitf', 'is_a', (format_detection.NITF, )),
+    ('sarpy.io.general.tiff', 'is_a', (format_detection.TIFF, )))
 
 
-def register_opener(open_func):
+def register_opener(open_func, format_types=None):
     """
     Provide a new opener.
 
@@ -29,6 +34,9 @@ def register_opener(open_func):
         This is required to be a function which takes a single argument (file name).
         This function should return a sarpy.io.general.base.BaseReader instance
         if the referenced file is viable for the underlying type, and None otherwise.
+    format_types : None|Tuple[str, ...]
+        The format types (see :mod:`sarpy.io.general.format_detection`) for
+        which this opener is plausible. If `None`, the opener is always attempted.
 
     Returns
     -------
@@ -39,15 +47,17 @@ def register_opener(open_func):
         raise TypeError('open_func must be a callable')
     if open_func not in _openers:
         _openers.append(open_func)
+        _opener_format_types[open_func] = None if format_types is None else tuple(format_types)
 
 
 def parse_openers():
     """
-    Automatically find the viable openers (i.e. :func:`is_a`) in the various modules.
+    Register the openers from the static registry of entry points. Note that
+    the format modules are not imported until the given opener is attempted.
 
     Returns
     -------
-
+    None
     """
 
     global _parsed_openers
@@ -55,31 +65,15 @@ def parse_openers():
         return
     _parsed_openers = True
 
-    def check_module(mod_name):
-        # import the module
-        import_module(mod_name)
-        # fetch the module from the modules dict
-        module = sys.modules[mod_name]
-        # see if it has an is_a function, if so, register it
-        if hasattr(module, 'is_a'):
-            register_opener(module.is_a)
-
-        # walk down any subpackages
-        path, fil = os.path.split(module.__file__)
-        if not fil.startswith('__init__.py'):
-            # there are no subpackages
-            return
-        for sub_module in pkgutil.walk_packages([path, ]):
-            _, sub_module_name, _ = sub_module
-            sub_name = "{}.{}".format(mod_name, sub_module_name)
-            check_module(sub_name)
-
-    check_module('sarpy.io.general')
+    for module_name, function_name, format_types in _opener_registry:
+        register_opener(format_detection.LazyOpener(module_name, function_name), format_types=format_types)
 
 
 def open_general(file_name):
     """
-    Given a file, try to find and return the appropriate reader object.
+    Given a file, try to find and return the appropriate reader object. Only
+    the openers plausible for the format detected from the file header (see
+    :func:`sarpy.io.general.format_detection.detect_format_types`) are attempted.
 
     Parameters
     ----------
@@ -99,10 +93,10 @@ def open_general(file_name):
     # parse openers, if not already done
     parse_openers()
     # see if we can find a reader though trial and error
-    for opener in _openers:
-        reader = opener(file_name)
-        if reader is not None:
-            return reader
+    reader = format_detection.probe_openers(
+        file_name, [(opener, _opener_format_types[opener]) for opener in _openers])
+    if reader is not None:
+        return reader
 
     # If for loop completes, no matching file format was found.
     raise SarpyIOError('Unable to determine image format.')
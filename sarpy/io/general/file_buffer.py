@@ -0,0 +1,425 @@
+"""
+Random access to the bytes of a file, or file like object, shared between the
+various arrays stored in the file.
+
+A local file (or other object with a usable file descriptor) is memory mapped,
+and an in-memory buffer (i.e. :class:`io.BytesIO`) is viewed directly, so no
+data is copied in either case. Any other seekable file like object (i.e. a
+member of an archive) is read in aligned blocks, which are maintained in a least
+recently used cache, and all reads use the one underlying handle.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import logging
+import os
+from io import BytesIO
+from typing import Union
+
+import numpy
+
+from sarpy.compliance import int_func, integer_types, string_types
+from sarpy.io.general.utils import is_file_like
+from sarpy.io.general.base import BaseChipper, BlockCache, SarpyIOError, get_file_lock
+
+
+class FileBuffer(object):
+    """
+    Thread-safe random access to the bytes of a file or file like object.
+    """
+
+    __slots__ = (
+        '_file_object', '_close_after', '_memory_map', '_size', '_block_size', '_cache', '_lock')
+
+    def __init__(self, file_object, block_size=1048576, max_bytes=67108864):
+        """
+
+        Parameters
+        ----------
+        file_object : str|BinaryIO
+            The path to, or seekable binary file like object for, the file.
+        block_size : int
+            The block size, in bytes, for reading a file like object which
+            cannot be memory mapped.
+        max_bytes : int
+            The maximum size, in bytes, of the cached blocks.
+        """
+
+        self._close_after = False
+        self._memory_map = None  # type: Union[None, numpy.ndarray]
+        self._cache = None  # type: Union[None, BlockCache]
+        if isinstance(file_object, string_types):
+            if not os.path.isfile(file_object):
+                raise SarpyIOError('Path {} either does not exists, or is not a file.'.format(file_object))
+            file_object = open(file_object, 'rb')
+            self._close_after = True
+        elif not is_file_like(file_object):
+            raise TypeError('Got unsupported input type {}'.format(type(file_object)))
+        self._file_object = file_object
+        # NB: the handle may be shared with other readers, so share its lock
+        self._lock = get_file_lock(file_object)
+        self._block_size = max(1, int_func(block_size))
+
+        file_object.seek(0, os.SEEK_END)
+        self._size = int_func(file_object.tell())
+        self._memory_map = self._get_memory_map()
+        if self._memory_map is None:
+            self._cache = BlockCache(max_bytes=max_bytes)
+
+    def _get_memory_map(self):
+        if self._size == 0:
+            return None
+        if isinstance(self._file_object, BytesIO):
+            # NB: the BytesIO object cannot be resized while this view exists
+            memory_map = numpy.frombuffer(self._file_object.getbuffer(), dtype='uint8')
+            memory_map.setflags(write=False)
+            return memory_map
+        if not hasattr(self._file_object, 'fileno'):
+            return None
+        # noinspection PyBroadException
+        try:
+            self._file_object.fileno()
+        except Exception:
+            return None  # i.e. io.UnsupportedOperation
+        try:
+            return numpy.memmap(self._file_object, dtype='uint8', mode='r', shape=(self._size, ))
+        except (OverflowError, OSError, ValueError) as e:
+            # the most likely cause is 32-bit python failing to map a file larger than 2GB
+            logging.warning('Falling back to reading blocks, after failing to memory map with error {}'.format(e))
+            return None
+
+    @property
+    def size(self):
+        """
+        int: The size of the file, in bytes.
+        """
+
+        return self._size
+
+    @property
+    def memory_map(self):
+        """
+        None|numpy.ndarray: The uint8 memory map or view of the file, if available.
+        """
+
+        return self._memory_map
+
+    @property
+    def cache(self):
+        """
+        None|BlockCache: The block cache, if the file is not memory mapped.
+        """
+
+        return self._cache
+
+    def _read_file(self, offset, size):
+        with self._lock:
+            self._file_object.seek(offset, os.SEEK_SET)
+            data = self._file_object.read(size)
+        if len(data) != size:
+            raise SarpyIOError('Tried to read {} bytes at offset {}, but received {}'.format(size, offset, len(data)))
+        return data
+
+    def _get_block(self, block_index):
+        block = self._cache.get(block_index)
+        if block is None:
+            offset = block_index*self._block_size
+            data = self._read_file(offset, min(self._block_size, self._size - offset))
+            block = self._cache.put(block_index, numpy.frombuffer(data, dtype='uint8'))
+        return block
+
+    def read(self, offset, size):
+        """
+        Read the given byte range.
+
+        Parameters
+        ----------
+        offset : int
+        size : int
+
+        Returns
+        -------
+        numpy.ndarray
+            A read only uint8 array, which is a view into the memory map, where possible.
+        """
+
+        offset, size = int_func(offset), int_func(size)
+        if offset < 0 or size < 0 or offset + size > self._size:
+            raise ValueError(
+                'Byte range ({}, {}) is not contained in the file of size {}'.format(offset, size, self._size))
+        if self._memory_map is not None:
+            return self._memory_map[offset:offset+size]
+        if size == 0:
+            return numpy.zeros((0, ), dtype='uint8')
+        if size > self._cache.max_bytes//4:
+            # a large read would only evict the cache, so bypass it
+            out = numpy.frombuffer(self._read_file(offset, size), dtype='uint8')
+            out.setflags(write=False)
+            return out
+        first_block = offset//self._block_size
+        last_block = (offset + size - 1)//self._block_size
+        if first_block == last_block:
+            start = offset - first_block*self._block_size
+            return self._get_block(first_block)[start:start+size]
+        out = numpy.empty((size, ), dtype='uint8')
+        position = 0
+        for block_index in range(first_block, last_block+1):
+            block = self._get_block(block_index)
+            start = max(offset - block_index*self._block_size, 0)
+            count = min(block.size - start, size - position)
+            out[position:position+count] = block[start:start+count]
+            position += count
+        out.setflags(write=False)
+        return out
+
+    def get_array(self, offset, dtype, shape):
+        """
+        Gets a lazily read array stored at the given offset.
+
+        Parameters
+        ----------
+        offset : int
+        dtype : str|numpy.dtype
+        shape : tuple
+
+        Returns
+        -------
+        BufferArray
+        """
+
+        return BufferArray(self, offset, dtype, shape)
+
+    def open_stream(self):
+        """
+        Gets a file like object for reading, with its own position.
+
+        Returns
+        -------
+        BufferStream
+        """
+
+        return BufferStream(self)
+
+    def close(self):
+        """
+        Release the memory map and cache, and close the file, if it was opened here.
+
+        Returns
+        -------
+        None
+        """
+
+        self._memory_map = None
+        if self._cache is not None:
+            self._cache.clear()
+        if self._close_after and not self._file_object.closed:
+            self._file_object.close()
+
+    def __del__(self):
+        if self._close_after and not self._file_object.closed:
+            self._file_object.close()
+
+
+class BufferArray(object):
+    """
+    A read only array stored in a :class:`FileBuffer`, in C order. Indexing reads
+    only the span of the first dimension which is required, and yields a numpy
+    array. Indexing in the first dimension is permitted by integer or slice.
+    """
+
+    __slots__ = ('_buffer', '_offset', '_dtype', '_shape', '_row_bytes')
+
+    def __init__(self, file_buffer, offset, dtype, shape):
+        """
+
+        Parameters
+        ----------
+        file_buffer : FileBuffer
+        offset : int
+        dtype : str|numpy.dtype
+        shape : int|tuple
+        """
+
+        self._buffer = file_buffer
+        self._offset = int_func(offset)
+        self._dtype = numpy.dtype(dtype)
+        if isinstance(shape, integer_types):
+            shape = (shape, )
+        self._shape = tuple(int_func(entry) for entry in shape)
+        if len(self._shape) < 1:
+            raise ValueError('shape must have at least one dimension')
+        self._row_bytes = self._dtype.itemsize*int_func(numpy.prod(self._shape[1:]))
+        if self._offset + self.nbytes > self._buffer.size:
+            raise SarpyIOError(
+                'An array of {} bytes at offset {} is not contained in the file of size {}'.format(
+                    self.nbytes, self._offset, self._buffer.size))
+
+    @property
+    def dtype(self):
+        """
+        numpy.dtype: The data type.
+        """
+
+        return self._dtype
+
+    @property
+    def shape(self):
+        """
+        tuple: The shape.
+        """
+
+        return self._shape
+
+    @property
+    def ndim(self):
+        """
+        int: The number of dimensions.
+        """
+
+        return len(self._shape)
+
+    @property
+    def size(self):
+        """
+        int: The number of elements.
+        """
+
+        return int_func(numpy.prod(self._shape))
+
+    @property
+    def nbytes(self):
+        """
+        int: The size in bytes.
+        """
+
+        return self._shape[0]*self._row_bytes
+
+    @property
+    def memory_map(self):
+        """
+        None|numpy.ndarray: The underlying memory map of the file buffer, if available.
+        """
+
+        return self._buffer.memory_map
+
+    def __len__(self):
+        return self._shape[0]
+
+    def _read_rows(self, start, stop):
+        data = self._buffer.read(self._offset + start*self._row_bytes, (stop - start)*self._row_bytes)
+        return numpy.reshape(data.view(self._dtype), (stop - start, ) + self._shape[1:])
+
+    def __array__(self, dtype=None):
+        data = self._read_rows(0, self._shape[0])
+        return data if dtype is None else data.astype(dtype)
+
+    def __getitem__(self, item):
+        if not isinstance(item, tuple):
+            item = (item, )
+        if self._buffer.memory_map is not None or len(item) == 0 or item[0] is Ellipsis:
+            return self._read_rows(0, self._shape[0])[item]
+
+        first, rest = item[0], item[1:]
+        if isinstance(first, slice):
+            rows = numpy.arange(*first.indices(self._shape[0]))
+            if rows.size == 0:
+                return numpy.empty((0, ) + self._shape[1:], dtype=self._dtype)[(slice(None), ) + rest]
+            start, stop = int_func(rows.min()), int_func(rows.max()) + 1
+            if first.step is None or first.step == 1:
+                return self._read_rows(start, stop)[(slice(None), ) + rest]
+            return self._read_rows(start, stop)[(rows - start, ) + rest]
+        elif isinstance(first, integer_types + (numpy.integer, )):
+            row = int_func(first)
+            if row < 0:
+                row += self._shape[0]
+            if not (0 <= row < self._shape[0]):
+                raise IndexError('index {} is out of bounds for axis 0 with size {}'.format(first, self._shape[0]))
+            return self._read_rows(row, row+1)[(0, ) + rest]
+        else:
+            raise TypeError('Got unsupported index type {} for the first dimension'.format(type(first)))
+
+
+class BufferStream(object):
+    """
+    A read only file like object for a :class:`FileBuffer`, with its own position.
+    """
+
+    __slots__ = ('_buffer', '_position')
+
+    def __init__(self, file_buffer):
+        """
+
+        Parameters
+        ----------
+        file_buffer : FileBuffer
+        """
+
+        self._buffer = file_buffer
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            self._position = int_func(offset)
+        elif whence == os.SEEK_CUR:
+            self._position += int_func(offset)
+        elif whence == os.SEEK_END:
+            self._position = self._buffer.size + int_func(offset)
+        else:
+            raise ValueError('Got unsupported whence {}'.format(whence))
+        return self._position
+
+    def read(self, size=-1):
+        start = min(self._position, self._buffer.size)
+        if size is None or size < 0:
+            size = self._buffer.size - start
+        size = min(int_func(size), self._buffer.size - start)
+        self._position = start + size
+        return self._buffer.read(start, size).tobytes()
+
+
+class BufferChipper(BaseChipper):
+    """
+    Band interleaved chipper for an array of shape `(rows, columns, bands)` stored
+    in a :class:`FileBuffer`.
+    """
+
+    __slots__ = ('_array', )
+
+    def __init__(self, array, symmetry=(False, False, False), transform_data=None):
+        """
+
+        Parameters
+        ----------
+        array : BufferArray
+            The raw array, of shape `(rows, columns, bands)`.
+        symmetry : tuple
+            Describes any required data transformation. See the `symmetry` property.
+        transform_data : None|str|Callable
+            For data transformation after reading.
+        """
+
+        if array.ndim != 3:
+            raise ValueError('array is required to be three dimensional, got shape {}'.format(array.shape))
+        self._array = array
+        super(BufferChipper, self).__init__(array.shape[:2], symmetry=symmetry, transform_data=transform_data)
+
+    def _is_source_view(self, data):
+        memory_map = self._array.memory_map
+        return memory_map is not None and numpy.may_share_memory(data, memory_map)
+
+    def _read_raw_fun(self, range1, range2):
+        range1, range2 = self._reorder_arguments(range1, range2)
+        slice1 = slice(range1[0], None, range1[2]) if (range1[1] == -1 and range1[2] < 0) else slice(*range1)
+        slice2 = slice(range2[0], None, range2[2]) if (range2[1] == -1 and range2[2] < 0) else slice(*range2)
+        return self._array[slice1, slice2]
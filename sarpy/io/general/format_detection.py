@@ -0,0 +1,307 @@
+"""
+Inexpensive identification of the plausible file format(s) of a given path,
+based on magic bytes from the beginning of the file, the file name, and the
+directory contents. This permits the various `open_*` methods to attempt only
+the plausible openers, instead of attempting every opener in turn.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import os
+import logging
+import struct
+import time
+from importlib import import_module
+
+from sarpy.compliance import string_types
+
+
+##########
+# The format type identifiers
+
+NITF = 'NITF'
+HDF5 = 'HDF5'
+TIFF = 'TIFF'
+CPHD = 'CPHD'
+SIO = 'SIO'
+CEOS = 'CEOS'
+SAFE_MANIFEST = 'SAFE_MANIFEST'
+RADARSAT_PRODUCT = 'RADARSAT_PRODUCT'
+TSX_PRODUCT = 'TSX_PRODUCT'
+
+HEADER_SIZE = 4096
+
+_HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+_TIFF_SIGNATURES = (b'II*\x00', b'MM\x00*', b'II+\x00', b'MM\x00+')
+_SIO_MAGIC = (0xFF017FFE, 0xFE7F01FF, 0xFF027FFD, 0xFD7F02FF)
+_CEOS_PREFIXES = ('IMG-', 'LED-', 'TRL-', 'VOL-')
+
+
+def _read_header(file_name, header_size):
+    """
+    Reads the first bytes of the file, restoring the current position for a
+    file-like object.
+
+    Parameters
+    ----------
+    file_name : str|BinaryIO
+    header_size : int
+
+    Returns
+    -------
+    bytes
+    """
+
+    if isinstance(file_name, string_types):
+        try:
+            with open(file_name, 'rb') as fi:
+                return fi.read(header_size)
+        except (IOError, OSError):
+            return b''
+
+    try:
+        current_location = file_name.tell()
+        file_name.seek(0, os.SEEK_SET)
+        header = file_name.read(header_size)
+        file_name.seek(current_location, os.SEEK_SET)
+    except Exception:
+        return b''
+    return header if isinstance(header, bytes) else b''
+
+
+def _header_format_types(header):
+    """
+    Determine the format types from the file header (magic) bytes.
+
+    Parameters
+    ----------
+    header : bytes
+
+    Returns
+    -------
+    List[str]
+    """
+
+    out = []
+    if header[:4] in (b'NITF', b'NSIF'):
+        out.append(NITF)
+    elif header[:4] == b'CPHD':
+        out.append(CPHD)
+    elif header[:4] in _TIFF_SIGNATURES:
+        out.append(TIFF)
+    # the hdf5 superblock may follow a user block of size 512*2^n
+    for location in (0, 512, 1024, 2048):
+        if header[location:location+8] == _HDF5_SIGNATURE:
+            out.append(HDF5)
+            break
+    if len(header) >= 12:
+        if struct.unpack('>I', header[:4])[0] in _SIO_MAGIC:
+            out.append(SIO)
+        parts = struct.unpack('>IBBBBI', header[:12])
+        if parts[0] == 1 and parts[2:5] == (192, 18, 18):
+            out.append(CEOS)
+    return out
+
+
+def _directory_format_types(directory):
+    """
+    Determine the plausible format types for a directory, based on the names
+    of the top level contents.
+
+    Parameters
+    ----------
+    directory : str
+
+    Returns
+    -------
+    List[str]
+    """
+
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    out = []
+    if 'manifest.safe' in names:
+        out.append(SAFE_MANIFEST)
+    if 'product.xml' in names or os.path.isfile(os.path.join(directory, 'metadata', 'product.xml')):
+        out.append(RADARSAT_PRODUCT)
+    if any(os.path.splitext(name)[1] == '.xml' for name in names) and \
+            os.path.isdir(os.path.join(directory, 'IMAGEDATA')):
+        out.append(TSX_PRODUCT)
+    if any(name.startswith(_CEOS_PREFIXES) for name in names):
+        out.append(CEOS)
+    return out
+
+
+def detect_format_types(file_name, header_size=HEADER_SIZE):
+    """
+    Determine the plausible format types for the given path or file-like object,
+    using only the first `header_size` bytes of the file (read once), the file
+    name, and the directory contents. This is intended to be inexpensive, and
+    does not validate the file in any real sense.
+
+    Parameters
+    ----------
+    file_name : str|BinaryIO
+    header_size : int
+
+    Returns
+    -------
+    Tuple[str, ...]
+        The collection of plausible format types. This is empty if no format
+        was recognized, in which case all formats should be considered plausible.
+    """
+
+    if isinstance(file_name, string_types) and os.path.isdir(file_name):
+        return tuple(_directory_format_types(file_name))
+
+    out = _header_format_types(_read_header(file_name, header_size))
+    if isinstance(file_name, string_types) and len(out) == 0:
+        base_name = os.path.split(file_name)[1]
+        if base_name == 'manifest.safe':
+            out.append(SAFE_MANIFEST)
+        elif base_name == 'product.xml':
+            out.append(RADARSAT_PRODUCT)
+        elif os.path.splitext(base_name)[1] == '.xml':
+            out.append(TSX_PRODUCT)
+    return tuple(out)
+
+
+class LazyOpener(object):
+    """
+    An opener entry point given by module and function name, for which the module
+    is only imported when the opener is first called. This permits registration
+    of the openers without the (possibly substantial) cost of importing every
+    format module.
+    """
+
+    __slots__ = ('_module_name', '_function_name', '_function')
+
+    def __init__(self, module_name, function_name='is_a'):
+        """
+
+        Parameters
+        ----------
+        module_name : str
+            The fully qualified module name.
+        function_name : str
+            The name of the opener function in the module.
+        """
+
+        self._module_name = module_name
+        self._function_name = function_name
+        self._function = None
+
+    @property
+    def name(self):
+        """
+        str: The fully qualified opener name.
+        """
+
+        return '{}.{}'.format(self._module_name, self._function_name)
+
+    @property
+    def is_loaded(self):
+        """
+        bool: Has the module been imported?
+        """
+
+        return self._function is not None
+
+    def load(self):
+        """
+        Import the module, if necessary, and get the opener function.
+
+        Returns
+        -------
+        Callable
+        """
+
+        if self._function is None:
+            self._function = getattr(import_module(self._module_name), self._function_name)
+        return self._function
+
+    def __call__(self, file_name):
+        return self.load()(file_name)
+
+    def __eq__(self, other):
+        return isinstance(other, LazyOpener) and self.name == other.name
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return 'LazyOpener({}, {})'.format(self._module_name, self._function_name)
+
+
+def get_plausible_openers(openers, format_types):
+    """
+    Filter the collection of openers to those plausible for the detected format types.
+
+    Parameters
+    ----------
+    openers : List[Tuple[Callable, None|Tuple[str, ...]]]
+        The collection of openers and associated format types. An opener
+        with format types `None` is always considered plausible.
+    format_types : Tuple[str, ...]
+        The detected format types. If empty, all openers are plausible.
+
+    Returns
+    -------
+    List[Callable]
+    """
+
+    if len(format_types) == 0:
+        return [opener for opener, _ in openers]
+    return [opener for opener, opener_types in openers
+            if opener_types is None or any(entry in format_types for entry in opener_types)]
+
+
+def _get_opener_name(opener):
+    if isinstance(opener, LazyOpener):
+        return opener.name
+    return '{}.{}'.format(
+        getattr(opener, '__module__', None), getattr(opener, '__name__', type(opener).__name__))
+
+
+def probe_openers(file_name, openers):
+    """
+    Detect the plausible format types, and attempt only the plausible openers in
+    order. The successful opener and the time spent probing are logged.
+
+    Parameters
+    ----------
+    file_name : str|BinaryIO
+    openers : List[Tuple[Callable, None|Tuple[str, ...]]]
+        The collection of openers and associated format types, in priority order.
+
+    Returns
+    -------
+    None|sarpy.io.general.base.BaseReader
+        The reader from the first successful opener, if any.
+    """
+
+    start_time = time.time()
+    format_types = detect_format_types(file_name)
+    plausible = get_plausible_openers(openers, format_types)
+    for i, opener in enumerate(plausible):
+        reader = opener(file_name)
+        if reader is not None:
+            logging.info(
+                'Opened {} using opener {}, with detected format types {}, '
+                'after probing {} of {} openers in {:.4f} seconds'.format(
+                    file_name, _get_opener_name(opener), format_types,
+                    i + 1, len(openers), time.time() - start_time))
+            return reader
+    logging.info(
+        'No opener succeeded for {}, with detected format types {}, after probing '
+        '{} of {} openers in {:.4f} seconds'.format(
+            file_name, format_types, len(plausible), len(openers), time.time() - start_time))
+    return None
@@ -12,10 +12,12 @@ import logging
 import os
 from typing import Union, List, Tuple, BinaryIO
 import re
-import mmap
-from tempfile import mkstemp
+import threading
+from io import BytesIO
 from collections import OrderedDict
 import struct
+from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy
 
@@ -37,7 +39,8 @@ except ImportError:
 
 from sarpy.compliance import int_func, string_types
 from sarpy.io.general.base import BaseReader, AbstractWriter, SubsetChipper, \
-    AggregateChipper, BIPChipper, BIPWriter, BSQChipper, BIRChipper, SarpyIOError
+    AggregateChipper, BIPChipper, BIPWriter, StreamingBIPWriter, BSQChipper, BIRChipper, \
+    BlockDecodingChipper, SarpyIOError, get_file_lock
 # noinspection PyProtectedMember
 from sarpy.io.general.nitf_elements.nitf_head import NITFHeader, NITFHeader0, \
     ImageSegmentsType, DataExtensionsType, _ItemArrayHeaders
@@ -834,12 +837,204 @@ def single_lut_conversion(lookup_table):
     return converter
 
 
+def _find_jpeg_end(file_object, start, end, chunk_size=65536):
+    """
+    Find the end of the JPEG stream which begins at the given location, by
+    traversing the marker segments and scanning the entropy coded data. No
+    decoding is performed.
+
+    Parameters
+    ----------
+    file_object : BinaryIO
+    start : int
+        The location of the start of image marker.
+    end : int
+        The location past which the search will not proceed.
+    chunk_size : int
+        The size of the reads while scanning the entropy coded data.
+
+    Returns
+    -------
+    int
+        The location immediately following the end of image marker.
+    """
+
+    def read(location, count):
+        file_object.seek(location, os.SEEK_SET)
+        return bytearray(file_object.read(max(0, min(count, end - location))))
+
+    if read(start, 2) != b'\xff\xd8':
+        raise ValueError('No JPEG start of image marker found at offset {}'.format(start))
+    position = start + 2
+    while position < end:
+        marker = read(position, 4)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError('Invalid JPEG marker found at offset {}'.format(position))
+        code = marker[1]
+        if code == 0xFF:
+            position += 1  # fill byte
+            continue
+        elif code == 0xD9:
+            return position + 2  # end of image
+        elif code == 0x01 or 0xD0 <= code <= 0xD7:
+            position += 2  # stand-alone marker
+            continue
+        if len(marker) < 4:
+            break
+        position += 2 + ((marker[2] << 8) | marker[3])
+        if code != 0xDA:
+            continue
+
+        # scan the entropy coded data (following start of scan) for the next marker
+        while position < end:
+            chunk = read(position, chunk_size)
+            location = chunk.find(b'\xff')
+            while location != -1 and location + 1 < len(chunk):
+                following = chunk[location + 1]
+                if following != 0 and not (0xD0 <= following <= 0xD7):
+                    break
+                location = chunk.find(b'\xff', location + 1)
+            if location == -1:
+                position += len(chunk)
+            elif location + 1 < len(chunk):
+                position += location
+                break
+            elif len(chunk) > 1:
+                position += location  # marker straddles the chunk boundary
+            else:
+                position = end
+    raise ValueError('No JPEG end of image marker found for the stream beginning at offset {}'.format(start))
+
+
+class CompressedBlockChipper(BlockDecodingChipper):
+    """
+    Reading of a compressed NITF image segment, one image block at a time. Only
+    the blocks which intersect a requested window are read and decoded (using
+    PIL), and the decoded blocks are maintained in a least recently used cache.
+
+    The block locations are either provided (i.e. from the block mask table of
+    a masked image segment), or are found lazily by sequentially traversing the
+    concatenated JPEG streams, one per block, of the image segment. In the latter
+    case, the compressed data is only traversed as far as the furthest block
+    requested.
+    """
+
+    __slots__ = (
+        '_file_object', '_lock', '_block_locations', '_block_count', '_scan_position', '_scan_end',
+        '_output_bands', '_output_dtype')
+
+    def __init__(self, file_object, data_size, block_shape, raw_dtype, raw_bands,
+                 block_locations=None, segment_location=None, symmetry=(False, False, False),
+                 transform_data=None, max_bytes=67108864, max_workers=1,
+                 output_bands=None, output_dtype=None, limit_to_raw_bands=None):
+        """
+
+        Parameters
+        ----------
+        file_object : BinaryIO
+        data_size : tuple
+            The `(rows, columns)` of the image segment.
+        block_shape : tuple
+            The `(rows, columns)` of each image block.
+        raw_dtype : str|numpy.dtype|numpy.number
+        raw_bands : int
+        block_locations : None|List[None|Tuple[int, int]]
+            The `(offset, size)` of the compressed data for each block, in row major
+            order, where `None` indicates a masked (i.e. missing) block. If not
+            provided, then the blocks are assumed to be concatenated JPEG streams.
+        segment_location : None|Tuple[int, int]
+            The `(offset, size)` of the compressed image data, required if `block_locations`
+            is not provided.
+        symmetry : tuple
+        transform_data : None|str|Callable
+        max_bytes : int
+            The maximum size, in bytes, of the decoded block cache.
+        max_workers : None|int
+            The number of threads used for decoding blocks.
+        output_bands : None|int
+            The number of output bands, after any `transform_data` application.
+            Defaults to the number of raw bands read.
+        output_dtype : None|str|numpy.dtype|numpy.number
+            The output data type, after any `transform_data` application.
+            Defaults to `raw_dtype`.
+        limit_to_raw_bands : None|int|numpy.ndarray|list|tuple
+            The collection of raw bands to which to read. `None` is all bands.
+        """
+
+        if PIL is None:
+            raise ValueError('Reading compressed NITF image segments requires PIL.')
+        self._file_object = file_object
+        # NB: the handle is shared with the other image segments, so share its lock
+        self._lock = get_file_lock(file_object)
+        super(CompressedBlockChipper, self).__init__(
+            data_size, block_shape, raw_dtype, raw_bands, symmetry=symmetry,
+            transform_data=transform_data, max_bytes=max_bytes, max_workers=max_workers,
+            limit_to_raw_bands=limit_to_raw_bands)
+        if output_bands is None:
+            output_bands = self._raw_bands if self._limit_to_raw_bands is None else self._limit_to_raw_bands.size
+        output_bands = int_func(output_bands)
+        if output_bands < 1:
+            raise ValueError('output_bands must be a positive integer.')
+        self._output_bands = output_bands
+        self._output_dtype = numpy.dtype(raw_dtype if output_dtype is None else output_dtype)
+        self._block_count = self._blocks_across*int_func(numpy.ceil(float(data_size[0])/self._block_shape[0]))
+        if block_locations is not None:
+            if len(block_locations) != self._block_count:
+                raise ValueError(
+                    'Got {} block locations, but expected {}'.format(len(block_locations), self._block_count))
+            self._block_locations = list(block_locations)
+            self._scan_position, self._scan_end = None, None
+        else:
+            if segment_location is None:
+                raise ValueError('One of block_locations or segment_location must be provided')
+            self._block_locations = []
+            self._scan_position = int_func(segment_location[0])
+            self._scan_end = self._scan_position + int_func(segment_location[1])
+
+    def _locate_block(self, block_index):
+        # NB: this must be called while holding the lock
+        while len(self._block_locations) <= block_index:
+            block_end = _find_jpeg_end(self._file_object, self._scan_position, self._scan_end)
+            self._block_locations.append((self._scan_position, block_end - self._scan_position))
+            self._scan_position = block_end
+        return self._block_locations[block_index]
+
+    def _read_block_bytes(self, block_indices):
+        out = [None for _ in block_indices]
+        with self._lock:
+            locations = [self._locate_block(block_index) for block_index in block_indices]
+            # read in file order
+            order = sorted(
+                [i for i, entry in enumerate(locations) if entry is not None], key=lambda i: locations[i][0])
+            for i in order:
+                self._file_object.seek(locations[i][0], os.SEEK_SET)
+                out[i] = self._file_object.read(locations[i][1])
+        return out
+
+    def _decode_block(self, block_index, data):
+        block = numpy.zeros(self._block_shape + (self._raw_bands, ), dtype=self._raw_dtype)
+        if data is None:
+            return block  # a masked block
+        img = PIL.Image.open(BytesIO(data))
+        decoded = numpy.asarray(img)
+        if decoded.ndim == 2:
+            decoded = decoded[:, :, numpy.newaxis]
+        if decoded.shape[2] != self._raw_bands:
+            raise ValueError(
+                'Block {} decompressed to data with {} bands, but {} bands are '
+                'expected'.format(block_index, decoded.shape[2], self._raw_bands))
+        rows = min(decoded.shape[0], self._block_shape[0])
+        cols = min(decoded.shape[1], self._block_shape[1])
+        block[:rows, :cols] = decoded[:rows, :cols]
+        return block
+
+
 class NITFReader(BaseReader):
     """
     A reader object for NITF 2.10 container files
     """
 
-    __slots__ = ('_nitf_details', '_cached_files', '_symmetry')
+    __slots__ = ('_nitf_details', '_symmetry')
 
     def __init__(self, nitf_details, reader_type="OTHER", symmetry=(False, False, False)):
         """
@@ -854,7 +1049,6 @@ class NITFReader(BaseReader):
         """
 
         self._symmetry = symmetry
-        self._cached_files = []
         if isinstance(nitf_details, string_types) or is_file_like(nitf_details):
             nitf_details = NITFDetails(nitf_details)
         if not isinstance(nitf_details, NITFDetails):
@@ -915,13 +1109,14 @@ class NITFReader(BaseReader):
                 '8, 16, and 32 are supported.'.format(index, img_header.NBPP))
             return False
 
-        if img_header.is_masked and img_header.is_compressed:
+        if img_header.is_masked and img_header.is_compressed and \
+                (img_header.mask_subheader is None or img_header.mask_subheader.BMR is None):
             logging.error(
-                'Image segment at index {} is both masked and compressed. This is '
-                'not currently supported.'.format(index))
+                'Image segment at index {} is both masked and compressed, but does not '
+                'provide a block mask table. This is not currently supported.'.format(index))
             return False
 
-        if img_header.IC in ['C0', 'C1', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'I1']:
+        if img_header.is_compressed:
             if PIL is None:
                 logging.error(
                     'Image segment at index {} has IC value {}, and PIL cannot '
@@ -1451,6 +1646,43 @@ class NITFReader(BaseReader):
             bounds[:, 2:] = t_bounds[:, :2]
         return AggregateChipper(bounds, output_dtype, chippers, output_bands=output_bands)
 
+    def _create_compressed_chipper(
+            self, index, img_header, data_offset, this_rows, this_cols, raw_dtype, raw_bands,
+            output_dtype, output_bands, transform_data, limit_to_raw_bands):
+        row_block_size, column_block_size = self._get_block_sizes(img_header, this_rows, this_cols)
+        segment_size = int_func(self.nitf_details.img_segment_sizes[index])
+        block_locations = None
+        segment_location = None
+        if img_header.is_masked:
+            # the block mask table provides the offset of each block, relative to the
+            #   end of the mask subheader
+            data_offset += img_header.mask_subheader.IMDATOFF
+            segment_size -= img_header.mask_subheader.IMDATOFF
+            exclude_value = 0xFFFFFFFF
+            block_offsets = [int_func(entry) for entry in img_header.mask_subheader.BMR[0]]
+            present = sorted(set(entry for entry in block_offsets if entry != exclude_value))
+            block_ends = dict(zip(present, present[1:] + [segment_size, ]))
+            block_locations = [
+                None if entry == exclude_value else (data_offset + entry, block_ends[entry] - entry)
+                for entry in block_offsets]
+        elif img_header.NBPR*img_header.NBPC == 1 or img_header.IC == 'C8':
+            # NB: a jpeg 2000 image segment is a single code stream, regardless of blocking
+            row_block_size, column_block_size = this_rows, this_cols
+            block_locations = [(data_offset, segment_size), ]
+        elif img_header.IC in ['C3', 'C5']:
+            # the blocks are concatenated jpeg streams, to be located as required
+            segment_location = (data_offset, segment_size)
+        else:
+            raise ValueError(
+                'Image segment at index {} has IC {} and multiple blocks, which is '
+                'not supported.'.format(index, img_header.IC))
+
+        return CompressedBlockChipper(
+            self.file_object, (this_rows, this_cols), (row_block_size, column_block_size),
+            raw_dtype, raw_bands, block_locations=block_locations, segment_location=segment_location,
+            symmetry=self._symmetry, transform_data=transform_data, output_bands=output_bands,
+            output_dtype=output_dtype, limit_to_raw_bands=limit_to_raw_bands)
+
     def _define_chipper(self, index, raw_dtype=None, raw_bands=None, transform_data=None,
                         output_bands=None, output_dtype=None, limit_to_raw_bands=None):
         """
@@ -1475,44 +1707,9 @@ class NITFReader(BaseReader):
 
         Returns
         -------
-        BIPChipper|AggregateChipper
+        BIPChipper|AggregateChipper|CompressedBlockChipper
         """
 
-        def handle_compressed():
-            if PIL is None:
-                raise ValueError('handling image segments with compression require PIL.')
-
-            # extract the image and dump out to a flat file
-            image_offset = self.nitf_details.img_segment_offsets[index]
-            image_size = self.nitf_details.nitf_header.ImageSegments.item_sizes[index]
-            our_memmap = MemMap(self.file_object, image_size, image_offset)
-            img = PIL.Image.open(our_memmap)  # this is a lazy operation
-            # dump the extracted image data out to a temp file
-            fi, path_name = mkstemp(suffix='.sarpy_cache', text=False)
-            logging.warning(
-                'Naively trying to use PIL to decompress image segment index {} of {}\n'
-                'to flat file {}.\n '
-                'The created cache file should be safely deleted,\n '
-                'with the possible exception of fatal execution error.\n '
-                'This is likely to not work unless IMODE ({} here) is `P` and\n '
-                'the image is a single block.'.format(self.file_name, index, path_name, img_header.IMODE))
-            data = numpy.asarray(img)  # create our numpy array from the PIL Image
-            if data.shape[:2] != (this_rows, this_cols):
-                raise ValueError(
-                    'Naively decompressed data of shape {}, but expected ({}, {}, {}). '
-                    'This is potentially due to image blocks.'.format(data.shape, this_rows, this_cols, raw_bands))
-            mem_map = numpy.memmap(path_name, dtype=data.dtype, mode='w+', offset=0, shape=data.shape)
-            mem_map[:] = data
-            # clean up this memmap and file overhead
-            del mem_map
-            os.close(fi)
-            self._cached_files.append(path_name)
-
-            return BIPChipper(
-                path_name, raw_dtype, (this_rows, this_cols), raw_bands, output_bands, output_dtype,
-                symmetry=self._symmetry, transform_data=transform_data, data_offset=0,
-                limit_to_raw_bands=limit_to_raw_bands)
-
         # verify that this image segment is viable
         if not self._compliance_check(index):
             raise ValueError(
@@ -1559,10 +1756,11 @@ class NITFReader(BaseReader):
                     output_dtype, output_bands, transform_data, limit_to_raw_bands)
             else:
                 raise ValueError('Unsupported IMODE {}'.format(img_header.IMODE))
-        elif img_header.IC in ['M1', 'M3', 'M4', 'M5', 'M6', 'M7', 'M8']:
-            raise ValueError('Compressed and masked image segments not currently supported.')
-        elif img_header.IC in ['C0', 'C1', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'I1']:
-            return handle_compressed()
+        elif img_header.IC in ['C0', 'C1', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'I1',
+                               'M1', 'M3', 'M4', 'M5', 'M6', 'M7', 'M8']:
+            return self._create_compressed_chipper(
+                index, img_header, data_offset, this_rows, this_cols, raw_dtype, raw_bands,
+                output_dtype, output_bands, transform_data, limit_to_raw_bands)
         else:
             raise ValueError('Got unhandled IC code {}'.format(img_header.IC))
 
@@ -1669,24 +1867,6 @@ class NITFReader(BaseReader):
         # this default behavior should be overridden for SICD/SIDD
         return self._define_chipper(segment[0])
 
-    def __del__(self):
-        """
-        Clean up any cached files.
-
-        Returns
-        -------
-        None
-        """
-
-        if not hasattr(self, '_cached_files'):
-            return
-
-        for fil in self._cached_files:
-            # NB: this should be an absolute path
-            if os.path.exists(fil):
-                os.remove(fil)
-                logging.info('Deleted cached file {}'.format(fil))
-
 
 #####
 # A general nitf writer and associated elements - intended for extension
@@ -1699,7 +1879,7 @@ class ImageDetails(object):
     __slots__ = (
         '_bands', '_dtype', '_transform_data', '_parent_index_range',
         '_subheader', '_subheader_offset', '_item_offset',
-        '_subheader_written', '_pixels_written')
+        '_subheader_written', '_pixels_written', '_lock')
 
     def __init__(self, bands, dtype, transform_data, parent_index_range, subheader):
         """
@@ -1723,6 +1903,7 @@ class ImageDetails(object):
         self._item_offset = None
         self._pixels_written = int_func(0)
         self._subheader_written = False
+        self._lock = threading.Lock()
 
         self._bands = int_func(bands)
         if self._bands <= 0:
@@ -1856,7 +2037,7 @@ class ImageDetails(object):
 
     def count_written(self, index_tuple):
         """
-        Count the overlap that we have written in a given step.
+        Count the overlap that we have written in a given step. This is thread-safe.
 
         Parameters
         ----------
@@ -1869,10 +2050,12 @@ class ImageDetails(object):
         """
 
         new_pixels = (index_tuple[1] - index_tuple[0])*(index_tuple[3] - index_tuple[2])
-        self._pixels_written += new_pixels
-        if self._pixels_written > self.total_pixels:
+        with self._lock:
+            self._pixels_written += new_pixels
+            pixels_written = self._pixels_written
+        if pixels_written > self.total_pixels:
             logging.error('A total of {} pixels have been written for an image that '
-                          'should only have {} pixels.'.format(self._pixels_written, self.total_pixels))
+                          'should only have {} pixels.'.format(pixels_written, self.total_pixels))
 
     def get_overlap(self, index_range):
         """
@@ -1920,12 +2103,13 @@ class ImageDetails(object):
 
     def create_writer(self, file_name):
         """
-        Creates the BIP writer for this image segment.
+        Creates the BIP writer for this image segment. For a file like object,
+        this is an inactive :class:`StreamingBIPWriter`.
 
         Parameters
         ----------
-        file_name : str
-            The parent file name.
+        file_name : str|BinaryIO
+            The parent file name, or the output stream.
 
         Returns
         -------
@@ -1935,6 +2119,10 @@ class ImageDetails(object):
         if self._item_offset is None:
             raise ValueError('The image segment subheader_offset must be defined '
                              'before a writer can be defined.')
+        if not isinstance(file_name, string_types):
+            return StreamingBIPWriter(
+                file_name, (self.rows, self.cols), self._dtype, self._bands,
+                self._transform_data, active=False)
         return BIPWriter(
             file_name, (self.rows, self.cols), self._dtype, self._bands,
             self._transform_data, data_offset=self.item_offset)
@@ -2154,30 +2342,49 @@ class NITFWriter(AbstractWriter):
     __slots__ = (
         '_file_name', '_security_tags', '_nitf_header', '_nitf_header_written',
         '_img_groups', '_shapes', '_img_details', '_writing_chippers', '_des_details',
-        '_closed')
+        '_closed', '_lock', '_max_workers', '_executor', '_stream_position', '_stream_segment')
 
     def __init__(self, file_name, check_existence=True):
         """
 
         Parameters
         ----------
-        file_name : str
+        file_name : str|BinaryIO
+            The output file name, or a writable file like object. For a file like
+            object, the NITF is emitted sequentially (the object need not be
+            seekable), so the image data must be provided in approximately
+            row major order, segment by segment.
         check_existence : bool
             Should we check if the given file already exists, and raises an exception if so?
         """
 
-        if check_existence and os.path.exists(file_name):
+        if check_existence and isinstance(file_name, string_types) and os.path.exists(file_name):
             raise SarpyIOError('Given file {} already exists, and a new NITF file cannot be created here.'.format(file_name))
+        if not isinstance(file_name, string_types) and not callable(getattr(file_name, 'write', None)):
+            raise TypeError('file_name must be a path or a writable file like object, got type {}'.format(type(file_name)))
 
         self._writing_chippers = None
         self._nitf_header_written = False
         self._closed = False
+        self._lock = threading.RLock()
+        self._max_workers = None
+        self._executor = None
+        self._stream_position = 0
+        self._stream_segment = 0
         super(NITFWriter, self).__init__(file_name)
         self._create_security_tags()
         self._create_image_segment_details()
         self._create_data_extension_details()
         self._create_nitf_header()
 
+    @property
+    def is_streaming(self):
+        """
+        bool: Is the output a file like object, written sequentially?
+        """
+
+        return not isinstance(self._file_name, string_types)
+
     @property
     def nitf_header_written(self):  # type: () -> bool
         """
@@ -2226,6 +2433,56 @@ class NITFWriter(AbstractWriter):
 
         return self._des_details
 
+    @property
+    def max_workers(self):
+        """
+        None|int: The number of worker threads for writing the pieces of a chip
+        which overlap different image segments, if parallel writing is enabled.
+        """
+
+        return self._max_workers
+
+    def enable_parallel_write(self, max_workers=None):
+        """
+        Enable writing the pieces of each chip which overlap distinct image segments
+        concurrently, on a thread pool. This is beneficial for large images split
+        into many image segments. Independent of this setting, :func:`write_chip`
+        may be called concurrently from multiple threads, provided that the chips
+        do not overlap.
+
+        Parameters
+        ----------
+        max_workers : None|int
+            The number of worker threads. Defaults to the cpu count.
+
+        Returns
+        -------
+        None
+        """
+
+        if max_workers is None:
+            max_workers = cpu_count()
+        max_workers = int_func(max_workers)
+        if max_workers < 1:
+            raise ValueError('max_workers must be a positive integer, got {}'.format(max_workers))
+        self.disable_parallel_write()
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def disable_parallel_write(self):
+        """
+        Disable concurrent writing of the image segment pieces of each chip.
+
+        Returns
+        -------
+        None
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._max_workers = None
+
     def _set_offsets(self):
         """
         Sets the offsets for the ImageDetail and DESDetail objects.
@@ -2288,6 +2545,10 @@ class NITFWriter(AbstractWriter):
             return
 
         logging.info('Writing NITF header.')
+        if self.is_streaming:
+            self._stream_write(self.nitf_header.to_bytes(), 0)
+            self._nitf_header_written = True
+            return
         with open(self._file_name, mode='r+b') as fi:
             fi.write(self.nitf_header.to_bytes())
             self._nitf_header_written = True
@@ -2316,17 +2577,69 @@ class NITFWriter(AbstractWriter):
         if self._nitf_header_written:
             return
 
-        # set the offsets for the images and data extensions,
-        #   and the file size in the NITF header
-        self._set_offsets()
-        self._write_file_header()
+        with self._lock:
+            if self._writing_chippers is not None:
+                return  # prepared by another thread
 
-        logging.info(
-            'Setting up the image segments in virtual memory. '
-            'This may require a large physical memory allocation, '
-            'and be time consuming.')
-        self._writing_chippers = tuple(
-            details.create_writer(self._file_name) for details in self.image_details)
+            # set the offsets for the images and data extensions,
+            #   and the file size in the NITF header
+            self._set_offsets()
+            self._write_file_header()
+
+            logging.info(
+                'Setting up the image segments in virtual memory. '
+                'This may require a large physical memory allocation, '
+                'and be time consuming.')
+            self._writing_chippers = tuple(
+                details.create_writer(self._file_name) for details in self.image_details)
+            if self.is_streaming:
+                self._advance_stream()
+
+    def _stream_write(self, the_bytes, location):
+        """
+        Write the bytes to the output stream, which must be positioned at
+        `location`.
+
+        Parameters
+        ----------
+        the_bytes : bytes
+        location : int
+
+        Returns
+        -------
+        None
+        """
+
+        if location != self._stream_position:
+            raise ValueError(
+                'Streaming output is at byte {}, and cannot write at byte {}'.format(self._stream_position, location))
+        self._file_name.write(the_bytes)
+        self._stream_position += len(the_bytes)
+
+    def _advance_stream(self):
+        """
+        For streaming output, write the image subheaders and activate the
+        image segment writers in order, as each preceding image segment is completed.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            while self._stream_segment < len(self._writing_chippers):
+                index = self._stream_segment
+                details = self.image_details[index]
+                writer = self._writing_chippers[index]
+                if not details.subheader_written:
+                    logging.info('Writing image segment {} header.'.format(index))
+                    self._stream_write(details.subheader.to_bytes(), details.subheader_offset)
+                    details.subheader_written = True
+                    writer.activate()
+                if not writer.complete:
+                    return
+                self._stream_position = details.end_of_item
+                self._stream_segment += 1
 
     def _write_image_header(self, index):
         """
@@ -2343,20 +2656,23 @@ class NITFWriter(AbstractWriter):
 
         details = self.image_details[index]
 
-        if details.subheader_written:
+        if details.subheader_written or self.is_streaming:
             return
 
         if details.subheader_offset is None:
             raise ValueError('DESDetails.subheader_offset must be defined for index {}.'.format(index))
 
-        logging.info(
-            'Writing image segment {} header. Depending on OS details, this '
-            'may require a large physical memory allocation, '
-            'and be time consuming.'.format(index))
-        with open(self._file_name, mode='r+b') as fi:
-            fi.seek(details.subheader_offset, os.SEEK_SET)
-            fi.write(details.subheader.to_bytes())
-            details.subheader_written = True
+        with self._lock:
+            if details.subheader_written:
+                return  # written by another thread
+            logging.info(
+                'Writing image segment {} header. Depending on OS details, this '
+                'may require a large physical memory allocation, '
+                'and be time consuming.'.format(index))
+            with open(self._file_name, mode='r+b') as fi:
+                fi.seek(details.subheader_offset, os.SEEK_SET)
+                fi.write(details.subheader.to_bytes())
+                details.subheader_written = True
 
     def _write_des_header(self, index):
         """
@@ -2381,6 +2697,10 @@ class NITFWriter(AbstractWriter):
 
         logging.info(
             'Writing data extension {} header.'.format(index))
+        if self.is_streaming:
+            self._stream_write(details.subheader.to_bytes(), details.subheader_offset)
+            details.subheader_written = True
+            return
         with open(self._file_name, mode='r+b') as fi:
             fi.seek(details.subheader_offset, os.SEEK_SET)
             fi.write(details.subheader.to_bytes())
@@ -2410,6 +2730,10 @@ class NITFWriter(AbstractWriter):
 
         logging.info(
             'Writing data extension {}.'.format(index))
+        if self.is_streaming:
+            self._stream_write(details.des_bytes, details.item_offset)
+            details.des_written = True
+            return
         with open(self._file_name, mode='r+b') as fi:
             fi.seek(details.item_offset, os.SEEK_SET)
             fi.write(details.des_bytes)
@@ -2551,7 +2875,8 @@ class NITFWriter(AbstractWriter):
                 'Got start_indices = {} and data of shape {}. '
                 'This is incompatible with total data shape {}.'.format(start_indices, data.shape, shape))
 
-        # iterate over the image segments for this group, and write as appropriate
+        # determine the pieces of the data overlapping each image segment in this group
+        pieces = []
         for img_index in self._img_groups[index]:
             details = self._img_details[img_index]
 
@@ -2560,15 +2885,53 @@ class NITFWriter(AbstractWriter):
                 # there is no overlap here, so skip
                 continue
 
-            self._write_image_header(img_index)  # no effect if already called
             # what are the relevant indices into data?
             data_indices = (overall_inds[0] - start_indices[0], overall_inds[1] - start_indices[0],
                             overall_inds[2] - start_indices[1], overall_inds[3] - start_indices[1])
-            # write the data
-            self._writing_chippers[img_index](data[data_indices[0]:data_indices[1], data_indices[2]: data_indices[3]],
-                                              (this_inds[0], this_inds[2]))
-            # count the written pixels
-            details.count_written(this_inds)
+            pieces.append((img_index, this_inds, data_indices))
+
+        if self.is_streaming:
+            # the stream must be written in order, so serialize
+            with self._lock:
+                for piece in pieces:
+                    self._write_segment_piece(data, *piece)
+                self._advance_stream()
+            return
+
+        executor = self._executor
+        if executor is not None and len(pieces) > 1:
+            futures = [executor.submit(self._write_segment_piece, data, *piece) for piece in pieces]
+            for future in futures:
+                future.result()
+        else:
+            for piece in pieces:
+                self._write_segment_piece(data, *piece)
+
+    def _write_segment_piece(self, data, img_index, this_inds, data_indices):
+        """
+        Write the given piece of data into the image segment.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+        img_index : int
+            The image segment index.
+        this_inds : Tuple[int, int, int, int]
+            The indices into the image segment.
+        data_indices : Tuple[int, int, int, int]
+            The indices into `data`.
+
+        Returns
+        -------
+        None
+        """
+
+        self._write_image_header(img_index)  # no effect if already called
+        # write the data
+        self._writing_chippers[img_index](data[data_indices[0]:data_indices[1], data_indices[2]: data_indices[3]],
+                                          (this_inds[0], this_inds[2]))
+        # count the written pixels
+        self._img_details[img_index].count_written(this_inds)
 
     def close(self):
         """
@@ -2584,6 +2947,7 @@ class NITFWriter(AbstractWriter):
 
         # set this status first, in the event of some kind of error
         self._closed = True
+        self.disable_parallel_write()
         # ensure that all images are fully written
         msg = None
         if self.image_details is not None:
@@ -2594,7 +2958,7 @@ class NITFWriter(AbstractWriter):
                     msg = msg_part if msg is None else msg + '\n' + msg_part
                     logging.critical(msg_part)
         # ensure that all data extensions are fully written
-        if self.des_details is not None:
+        if self.des_details is not None and not (self.is_streaming and msg is not None):
             for i, des_detail in enumerate(self.des_details):
                 if not des_detail.des_written:
                     self._write_des_bytes(i)
@@ -2724,64 +3088,3 @@ class NITFWriter(AbstractWriter):
             FDT=self._get_fdt(), FTITLE=self._get_ftitle(), FL=0,
             ImageSegments=self._get_nitf_image_segments(),
             DataExtensions=self._get_nitf_data_extensions())
-
-
-#######
-# Flexible memmap object for opening compressed NITF image segment
-
-class MemMap(object):
-    """
-    Spoofing necessary memory map functionality to permit READ ONLY opening of a
-    compressed NITF image segment using the PIL interface. This is just a thin
-    wrapper around the built-in memmap class which accommodates arbitrary offset.
-
-    Note that the bare minimum of functionality is implemented to permit the
-    intended use.
-    """
-
-    __slots__ = ('_mem_map', '_file_obj', '_offset_shift')
-
-    def __init__(self, file_name, length, offset):
-        """
-
-        Parameters
-        ----------
-        file_name : str
-        length : int
-        offset : int
-        """
-
-        # length and offset validation
-        length = int_func(length)
-        offset = int_func(offset)
-        if length < 0 or offset < 0:
-            raise ValueError(
-                'length ({}) and offset ({}) must be non-negative integers'.format(length, offset))
-        # determine offset and length accommodating allocation block size limitation
-        self._offset_shift = (offset % mmap.ALLOCATIONGRANULARITY)
-        offset = offset - self._offset_shift
-        length = length + self._offset_shift
-        # establish the mem map
-        self._file_obj = open(file_name, 'rb')
-        self._mem_map = mmap.mmap(self._file_obj.fileno(), length, access=mmap.ACCESS_READ, offset=offset)
-
-    def read(self, n):
-        return self._mem_map.read(n)
-
-    def tell(self):
-        return self._mem_map.tell() - self._offset_shift
-
-    def seek(self, pos, whence=0):
-        whence = int_func(whence)
-        pos = int_func(pos)
-        if whence == 0:
-            self._mem_map.seek(pos+self._offset_shift, 0)
-        else:
-            self._mem_map.seek(pos, whence)
-
-    @property
-    def closed(self):
-        return self._file_obj.closed
-
-    def close(self):
-        self._file_obj.close()
@@ -13,13 +13,34 @@ __author__ = ("Thomas McCullough", "Daniel Haverporth")
 
 import logging
 import os
+import struct
+import zlib
+from io import BytesIO
 
 import numpy
 import re
 from typing import Tuple
 
 from sarpy.compliance import int_func, string_types
-from sarpy.io.general.base import BaseReader, BIPChipper, SarpyIOError
+from sarpy.io.general.base import BaseReader, BIPChipper, BlockDecodingChipper, SarpyIOError
+
+try:
+    # noinspection PyPackageRequirements
+    import imagecodecs
+except ImportError:
+    imagecodecs = None
+
+try:
+    # noinspection PyPackageRequirements
+    import PIL
+    # noinspection PyPackageRequirements
+    import PIL.Image
+    # noinspection PyPackageRequirements
+    from PIL import features as _pil_features
+    if not _pil_features.check('libtiff'):
+        PIL = None
+except ImportError:
+    PIL = None
 
 
 _BASELINE_TAGS = {
@@ -131,6 +152,231 @@ _GEOTIFF_TAGS = {
     34737: 'GeoAsciiParamsTag',
 }
 
+
+
+##########
+# tiff decompression
+
+def decode_packbits(data):
+    """
+    Decode PackBits (tiff compression 32773) compressed data.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    bytes
+    """
+
+    data = bytearray(data)
+    out = bytearray()
+    i = 0
+    length = len(data)
+    while i < length:
+        header = data[i]
+        i += 1
+        if header < 128:
+            # copy the next header+1 bytes literally
+            out += data[i:i+header+1]
+            i += header + 1
+        elif header > 128:
+            # repeat the next byte 257-header times
+            out += data[i:i+1]*(257 - header)
+            i += 1
+        # header == 128 is a no-op
+    return bytes(out)
+
+
+def _decode_lzw_python(data):
+    """
+    Decode tiff style LZW compressed data in pure Python.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    bytes
+    """
+
+    data = bytearray(data) + bytearray(3)  # padding permits reading three bytes at a time
+    total_bits = 8*(len(data) - 3)
+    initial_table = [bytes(bytearray([i])) for i in range(256)] + [b'', b'']
+    table = list(initial_table)
+    out = bytearray()
+    width = 9
+    bit_position = 0
+    previous = None
+    while bit_position + width <= total_bits:
+        byte_position = bit_position >> 3
+        value = (data[byte_position] << 16) | (data[byte_position+1] << 8) | data[byte_position+2]
+        code = (value >> (24 - (bit_position & 7) - width)) & ((1 << width) - 1)
+        bit_position += width
+
+        if code == 256:  # clear code
+            table = list(initial_table)
+            width = 9
+            previous = None
+            continue
+        elif code == 257:  # end of information code
+            break
+
+        if previous is None:
+            entry = table[code]
+        elif code < len(table):
+            entry = table[code]
+            table.append(previous + entry[:1])
+        elif code == len(table):
+            entry = previous + previous[:1]
+            table.append(entry)
+        else:
+            raise ValueError('Invalid LZW code {}, with table of size {}'.format(code, len(table)))
+        out += entry
+        previous = entry
+        if len(table) >= (1 << width) - 1 and width < 12:
+            width += 1
+    return bytes(out)
+
+
+def _decode_lzw_pil(data, expected_size):
+    """
+    Decode tiff style LZW compressed data using the libtiff support of PIL, by
+    presenting the data as the single strip of a one row, eight bit tiff image.
+
+    Parameters
+    ----------
+    data : bytes
+    expected_size : int
+
+    Returns
+    -------
+    bytes
+    """
+
+    # the ifd follows the eight byte header, and the data follows the ifd
+    data_offset = 8 + 2 + 12*9 + 4
+    entries = [
+        (256, 4, expected_size),  # ImageWidth
+        (257, 4, 1),  # ImageLength
+        (258, 3, 8),  # BitsPerSample
+        (259, 3, 5),  # Compression
+        (262, 3, 1),  # PhotometricInterpretation
+        (273, 4, data_offset),  # StripOffsets
+        (277, 3, 1),  # SamplesPerPixel
+        (278, 4, 1),  # RowsPerStrip
+        (279, 4, len(data))]  # StripByteCounts
+    header = struct.pack('<2sHIH', b'II', 42, 8, len(entries))
+    for tag, field_type, value in entries:
+        header += struct.pack('<HHI' + ('H2x' if field_type == 3 else 'I'), tag, field_type, 1, value)
+    header += struct.pack('<I', 0)
+    return PIL.Image.open(BytesIO(header + data)).tobytes()
+
+
+def decode_lzw(data, expected_size=None):
+    """
+    Decode tiff style LZW (tiff compression 5) compressed data. This is the
+    most significant bit first variant, with the code width incremented one
+    code early, as specified by the tiff 6.0 standard.
+
+    This uses imagecodecs, if installed, or otherwise the libtiff support of PIL,
+    if available and the expected size is provided. The (much slower) pure
+    Python implementation is used otherwise, or if either of these fails.
+
+    Parameters
+    ----------
+    data : bytes
+    expected_size : None|int
+        The expected size of the decoded data, in bytes.
+
+    Returns
+    -------
+    bytes
+    """
+
+    if imagecodecs is not None:
+        try:
+            return bytes(imagecodecs.lzw_decode(data))
+        except (RuntimeError, ValueError) as e:
+            logging.warning('imagecodecs failed decoding LZW data with error {}'.format(e))
+    elif PIL is not None and expected_size is not None and \
+            0 < expected_size <= (PIL.Image.MAX_IMAGE_PIXELS or expected_size):
+        try:
+            return _decode_lzw_pil(data, expected_size)
+        except (OSError, ValueError) as e:
+            logging.warning('PIL failed decoding LZW data with error {}'.format(e))
+    return _decode_lzw_python(data)
+
+
+# NB: each decoding function has signature (data, expected_size)
+
+def _decode_deflate(data, expected_size):
+    return zlib.decompress(data)
+
+
+def _decode_none(data, expected_size):
+    return data
+
+
+def _decode_packbits(data, expected_size):
+    return decode_packbits(data)
+
+
+# tiff compression tag value to decoding function
+_DECODERS = {
+    1: _decode_none,
+    5: decode_lzw,
+    8: _decode_deflate,
+    32946: _decode_deflate,
+    32773: _decode_packbits}
+
+
+def _undo_horizontal_predictor(data):
+    """
+    Undo the horizontal differencing predictor (tiff predictor 2), in place.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Integer array of shape `(rows, cols, samples)`.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    # integer overflow wraps, as intended
+    return numpy.cumsum(data, axis=1, dtype=data.dtype, out=data)
+
+
+def _undo_floating_point_predictor(data, rows, cols, samples, dtype):
+    """
+    Undo the floating point predictor (tiff predictor 3).
+
+    Parameters
+    ----------
+    data : bytes
+    rows : int
+    cols : int
+    samples : int
+    dtype : numpy.dtype
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    item_size = dtype.itemsize
+    the_bytes = numpy.frombuffer(data, dtype='u1', count=rows*cols*samples*item_size)
+    the_bytes = numpy.cumsum(numpy.reshape(the_bytes, (rows, -1)), axis=1, dtype='u1')
+    # bytes are stored by significance, most significant first, for each row
+    the_bytes = numpy.reshape(the_bytes, (rows, item_size, cols*samples)).transpose((0, 2, 1))
+    values = numpy.ascontiguousarray(the_bytes).view('>{}{}'.format(dtype.kind, item_size))
+    return numpy.reshape(values, (rows, cols, samples)).astype(dtype)
+
+
 ########
 # base expected functionality for a module with an implemented Reader
 
@@ -370,50 +616,166 @@ class TiffDetails(object):
                 fi.seek(offset)  # get to the offset location
                 value = self._read_tag(fi, tiff_type, num_tag, count)  # read the tag value
                 fi.seek(save_ptr)  # return to our location
-            tags[value['Name']] = value['Value']
+            if value['Name'] not in tags:
+                # the first image file directory is the full resolution image, and
+                #   any subsequent directories (i.e. overviews) can not override it
+                tags[value['Name']] = value['Value']
         self._parse_ifd(fi, tags, type_dtype, count_dtype, offset_dtype, offset_size)  # recurse
 
+    @property
+    def is_tiled(self):
+        """
+        bool: Is the image data organized in tiles, instead of strips?
+        """
+
+        return 'TileWidth' in self.tags or 'TileLength' in self.tags
+
+    @property
+    def is_compressed(self):
+        """
+        bool: Is the image data compressed?
+        """
+
+        return int_func(self.tags.get('Compression', 1)) != 1
+
+    @property
+    def is_contiguous(self):
+        """
+        bool: Is the image data stored as a single uncompressed contiguous block,
+        which can be directly memory mapped?
+        """
+
+        if self.is_tiled or self.is_compressed or 'StripOffsets' not in self.tags:
+            return False
+        offsets = numpy.atleast_1d(self.tags['StripOffsets']).astype('int64')
+        counts = numpy.atleast_1d(self.tags.get('StripByteCounts', 0)).astype('int64')
+        if offsets.size < 2:
+            return True
+        return offsets.size == counts.size and numpy.all(offsets[1:] == offsets[:-1] + counts[:-1])
+
     def check_compression(self):
         """
-        Check the Compression tag, and verify uncompressed.
+        Check the Compression and Predictor tags, and verify that the compression
+        scheme is supported. Uncompressed, LZW, DEFLATE, and PackBits compression
+        are supported.
 
         Returns
         -------
         None
         """
 
-        if self.tags['Compression'] != 1:
+        compression = int_func(self.tags.get('Compression', 1))
+        if compression not in _DECODERS:
             raise ValueError(
-                'The file {} indicates some kind of tiff compression, and the sarpy API requirements '
-                'do not presently support reading of compressed tiff files. Consider using gdal to '
-                'translate this tiff to an uncompressed file via the commmand\n\t'
-                '"gdal_translate -co TILED=no <input_file> <output_file>"')
+                'The file {} indicates tiff compression type {}, which is not supported by '
+                'the sarpy tiff reader. Consider using gdal to translate this tiff to an '
+                'uncompressed file via the commmand\n\t'
+                '"gdal_translate -co TILED=no <input_file> <output_file>"'.format(self.file_name, compression))
+        predictor = int_func(self.tags.get('Predictor', 1))
+        if predictor not in [1, 2, 3]:
+            raise ValueError(
+                'The file {} indicates tiff predictor {}, which is not supported by the '
+                'sarpy tiff reader.'.format(self.file_name, predictor))
 
     def check_tiled(self):
         """
-        Check if the tiff file is tiled.
+        Check that the tile (or strip) organization tags are present and consistent.
 
         Returns
         -------
         None
         """
 
-        if 'TileLength' in self.tags or 'TileWidth' in self.tags:
+        if self.is_tiled:
+            offset_name, count_name = 'TileOffsets', 'TileByteCounts'
+            if 'TileWidth' not in self.tags or 'TileLength' not in self.tags:
+                raise ValueError(
+                    'The file {} is tiled, but does not provide both the TileWidth '
+                    'and TileLength tags'.format(self.file_name))
+            rows, cols = int_func(self.tags['TileLength']), int_func(self.tags['TileWidth'])
+            expected = int_func(numpy.ceil(float(self.tags['ImageLength'])/rows)) * \
+                int_func(numpy.ceil(float(self.tags['ImageWidth'])/cols))
+        else:
+            offset_name, count_name = 'StripOffsets', 'StripByteCounts'
+            rows = int_func(self.tags.get('RowsPerStrip', self.tags['ImageLength']))
+            expected = int_func(numpy.ceil(float(self.tags['ImageLength'])/min(rows, self.tags['ImageLength'])))
+
+        if offset_name not in self.tags:
+            raise ValueError('The file {} does not provide the {} tag'.format(self.file_name, offset_name))
+        offset_count = numpy.atleast_1d(self.tags[offset_name]).size
+        if int_func(self.tags.get('PlanarConfiguration', 1)) == 2:
+            expected *= int_func(self.tags['SamplesPerPixel'])
+        if offset_count != expected:
             raise ValueError(
-                'The file {} indicates that this is a tiled file, and the sarpy API requirements '
-                'do not presently support reading of tiled tiff files. Consider using gdal to '
-                'translate this tiff to a flat file via the commmand\n\t'
-                '"gdal_translate -co TILED=no <input_file> <output_file>"')
+                'The file {} provides {} entries in the {} tag, but {} are '
+                'expected'.format(self.file_name, offset_count, offset_name, expected))
+        if (self.is_compressed or self.is_tiled) and \
+                (count_name not in self.tags or numpy.atleast_1d(self.tags[count_name]).size != expected):
+            raise ValueError(
+                'The file {} does not provide a valid {} tag'.format(self.file_name, count_name))
+
+
+def _get_tiff_data_parameters(tiff_details):
+    """
+    Determine the raw and output data parameters from the tiff tags.
+
+    Parameters
+    ----------
+    tiff_details : TiffDetails
+
+    Returns
+    -------
+    raw_dtype : numpy.dtype
+    raw_bands : int
+    output_bands : int
+    output_dtype : numpy.dtype|str
+    transform_data : None|str
+    """
+
+    samp_form = numpy.atleast_1d(tiff_details.tags.get('SampleFormat', 1))[0]
+    if samp_form not in _SAMPLE_FORMATS:
+        raise ValueError('Invalid sample format {}'.format(samp_form))
+    bits_per_sample = numpy.atleast_1d(tiff_details.tags['BitsPerSample'])[0]
+
+    raw_bands = int(tiff_details.tags.get('SamplesPerPixel', 1))
+
+    if samp_form in [5, 6]:
+        transform_data = 'COMPLEX'
+        output_bands = int(raw_bands)
+        raw_bands *= 2
+        bits_per_sample /= 2
+        output_dtype = 'complex64'
+    elif raw_bands == 2:
+        # NB: this is heavily skewed towards SAR and obviously not general
+        transform_data = 'COMPLEX'
+        output_dtype = 'complex64'
+        output_bands = 1
+    else:
+        transform_data = None
+        output_bands = raw_bands
+        output_dtype = None
+
+    raw_dtype = numpy.dtype('{0:s}{1:s}{2:d}'.format(
+        tiff_details.endian, _SAMPLE_FORMATS[samp_form], int(bits_per_sample/8)))
+    if output_dtype is None:
+        output_dtype = raw_dtype
+    return raw_dtype, raw_bands, output_bands, output_dtype, transform_data
+
+
+# tiff SampleFormat tag value to numpy dtype kind
+_SAMPLE_FORMATS = {
+    1: 'u', 2: 'i', 3: 'f', 5: 'i', 6: 'f'}  # 5 and 6 are complex int/float
 
 
 class NativeTiffChipper(BIPChipper):
     """
-    Direct reading of data from tiff file, failing if compression is present
+    Direct reading of data from tiff file, failing if compression is present,
+    or the data is not stored contiguously. See :class:`TiledTiffChipper`
+    for the general case.
     """
 
     __slots__ = ('_tiff_details', )
-    _SAMPLE_FORMATS = {
-        1: 'u', 2: 'i', 3: 'f', 5: 'i', 6: 'f'}  # 5 and 6 are complex int/float
+    _SAMPLE_FORMATS = _SAMPLE_FORMATS
 
     def __init__(self, tiff_details, symmetry=(False, False, True)):
         """
@@ -430,50 +792,162 @@ class NativeTiffChipper(BIPChipper):
             raise TypeError('NativeTiffChipper input argument must be a filename '
                             'or TiffDetails object.')
 
+        if tiff_details.is_compressed:
+            raise ValueError(
+                'The file {} is compressed, so use TiledTiffChipper'.format(tiff_details.file_name))
+        if tiff_details.is_tiled:
+            raise ValueError(
+                'The file {} is tiled, so use TiledTiffChipper'.format(tiff_details.file_name))
+        if not tiff_details.is_contiguous:
+            raise ValueError(
+                'The file {} does not store the strips contiguously, '
+                'so use TiledTiffChipper'.format(tiff_details.file_name))
+
+        self._tiff_details = tiff_details
+        raw_dtype, raw_bands, output_bands, output_dtype, transform_data = \
+            _get_tiff_data_parameters(tiff_details)
+        data_size = (int_func(tiff_details.tags['ImageLength']), int_func(tiff_details.tags['ImageWidth']))
+        data_offset = int_func(numpy.atleast_1d(tiff_details.tags['StripOffsets'])[0])
+
+        super(NativeTiffChipper, self).__init__(
+            tiff_details.file_name, raw_dtype, data_size, raw_bands, output_bands, output_dtype,
+            symmetry=symmetry, transform_data=transform_data, data_offset=data_offset)
+
+
+class TiledTiffChipper(BlockDecodingChipper):
+    """
+    Reading of data from a tiled or stripped tiff file, which may be compressed
+    using LZW, DEFLATE, or PackBits. Strips are treated as tiles spanning the
+    full image width. Only the tiles which intersect a requested window are
+    read and decoded, and the decoded tiles are maintained in a least recently
+    used cache, so repeated or overlapping reads avoid decoding again.
+
+    The decoding of multiple tiles for a given read may optionally be performed
+    on a thread pool. Note that zlib (i.e. DEFLATE) decompression releases the
+    GIL, as does LZW decoding using imagecodecs or PIL (when available), while
+    PackBits decoding is implemented in pure Python.
+    """
+
+    __slots__ = ('_tiff_details', '_offsets', '_byte_counts', '_decoder', '_predictor')
+
+    def __init__(self, tiff_details, symmetry=(False, False, True), max_bytes=67108864, max_workers=1):
+        """
+
+        Parameters
+        ----------
+        tiff_details : str|TiffDetails
+        symmetry : Tuple[bool]
+        max_bytes : int
+            The maximum size, in bytes, of the decoded tile cache.
+        max_workers : None|int
+            The number of threads used for decoding tiles. `None` uses the cpu count,
+            and `1` decodes serially.
+        """
+
+        if isinstance(tiff_details, str):
+            tiff_details = TiffDetails(tiff_details)
+        if not isinstance(tiff_details, TiffDetails):
+            raise TypeError('TiledTiffChipper input argument must be a filename '
+                            'or TiffDetails object.')
         tiff_details.check_compression()
         tiff_details.check_tiled()
+        if int_func(tiff_details.tags.get('PlanarConfiguration', 1)) != 1:
+            raise ValueError(
+                'The file {} uses planar configuration {}, and only chunky (band interleaved) '
+                'configuration is supported'.format(tiff_details.file_name, tiff_details.tags['PlanarConfiguration']))
 
         self._tiff_details = tiff_details
-        if isinstance(tiff_details.tags['SampleFormat'], numpy.ndarray):
-            samp_form = tiff_details.tags['SampleFormat'][0]
-        else:
-            samp_form = tiff_details.tags['SampleFormat']
-        if samp_form not in self._SAMPLE_FORMATS:
-            raise ValueError('Invalid sample format {}'.format(samp_form))
-        if isinstance(tiff_details.tags['BitsPerSample'], numpy.ndarray):
-            bits_per_sample = tiff_details.tags['BitsPerSample'][0]
-        else:
-            bits_per_sample = tiff_details.tags['BitsPerSample']
-
-        raw_bands = int(tiff_details.tags['SamplesPerPixel'])
-
-        if samp_form in [5, 6]:
-            transform_data = 'COMPLEX'
-            output_bands = int(raw_bands)
-            raw_bands *= 2
-            bits_per_sample /= 2
-            output_dtype = 'complex64'
-        elif raw_bands == 2:
-            # NB: this is heavily skewed towards SAR and obviously not general
-            transform_data = 'COMPLEX'
-            output_dtype = 'complex64'
-            output_bands = 1
+        raw_dtype, raw_bands, output_bands, output_dtype, transform_data = \
+            _get_tiff_data_parameters(tiff_details)
+        data_size = (int_func(tiff_details.tags['ImageLength']), int_func(tiff_details.tags['ImageWidth']))
+        if tiff_details.is_tiled:
+            tile_shape = (int_func(tiff_details.tags['TileLength']), int_func(tiff_details.tags['TileWidth']))
+            self._offsets = numpy.atleast_1d(tiff_details.tags['TileOffsets']).astype('int64')
+            self._byte_counts = numpy.atleast_1d(tiff_details.tags['TileByteCounts']).astype('int64')
         else:
-            transform_data = None
-            output_bands = raw_bands
-            output_dtype = None
+            rows_per_strip = min(int_func(tiff_details.tags.get('RowsPerStrip', data_size[0])), data_size[0])
+            tile_shape = (rows_per_strip, data_size[1])
+            self._offsets = numpy.atleast_1d(tiff_details.tags['StripOffsets']).astype('int64')
+            if 'StripByteCounts' in tiff_details.tags:
+                self._byte_counts = numpy.atleast_1d(tiff_details.tags['StripByteCounts']).astype('int64')
+            else:
+                self._byte_counts = numpy.full(
+                    self._offsets.shape, rows_per_strip*data_size[1]*raw_bands*raw_dtype.itemsize, dtype='int64')
+        self._decoder = _DECODERS[int_func(tiff_details.tags.get('Compression', 1))]
+        self._predictor = int_func(tiff_details.tags.get('Predictor', 1))
+        super(TiledTiffChipper, self).__init__(
+            data_size, tile_shape, raw_dtype, raw_bands, symmetry=symmetry, transform_data=transform_data,
+            max_bytes=max_bytes, max_workers=max_workers)
 
-        data_size = (int_func(tiff_details.tags['ImageLength']), int_func(tiff_details.tags['ImageWidth']))
-        raw_dtype = numpy.dtype('{0:s}{1:s}{2:d}'.format(
-            self._tiff_details.endian, self._SAMPLE_FORMATS[samp_form], int(bits_per_sample/8)))
+    @property
+    def tile_shape(self):
+        """
+        Tuple[int, int]: The shape of each tile (or strip), in the raw file coordinates.
+        """
 
-        if output_dtype is None:
-            output_dtype = raw_dtype
-        data_offset = int_func(tiff_details.tags['StripOffsets'][0])
+        return self._block_shape
+
+    def _get_tile_rows(self, tile_index):
+        # strips are not padded, so the final strip may be short
+        if self._tiff_details.is_tiled:
+            return self._block_shape[0]
+        tile_row = tile_index//self._blocks_across
+        return min(self._block_shape[0], self._data_size[0] - tile_row*self._block_shape[0])
+
+    def _read_block_bytes(self, block_indices):
+        # read in file order
+        out = [None for _ in block_indices]
+        order = sorted(range(len(block_indices)), key=lambda entry: self._offsets[block_indices[entry]])
+        with open(self._tiff_details.file_name, 'rb') as fi:
+            for i in order:
+                fi.seek(int_func(self._offsets[block_indices[i]]))
+                out[i] = fi.read(int_func(self._byte_counts[block_indices[i]]))
+        return out
+
+    def _decode_block(self, block_index, data):
+        rows, cols = self._get_tile_rows(block_index), self._block_shape[1]
+        expected_bytes = rows*cols*self._raw_bands*self._raw_dtype.itemsize
+        data = self._decoder(data, expected_bytes)
+        if len(data) < expected_bytes:
+            logging.warning(
+                'Tile {} of file {} decoded to {} bytes, but {} bytes were expected. '
+                'Padding with zeros.'.format(block_index, self._tiff_details.file_name, len(data), expected_bytes))
+            data = data + b'\x00'*(expected_bytes - len(data))
+
+        if self._predictor == 3:
+            return _undo_floating_point_predictor(data, rows, cols, self._raw_bands, self._raw_dtype)
+        tile = numpy.frombuffer(data, dtype=self._raw_dtype, count=rows*cols*self._raw_bands)
+        tile = numpy.reshape(tile, (rows, cols, self._raw_bands))
+        if self._predictor == 2:
+            tile = _undo_horizontal_predictor(numpy.array(tile))
+        return tile
+
+
+def create_tiff_chipper(tiff_details, symmetry=(False, False, True), max_bytes=67108864, max_workers=1):
+    """
+    Create the appropriate chipper for the given tiff file. A memory mapped
+    :class:`NativeTiffChipper` is used for uncompressed data stored contiguously,
+    and a :class:`TiledTiffChipper` is used otherwise.
 
-        super(NativeTiffChipper, self).__init__(
-            tiff_details.file_name, raw_dtype, data_size, raw_bands, output_bands, output_dtype,
-            symmetry=symmetry, transform_data=transform_data, data_offset=data_offset)
+    Parameters
+    ----------
+    tiff_details : str|TiffDetails
+    symmetry : Tuple[bool]
+    max_bytes : int
+        The maximum size, in bytes, of the decoded tile cache, if applicable.
+    max_workers : None|int
+        The number of threads used for decoding tiles, if applicable.
+
+    Returns
+    -------
+    NativeTiffChipper|TiledTiffChipper
+    """
+
+    if isinstance(tiff_details, str):
+        tiff_details = TiffDetails(tiff_details)
+    if tiff_details.is_contiguous:
+        return NativeTiffChipper(tiff_details, symmetry=symmetry)
+    return TiledTiffChipper(tiff_details, symmetry=symmetry, max_bytes=max_bytes, max_workers=max_workers)
 
 
 class TiffReader(BaseReader):
@@ -499,7 +973,7 @@ class TiffReader(BaseReader):
         if symmetry is None:
             symmetry = self._DEFAULT_SYMMETRY
 
-        chipper = NativeTiffChipper(tiff_details, symmetry=symmetry)
+        chipper = create_tiff_chipper(tiff_details, symmetry=symmetry)
         super(TiffReader, self).__init__(chipper, reader_type="OTHER")
 
     @property
@@ -4,6 +4,8 @@ Module for reading and writing CPHD files - should support reading CPHD version
 
 import logging
 import os
+import threading
+from tempfile import mkstemp
 from typing import Union, Tuple, Dict, BinaryIO
 from collections import OrderedDict
 
@@ -11,9 +13,14 @@ import numpy
 
 from sarpy.compliance import int_func, integer_types, string_types
 from sarpy.io.general.utils import parse_xml_from_string, validate_range, is_file_like
-from sarpy.io.general.base import AbstractWriter, BaseReader, BIPChipper, SarpyIOError
+from sarpy.io.general.base import AbstractWriter, BaseReader, BlockDecodingChipper, SarpyIOError, \
+    get_file_lock
+from sarpy.io.general.file_buffer import FileBuffer, BufferChipper
 
 from sarpy.io.phase_history.cphd1_elements.utils import binary_format_string_to_dtype
+from sarpy.io.phase_history.signal_compression import get_signal_codec, read_container_header, \
+    make_container_header, get_container_header_size
+from sarpy.io.phase_history.pvp_index import PVPIndex
 # noinspection PyProtectedMember
 from sarpy.io.phase_history.cphd1_elements.CPHD import CPHDType, CPHDHeader, _CPHD_SECTION_TERMINATOR
 from sarpy.io.phase_history.cphd0_3_elements.CPHD import CPHDType as CPHDType0_3, CPHDHeader as CPHDHeader0_3
@@ -56,7 +63,7 @@ class CPHDDetails(object):
     """
 
     __slots__ = (
-        '_file_name', '_file_object', '_close_after', '_cphd_version', '_cphd_header', '_cphd_meta')
+        '_file_name', '_file_object', '_close_after', '_buffer', '_cphd_version', '_cphd_header', '_cphd_meta')
 
     def __init__(self, file_object):
         """
@@ -71,6 +78,7 @@ class CPHDDetails(object):
         self._cphd_header = None
         self._cphd_meta = None
         self._close_after = False
+        self._buffer = None
 
         if isinstance(file_object, string_types):
             if not os.path.exists(file_object) or not os.path.isfile(file_object):
@@ -116,6 +124,17 @@ class CPHDDetails(object):
 
         return self._file_object
 
+    @property
+    def buffer(self):
+        """
+        FileBuffer: The buffer for random access to the file contents, which is
+        shared by the signal, PVP, and support array access.
+        """
+
+        if self._buffer is None:
+            self._buffer = FileBuffer(self._file_object)
+        return self._buffer
+
     @property
     def cphd_version(self):
         # type: () -> str
@@ -233,7 +252,7 @@ def _validate_cphd_details(cphd_details, version=None):
 
     Parameters
     ----------
-    cphd_details : str|CPHDDetails
+    cphd_details : str|BinaryIO|CPHDDetails
     version : None|str
 
     Returns
@@ -241,12 +260,12 @@ def _validate_cphd_details(cphd_details, version=None):
     CPHDDetails
     """
 
-    if isinstance(cphd_details, string_types):
+    if isinstance(cphd_details, string_types) or is_file_like(cphd_details):
         cphd_details = CPHDDetails(cphd_details)
 
     if not isinstance(cphd_details, CPHDDetails):
-        raise TypeError('cphd_details is required to be a file path to a CPHD file '
-                        'or CPHDDetails, got type {}'.format(cphd_details))
+        raise TypeError('cphd_details is required to be a file path to a CPHD file, '
+                        'a file like object, or CPHDDetails, got type {}'.format(cphd_details))
 
     if version is not None:
         if not cphd_details.cphd_version.startswith(version):
@@ -255,6 +274,74 @@ def _validate_cphd_details(cphd_details, version=None):
     return cphd_details
 
 
+class CompressedSignalChipper(BlockDecodingChipper):
+    """
+    Reading of a compressed CPHD signal array, one block of vectors at a time.
+    Only the blocks intersecting a requested range of vectors are read and
+    decompressed, possibly concurrently, and the decompressed blocks are
+    maintained in a least recently used cache. See
+    :mod:`sarpy.io.phase_history.signal_compression`.
+    """
+
+    __slots__ = ('_file_object', '_lock', '_codec', '_signal_dtype', '_block_locations')
+
+    def __init__(self, file_object, data_offset, data_size, codec, signal_dtype,
+                 max_bytes=67108864, max_workers=None):
+        """
+
+        Parameters
+        ----------
+        file_object : BinaryIO
+        data_offset : int
+            The offset of the compressed signal array in the file.
+        data_size : Tuple[int, int]
+            The `(NumVectors, NumSamples)` of the signal array.
+        codec : sarpy.io.phase_history.signal_compression.SignalCodec
+        signal_dtype : numpy.dtype
+            The (uncompressed) signal array dtype.
+        max_bytes : int
+            The maximum size, in bytes, of the decompressed block cache.
+        max_workers : None|int
+            The number of threads used for decompressing blocks. `None` uses
+            the cpu count.
+        """
+
+        self._file_object = file_object
+        # NB: the handle is shared with the other channels, so share its lock
+        self._lock = get_file_lock(file_object)
+        self._codec = codec
+        self._signal_dtype = numpy.dtype(signal_dtype)
+        with self._lock:
+            block_vectors, self._block_locations = read_container_header(file_object, data_offset)
+        expected_blocks = int_func(numpy.ceil(float(data_size[0])/block_vectors))
+        if len(self._block_locations) != expected_blocks:
+            raise ValueError(
+                'The compressed signal array has {} blocks of {} vectors, and {} vectors '
+                'are expected'.format(len(self._block_locations), block_vectors, data_size[0]))
+        if self._signal_dtype.fields is not None:
+            raw_dtype = self._signal_dtype.fields['real'][0]
+        else:
+            raw_dtype = numpy.dtype('>f{}'.format(self._signal_dtype.itemsize//2))
+        super(CompressedSignalChipper, self).__init__(
+            data_size, (block_vectors, data_size[1]), raw_dtype, 2, symmetry=(False, False, False),
+            transform_data='COMPLEX', max_bytes=max_bytes, max_workers=max_workers)
+
+    def _read_block_bytes(self, block_indices):
+        out = [None for _ in block_indices]
+        with self._lock:
+            for i in sorted(range(len(block_indices)), key=lambda j: block_indices[j]):
+                location, size = self._block_locations[block_indices[i]]
+                self._file_object.seek(location, os.SEEK_SET)
+                out[i] = self._file_object.read(size)
+        return out
+
+    def _decode_block(self, block_index, data):
+        start = block_index*self._block_shape[0]
+        vectors = min(self._block_shape[0], self._data_size[0] - start)
+        block = self._codec.decode(data, (vectors, self._block_shape[1]), self._signal_dtype)
+        return numpy.reshape(block.view(self._raw_dtype), (vectors, self._block_shape[1], 2))
+
+
 class CPHDReader(BaseReader):
     """
     The Abstract CPHD reader instance, which just selects the proper CPHD reader
@@ -264,14 +351,13 @@ class CPHDReader(BaseReader):
     """
 
     _cphd_details = None
+    _pvp_indices = None
 
     def __new__(cls, *args, **kwargs):
         if len(args) == 0:
             raise ValueError(
-                'The first argument of the constructor is required to be a file_path '
-                'or CPHDDetails instance.')
-        if is_file_like(args[0]):
-            raise ValueError('File like object input not supported for CPHD reading at this time.')
+                'The first argument of the constructor is required to be a file_path, '
+                'file like object, or CPHDDetails instance.')
         cphd_details = _validate_cphd_details(args[0])
 
         if cphd_details.cphd_version.startswith('0.3'):
@@ -321,7 +407,7 @@ class CPHDReader(BaseReader):
     def file_name(self):
         return self.cphd_details.file_name
 
-    def _fetch(self, range1, range2, index):
+    def _fetch(self, range1, range2, index, out=None):
         """
 
         Parameters
@@ -329,6 +415,7 @@ class CPHDReader(BaseReader):
         range1 : tuple
         range2 : tuple
         index : int
+        out : None|numpy.ndarray
 
         Returns
         -------
@@ -340,7 +427,7 @@ class CPHDReader(BaseReader):
         # NB: it is critical that there is no reorientation operation in CPHD.
         # noinspection PyProtectedMember
         range1, range2 = chipper._reorder_arguments(range1, range2)
-        data = chipper(range1, range2)
+        data = chipper(range1, range2, out=out)
 
         # fetch the scale data, if there is any
         scale = self.read_pvp_variable('AmpSF', index, the_range=range1)
@@ -349,6 +436,13 @@ class CPHDReader(BaseReader):
 
         scale = numpy.cast['float32'](scale)
         # recast from double, so our data will remain float32
+        if out is not None:
+            # scale in place, to avoid any further allocation
+            if scale.size == 1 or data.ndim == 1:
+                data *= scale
+            else:
+                data *= scale[:, numpy.newaxis]
+            return data
         if scale.size == 1:
             return scale[0]*data
         elif data.ndim == 1:
@@ -356,9 +450,9 @@ class CPHDReader(BaseReader):
         else:
             return scale[:, numpy.newaxis]*data
 
-    def __call__(self, range1, range2, index=0):
+    def __call__(self, range1, range2, index=0, out=None):
         index = self._validate_index(index)
-        return self._fetch(range1, range2, index)
+        return self._fetch(range1, range2, index, out=out)
 
     def __getitem__(self, item):
         item, index = self._validate_slice(item)
@@ -367,8 +461,8 @@ class CPHDReader(BaseReader):
         range1, range2 = chipper._slice_to_args(item)
         return self._fetch(range1, range2, index)
 
-    def read_chip(self, dim1range, dim2range, index=0):
-        # type: (Union[None, int, Tuple[int, int], Tuple[int, int, int]], Union[None, int, Tuple[int, int], Tuple[int, int, int]], Union[int, str]) -> numpy.ndarray
+    def read_chip(self, dim1range, dim2range, index=0, out=None):
+        # type: (Union[None, int, Tuple[int, int], Tuple[int, int, int]], Union[None, int, Tuple[int, int], Tuple[int, int, int]], Union[int, str], Union[None, numpy.ndarray]) -> numpy.ndarray
         """
         Read the signal block associated with `index`, and given ranges.
 
@@ -377,13 +471,16 @@ class CPHDReader(BaseReader):
         dim1range : None|int|Tuple[int, int]|Tuple[int, int, int]
         dim2range : None|int|Tuple[int, int]|Tuple[int, int, int]
         index : int|str
+        out : None|numpy.ndarray
+            If provided, the data will be written into this array (which must
+            be of the appropriate shape), and it will be returned.
 
         Returns
         -------
         numpy.ndarray
         """
 
-        return self.__call__(dim1range, dim2range, index=index)
+        return self.__call__(dim1range, dim2range, index=index, out=out)
 
     def read_pvp_variable(self, variable, index, the_range=None):
         """
@@ -425,6 +522,29 @@ class CPHDReader(BaseReader):
 
         raise NotImplementedError
 
+    def get_pvp_index(self, index):
+        """
+        Gets the PVP index for the given channel, which supports time, range, and
+        angle sector queries returning vector ranges suitable for :meth:`read_chip`.
+        This is constructed on first request, and retained.
+
+        Parameters
+        ----------
+        index : int|str
+            The CPHD channel index or identifier.
+
+        Returns
+        -------
+        PVPIndex
+        """
+
+        int_index = self._validate_index(index)
+        if self._pvp_indices is None:
+            self._pvp_indices = {}
+        if int_index not in self._pvp_indices:
+            self._pvp_indices[int_index] = PVPIndex(self.read_pvp_array(int_index))
+        return self._pvp_indices[int_index]
+
     def read_support_array(self, index, dim1_range, dim2_range):
         # type: (Union[int, str], Union[None, int, Tuple[int, int], Tuple[int, int, int]], Union[None, int, Tuple[int, int], Tuple[int, int, int]]) -> numpy.ndarray
         """
@@ -478,7 +598,7 @@ class CPHDReader1_0(CPHDReader):
 
         Parameters
         ----------
-        cphd_details : str|CPHDDetails
+        cphd_details : str|BinaryIO|CPHDDetails
         """
 
         self._channel_map = None  # type: Union[None, Dict[str, int]]
@@ -515,16 +635,23 @@ class CPHDReader1_0(CPHDReader):
 
         Returns
         -------
-        Tuple[BIPChipper]
+        Tuple[BIPChipper|CompressedSignalChipper]
         """
 
         chippers = []
 
         data = self.cphd_meta.Data
+        block_offset = self.cphd_header.SIGNAL_BLOCK_BYTE_OFFSET
+        if data.SignalCompressionID is not None:
+            codec = get_signal_codec(data.SignalCompressionID)
+            signal_dtype = binary_format_string_to_dtype(data.SignalArrayFormat)
+            for entry in data.Channels:
+                chippers.append(CompressedSignalChipper(
+                    self.cphd_details.buffer.open_stream(), block_offset+entry.SignalArrayByteOffset,
+                    (entry.NumVectors, entry.NumSamples), codec, signal_dtype))
+            return tuple(chippers)
+
         sample_type = data.SignalArrayFormat
-        raw_bands = 2
-        output_bands = 1
-        output_dtype = 'complex64'
         if sample_type == "CF8":
             raw_dtype = numpy.dtype('>f4')
         elif sample_type == "CI4":
@@ -533,15 +660,11 @@ class CPHDReader1_0(CPHDReader):
             raw_dtype = numpy.dtype('>i1')
         else:
             raise ValueError('Got unhandled signal array format {}'.format(sample_type))
-        symmetry = (False, False, False)
 
-        block_offset = self.cphd_header.SIGNAL_BLOCK_BYTE_OFFSET
         for entry in data.Channels:
-            img_siz = (entry.NumVectors, entry.NumSamples)
-            data_offset = entry.SignalArrayByteOffset
-            chippers.append(BIPChipper(
-                self.cphd_details.file_object, raw_dtype, img_siz, raw_bands, output_bands, output_dtype,
-                symmetry=symmetry, transform_data='COMPLEX', data_offset=block_offset+data_offset))
+            array = self.cphd_details.buffer.get_array(
+                block_offset+entry.SignalArrayByteOffset, raw_dtype, (entry.NumVectors, entry.NumSamples, 2))
+            chippers.append(BufferChipper(array, transform_data='COMPLEX'))
         return tuple(chippers)
 
     def _create_pvp_memmaps(self):
@@ -567,10 +690,8 @@ class CPHDReader1_0(CPHDReader):
         for i, entry in enumerate(self.cphd_meta.Data.Channels):
             self._channel_map[entry.Identifier] = i
             offset = self.cphd_header.PVP_BLOCK_BYTE_OFFSET + entry.PVPArrayByteOffset
-            shape = (entry.NumVectors, )
-            # TODO: revamp this for file like object support...
-            self._pvp_memmap[entry.Identifier] = numpy.memmap(
-                self.cphd_details.file_name, dtype=pvp_dtype, mode='r', offset=offset, shape=shape)
+            self._pvp_memmap[entry.Identifier] = self.cphd_details.buffer.get_array(
+                offset, pvp_dtype, (entry.NumVectors, ))
 
     def _create_support_array_memmaps(self):
         """
@@ -595,11 +716,8 @@ class CPHDReader1_0(CPHDReader):
             offset = self.cphd_header.SUPPORT_BLOCK_BYTE_OFFSET + entry.ArrayByteOffset
             # determine numpy dtype and depth of array
             dtype, depth = details.get_numpy_format()
-            # set up the numpy memory map
             shape = (entry.NumRows, entry.NumCols) if depth == 1 else (entry.NumRows, entry.NumCols, depth)
-            # TODO: revamp this for file like object support...
-            self._support_array_memmap[entry.Identifier] = numpy.memmap(
-                self.cphd_details.file_name, dtype=dtype, mode='r', offset=offset, shape=shape)
+            self._support_array_memmap[entry.Identifier] = self.cphd_details.buffer.get_array(offset, dtype, shape)
 
     def _validate_index(self, index):
         """
@@ -660,7 +778,7 @@ class CPHDReader1_0(CPHDReader):
         channel = cphd_meta.Data.Channels[int_index]
         the_range = validate_range(the_range, channel.NumVectors)
         if variable in self._pvp_memmap[channel.Identifier].dtype.fields:
-            return self._pvp_memmap[channel.Identifier][variable][the_range[0]:the_range[1]:the_range[2]]
+            return self._pvp_memmap[channel.Identifier][the_range[0]:the_range[1]:the_range[2]][variable]
         else:
             return None
 
@@ -681,37 +799,12 @@ class CPHDReader1_0(CPHDReader):
         else:
             raise TypeError('Got unexpected type {} for identifier'.format(type(index)))
 
-        # TODO: use the memmaps defined above...
         # validate the range definition
         range1 = validate_range(dim1_range, the_entry.NumRows)
         range2 = validate_range(dim2_range, the_entry.NumCols)
-        # extract the support array metadata details
-        details = self.cphd_meta.SupportArray.find_support_array(identifier)
-        # determine array byte offset
-        offset = self.cphd_header.SUPPORT_BLOCK_BYTE_OFFSET + the_entry.ArrayByteOffset
-        # determine numpy dtype and depth of array
-        dtype, depth = details.get_numpy_format()
-        # set up the numpy memory map
-        shape = (the_entry.NumRows, the_entry.NumCols) if depth == 1 else \
-            (the_entry.NumRows, the_entry.NumCols, depth)
-
-        # TODO: revamp this for file like object support...
-        mem_map = numpy.memmap(self.cphd_details.file_name,
-                               dtype=dtype,
-                               mode='r',
-                               offset=offset,
-                               shape=shape)
-        if range1[0] == -1 and range1[2] < 0 and range2[0] == -1 and range2[2] < 0:
-            data = mem_map[range1[0]::range1[2], range2[0]::range2[2]]
-        elif range1[0] == -1 and range1[2] < 0:
-            data = mem_map[range1[0]::range1[2], range2[0]:range2[1]:range2[2]]
-        elif range2[0] == -1 and range2[2] < 0:
-            data = mem_map[range1[0]:range1[1]:range1[2], range2[0]::range2[2]]
-        else:
-            data = mem_map[range1[0]:range1[1]:range1[2], range2[0]:range2[1]:range2[2]]
-        # clean up the memmap object, probably unnecessary, and there SHOULD be a close method
-        del mem_map
-        return data
+        slice1 = slice(range1[0], None, range1[2]) if (range1[1] == -1 and range1[2] < 0) else slice(*range1)
+        slice2 = slice(range2[0], None, range2[2]) if (range2[1] == -1 and range2[2] < 0) else slice(*range2)
+        return self._support_array_memmap[identifier][slice1, slice2]
 
     def read_pvp_array(self, index, the_range=None):
         int_index = self._validate_index(index)
@@ -777,7 +870,7 @@ class CPHDReader0_3(CPHDReader):
 
         Parameters
         ----------
-        cphd_details : str|CPHDDetails
+        cphd_details : str|BinaryIO|CPHDDetails
         """
 
         self._cphd_details = _validate_cphd_details(cphd_details, version='0.3')
@@ -826,9 +919,6 @@ class CPHDReader0_3(CPHDReader):
 
         data = self.cphd_meta.Data
         sample_type = data.SampleType
-        raw_bands = 2
-        output_bands = 1
-        output_dtype = 'complex64'
         if sample_type == "RE32F_IM32F":
             raw_dtype = numpy.dtype('>f4')
             bpp = 8
@@ -840,15 +930,13 @@ class CPHDReader0_3(CPHDReader):
             bpp = 2
         else:
             raise ValueError('Got unhandled sample type {}'.format(sample_type))
-        symmetry = (False, False, False)
 
         data_offset = self.cphd_header.CPHD_BYTE_OFFSET
         for entry in data.ArraySize:
-            img_siz = (entry.NumVectors, entry.NumSamples)
-            chippers.append(BIPChipper(
-                self.cphd_details.file_object, raw_dtype, img_siz, raw_bands, output_bands, output_dtype,
-                symmetry=symmetry, transform_data='COMPLEX', data_offset=data_offset))
-            data_offset += img_siz[0]*img_siz[1]*bpp
+            array = self.cphd_details.buffer.get_array(
+                data_offset, raw_dtype, (entry.NumVectors, entry.NumSamples, 2))
+            chippers.append(BufferChipper(array, transform_data='COMPLEX'))
+            data_offset += entry.NumVectors*entry.NumSamples*bpp
         return tuple(chippers)
 
     def _create_pvp_memmaps(self):
@@ -865,18 +953,13 @@ class CPHDReader0_3(CPHDReader):
         self._pvp_memmap = []
         for i, entry in enumerate(self.cphd_meta.Data.ArraySize):
             offset = self.cphd_header.VB_BYTE_OFFSET + self.cphd_meta.Data.NumBytesVBP*i
-            shape = (entry.NumVectors, )
-
-            # TODO: revamp this for file like object support...
-            self._pvp_memmap.append(
-                numpy.memmap(
-                    self.cphd_details.file_name, dtype=pvp_dtype, mode='r', offset=offset, shape=shape))
+            self._pvp_memmap.append(self.cphd_details.buffer.get_array(offset, pvp_dtype, (entry.NumVectors, )))
 
     def read_pvp_variable(self, variable, index, the_range=None):
         int_index = self._validate_index(index)
         the_range = validate_range(the_range, self.cphd_meta.Data.ArraySize[int_index].NumVectors)
         if variable in self._pvp_memmap[int_index].dtype.fields:
-            return self._pvp_memmap[int_index][variable][the_range[0]:the_range[1]:the_range[2]]
+            return self._pvp_memmap[int_index][the_range[0]:the_range[1]:the_range[2]][variable]
         else:
             return None
 
@@ -954,7 +1037,7 @@ class CPHDWriter1_0(AbstractWriter):
         self._writing_state = {'header': False, 'pvp': {}, 'support': {}, 'signal': {}}
         self._closed = False
         self._cphd_meta = cphd_meta
-        self._cphd_header = cphd_meta.make_file_header()
+        self._cphd_header = None
 
         if check_existence and os.path.exists(file_name):
             raise SarpyIOError(
@@ -1106,6 +1189,9 @@ class CPHDWriter1_0(AbstractWriter):
         Expected to be called only by _prepare_for_writing().
         """
 
+        if self.cphd_meta.Data.SignalCompressionID is not None:
+            raise ValueError(
+                'CPHDWriter1_0 does not support compressed signal arrays, use CPHDAppendWriter1_0.')
         self._pvp_memmaps = {}
         self._signal_memmaps = {}
         self._channel_map = {}
@@ -1155,6 +1241,7 @@ class CPHDWriter1_0(AbstractWriter):
             logging.warning('The header for CPHD file {} has already been written. Exiting.'.format(self._file_name))
             return
 
+        self._cphd_header = self.cphd_meta.make_file_header()
         with open(self._file_name, "wb") as outfile:
             # write header
             outfile.write(self._cphd_header.to_string().encode())
@@ -1457,3 +1544,520 @@ class CPHDWriter1_0(AbstractWriter):
 
         if support_block:
             self.write_support_block(support_block)
+
+
+class CPHDAppendWriter1_0(CPHDWriter1_0):
+    """
+    A CPHD version 1.0 writer for which the per vector parameters and signal
+    vectors of each channel are appended in vector order, as they become
+    available. The number of vectors for each channel need not be known in
+    advance, and `NumVectors` (and the array offsets) in the CPHD structure
+    and file header are determined when the file is closed.
+
+    The appended data is gathered in memory, and written sequentially to a
+    single temporary spool file (in the directory of the output file) with large
+    writes. On close, the file header, xml, support arrays, and the gathered
+    PVP and signal arrays are written to the output file, and the spool file is
+    removed. No memory map is required for any channel. If an exception is raised
+    in a `with` block, or an incomplete writer is garbage collected, then the spool
+    file is removed and no output file is written.
+
+    The support arrays must be written in full, using :func:`write_support_array`.
+
+    If `Data.SignalCompressionID` is populated, then the signal vectors of each
+    channel are compressed in blocks of vectors by the corresponding codec (see
+    :mod:`sarpy.io.phase_history.signal_compression`), and `CompressedSignalSize`
+    is also determined on close.
+    """
+
+    __slots__ = (
+        '_lock', '_max_buffer_bytes', '_buffers', '_buffered_bytes', '_segments',
+        '_spool', '_spool_name', '_spool_size', '_support_arrays', '_pvp_dtype', '_signal_dtype',
+        '_codec', '_block_vectors', '_pending', '_block_sizes')
+
+    def __init__(self, file_name, cphd_meta, check_existence=True, max_buffer_bytes=67108864,
+                 block_vectors=None, codec_kwargs=None):
+        """
+
+        Parameters
+        ----------
+        file_name : str
+        cphd_meta : sarpy.io.phase_history.cphd1_elements.CPHD.CPHDType
+            The structure is copied. For each channel, `NumVectors`, `PVPArrayByteOffset`,
+            and `SignalArrayByteOffset` will be determined on close.
+        check_existence : bool
+            Should we check if the given file already exists, and raises an exception if so?
+        max_buffer_bytes : int
+            The maximum size, in bytes, of the appended data gathered in memory before
+            it is written to the spool file.
+        block_vectors : None|int
+            The number of vectors in each compressed block, only relevant for
+            compressed signal arrays. The default yields blocks of approximately 1 MB.
+        codec_kwargs : None|dict
+            Keyword arguments for the codec constructor (i.e. compression level),
+            only relevant for compressed signal arrays.
+        """
+
+        self._codec = None
+        if cphd_meta.Data.SignalCompressionID is not None:
+            self._codec = get_signal_codec(
+                cphd_meta.Data.SignalCompressionID, **({} if codec_kwargs is None else codec_kwargs))
+        self._block_vectors = {}
+        self._pending = {}
+        self._block_sizes = {}
+        self._lock = threading.Lock()
+        self._max_buffer_bytes = int_func(max_buffer_bytes)
+        self._buffers = OrderedDict()
+        self._buffered_bytes = 0
+        self._segments = OrderedDict()
+        self._spool = None
+        self._spool_name = None
+        self._spool_size = 0
+        self._support_arrays = {}
+        self._pvp_dtype = cphd_meta.PVP.get_vector_dtype()
+        self._signal_dtype = binary_format_string_to_dtype(cphd_meta.Data.SignalArrayFormat)
+        super(CPHDAppendWriter1_0, self).__init__(file_name, cphd_meta.copy(), check_existence=check_existence)
+        if self._codec is not None:
+            for entry in self.cphd_meta.Data.Channels:
+                if block_vectors is None:
+                    this_block_vectors = max(1, 1048576//(entry.NumSamples*self._signal_dtype.itemsize))
+                else:
+                    this_block_vectors = int_func(block_vectors)
+                self._block_vectors[entry.Identifier] = this_block_vectors
+                self._pending[entry.Identifier] = []
+                self._block_sizes[entry.Identifier] = []
+
+    def _prepare_for_writing(self):
+        """
+        Prepare the state variables and the spool file. Nothing is written to
+        the output file until close.
+        """
+
+        self._channel_map = {}
+        for i, entry in enumerate(self.cphd_meta.Data.Channels):
+            self._channel_map[entry.Identifier] = i
+            self._writing_state['pvp'][entry.Identifier] = 0
+            self._writing_state['signal'][entry.Identifier] = 0
+            for kind in ['pvp', 'signal']:
+                self._buffers[(entry.Identifier, kind)] = []
+                self._segments[(entry.Identifier, kind)] = []
+        self._support_map = {}
+        if self.cphd_meta.Data.SupportArrays is not None:
+            for i, entry in enumerate(self.cphd_meta.Data.SupportArrays):
+                self._support_map[entry.Identifier] = i
+                self._writing_state['support'][entry.Identifier] = 0
+
+        directory = os.path.split(os.path.abspath(self._file_name))[0]
+        fd, self._spool_name = mkstemp(suffix='.spool', dir=directory)
+        self._spool = os.fdopen(fd, 'w+b')
+
+    @property
+    def vectors_written(self):
+        """
+        Dict[str, int]: The number of complete vectors (both PVP and signal)
+        appended for each channel.
+        """
+
+        with self._lock:
+            return OrderedDict(
+                (entry.Identifier, min(self._writing_state['pvp'][entry.Identifier],
+                                       self._writing_state['signal'][entry.Identifier]))
+                for entry in self.cphd_meta.Data.Channels)
+
+    def _append(self, identifier, kind, data):
+        """
+        Append the data to the buffer, compressing complete blocks of signal
+        vectors if appropriate. This is expected to be called while holding the lock.
+
+        Parameters
+        ----------
+        identifier : str
+        kind : str
+        data : numpy.ndarray
+
+        Returns
+        -------
+        None
+        """
+
+        self._writing_state[kind][identifier] += data.shape[0]
+        if kind == 'pvp' or self._codec is None:
+            self._append_bytes((identifier, kind), data.tobytes())
+        else:
+            self._pending[identifier].append(data)
+            self._compress_pending(identifier, final=False)
+
+    def _compress_pending(self, identifier, final=False):
+        """
+        Compress the complete blocks (and the partial final block, if `final`)
+        of pending signal vectors. This is expected to be called while holding the lock.
+
+        Parameters
+        ----------
+        identifier : str
+        final : bool
+
+        Returns
+        -------
+        None
+        """
+
+        block_vectors = self._block_vectors[identifier]
+        pending = self._pending[identifier]
+        count = sum(entry.shape[0] for entry in pending)
+        if count < block_vectors and not (final and count > 0):
+            return
+        if len(pending) == 1:
+            data = pending[0]
+        else:
+            # NB: concatenate does not preserve the (big endian) byte order
+            data = numpy.concatenate(pending, axis=0).astype(pending[0].dtype, copy=False)
+        start = 0
+        while count - start >= block_vectors or (final and start < count):
+            the_bytes = self._codec.encode(data[start:start+block_vectors])
+            self._block_sizes[identifier].append(len(the_bytes))
+            self._append_bytes((identifier, 'signal'), the_bytes)
+            start += block_vectors
+        self._pending[identifier] = [data[start:], ] if start < count else []
+
+    def _append_bytes(self, key, the_bytes):
+        """
+        Append the bytes to the buffer, and write the buffers to the spool file if
+        the maximum size is exceeded. This is expected to be called while holding
+        the lock.
+
+        Parameters
+        ----------
+        key : Tuple[str, str]
+        the_bytes : bytes
+
+        Returns
+        -------
+        None
+        """
+
+        self._buffers[key].append(the_bytes)
+        self._buffered_bytes += len(the_bytes)
+        if self._buffered_bytes >= self._max_buffer_bytes:
+            self._flush_buffers()
+
+    def _flush_buffers(self):
+        """
+        Write each buffer to the spool file as a single contiguous segment. This is
+        expected to be called while holding the lock.
+
+        Returns
+        -------
+        None
+        """
+
+        for key, buffer in self._buffers.items():
+            if len(buffer) == 0:
+                continue
+            the_bytes = b''.join(buffer)
+            self._spool.write(the_bytes)
+            self._segments[key].append((self._spool_size, len(the_bytes)))
+            self._spool_size += len(the_bytes)
+            del buffer[:]
+        self._buffered_bytes = 0
+
+    def flush(self):
+        """
+        Write any gathered data to the spool file.
+
+        Returns
+        -------
+        None
+        """
+
+        with self._lock:
+            if self._spool is not None:
+                self._flush_buffers()
+
+    def write_support_array(self, identifier, data, start_indices=(0, 0)):
+        """
+        Write the full support array. This is held in memory until close.
+
+        Parameters
+        ----------
+        identifier : str
+        data : numpy.ndarray
+        start_indices : Tuple[int, int]
+            Only `(0, 0)` is supported.
+        """
+
+        int_index = self._validate_support_index(identifier)
+        identifier = self._validate_support_key(identifier)
+        entry = self.cphd_meta.Data.SupportArrays[int_index]
+        if tuple(int_func(el) for el in start_indices) != (0, 0) or \
+                data.shape[:2] != (entry.NumRows, entry.NumCols):
+            raise ValueError(
+                'The append writer requires the full support array {} of shape {}, '
+                'got start_indices {} and shape {}'.format(
+                    identifier, (entry.NumRows, entry.NumCols), start_indices, data.shape))
+        if int_func(data.nbytes/(entry.NumRows*entry.NumCols)) != entry.BytesPerElement:
+            raise ValueError(
+                'Observed bytes per pixel {} for support {}, expected bytes per pixel {}'.format(
+                    int_func(data.nbytes/(entry.NumRows*entry.NumCols)), identifier, entry.BytesPerElement))
+        details = self.cphd_meta.SupportArray.find_support_array(identifier)
+        dtype, depth = details.get_numpy_format()
+        out = numpy.empty(data.shape, dtype=dtype)
+        out[:] = data
+        with self._lock:
+            self._support_arrays[identifier] = out
+            self._writing_state['support'][identifier] = entry.NumRows*entry.NumCols
+
+    def write_pvp_array(self, identifier, data, start_index=None):
+        """
+        Append the PVP array data for the given channel.
+
+        Parameters
+        ----------
+        identifier : int|str
+        data : numpy.ndarray
+        start_index : None|int
+            If provided, this must be the number of PVP records already appended
+            for this channel.
+        """
+
+        if data.ndim != 1:
+            raise ValueError('Provided data is required to be one dimensional')
+        identifier = self._validate_channel_key(identifier)
+        self._verify_dtype(data.dtype, self._pvp_dtype, 'PVP channel {}'.format(identifier))
+        out = numpy.empty(data.shape, dtype=self._pvp_dtype)
+        out[:] = data
+
+        with self._lock:
+            count = self._writing_state['pvp'][identifier]
+            if start_index is not None and int_func(start_index) != count:
+                raise ValueError(
+                    'PVP data for channel {} must be appended in order, and {} records '
+                    'have been written, got start_index {}'.format(identifier, count, start_index))
+            self._append(identifier, 'pvp', out)
+
+    def __call__(self, data, start_indices=None, identifier=0):
+        """
+        Append the signal vectors for the given channel.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The signal data, of shape `(vectors, NumSamples)`.
+        start_indices : None|Tuple[int, int]
+            If provided, this must be `(vectors already appended, 0)`.
+        identifier : int|str
+            The signal index or identifier to which to write.
+        """
+
+        if data.ndim != 2:
+            raise ValueError('Provided data is required to be two dimensional')
+        int_index = self._validate_channel_index(identifier)
+        identifier = self._validate_channel_key(identifier)
+        entry = self.cphd_meta.Data.Channels[int_index]
+        if data.shape[1] != entry.NumSamples:
+            raise ValueError(
+                'Signal data for channel {} must be full vectors of {} samples, '
+                'got shape {}'.format(identifier, entry.NumSamples, data.shape))
+        if data.size > 0 and int_func(data.nbytes/data.size) != self._signal_dtype.itemsize:
+            raise ValueError(
+                'Observed bytes per pixel {} for signal channel {}, expected bytes per pixel {}'.format(
+                    int_func(data.nbytes/data.size), identifier, self._signal_dtype.itemsize))
+        out = numpy.empty(data.shape, dtype=self._signal_dtype)
+        out[:] = data
+
+        with self._lock:
+            count = self._writing_state['signal'][identifier]
+            if start_indices is not None and \
+                    (int_func(start_indices[0]), int_func(start_indices[1])) != (count, 0):
+                raise ValueError(
+                    'Signal data for channel {} must be appended in order, and {} vectors '
+                    'have been written, got start_indices {}'.format(identifier, count, start_indices))
+            self._append(identifier, 'signal', out)
+
+    def write_chip(self, data, start_indices=None, index=0):
+        """
+        Append the signal vectors for the given channel. This is an alias to
+        :code:`writer(data, start_indices, identifier)`.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+        start_indices : None|Tuple[int, int]
+        index : int|str
+        """
+
+        self.__call__(data, start_indices=start_indices, identifier=index)
+
+    def append_vectors(self, identifier, pvp_data, signal_data):
+        """
+        Append a batch of PVP records and the corresponding signal vectors for
+        the given channel.
+
+        Parameters
+        ----------
+        identifier : int|str
+        pvp_data : numpy.ndarray
+        signal_data : numpy.ndarray
+        """
+
+        if pvp_data.shape[0] != signal_data.shape[0]:
+            raise ValueError(
+                'Got {} PVP records and {} signal vectors'.format(pvp_data.shape[0], signal_data.shape[0]))
+        self.write_pvp_array(identifier, pvp_data)
+        self.write_chip(signal_data, index=identifier)
+
+    def _check_fully_written(self):
+        if self._closed or self.cphd_meta is None:
+            return True
+
+        status = True
+        for entry in self.cphd_meta.Data.Channels:
+            pvp_count = self._writing_state['pvp'][entry.Identifier]
+            signal_count = self._writing_state['signal'][entry.Identifier]
+            if pvp_count != signal_count or pvp_count == 0:
+                status = False
+                logging.error(
+                    'CPHD channel {} has {} PVP records and {} signal vectors written'.format(
+                        entry.Identifier, pvp_count, signal_count))
+        if self.cphd_meta.Data.SupportArrays is not None:
+            for entry in self.cphd_meta.Data.SupportArrays:
+                if entry.Identifier not in self._support_arrays:
+                    status = False
+                    logging.error('CPHD support array {} has not been written'.format(entry.Identifier))
+        if not status:
+            logging.error('CPHD file %s is not completely written, and the result may be corrupt.', self._file_name)
+        return status
+
+    def _finalize_structure(self):
+        """
+        Set the number of vectors and array offsets for each channel, and
+        create the file header.
+
+        Returns
+        -------
+        None
+        """
+
+        pvp_offset = 0
+        signal_offset = 0
+        for entry in self.cphd_meta.Data.Channels:
+            entry.NumVectors = self._writing_state['pvp'][entry.Identifier]
+            entry.PVPArrayByteOffset = pvp_offset
+            entry.SignalArrayByteOffset = signal_offset
+            pvp_offset += entry.NumVectors*self.cphd_meta.Data.NumBytesPVP
+            if self._codec is None:
+                signal_offset += entry.NumVectors*entry.NumSamples*self._signal_dtype.itemsize
+            else:
+                block_sizes = self._block_sizes[entry.Identifier]
+                entry.CompressedSignalSize = get_container_header_size(len(block_sizes)) + sum(block_sizes)
+                signal_offset += entry.CompressedSignalSize
+        self._cphd_header = self.cphd_meta.make_file_header()
+
+    def _copy_segments(self, outfile, key):
+        """
+        Copy the spooled segments, in order, to the current position of `outfile`.
+
+        Parameters
+        ----------
+        outfile : BinaryIO
+        key : Tuple[str, str]
+
+        Returns
+        -------
+        None
+        """
+
+        for location, size in self._segments[key]:
+            self._spool.seek(location, os.SEEK_SET)
+            while size > 0:
+                the_bytes = self._spool.read(min(size, self._max_buffer_bytes))
+                if len(the_bytes) == 0:
+                    raise SarpyIOError('The spool file {} is truncated'.format(self._spool_name))
+                outfile.write(the_bytes)
+                size -= len(the_bytes)
+
+    def close(self):
+        """
+        Determine the number of vectors for each channel, write the CPHD file,
+        and remove the spool file.
+        """
+
+        if getattr(self, '_spool', None) is None or self._closed:
+            return
+
+        try:
+            with self._lock:
+                if self._codec is not None:
+                    for entry in self.cphd_meta.Data.Channels:
+                        self._compress_pending(entry.Identifier, final=True)
+                self._flush_buffers()
+                fully_written = self._check_fully_written()
+                self._finalize_structure()
+                header = self._cphd_header
+                with open(self._file_name, 'wb') as outfile:
+                    outfile.write(header.to_string().encode())
+                    outfile.write(_CPHD_SECTION_TERMINATOR)
+                    outfile.seek(header.XML_BLOCK_BYTE_OFFSET, os.SEEK_SET)
+                    outfile.write(self.cphd_meta.to_xml_bytes())
+                    outfile.write(_CPHD_SECTION_TERMINATOR)
+                    if self.cphd_meta.Data.SupportArrays is not None:
+                        for entry in self.cphd_meta.Data.SupportArrays:
+                            if entry.Identifier in self._support_arrays:
+                                outfile.seek(header.SUPPORT_BLOCK_BYTE_OFFSET + entry.ArrayByteOffset, os.SEEK_SET)
+                                outfile.write(self._support_arrays[entry.Identifier].tobytes())
+                    outfile.seek(header.PVP_BLOCK_BYTE_OFFSET, os.SEEK_SET)
+                    for entry in self.cphd_meta.Data.Channels:
+                        self._copy_segments(outfile, (entry.Identifier, 'pvp'))
+                    outfile.seek(header.SIGNAL_BLOCK_BYTE_OFFSET, os.SEEK_SET)
+                    for entry in self.cphd_meta.Data.Channels:
+                        if self._codec is not None:
+                            outfile.write(make_container_header(
+                                self._block_vectors[entry.Identifier], self._block_sizes[entry.Identifier]))
+                        self._copy_segments(outfile, (entry.Identifier, 'signal'))
+                self._writing_state['header'] = True
+        finally:
+            self._closed = True
+            self._spool.close()
+            self._spool = None
+            os.remove(self._spool_name)
+        if not fully_written:
+            raise SarpyIOError('CPHD file {} is not fully written'.format(self._file_name))
+
+    def _discard(self):
+        """
+        Remove the spool file (and the empty placeholder output file) without
+        writing the CPHD file.
+
+        Returns
+        -------
+        None
+        """
+
+        if getattr(self, '_spool', None) is None or self._closed:
+            return
+
+        logging.error(
+            'The {} file writer was not closed cleanly, and the CPHD file {} '
+            'has not been written.'.format(self.__class__.__name__, self._file_name))
+        self._closed = True
+        self._spool.close()
+        self._spool = None
+        os.remove(self._spool_name)
+        if os.path.isfile(self._file_name) and os.path.getsize(self._file_name) == 0:
+            os.remove(self._file_name)
+
+    def __del__(self):
+        # NB: an incomplete file is discarded, rather than written and then
+        #   raising an exception during garbage collection
+        if getattr(self, '_spool', None) is None or self._closed:
+            return
+        if self._check_fully_written():
+            self.close()
+        else:
+            self._discard()
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        if exception_type is None:
+            self.close()
+        else:
+            self._discard()
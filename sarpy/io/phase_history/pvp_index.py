@@ -0,0 +1,350 @@
+"""
+Indexing of the per vector parameters (PVP) of a CPHD channel, permitting
+inexpensive time, range, and angle sector queries. The queries return vector
+index ranges of the form `(start, stop, 1)`, suitable for direct use in
+:meth:`sarpy.io.phase_history.cphd.CPHDReader.read_chip`.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import numpy
+
+from sarpy.geometry.geocoords import ecf_to_ned
+
+
+def _indices_to_runs(indices):
+    """
+    Convert the collection of vector indices to contiguous runs.
+
+    Parameters
+    ----------
+    indices : numpy.ndarray
+        One dimensional integer array, assumed sorted and unique.
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+        The runs, of the form `(start, stop, 1)`.
+    """
+
+    if indices.size == 0:
+        return []
+    breaks = numpy.nonzero(numpy.diff(indices) != 1)[0]
+    starts = numpy.concatenate(([indices[0], ], indices[breaks+1]))
+    stops = numpy.concatenate((indices[breaks]+1, [indices[-1]+1, ]))
+    return [(int(start), int(stop), 1) for start, stop in zip(starts, stops)]
+
+
+def _intersect_runs(runs1, runs2):
+    """
+    Intersect two sorted collections of disjoint runs.
+
+    Parameters
+    ----------
+    runs1 : List[Tuple[int, int, int]]
+    runs2 : List[Tuple[int, int, int]]
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+    """
+
+    out = []
+    i, j = 0, 0
+    while i < len(runs1) and j < len(runs2):
+        start = max(runs1[i][0], runs2[j][0])
+        stop = min(runs1[i][1], runs2[j][1])
+        if start < stop:
+            out.append((start, stop, 1))
+        if runs1[i][1] < runs2[j][1]:
+            i += 1
+        else:
+            j += 1
+    return out
+
+
+def _union_runs(runs1, runs2):
+    """
+    Union of two sorted collections of disjoint runs.
+
+    Parameters
+    ----------
+    runs1 : List[Tuple[int, int, int]]
+    runs2 : List[Tuple[int, int, int]]
+
+    Returns
+    -------
+    List[Tuple[int, int, int]]
+    """
+
+    out = []
+    for start, stop, _ in sorted(runs1 + runs2):
+        if len(out) > 0 and start <= out[-1][1]:
+            out[-1] = (out[-1][0], max(stop, out[-1][1]), 1)
+        else:
+            out.append((start, stop, 1))
+    return out
+
+
+class _SortedKey(object):
+    """
+    Binary search on a (not necessarily sorted) key column, for an interval query.
+    """
+
+    __slots__ = ('_order', '_sorted_values')
+
+    def __init__(self, values):
+        """
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+        """
+
+        if values.size < 2 or numpy.all(values[1:] >= values[:-1]):
+            self._order = None  # the typical case, for time or range
+            self._sorted_values = values
+        else:
+            self._order = numpy.argsort(values, kind='mergesort')
+            self._sorted_values = values[self._order]
+
+    def interval(self, lower, upper):
+        """
+        Find the vectors with `lower <= value <= upper`.
+
+        Parameters
+        ----------
+        lower : float
+        upper : float
+
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+        """
+
+        start = int(numpy.searchsorted(self._sorted_values, lower, side='left'))
+        stop = int(numpy.searchsorted(self._sorted_values, upper, side='right'))
+        if start >= stop:
+            return []
+        if self._order is None:
+            return [(start, stop, 1), ]
+        return _indices_to_runs(numpy.sort(self._order[start:stop]))
+
+    def nearest(self, value):
+        """
+        Find the vector index with value nearest the given value.
+
+        Parameters
+        ----------
+        value : float
+
+        Returns
+        -------
+        int
+        """
+
+        the_size = self._sorted_values.size
+        location = int(numpy.searchsorted(self._sorted_values, value, side='left'))
+        if location == the_size or \
+                (location > 0 and value - self._sorted_values[location-1] <= self._sorted_values[location] - value):
+            location -= 1
+        return location if self._order is None else int(self._order[location])
+
+
+class PVPIndex(object):
+    """
+    Index for the PVP array of a single CPHD channel, built once, which answers
+    time interval, slant range interval, angle sector, and nearest time queries
+    by binary search on precomputed key columns.
+
+    The range and angles are determined with respect to the aperture reference
+    point, the midpoint of the transmit and receive positions, and the stabilization
+    reference point (SRP) for each vector. The azimuth and graze angles are given in
+    degrees, in the North-East-Down frame centered at the SRP of the center vector.
+    Azimuth is measured clockwise from North, in the range `[-180, 180]`.
+    """
+
+    __slots__ = (
+        '_num_vectors', '_times', '_slant_range', '_azimuth', '_graze', '_valid_runs',
+        '_time_key', '_range_key', '_azimuth_key', '_graze_key')
+
+    def __init__(self, pvp_array):
+        """
+
+        Parameters
+        ----------
+        pvp_array : numpy.ndarray
+            The structured PVP array for the channel, which is required to have
+            `TxTime`, `TxPos`, `RcvPos`, and `SRPPos` fields.
+        """
+
+        for field in ['TxTime', 'TxPos', 'RcvPos', 'SRPPos']:
+            if field not in pvp_array.dtype.fields:
+                raise ValueError('The PVP array has no {} field'.format(field))
+
+        self._num_vectors = pvp_array.shape[0]
+        self._times = numpy.array(pvp_array['TxTime'], dtype='float64')
+        tx_pos = numpy.array(pvp_array['TxPos'], dtype='float64')
+        rcv_pos = numpy.array(pvp_array['RcvPos'], dtype='float64')
+        srp_pos = numpy.array(pvp_array['SRPPos'], dtype='float64')
+        self._slant_range = 0.5*(numpy.linalg.norm(tx_pos - srp_pos, axis=1) +
+                                 numpy.linalg.norm(rcv_pos - srp_pos, axis=1))
+
+        if self._num_vectors > 0:
+            line_of_sight = ecf_to_ned(
+                0.5*(tx_pos + rcv_pos) - srp_pos, srp_pos[self._num_vectors//2], absolute_coords=False)
+            self._azimuth = numpy.rad2deg(numpy.arctan2(line_of_sight[:, 1], line_of_sight[:, 0]))
+            self._graze = numpy.rad2deg(numpy.arctan2(
+                -line_of_sight[:, 2], numpy.linalg.norm(line_of_sight[:, :2], axis=1)))
+        else:
+            self._azimuth = numpy.zeros((0, ), dtype='float64')
+            self._graze = numpy.zeros((0, ), dtype='float64')
+
+        if 'SIGNAL' in pvp_array.dtype.fields:
+            self._valid_runs = _indices_to_runs(numpy.nonzero(pvp_array['SIGNAL'] == 1)[0])
+        else:
+            self._valid_runs = [(0, self._num_vectors, 1), ] if self._num_vectors > 0 else []
+
+        self._time_key = _SortedKey(self._times)
+        self._range_key = _SortedKey(self._slant_range)
+        self._azimuth_key = _SortedKey(self._azimuth)
+        self._graze_key = _SortedKey(self._graze)
+
+    @property
+    def num_vectors(self):
+        """
+        int: The number of vectors.
+        """
+
+        return self._num_vectors
+
+    @property
+    def times(self):
+        """
+        numpy.ndarray: The transmit time for each vector.
+        """
+
+        return self._times
+
+    @property
+    def slant_range(self):
+        """
+        numpy.ndarray: The average of the transmit and receive ranges to the SRP, for each vector.
+        """
+
+        return self._slant_range
+
+    @property
+    def azimuth(self):
+        """
+        numpy.ndarray: The azimuth angle in degrees, for each vector.
+        """
+
+        return self._azimuth
+
+    @property
+    def graze(self):
+        """
+        numpy.ndarray: The graze angle in degrees, for each vector.
+        """
+
+        return self._graze
+
+    @property
+    def valid_runs(self):
+        """
+        List[Tuple[int, int, int]]: The contiguous runs of vectors with valid signal
+        (i.e. `SIGNAL == 1`, or all vectors if there is no `SIGNAL` PVP).
+        """
+
+        return list(self._valid_runs)
+
+    def _finalize(self, runs, valid_only):
+        return _intersect_runs(runs, self._valid_runs) if valid_only else runs
+
+    def time_range(self, start_time, end_time, valid_only=False):
+        """
+        Find the vectors with transmit time in the interval `[start_time, end_time]`.
+
+        Parameters
+        ----------
+        start_time : float
+        end_time : float
+        valid_only : bool
+            Restrict to vectors with valid signal?
+
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+            The vector index runs, in increasing order.
+        """
+
+        return self._finalize(self._time_key.interval(start_time, end_time), valid_only)
+
+    def range_interval(self, min_range, max_range, valid_only=False):
+        """
+        Find the vectors with slant range in the interval `[min_range, max_range]`.
+
+        Parameters
+        ----------
+        min_range : float
+        max_range : float
+        valid_only : bool
+            Restrict to vectors with valid signal?
+
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+            The vector index runs, in increasing order.
+        """
+
+        return self._finalize(self._range_key.interval(min_range, max_range), valid_only)
+
+    def sector(self, min_azimuth, max_azimuth, min_graze=None, max_graze=None, valid_only=False):
+        """
+        Find the vectors in the given angle sector. If `min_azimuth > max_azimuth`,
+        then the sector is assumed to cross the `180/-180` boundary.
+
+        Parameters
+        ----------
+        min_azimuth : float
+        max_azimuth : float
+        min_graze : None|float
+        max_graze : None|float
+        valid_only : bool
+            Restrict to vectors with valid signal?
+
+        Returns
+        -------
+        List[Tuple[int, int, int]]
+            The vector index runs, in increasing order.
+        """
+
+        if min_azimuth <= max_azimuth:
+            runs = self._azimuth_key.interval(min_azimuth, max_azimuth)
+        else:
+            runs = _union_runs(
+                self._azimuth_key.interval(min_azimuth, 180.), self._azimuth_key.interval(-180., max_azimuth))
+        if min_graze is not None or max_graze is not None:
+            runs = _intersect_runs(runs, self._graze_key.interval(
+                -90. if min_graze is None else min_graze, 90. if max_graze is None else max_graze))
+        return self._finalize(runs, valid_only)
+
+    def nearest_time(self, the_time):
+        """
+        Find the vector with transmit time nearest the given time.
+
+        Parameters
+        ----------
+        the_time : float
+
+        Returns
+        -------
+        int
+        """
+
+        if self._num_vectors == 0:
+            raise ValueError('There are no vectors')
+        return self._time_key.nearest(the_time)
@@ -0,0 +1,437 @@
+"""
+Compression of CPHD signal arrays, for use with `Data.SignalCompressionID`.
+
+The CPHD standard leaves the format of compressed signal arrays to the
+compression method identified by `SignalCompressionID`. The methods here share
+a common container format for each channel signal array, so that blocks of
+vectors can be independently read and decompressed. The container is given by
+
+* a header of the magic bytes `SCSB`, container version, number of vectors per
+  block, and number of blocks, in the big-endian struct format `>4sHHII`,
+* the `(offset, size)` of each compressed block, relative to the beginning
+  of the signal array, in the big-endian struct format `>QQ`,
+* the compressed blocks.
+
+The compression of each block is performed by a :class:`SignalCodec`,
+registered by its `SignalCompressionID` value. See :func:`register_signal_codec`.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import struct
+import zlib
+from collections import OrderedDict
+
+import numpy
+
+from sarpy.compliance import int_func
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+_CONTAINER_MAGIC = b'SCSB'
+_CONTAINER_VERSION = 1
+_HEADER_FORMAT = '>4sHHII'
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+_ENTRY_FORMAT = '>QQ'
+_ENTRY_SIZE = struct.calcsize(_ENTRY_FORMAT)
+
+
+##########
+# codec definitions
+
+def _component_dtype(dtype):
+    """
+    Gets the dtype of the real and imaginary components for the signal array dtype.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype
+
+    Returns
+    -------
+    numpy.dtype
+    """
+
+    if dtype.fields is not None:
+        return dtype.fields['real'][0]
+    elif dtype.kind == 'c':
+        return numpy.dtype('{}f{}'.format(dtype.byteorder if dtype.byteorder in '<>' else '=', dtype.itemsize//2))
+    raise ValueError('Got unhandled signal array dtype {}'.format(dtype))
+
+
+class SignalCodec(object):
+    """
+    Abstract compression method for blocks of CPHD signal vectors.
+
+    **Extension Requirement:** Any extension must define the class attribute
+    `identifier` (the `SignalCompressionID` value), and implement `encode`
+    and `decode`.
+    """
+
+    __slots__ = ()
+    identifier = None  # type: str
+    lossless = True
+
+    def encode(self, data):
+        """
+        Compress the block of signal vectors.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The array of shape `(vectors, samples)`, of the signal array dtype
+            (see :func:`sarpy.io.phase_history.cphd1_elements.utils.binary_format_string_to_dtype`).
+
+        Returns
+        -------
+        bytes
+        """
+
+        raise NotImplementedError
+
+    def decode(self, the_bytes, shape, dtype):
+        """
+        Decompress the block of signal vectors.
+
+        Parameters
+        ----------
+        the_bytes : bytes
+        shape : Tuple[int, int]
+            The `(vectors, samples)` of the block.
+        dtype : numpy.dtype
+            The signal array dtype.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        raise NotImplementedError
+
+
+class _ShuffledByteCodec(SignalCodec):
+    """
+    Lossless compression of the signal bytes, after shuffling the bytes of each
+    real and imaginary component by significance, which makes the (slowly
+    varying) high order bytes much more compressible.
+    """
+
+    __slots__ = ()
+
+    def _compress(self, the_bytes):
+        raise NotImplementedError
+
+    def _decompress(self, the_bytes):
+        raise NotImplementedError
+
+    @staticmethod
+    def _shuffle(data):
+        component = _component_dtype(data.dtype)
+        the_bytes = numpy.frombuffer(numpy.ascontiguousarray(data).tobytes(), dtype=numpy.uint8)
+        return numpy.ascontiguousarray(numpy.reshape(the_bytes, (-1, component.itemsize)).T).tobytes()
+
+    @staticmethod
+    def _unshuffle(the_bytes, shape, dtype):
+        component = _component_dtype(dtype)
+        the_bytes = numpy.reshape(numpy.frombuffer(the_bytes, dtype=numpy.uint8), (component.itemsize, -1))
+        components = numpy.ascontiguousarray(the_bytes.T).view(component)
+        return numpy.reshape(numpy.reshape(components, (-1, )).view(dtype), shape)
+
+    def encode(self, data):
+        return self._compress(self._shuffle(data))
+
+    def decode(self, the_bytes, shape, dtype):
+        return self._unshuffle(self._decompress(the_bytes), shape, dtype)
+
+
+class ZlibSignalCodec(_ShuffledByteCodec):
+    """
+    Lossless zlib (deflate) compression of the byte shuffled signal vectors.
+    """
+
+    __slots__ = ('_level', )
+    identifier = 'SARPY_ZLIB'
+
+    def __init__(self, level=6):
+        """
+
+        Parameters
+        ----------
+        level : int
+            The zlib compression level, only relevant for encoding.
+        """
+
+        self._level = int_func(level)
+
+    def _compress(self, the_bytes):
+        return zlib.compress(the_bytes, self._level)
+
+    def _decompress(self, the_bytes):
+        return zlib.decompress(the_bytes)
+
+
+class ZstdSignalCodec(_ShuffledByteCodec):
+    """
+    Lossless zstandard compression of the byte shuffled signal vectors. This
+    requires the optional `zstandard` package.
+    """
+
+    __slots__ = ('_level', )
+    identifier = 'SARPY_ZSTD'
+
+    def __init__(self, level=3):
+        """
+
+        Parameters
+        ----------
+        level : int
+            The zstandard compression level, only relevant for encoding.
+        """
+
+        if zstandard is None:
+            raise ImportError('The SARPY_ZSTD signal compression requires the zstandard package.')
+        self._level = int_func(level)
+
+    def _compress(self, the_bytes):
+        return zstandard.ZstdCompressor(level=self._level).compress(the_bytes)
+
+    def _decompress(self, the_bytes):
+        return zstandard.ZstdDecompressor().decompress(the_bytes)
+
+
+class BlockFloatingPointSignalCodec(SignalCodec):
+    """
+    Lossy block floating point quantization of the signal vectors. Each vector
+    is represented by a single (power of two) exponent, and the real and imaginary
+    components by signed integer mantissas of `bits` bits. The quantization error
+    for each sample is bounded by half of the least significant mantissa bit,
+    relative to the largest component magnitude of the vector.
+    """
+
+    __slots__ = ()
+    bits = None  # type: int
+    lossless = False
+
+    @property
+    def _mantissa_dtype(self):
+        return numpy.dtype('>i{}'.format(self.bits//8))
+
+    def encode(self, data):
+        component = _component_dtype(data.dtype)
+        values = numpy.reshape(numpy.ascontiguousarray(data).view(component), (data.shape[0], -1))
+        values = values.astype('float64')
+        _, exponents = numpy.frexp(numpy.max(numpy.abs(values), axis=1))
+        limit = 2**(self.bits - 1) - 1
+        mantissas = numpy.ldexp(values, (self.bits - 1 - exponents)[:, numpy.newaxis])
+        mantissas = numpy.clip(numpy.rint(mantissas), -limit, limit).astype(self._mantissa_dtype)
+        return exponents.astype('>i2').tobytes() + mantissas.tobytes()
+
+    def decode(self, the_bytes, shape, dtype):
+        exponents = numpy.frombuffer(the_bytes, dtype='>i2', count=shape[0]).astype('int64')
+        mantissas = numpy.reshape(
+            numpy.frombuffer(the_bytes, dtype=self._mantissa_dtype, offset=2*shape[0]), (shape[0], -1))
+        values = numpy.ldexp(mantissas.astype('float64'), (exponents - (self.bits - 1))[:, numpy.newaxis])
+        component = _component_dtype(dtype)
+        if component.kind == 'i':
+            info = numpy.iinfo(component)
+            values = numpy.clip(numpy.rint(values), info.min, info.max)
+        out = numpy.empty(shape, dtype=dtype)
+        out.view(component).reshape(values.shape)[:] = values
+        return out
+
+
+class BlockFloatingPoint8SignalCodec(BlockFloatingPointSignalCodec):
+    """
+    Block floating point quantization with 8 bit mantissas.
+    """
+
+    __slots__ = ()
+    identifier = 'SARPY_BFP8'
+    bits = 8
+
+
+class BlockFloatingPoint16SignalCodec(BlockFloatingPointSignalCodec):
+    """
+    Block floating point quantization with 16 bit mantissas.
+    """
+
+    __slots__ = ()
+    identifier = 'SARPY_BFP16'
+    bits = 16
+
+
+##########
+# the codec registry
+
+_codecs = OrderedDict()
+
+
+def register_signal_codec(codec_class):
+    """
+    Register a signal compression codec class, by its identifier.
+
+    Parameters
+    ----------
+    codec_class : Type[SignalCodec]
+
+    Returns
+    -------
+    None
+    """
+
+    if not (isinstance(codec_class, type) and issubclass(codec_class, SignalCodec)):
+        raise TypeError('codec_class must be a subclass of SignalCodec')
+    if codec_class.identifier is None:
+        raise ValueError('codec_class must have the identifier class attribute defined')
+    _codecs[codec_class.identifier] = codec_class
+
+
+def get_signal_codec_identifiers():
+    """
+    Gets the identifiers for the registered signal compression codecs.
+
+    Returns
+    -------
+    Tuple[str, ...]
+    """
+
+    return tuple(_codecs.keys())
+
+
+def get_signal_codec(identifier, **kwargs):
+    """
+    Gets the signal compression codec instance for the given `SignalCompressionID`.
+
+    Parameters
+    ----------
+    identifier : str
+    kwargs
+        Keyword arguments for the codec constructor.
+
+    Returns
+    -------
+    SignalCodec
+
+    Raises
+    ------
+    ValueError
+        If there is no such registered codec.
+    """
+
+    if identifier not in _codecs:
+        raise ValueError(
+            'Got unsupported SignalCompressionID {}, the supported values are {}'.format(
+                identifier, get_signal_codec_identifiers()))
+    return _codecs[identifier](**kwargs)
+
+
+for _codec_class in [ZlibSignalCodec, ZstdSignalCodec, BlockFloatingPoint8SignalCodec,
+                     BlockFloatingPoint16SignalCodec]:
+    register_signal_codec(_codec_class)
+
+
+##########
+# the container format
+
+def get_container_header_size(num_blocks):
+    """
+    Gets the size of the container header, including the block table.
+
+    Parameters
+    ----------
+    num_blocks : int
+
+    Returns
+    -------
+    int
+    """
+
+    return _HEADER_SIZE + num_blocks*_ENTRY_SIZE
+
+
+def make_container_header(block_vectors, block_sizes):
+    """
+    Make the container header, including the block table, for the compressed
+    blocks of the given sizes, which immediately follow the header in order.
+
+    Parameters
+    ----------
+    block_vectors : int
+    block_sizes : List[int]
+
+    Returns
+    -------
+    bytes
+    """
+
+    header_size = get_container_header_size(len(block_sizes))
+    out = [struct.pack(_HEADER_FORMAT, _CONTAINER_MAGIC, _CONTAINER_VERSION, 0, block_vectors, len(block_sizes))]
+    offset = header_size
+    for size in block_sizes:
+        out.append(struct.pack(_ENTRY_FORMAT, offset, size))
+        offset += size
+    return b''.join(out)
+
+
+def read_container_header(file_object, offset):
+    """
+    Reads the container header for the compressed signal array.
+
+    Parameters
+    ----------
+    file_object : BinaryIO
+    offset : int
+        The offset of the compressed signal array in the file.
+
+    Returns
+    -------
+    block_vectors : int
+    block_locations : List[Tuple[int, int]]
+        The `(offset, size)` of each compressed block, in the file.
+    """
+
+    file_object.seek(offset)
+    header = file_object.read(_HEADER_SIZE)
+    if len(header) != _HEADER_SIZE:
+        raise ValueError('The compressed signal array at offset {} is truncated'.format(offset))
+    magic, version, _, block_vectors, num_blocks = struct.unpack(_HEADER_FORMAT, header)
+    if magic != _CONTAINER_MAGIC:
+        raise ValueError('The compressed signal array at offset {} has unexpected magic bytes {}'.format(offset, magic))
+    if version != _CONTAINER_VERSION:
+        raise ValueError('Got unsupported compressed signal array container version {}'.format(version))
+    table = file_object.read(num_blocks*_ENTRY_SIZE)
+    if len(table) != num_blocks*_ENTRY_SIZE:
+        raise ValueError('The compressed signal array at offset {} is truncated'.format(offset))
+    block_locations = []
+    for i in range(num_blocks):
+        block_offset, block_size = struct.unpack_from(_ENTRY_FORMAT, table, i*_ENTRY_SIZE)
+        block_locations.append((offset + block_offset, block_size))
+    return block_vectors, block_locations
+
+
+def compress_signal_array(codec, data, block_vectors):
+    """
+    Compress the full signal array for a channel into the container format.
+
+    Parameters
+    ----------
+    codec : SignalCodec
+    data : numpy.ndarray
+        Of shape `(vectors, samples)`, of the signal array dtype.
+    block_vectors : int
+        The number of vectors in each block.
+
+    Returns
+    -------
+    bytes
+    """
+
+    block_vectors = int_func(block_vectors)
+    blocks = [codec.encode(data[start:start+block_vectors]) for start in range(0, data.shape[0], block_vectors)]
+    return make_container_header(block_vectors, [len(entry) for entry in blocks]) + b''.join(blocks)
@@ -496,7 +496,9 @@ class SIDDWriter(NITFWriter):
 
         Parameters
         ----------
-        file_name : str
+        file_name : str|BinaryIO
+            The output file name, or a writable (not necessarily seekable) file like
+            object, to which the file is emitted sequentially. See :class:`NITFWriter`.
         sidd_meta : SIDDType|List[SIDDType]|SIDDType1|List[SIDDType1]
         sicd_meta : SICDType|List[SICDType]
         check_existence : bool
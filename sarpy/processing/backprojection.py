@@ -0,0 +1,507 @@
+"""
+Time domain back-projection image formation, from CPHD version 1.0 (in the
+transmit frequency domain) to SICD. This is suitable for wide angle and bistatic
+collections, for which the polar format approximations break down.
+
+The processing is performed in two passes:
+
+1. blocks of signal vectors are read from the CPHD, and each vector is range
+   compressed (and upsampled) by zero padded fourier transform, and written to a
+   temporary buffer file,
+2. the image is partitioned into tiles, which are distributed across a process
+   pool. Each worker memory maps the buffer file (so the pulses are never pickled
+   and sent to the workers), and accumulates the contribution of each pulse to
+   each pixel of the tile, using the exact (bistatic) differential time of arrival.
+
+The image is formed on a uniform grid in the chosen image plane, and the SICD
+`Grid.Type` is `PLANE`. The image is demodulated to the center of the spatial
+frequency support, so the usual SICD fourier transform conventions apply.
+
+For a speed versus accuracy trade-off, a factorized (local subaperture)
+back-projection is also provided. Each subaperture of pulses is first combined
+into a single range profile, which is coherent at the center of the tile, and this
+profile is then back-projected to the tile. The cost is reduced by a factor of
+roughly `subaperture_size`, at the expense of phase errors which grow with the
+size of the tile and the angular extent of the subaperture.
+
+Examples
+--------
+.. code-block:: python
+
+    from sarpy.processing.backprojection import BackProjectionProcessor
+
+    processor = BackProjectionProcessor('<cphd file name>', image_plane='GROUND', tile_size=64)
+    print(processor.sicd.Grid.Row.SS, processor.image_size)
+    processor.form_image('<sicd file name>')
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import logging
+import os
+from tempfile import mkstemp
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy
+from scipy.constants import speed_of_light
+
+from sarpy.compliance import int_func
+from sarpy.geometry.geocoords import wgs_84_norm
+from sarpy.io.complex.sicd import SICDWriter
+from sarpy.io.complex.sicd_elements.blocks import Poly2DType
+from sarpy.io.complex.sicd_elements.Grid import GridType, DirParamType, WgtTypeType
+from sarpy.io.complex.sicd_elements.ImageFormation import ProcessingType
+from sarpy.processing.fft_base import fft, ifft, fftshift
+# noinspection PyProtectedMember
+from sarpy.processing.image_formation import CPHDImageFormation, _get_slant_plane_normal
+
+
+# the memory mapped buffers opened in this process, by file name
+_BUFFERS = {}
+
+
+def _get_buffer(file_name):
+    the_buffer = _BUFFERS.get(file_name, None)
+    if the_buffer is None:
+        the_buffer = numpy.load(file_name, mmap_mode='r')
+        _BUFFERS[file_name] = the_buffer
+    return the_buffer
+
+
+def _get_delay(geometry, positions):
+    """
+    Gets the differential time of arrival, with respect to the stabilization
+    reference point, for each pulse and position.
+
+    Parameters
+    ----------
+    geometry : numpy.ndarray
+        The pulse geometry array of shape `(pulses, 9)`.
+    positions : numpy.ndarray
+        Of shape `(N, 3)`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Of shape `(pulses, N)`.
+    """
+
+    tx_range = numpy.linalg.norm(geometry[:, numpy.newaxis, 0:3] - positions[numpy.newaxis, :, :], axis=2)
+    rcv_range = numpy.linalg.norm(geometry[:, numpy.newaxis, 3:6] - positions[numpy.newaxis, :, :], axis=2)
+    return (tx_range + rcv_range - geometry[:, 6:7])/speed_of_light
+
+
+def _sample(data, positions):
+    """
+    Linear interpolation of each row of `data` at the corresponding row of
+    (fractional sample) `positions`. Positions outside of the array yield 0.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Of shape `(lines, input_samples)`.
+    positions : numpy.ndarray
+        Of shape `(lines, output_samples)`.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    lines, input_samples = data.shape
+    base = numpy.floor(positions)
+    fraction = positions - base
+    indices = base.astype('int64')
+    invalid = (indices < 0) | (indices >= input_samples - 1)
+    numpy.clip(indices, 0, input_samples - 2, out=indices)
+    indices += (numpy.arange(lines, dtype='int64')*input_samples)[:, numpy.newaxis]
+    flat_data = numpy.reshape(data, (-1, ))
+    lower = numpy.take(flat_data, indices)
+    out = lower + fraction*(numpy.take(flat_data, indices + 1) - lower)
+    out[invalid] = 0
+    return out
+
+
+def _backproject_direct(profiles, geometry, positions, sgn, pulse_block):
+    """
+    Direct back-projection of all pulses to the given positions.
+
+    Parameters
+    ----------
+    profiles : numpy.ndarray
+    geometry : numpy.ndarray
+    positions : numpy.ndarray
+    sgn : int
+    pulse_block : int
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    num_pulses, length = profiles.shape
+    out = numpy.zeros((positions.shape[0], ), dtype='complex128')
+    for start in range(0, num_pulses, pulse_block):
+        end = min(start + pulse_block, num_pulses)
+        geom = geometry[start:end]
+        delay = _get_delay(geom, positions)
+        values = _sample(numpy.asarray(profiles[start:end]), delay/geom[:, 8:9] + length//2)
+        out += numpy.sum(values*numpy.exp((-sgn*2j*numpy.pi)*geom[:, 7:8]*delay), axis=0)
+    return out
+
+
+def _backproject_factorized(profiles, geometry, positions, sgn, subaperture_size):
+    """
+    Factorized back-projection, where each subaperture is first combined into a
+    single range profile focused at the center of the positions.
+
+    Parameters
+    ----------
+    profiles : numpy.ndarray
+    geometry : numpy.ndarray
+    positions : numpy.ndarray
+    sgn : int
+    subaperture_size : int
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    num_pulses, length = profiles.shape
+    center = numpy.mean(positions, axis=0)[numpy.newaxis, :]
+    out = numpy.zeros((positions.shape[0], ), dtype='complex128')
+    for start in range(0, num_pulses, subaperture_size):
+        end = min(start + subaperture_size, num_pulses)
+        geom = geometry[start:end]
+        middle = (end - start)//2
+        center_delay = _get_delay(geom, center)[:, 0]
+        # the differential delay over the positions, for the middle pulse of the subaperture
+        delta = _get_delay(geom[middle:middle+1], positions)[0] - center_delay[middle]
+        spacing = geom[middle, 8]
+        delta_min = float(numpy.min(delta))
+        count = int_func(numpy.ceil((float(numpy.max(delta)) - delta_min)/spacing)) + 2
+        delta_grid = delta_min + spacing*numpy.arange(count)
+
+        values = _sample(
+            numpy.asarray(profiles[start:end]),
+            (center_delay[:, numpy.newaxis] + delta_grid[numpy.newaxis, :])/geom[:, 8:9] + length//2)
+        carrier = numpy.exp((-sgn*2j*numpy.pi)*geom[:, 7]*center_delay)
+        combined = numpy.sum(values*carrier[:, numpy.newaxis], axis=0)
+        center_frequency = float(numpy.mean(geom[:, 7]))
+        out += _sample(combined[numpy.newaxis, :], ((delta - delta_min)/spacing)[numpy.newaxis, :])[0] * \
+            numpy.exp((-sgn*2j*numpy.pi*center_frequency)*delta)
+    return out
+
+
+def _backproject_tile(task):
+    """
+    Form the given image tile. This is the process pool worker function.
+
+    Parameters
+    ----------
+    task : tuple
+        Of the form `(profile_file, geometry_file, grid_params, tile_limits,
+        subaperture_size, pulse_block)`, where `grid_params` is
+        `(scp, u_row, u_col, spacing, scp_pixel, k_ctr, sgn)`, and `tile_limits`
+        is `(row_start, row_end, col_start, col_end)`.
+
+    Returns
+    -------
+    (int, int, numpy.ndarray)
+        The tile start row, start column, and data.
+    """
+
+    profile_file, geometry_file, grid_params, tile_limits, subaperture_size, pulse_block = task
+    scp, u_row, u_col, spacing, scp_pixel, k_ctr, sgn = grid_params
+    row_start, row_end, col_start, col_end = tile_limits
+    profiles = _get_buffer(profile_file)
+    geometry = numpy.asarray(_get_buffer(geometry_file))
+
+    row_dist = (numpy.arange(row_start, row_end) - scp_pixel[0])*spacing[0]
+    col_dist = (numpy.arange(col_start, col_end) - scp_pixel[1])*spacing[1]
+    row_dist, col_dist = numpy.meshgrid(row_dist, col_dist, indexing='ij')
+    row_dist, col_dist = numpy.reshape(row_dist, (-1, )), numpy.reshape(col_dist, (-1, ))
+    positions = scp + numpy.outer(row_dist, u_row) + numpy.outer(col_dist, u_col)
+
+    if subaperture_size > 1:
+        data = _backproject_factorized(profiles, geometry, positions, sgn, subaperture_size)
+    else:
+        data = _backproject_direct(profiles, geometry, positions, sgn, pulse_block)
+    # demodulate to the center of the spatial frequency support
+    data *= numpy.exp((sgn*2j*numpy.pi)*(k_ctr[0]*row_dist + k_ctr[1]*col_dist))
+    return row_start, col_start, numpy.reshape(data, (row_end - row_start, col_end - col_start)).astype('complex64')
+
+
+class BackProjectionProcessor(CPHDImageFormation):
+    """
+    Time domain back-projection image formation for a single channel of a CPHD
+    version 1.0 file, with signal in the transmit frequency (FX) domain. The
+    resulting SICD structure is determined on construction, and the image is
+    formed and written by :meth:`form_image`.
+
+    The exact transmit and receive positions are used for each pulse, so bistatic
+    collections are supported. The image row direction is the projection into the
+    image plane of the average spatial frequency direction, and the bounding
+    rectangle of the spatial frequency support determines the impulse response
+    bandwidths, with uniform weighting.
+    """
+
+    __slots__ = (
+        '_upsample', '_profile_length', '_tile_size', '_subaperture_size', '_grid_params')
+
+    def __init__(self, reader, index=0, image_plane='SLANT', oversample=1.25, image_size=None,
+                 upsample=8, tile_size=128, subaperture_size=1, block_size=64, max_workers=None,
+                 temp_directory=None):
+        """
+
+        Parameters
+        ----------
+        reader : str|CPHDReader
+            The CPHD file name or reader.
+        index : int|str
+            The CPHD channel index or identifier.
+        image_plane : str
+            One of 'SLANT' or 'GROUND'.
+        oversample : float|Tuple[float, float]
+            The (row, column) ratio of the sample rate to the impulse response
+            bandwidth, which must be at least 1.
+        image_size : None|Tuple[int, int]
+            The (rows, columns) size of the image. The default is the number of
+            samples and the number of valid vectors, scaled by `oversample`.
+        upsample : int
+            The range compression upsample factor, which determines the accuracy
+            of the linear interpolation of the range profiles.
+        tile_size : int|Tuple[int, int]
+            The size of the image tiles distributed to the workers.
+        subaperture_size : int
+            The number of pulses in each subaperture for factorized back-projection,
+            where `1` yields direct back-projection.
+        block_size : int|float
+            The approximate processing block size, given in MB.
+        max_workers : None|int
+            The number of worker processes, where `None` uses the number of cpus,
+            and `1` processes all tiles in this process.
+        temp_directory : None|str
+            The directory for the temporary working files, which defaults to the
+            directory of the output file.
+        """
+
+        image_plane = image_plane.upper()
+        if image_plane not in ['SLANT', 'GROUND']:
+            raise ValueError('image_plane must be one of "SLANT" or "GROUND", got {}'.format(image_plane))
+        if not isinstance(oversample, (list, tuple)):
+            oversample = (oversample, oversample)
+        if min(oversample) < 1:
+            raise ValueError('oversample must be at least 1, got {}'.format(oversample))
+        if not isinstance(tile_size, (list, tuple)):
+            tile_size = (tile_size, tile_size)
+        self._tile_size = (max(1, int_func(tile_size[0])), max(1, int_func(tile_size[1])))
+        self._upsample = max(1, int_func(upsample))
+        self._subaperture_size = max(1, int_func(subaperture_size))
+
+        super(BackProjectionProcessor, self).__init__(
+            reader, index=index, block_size=block_size, max_workers=max_workers, temp_directory=temp_directory)
+        num_samples = self._reader.cphd_meta.Data.Channels[self._index].NumSamples
+        self._profile_length = int_func(2**numpy.ceil(numpy.log2(num_samples*self._upsample)))
+        if image_size is None:
+            image_size = (int_func(numpy.ceil(num_samples*oversample[0])),
+                          int_func(numpy.ceil(self._vectors.size*oversample[1])))
+        self._initialize_sicd(image_plane, oversample, (int_func(image_size[0]), int_func(image_size[1])))
+
+    @property
+    def subaperture_size(self):
+        """
+        int: The number of pulses in each subaperture, where `1` indicates direct back-projection.
+        """
+
+        return self._subaperture_size
+
+    def _initialize_sicd(self, image_plane, oversample, image_size):
+        """
+        Determine the image plane grid, and the SICD structure.
+
+        Parameters
+        ----------
+        image_plane : str
+        oversample : Tuple[float, float]
+        image_size : Tuple[int, int]
+
+        Returns
+        -------
+        None
+        """
+
+        pvp = self._pvp
+        times, position = self._get_position()
+        ref_time = times[self._vectors.size//2]
+        ipn = _get_slant_plane_normal(
+            self._scp, position.ARPPoly(ref_time), position.ARPPoly.derivative_eval(ref_time, der_order=1)) \
+            if image_plane == 'SLANT' else wgs_84_norm(self._scp)
+
+        # the spatial frequency per Hz for each pulse, oriented away from the platforms
+        u_tx = pvp['TxPos'] - self._scp
+        u_tx /= numpy.linalg.norm(u_tx, axis=1)[:, numpy.newaxis]
+        u_rcv = pvp['RcvPos'] - self._scp
+        u_rcv /= numpy.linalg.norm(u_rcv, axis=1)[:, numpy.newaxis]
+        k_per_hz = -(u_tx + u_rcv)/speed_of_light
+        k_mean = numpy.mean(k_per_hz*(0.5*(pvp['FX1'] + pvp['FX2']))[:, numpy.newaxis], axis=0)
+        u_row = k_mean - k_mean.dot(ipn)*ipn
+        u_row /= numpy.linalg.norm(u_row)
+        u_col = numpy.cross(ipn, u_row)
+
+        # the bounding rectangle of the spatial frequency support
+        bounds = []
+        for direction in [u_row, u_col]:
+            k_values = k_per_hz.dot(direction)[:, numpy.newaxis]*numpy.stack([pvp['FX1'], pvp['FX2']], axis=1)
+            bounds.append((float(numpy.min(k_values)), float(numpy.max(k_values))))
+        row_bw = bounds[0][1] - bounds[0][0]
+        col_bw = bounds[1][1] - bounds[1][0]
+        if row_bw <= 0 or col_bw <= 0:
+            raise ValueError('The spatial frequency support is empty')
+        k_ctr = (0.5*(bounds[0][0] + bounds[0][1]), 0.5*(bounds[1][0] + bounds[1][1]))
+        spacing = (1./(oversample[0]*row_bw), 1./(oversample[1]*col_bw))
+
+        grid = GridType(
+            ImagePlane=image_plane, Type='PLANE', TimeCOAPoly=Poly2DType(Coefs=[[ref_time, ], ]),
+            Row=DirParamType(
+                UVectECF=u_row, SS=spacing[0], ImpRespWid=0.886/row_bw, Sgn=self._sgn,
+                ImpRespBW=row_bw, KCtr=k_ctr[0], DeltaK1=-0.5*row_bw, DeltaK2=0.5*row_bw,
+                DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')),
+            Col=DirParamType(
+                UVectECF=u_col, SS=spacing[1], ImpRespWid=0.886/col_bw, Sgn=self._sgn,
+                ImpRespBW=col_bw, KCtr=k_ctr[1], DeltaK1=-0.5*col_bw, DeltaK2=0.5*col_bw,
+                DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')))
+        method = 'FACTORIZED' if self._subaperture_size > 1 else 'DIRECT'
+        processing = ProcessingType(
+            Type='Backprojection', Applied=True,
+            Parameters={'Method': method, 'SubapertureSize': str(self._subaperture_size),
+                        'Upsample': str(self._upsample)})
+        self._sicd = self._create_sicd(image_size, position, grid, 'OTHER', Processings=[processing, ])
+        scp_pixel = (image_size[0]//2, image_size[1]//2)
+        self._grid_params = (self._scp, u_row, u_col, spacing, scp_pixel, k_ctr, self._sgn)
+
+    def _range_compress(self, profiles):
+        """
+        Read the signal vectors, and range compress each. The profile for each
+        vector is baseband with respect to the frequency of its center sample, and
+        the center of the profile corresponds to the stabilization reference point.
+
+        Parameters
+        ----------
+        profiles : numpy.memmap
+            Of shape `(vectors, profile length)`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The pulse geometry array of shape `(vectors, 9)`, consisting of the
+            transmit position, receive position, the reference range sum, the
+            carrier frequency, and the profile sample spacing in seconds.
+        """
+
+        pvp = self._pvp
+        length = self._profile_length
+        num_samples = self._reader.cphd_meta.Data.Channels[self._index].NumSamples
+        center = num_samples//2
+        columns = (numpy.arange(num_samples) - center) % length
+
+        geometry = numpy.empty((self._vectors.size, 9), dtype='float64')
+        geometry[:, 0:3] = pvp['TxPos']
+        geometry[:, 3:6] = pvp['RcvPos']
+        geometry[:, 6] = numpy.linalg.norm(pvp['TxPos'] - pvp['SRPPos'], axis=1) + \
+            numpy.linalg.norm(pvp['RcvPos'] - pvp['SRPPos'], axis=1)
+        geometry[:, 7] = pvp['SC0'] + center*pvp['SCSS']
+        geometry[:, 8] = 1./(length*pvp['SCSS'])
+
+        step = max(1, int_func(self._block_size//(length*32)))
+        # read contiguous runs of vectors
+        breaks = numpy.nonzero(numpy.diff(self._vectors) != 1)[0] + 1
+        run_starts = numpy.concatenate(([0, ], breaks))
+        run_ends = numpy.concatenate((breaks, [self._vectors.size, ]))
+        for run_start, run_end in zip(run_starts, run_ends):
+            for start in range(run_start, run_end, step):
+                end = min(start + step, run_end)
+                data = self._reader.read_chip(
+                    (int_func(self._vectors[start]), int_func(self._vectors[end-1]) + 1, 1), None, index=self._index)
+                spectrum = numpy.zeros((end - start, length), dtype='complex64')
+                spectrum[:, columns] = data
+                compressed = ifft(spectrum, axis=1)*length if self._sgn < 0 else fft(spectrum, axis=1)
+                profiles[start:end, :] = fftshift(compressed, axes=1)
+        return geometry
+
+    def _get_tasks(self, profile_file, geometry_file):
+        rows, cols = self.image_size
+        tile_rows, tile_cols = self._tile_size
+        pulse_block = max(1, int_func(self._block_size//(tile_rows*tile_cols*96)))
+        for row_start in range(0, rows, tile_rows):
+            for col_start in range(0, cols, tile_cols):
+                tile_limits = (row_start, min(row_start + tile_rows, rows), col_start, min(col_start + tile_cols, cols))
+                yield (profile_file, geometry_file, self._grid_params, tile_limits,
+                       self._subaperture_size, pulse_block)
+
+    def form_image(self, output_file, check_existence=True):
+        """
+        Form the image, and write the SICD file.
+
+        Parameters
+        ----------
+        output_file : str
+        check_existence : bool
+            Should we check if the given file already exists, and raises an exception if so?
+
+        Returns
+        -------
+        None
+        """
+
+        directory = self._get_temp_directory(output_file)
+        logging.info(
+            'Forming back-projection image of size {} from {} vectors of CPHD channel {}'.format(
+                self.image_size, self._vectors.size, self._identifier))
+
+        temp_files = []
+        executor = None
+        writer = SICDWriter(output_file, self._sicd, check_existence=check_existence)
+        try:
+            for _ in range(2):
+                fd, temp_file = mkstemp(suffix='.npy', dir=directory)
+                os.close(fd)
+                temp_files.append(temp_file)
+            profiles = numpy.lib.format.open_memmap(
+                temp_files[0], mode='w+', dtype='complex64', shape=(self._vectors.size, self._profile_length))
+            geometry = self._range_compress(profiles)
+            profiles.flush()
+            del profiles
+            numpy.save(temp_files[1], geometry)
+
+            tasks = self._get_tasks(temp_files[0], temp_files[1])
+            if self._max_workers == 1:
+                for row_start, col_start, data in map(_backproject_tile, tasks):
+                    writer.write_chip(data, start_indices=(row_start, col_start))
+            else:
+                # NB: only a few tiles per worker are in flight, so the completed
+                #   tiles do not accumulate in memory ahead of the writer
+                executor = ProcessPoolExecutor(max_workers=self._max_workers)
+                pending = set()
+                while True:
+                    for task in tasks:
+                        pending.add(executor.submit(_backproject_tile, task))
+                        if len(pending) >= 2*self._max_workers:
+                            break
+                    if len(pending) == 0:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        row_start, col_start, data = future.result()
+                        writer.write_chip(data, start_indices=(row_start, col_start))
+        finally:
+            writer.close()
+            if executor is not None:
+                executor.shutdown()
+            for temp_file in temp_files:
+                _BUFFERS.pop(temp_file, None)
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
@@ -45,7 +45,7 @@ from sarpy.compliance import int_func
 from sarpy.processing.fft_base import FFTCalculator, fft, ifft, fftshift
 from sarpy.io.general.base import BaseReader
 # noinspection PyProtectedMember
-from sarpy.processing.ortho_rectify import _get_fetch_block_size
+from sarpy.processing.ortho_rectify import _get_fetch_block_size, _validate_output
 
 __classification__ = "UNCLASSIFIED"
 __author__ = ('Thomas McCullough',  'Melanie Baker')
@@ -234,19 +234,23 @@ class CSICalculator(FFTCalculator):
             data, dimension=1, platform_direction=self._platform_direction,
             filter_map=filter_map)
 
-    def _prepare_output(self, row_range, col_range):
-        row_count = int_func((row_range[1] - row_range[0]) / float(row_range[2]))
-        col_count = int_func((col_range[1] - col_range[0]) / float(col_range[2]))
-        out_size = (row_count, col_count, 3)
+    def _prepare_output(self, row_range, col_range, out=None):
+        out_size = self._get_output_size(row_range, col_range) + (3, )
+        if out is not None:
+            return _validate_output(out, out_size)
         return numpy.zeros(out_size, dtype=numpy.float64)
 
-    def __getitem__(self, item):
+    def fetch(self, item, out=None):
         """
-        Fetches the csi data based on the input slice.
+        Fetches the csi data based on the input slice. Note that
+        :code:`calculator[item]` is equivalent to :code:`calculator.fetch(item)`.
 
         Parameters
         ----------
         item
+        out : None|numpy.ndarray
+            If provided, the result is written into this array, which is
+            returned. This permits reuse of output buffers.
 
         Returns
         -------
@@ -271,13 +275,13 @@ class CSICalculator(FFTCalculator):
             filter_map, row_block_size, this_row_range = get_dimension_details(row_range)
             # get our block definitions
             column_blocks, result_blocks = self.extract_blocks(col_range, row_block_size)
-            if len(column_blocks) == 1:
+            if len(column_blocks) == 1 and out is None:
                 # it's just a single block
                 csi = self._full_row_resolution(this_row_range, col_range, filter_map)
                 return csi[::abs(row_range[2]), :, :]
             else:
                 # prepare the output space
-                out = self._prepare_output(row_range, col_range)
+                out = self._prepare_output(row_range, col_range, out=out)
                 for this_column_range, result_range in zip(column_blocks, result_blocks):
                     csi = self._full_row_resolution(this_row_range, this_column_range, filter_map)
                     out[:, result_range[0]:result_range[1], :] = csi[::abs(row_range[2]), :, :]
@@ -287,13 +291,13 @@ class CSICalculator(FFTCalculator):
             filter_map, column_block_size, this_col_range = get_dimension_details(col_range)
             # get our block definitions
             row_blocks, result_blocks = self.extract_blocks(row_range, column_block_size)
-            if len(row_blocks) == 1:
+            if len(row_blocks) == 1 and out is None:
                 # it's just a single block
                 csi = self._full_column_resolution(row_range, this_col_range, filter_map)
                 return csi[:, ::abs(col_range[2]), :]
             else:
                 # prepare the output space
-                out = self._prepare_output(row_range, col_range)
+                out = self._prepare_output(row_range, col_range, out=out)
                 for this_row_range, result_range in zip(row_blocks, result_blocks):
                     csi = self._full_column_resolution(this_row_range, this_col_range, filter_map)
                     out[result_range[0]:result_range[1], :, :] = csi[:, ::abs(col_range[2]), :]
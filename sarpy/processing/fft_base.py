@@ -123,13 +123,17 @@ class FFTCalculator(FullResolutionFetcher):
                 fill = 1.0
         self._fill = max(1.0, float(fill))
 
-    def __getitem__(self, item):
+    def fetch(self, item, out=None):
         """
-        Fetches the processed data based on the input slice.
+        Fetches the processed data based on the input slice. Note that
+        :code:`calculator[item]` is equivalent to :code:`calculator.fetch(item)`.
 
         Parameters
         ----------
         item
+        out : None|numpy.ndarray
+            If provided, the result is written into this array, which is
+            returned.
 
         Returns
         -------
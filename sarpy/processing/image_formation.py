@@ -0,0 +1,294 @@
+"""
+Common elements for image formation from CPHD version 1.0 (in the transmit
+frequency domain) to SICD.
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import os
+from multiprocessing import cpu_count
+
+import numpy
+from numpy.polynomial import polynomial
+
+from sarpy.compliance import int_func, string_types
+from sarpy.geometry.geocoords import wgs_84_norm
+from sarpy.io.complex.utils import fit_position_xvalidation
+from sarpy.io.complex.sicd_elements.blocks import XYZPolyType
+from sarpy.io.complex.sicd_elements.SICD import SICDType
+from sarpy.io.complex.sicd_elements.CollectionInfo import CollectionInfoType
+from sarpy.io.complex.sicd_elements.ImageData import ImageDataType
+from sarpy.io.complex.sicd_elements.GeoData import GeoDataType, SCPType
+from sarpy.io.complex.sicd_elements.Position import PositionType
+from sarpy.io.complex.sicd_elements.RadarCollection import RadarCollectionType, TxFrequencyType, \
+    ChanParametersType
+from sarpy.io.complex.sicd_elements.Timeline import TimelineType, IPPSetType
+from sarpy.io.complex.sicd_elements.ImageFormation import ImageFormationType, RcvChanProcType, \
+    TxFrequencyProcType
+from sarpy.io.phase_history.cphd import CPHDReader, CPHDReader1_0
+
+
+def _get_slant_plane_normal(scp, arp, arp_vel):
+    """
+    Gets the slant plane normal, oriented away from the earth.
+
+    Parameters
+    ----------
+    scp : numpy.ndarray
+    arp : numpy.ndarray
+    arp_vel : numpy.ndarray
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    u_los = (scp - arp)/numpy.linalg.norm(scp - arp)
+    spn = numpy.cross(arp_vel, u_los)
+    spn /= numpy.linalg.norm(spn)
+    return spn if spn.dot(wgs_84_norm(scp)) >= 0 else -spn
+
+
+class CPHDImageFormation(object):
+    """
+    Base class for image formation from a single channel of a CPHD version 1.0
+    file, with signal in the transmit frequency (FX) domain. The SICD structure
+    is determined on construction, and the image is formed and written by
+    :meth:`form_image`.
+
+    Only the vectors with valid signal are processed. The image is formed about
+    the image area reference point (or the stabilization reference point of the
+    center vector, if the `SceneCoordinates` are not populated).
+    """
+
+    __slots__ = (
+        '_reader', '_index', '_identifier', '_sgn', '_vectors', '_pvp', '_scp',
+        '_range_correction', '_sicd', '_block_size', '_max_workers', '_temp_directory')
+
+    def __init__(self, reader, index=0, block_size=64, max_workers=None, temp_directory=None):
+        """
+
+        Parameters
+        ----------
+        reader : str|CPHDReader
+            The CPHD file name or reader.
+        index : int|str
+            The CPHD channel index or identifier.
+        block_size : int|float
+            The approximate processing block size, given in MB.
+        max_workers : None|int
+            The number of workers, where `None` uses the number of cpus.
+        temp_directory : None|str
+            The directory for the temporary working files, which defaults to the
+            directory of the output file.
+        """
+
+        if isinstance(reader, string_types):
+            reader = CPHDReader(reader)
+        if not isinstance(reader, CPHDReader1_0):
+            raise TypeError('reader is required to be a CPHD version 1.0 reader, got {}'.format(type(reader)))
+
+        self._reader = reader
+        # noinspection PyProtectedMember
+        self._index = reader._validate_index(index)
+        self._identifier = reader.cphd_meta.Data.Channels[self._index].Identifier
+        self._sicd = None
+        self._block_size = max(1, int_func(block_size*1024*1024))
+        self._max_workers = cpu_count() if max_workers is None else max(1, int_func(max_workers))
+        self._temp_directory = temp_directory
+
+        global_params = reader.cphd_meta.Global
+        if global_params is None or global_params.DomainType != 'FX':
+            raise ValueError('Image formation requires a CPHD with FX domain signal')
+        self._sgn = global_params.SGN
+        self._initialize_geometry()
+
+    @property
+    def reader(self):
+        """
+        CPHDReader1_0: The CPHD reader.
+        """
+
+        return self._reader
+
+    @property
+    def index(self):
+        """
+        int: The CPHD channel index.
+        """
+
+        return self._index
+
+    @property
+    def sicd(self):
+        """
+        SICDType: The SICD structure for the formed image.
+        """
+
+        return self._sicd
+
+    @property
+    def image_size(self):
+        """
+        Tuple[int, int]: The (rows, columns) size of the formed image.
+        """
+
+        return self._sicd.ImageData.NumRows, self._sicd.ImageData.NumCols
+
+    def _initialize_geometry(self):
+        """
+        Extract the per vector parameters for the (valid) vectors, and establish
+        the scene center point.
+
+        Returns
+        -------
+        None
+        """
+
+        # only process the vectors with valid signal
+        runs = self._reader.get_pvp_index(self._index).valid_runs
+        if len(runs) == 0:
+            raise ValueError('Channel {} has no valid signal vectors'.format(self._identifier))
+        self._vectors = numpy.concatenate([numpy.arange(start, stop) for start, stop, _ in runs])
+        if self._vectors.size < 2:
+            raise ValueError('Channel {} has fewer than 2 valid signal vectors'.format(self._identifier))
+
+        pvp = self._reader.read_pvp_array(self._index)
+        self._pvp = {}
+        for field in ['TxTime', 'RcvTime', 'FX1', 'FX2', 'SC0', 'SCSS']:
+            self._pvp[field] = numpy.array(pvp[field][self._vectors], dtype='float64')
+        for field in ['TxPos', 'RcvPos', 'TxVel', 'RcvVel', 'SRPPos']:
+            self._pvp[field] = numpy.array(pvp[field][self._vectors, :], dtype='float64')
+
+        scene = self._reader.cphd_meta.SceneCoordinates
+        if scene is not None and scene.IARP is not None and scene.IARP.ECF is not None:
+            self._scp = scene.IARP.ECF.get_array(dtype='float64')
+        else:
+            self._scp = self._pvp['SRPPos'][self._vectors.size//2]
+
+        # the phase history is referenced to the SRP, which may not be the scene center point
+        srp_range = numpy.linalg.norm(self._pvp['TxPos'] - self._pvp['SRPPos'], axis=1) + \
+            numpy.linalg.norm(self._pvp['RcvPos'] - self._pvp['SRPPos'], axis=1)
+        scp_range = numpy.linalg.norm(self._pvp['TxPos'] - self._scp, axis=1) + \
+            numpy.linalg.norm(self._pvp['RcvPos'] - self._scp, axis=1)
+        self._range_correction = srp_range - scp_range
+        if numpy.all(numpy.abs(self._range_correction) < 1e-6):
+            self._range_correction = None
+
+    def _get_collection_info(self):
+        collection_id = self._reader.cphd_meta.CollectionID
+        return CollectionInfoType(
+            CollectorName=collection_id.CollectorName, IlluminatorName=collection_id.IlluminatorName,
+            CoreName=collection_id.CoreName, CollectType=collection_id.CollectType,
+            RadarMode=collection_id.RadarMode, Classification=collection_id.Classification,
+            CountryCodes=collection_id.CountryCodes, Parameters=collection_id.Parameters)
+
+    def _get_polarization(self):
+        # type: () -> (str, str)
+        channel = self._reader.cphd_meta.Channel
+        if channel is not None and channel.Parameters is not None:
+            for entry in channel.Parameters:
+                if entry.Identifier == self._identifier and entry.Polarization is not None:
+                    return entry.Polarization.TxPol, '{}:{}'.format(
+                        entry.Polarization.TxPol, entry.Polarization.RcvPol)
+        return 'UNKNOWN', 'UNKNOWN'
+
+    def _get_position(self):
+        """
+        Fit the aperture reference point polynomial, using the monostatic equivalent
+        aperture reference point (the midpoint of the transmit and receive positions).
+
+        Returns
+        -------
+        (numpy.ndarray, PositionType)
+            The vector times and the position.
+        """
+
+        pvp = self._pvp
+        times = 0.5*(pvp['TxTime'] + pvp['RcvTime'])
+        arp = 0.5*(pvp['TxPos'] + pvp['RcvPos'])
+        arp_vel = 0.5*(pvp['TxVel'] + pvp['RcvVel'])
+        px, py, pz = fit_position_xvalidation(times, arp, arp_vel, max_degree=5)
+        return times, PositionType(ARPPoly=XYZPolyType(X=px, Y=py, Z=pz))
+
+    def _create_sicd(self, image_size, position, grid, image_form_algo, **kwargs):
+        """
+        Create the SICD structure, and derive the remaining fields.
+
+        Parameters
+        ----------
+        image_size : Tuple[int, int]
+        position : PositionType
+        grid : sarpy.io.complex.sicd_elements.Grid.GridType
+        image_form_algo : str
+        kwargs
+            Additional SICD elements (i.e. `PFA`), or `Processings` for the image
+            formation element.
+
+        Returns
+        -------
+        SICDType
+        """
+
+        pvp = self._pvp
+        rows, cols = image_size
+        times = 0.5*(pvp['TxTime'] + pvp['RcvTime'])
+        processings = kwargs.pop('Processings', None)
+        tx_polarization, polarization = self._get_polarization()
+        global_params = self._reader.cphd_meta.Global
+        min_freq, max_freq = float(numpy.min(pvp['FX1'])), float(numpy.max(pvp['FX2']))
+        tx_frequency = TxFrequencyType(Min=min_freq, Max=max_freq)
+        if global_params.FxBand is not None:
+            tx_frequency = TxFrequencyType(Min=global_params.FxBand.FxMin, Max=global_params.FxBand.FxMax)
+        ipp_poly = polynomial.polyfit(pvp['TxTime'], self._vectors, 1)
+        start_time, end_time = float(pvp['TxTime'][0]), float(pvp['TxTime'][-1])
+
+        sicd = SICDType(
+            CollectionInfo=self._get_collection_info(),
+            ImageData=ImageDataType(
+                NumRows=rows, NumCols=cols, FirstRow=0, FirstCol=0, PixelType='RE32F_IM32F',
+                FullImage=(rows, cols), SCPPixel=(rows//2, cols//2)),
+            GeoData=GeoDataType(SCP=SCPType(ECF=self._scp)),
+            Position=position,
+            Grid=grid,
+            RadarCollection=RadarCollectionType(
+                TxFrequency=tx_frequency, TxPolarization=tx_polarization,
+                RcvChannels=[ChanParametersType(TxRcvPolarization=polarization, index=1), ]),
+            Timeline=TimelineType(
+                CollectStart=global_params.Timeline.CollectionStart, CollectDuration=float(numpy.max(times)),
+                IPP=[IPPSetType(
+                    TStart=start_time, TEnd=end_time, IPPStart=int_func(self._vectors[0]),
+                    IPPEnd=int_func(self._vectors[-1]), IPPPoly=ipp_poly, index=1), ]),
+            ImageFormation=ImageFormationType(
+                RcvChanProc=RcvChanProcType(NumChanProc=1, PRFScaleFactor=1, ChanIndices=[self._index + 1, ]),
+                TxRcvPolarizationProc=polarization, TStartProc=start_time, TEndProc=end_time,
+                TxFrequencyProc=TxFrequencyProcType(MinProc=min_freq, MaxProc=max_freq),
+                ImageFormAlgo=image_form_algo, STBeamComp='NO', ImageBeamComp='NO', AzAutofocus='NO',
+                RgAutofocus='NO', Processings=processings),
+            **kwargs)
+        sicd.derive()
+        return sicd
+
+    def _get_temp_directory(self, output_file):
+        if self._temp_directory is not None:
+            return self._temp_directory
+        return os.path.split(os.path.abspath(output_file))[0]
+
+    def form_image(self, output_file, check_existence=True):
+        """
+        Form the image, and write the SICD file.
+
+        Parameters
+        ----------
+        output_file : str
+        check_existence : bool
+            Should we check if the given file already exists, and raises an exception if so?
+
+        Returns
+        -------
+        None
+        """
+
+        raise NotImplementedError
@@ -304,13 +304,17 @@ class DeskewCalculator(FullResolutionFetcher):
         col_array = self._col_mult*(numpy.arange(col_range[0], col_range[1], col_step) - self._col_shift)
         return row_array, col_array
 
-    def __getitem__(self, item):
+    def fetch(self, item, out=None):
         """
-        Fetches the processed data based on the input slice.
+        Fetches the processed data based on the input slice. Note that
+        :code:`calculator[item]` is equivalent to :code:`calculator.fetch(item)`.
 
         Parameters
         ----------
         item
+        out : None|numpy.ndarray
+            If provided, the result is written into this array, which is
+            returned. This permits reuse of output buffers.
 
         Returns
         -------
@@ -340,7 +344,8 @@ class DeskewCalculator(FullResolutionFetcher):
             # just fetch the data and return
             if not isinstance(item, tuple) or len(item) != 2:
                 raise KeyError('Slicing in the deskew calculator must be two dimensional. Got slice item {}'.format(item))
-            return self.reader.__getitem__((item[0], item[1], self.index))
+            row_range, col_range, _ = self._parse_slicing(item)
+            return self.reader(row_range, col_range, index=self.index, out=out)
 
         # parse the slicing to ensure consistent structure
         row_range, col_range, _ = self._parse_slicing(item)
@@ -376,7 +381,12 @@ class DeskewCalculator(FullResolutionFetcher):
             if self._apply_off_axis:
                 # deskew off axis, to the extent possible
                 full_data = other_axis_deskew(full_data, self._row_fft_sgn)
-        return full_data[::abs(row_range[2]), ::abs(col_range[2])]
+        result = full_data[::abs(row_range[2]), ::abs(col_range[2])]
+        if out is None:
+            return result
+        out = self._prepare_output(row_range, col_range, out=out)
+        out[:] = result
+        return out
 
 
 def _get_deskew_params(the_sicd, dimension):
@@ -147,9 +147,10 @@ class ProjectionHelper(object):
     ortho-rectification usage for a sicd type object.
     """
 
-    __slots__ = ('_sicd', '_row_spacing', '_col_spacing', '_default_pixel_method')
+    __slots__ = ('_sicd', '_row_spacing', '_col_spacing', '_default_pixel_method', '_surrogate')
 
-    def __init__(self, sicd, row_spacing=None, col_spacing=None, default_pixel_method='GEOM_MEAN'):
+    def __init__(self, sicd, row_spacing=None, col_spacing=None, default_pixel_method='GEOM_MEAN',
+                 surrogate=None):
         r"""
 
         Parameters
@@ -168,8 +169,12 @@ class ProjectionHelper(object):
             row/column spacing will be the implied function applied to the range
             and azimuth ground resolution. Note that geometric mean is defined as
             :math:`\sqrt(x*x + y*y)`
+        surrogate : None|sarpy.geometry.projection_surrogate.ProjectionSurrogate
+            The optional fitted projection surrogate, used in place of the rigorous
+            ground to image and image to ground plane projections.
         """
 
+        self._surrogate = surrogate
         self._row_spacing = None
         self._col_spacing = None
         default_pixel_method = default_pixel_method.upper()
@@ -196,6 +201,15 @@ class ProjectionHelper(object):
 
         return self._sicd
 
+    @property
+    def surrogate(self):
+        """
+        None|sarpy.geometry.projection_surrogate.ProjectionSurrogate: The fitted
+        projection surrogate, if any.
+        """
+
+        return self._surrogate
+
     @property
     def row_spacing(self):
         """
@@ -503,7 +517,7 @@ class PGProjection(ProjectionHelper):
 
     def __init__(self, sicd, reference_point=None, reference_pixels=None, normal_vector=None, row_vector=None,
                  col_vector=None, row_spacing=None, col_spacing=None,
-                 default_pixel_method='GEOM_MEAN'):
+                 default_pixel_method='GEOM_MEAN', surrogate=None):
         r"""
 
         Parameters
@@ -533,6 +547,9 @@ class PGProjection(ProjectionHelper):
             row/column spacing will be the implied function applied to the range
             and azimuth ground resolution. Note that geometric mean is defined as
             :math:`\sqrt(x*x + y*y)`
+        surrogate : None|sarpy.geometry.projection_surrogate.ProjectionSurrogate
+            The optional fitted projection surrogate, used in place of the rigorous
+            ground to image and image to ground plane projections.
         """
 
         self._reference_point = None
@@ -542,7 +559,8 @@ class PGProjection(ProjectionHelper):
         self._row_vector = None
         self._col_vector = None
         super(PGProjection, self).__init__(
-            sicd, row_spacing=row_spacing, col_spacing=col_spacing, default_pixel_method=default_pixel_method)
+            sicd, row_spacing=row_spacing, col_spacing=col_spacing, default_pixel_method=default_pixel_method,
+            surrogate=surrogate)
         self.set_reference_point(reference_point=reference_point)
         self.set_reference_pixels(reference_pixels=reference_pixels)
         self.set_plane_frame(
@@ -794,7 +812,7 @@ class PGProjection(ProjectionHelper):
         return out
 
     def ecf_to_pixel(self, coords):
-        pixel, _, _ = self.sicd.project_ground_to_image(coords)
+        pixel, _, _ = self.sicd.project_ground_to_image(coords, surrogate=self._surrogate)
         return pixel
 
     def ll_to_ortho(self, ll_coords):
@@ -838,7 +856,8 @@ class PGProjection(ProjectionHelper):
 
     def ortho_to_pixel(self, ortho_coords):
         ortho_coords, o_shape = self._reshape(ortho_coords, 2)
-        pixel, _, _ = self.sicd.project_ground_to_image(self.ortho_to_ecf(ortho_coords))
+        pixel, _, _ = self.sicd.project_ground_to_image(
+            self.ortho_to_ecf(ortho_coords), surrogate=self._surrogate)
         return numpy.reshape(pixel, o_shape)
 
     def pixel_to_ortho(self, pixel_coords):
@@ -847,7 +866,7 @@ class PGProjection(ProjectionHelper):
     def pixel_to_ecf(self, pixel_coords):
         return self.sicd.project_image_to_ground(
             pixel_coords, projection_type='PLANE',
-            gref=self.reference_point, ugpn=self.normal_vector)
+            gref=self.reference_point, ugpn=self.normal_vector, surrogate=self._surrogate)
 
 
 ################
@@ -1961,6 +1980,27 @@ def _extract_blocks(the_range, index_block_size):
     return out1, out2
 
 
+def _validate_output(out, shape):
+    """
+    Validate a caller supplied output array.
+
+    Parameters
+    ----------
+    out : numpy.ndarray
+    shape : tuple
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+
+    if not isinstance(out, numpy.ndarray):
+        raise TypeError('out must be a numpy.ndarray, got type {}'.format(type(out)))
+    if out.shape != tuple(shape):
+        raise ValueError('out has shape {}, but shape {} is required'.format(out.shape, shape))
+    return out
+
+
 def _get_data_mean_magnitude(bounds, reader, index, block_size_in_bytes):
     """
     Gets the mean magnitude in the region defined by bounds.
@@ -2311,32 +2351,44 @@ class FullResolutionFetcher(object):
         data[~numpy.isfinite(data)] = 0
         return data
 
-    def _prepare_output(self, row_range, col_range):
+    @staticmethod
+    def _get_output_size(row_range, col_range):
+        row_count = int_func(numpy.ceil((row_range[1] - row_range[0]) / float(row_range[2])))
+        col_count = int_func(numpy.ceil((col_range[1] - col_range[0]) / float(col_range[2])))
+        return row_count, col_count
+
+    def _prepare_output(self, row_range, col_range, out=None):
         """
-        Prepare the output workspace for :func:`__getitem__`.
+        Prepare the output workspace for :func:`fetch`.
 
         Parameters
         ----------
         row_range
         col_range
+        out : None|numpy.ndarray
+            The caller supplied output array, which will be validated.
 
         Returns
         -------
         numpy.ndarray
         """
 
-        row_count = int_func((row_range[1] - row_range[0]) / float(row_range[2]))
-        col_count = int_func((col_range[1] - col_range[0]) / float(col_range[2]))
-        out_size = (row_count, col_count)
+        out_size = self._get_output_size(row_range, col_range)
+        if out is not None:
+            return _validate_output(out, out_size)
         return numpy.zeros(out_size, dtype=numpy.complex64)
 
-    def __getitem__(self, item):
+    def fetch(self, item, out=None):
         """
-        Fetches the processed data based on the input slice.
+        Fetches the processed data based on the input slice. Note that
+        :code:`fetcher[item]` is equivalent to :code:`fetcher.fetch(item)`.
 
         Parameters
         ----------
         item
+        out : None|numpy.ndarray
+            If provided, the result is written into this array, which is
+            returned. This permits reuse of output buffers.
 
         Returns
         -------
@@ -2345,10 +2397,22 @@ class FullResolutionFetcher(object):
 
         # parse the slicing to ensure consistent structure
         row_range, col_range, _ = self._parse_slicing(item)
-        return self.reader[
-               row_range[0]:row_range[1]:row_range[2],
-               col_range[0]:col_range[1]:col_range[2],
-               self.index]
+        return self.reader(row_range, col_range, index=self.index, out=out)
+
+    def __getitem__(self, item):
+        """
+        Fetches the processed data based on the input slice.
+
+        Parameters
+        ----------
+        item
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        return self.fetch(item)
 
 
 class OrthorectificationIterator(object):
@@ -2360,7 +2424,7 @@ class OrthorectificationIterator(object):
     __slots__ = (
         '_calculator', '_ortho_helper', '_pixel_bounds', '_ortho_bounds',
         '_this_index', '_iteration_blocks', '_the_mean', '_apply_remap',
-        '_dmin', '_mmult')
+        '_dmin', '_mmult', '_fetch_buffer')
 
     def __init__(
             self, ortho_helper, calculator=None, bounds=None, apply_remap=True,
@@ -2391,6 +2455,7 @@ class OrthorectificationIterator(object):
         self._this_index = None
         self._iteration_blocks = None
         self._the_mean = None
+        self._fetch_buffer = None
         self._dmin = dmin
         self._mmult = mmult
 
@@ -2550,6 +2615,44 @@ class OrthorectificationIterator(object):
             # we only need this in order to apply a remap
             self._the_mean = self.calculator.get_data_mean_magnitude(self._pixel_bounds)
 
+    def _fetch_data(self, pixel_bounds, frame=None):
+        """
+        Fetch the data from the calculator for the given pixel bounds. The fetch
+        workspace is reused across iterations, so the result is only valid until
+        the next fetch.
+
+        Parameters
+        ----------
+        pixel_bounds : numpy.ndarray|tuple
+        frame : None|int
+            The (optional) final slice entry for the calculator.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        if frame is None:
+            item = (slice(pixel_bounds[0], pixel_bounds[1]), slice(pixel_bounds[2], pixel_bounds[3]))
+        else:
+            item = (slice(pixel_bounds[0], pixel_bounds[1]), slice(pixel_bounds[2], pixel_bounds[3]), frame)
+
+        buffer = self._fetch_buffer
+        if buffer is not None:
+            shape = (int_func(pixel_bounds[1] - pixel_bounds[0]), int_func(pixel_bounds[3] - pixel_bounds[2])) + \
+                buffer.shape[2:]
+            element_count = int_func(numpy.prod(shape))
+            if element_count <= buffer.size:
+                out = numpy.reshape(numpy.reshape(buffer, (-1, ))[:element_count], shape)
+                try:
+                    return self._calculator.fetch(item, out=out)
+                except ValueError:
+                    pass  # the shape is not as expected, so fall back to allocation
+        data = self._calculator.fetch(item)
+        if data.flags.c_contiguous and data.flags.writeable and (buffer is None or data.size > buffer.size):
+            self._fetch_buffer = data
+        return data
+
     def _get_ortho_helper(self, pixel_bounds, this_data):
         """
         Get helper data for ortho-rectification.
@@ -2662,8 +2765,7 @@ class OrthorectificationIterator(object):
                 this_ortho_bounds[2] - self.ortho_bounds[2], this_ortho_bounds[3] - self.ortho_bounds[2],
                 self.ortho_bounds[1] - self.ortho_bounds[0], self.ortho_bounds[3] - self.ortho_bounds[2]))
         ortho_data = self._get_orthorectified_version(
-            this_ortho_bounds, this_pixel_bounds,
-            self._calculator[this_pixel_bounds[0]:this_pixel_bounds[1], this_pixel_bounds[2]:this_pixel_bounds[3]])
+            this_ortho_bounds, this_pixel_bounds, self._fetch_data(this_pixel_bounds))
         # determine the relative image size
         start_indices = (this_ortho_bounds[0] - self.ortho_bounds[0],
                          this_ortho_bounds[2] - self.ortho_bounds[2])
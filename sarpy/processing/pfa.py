@@ -0,0 +1,447 @@
+"""
+Polar format algorithm (PFA) image formation, from CPHD version 1.0 (in the
+transmit frequency domain) to SICD.
+
+The processing is performed in three passes, with bounded memory usage:
+
+1. blocks of signal vectors are read from the CPHD, and each vector is resampled
+   to a common uniform grid in range spatial frequency (Krg), and written to a
+   temporary file,
+2. blocks of Krg columns are resampled to a uniform grid in azimuth spatial
+   frequency (Kaz), and transformed to the image domain in azimuth, and written
+   to a second temporary file,
+3. blocks of image columns are transformed to the image domain in range, and
+   written to the SICD file.
+
+The resampling is performed using a vectorized polyphase (i.e. tabulated) windowed
+sinc interpolation kernel, and is performed on a thread pool. The fourier transforms
+follow the sign conventions of :mod:`sarpy.processing.fft_base`.
+
+Examples
+--------
+.. code-block:: python
+
+    from sarpy.processing.pfa import PFAProcessor
+
+    processor = PFAProcessor('<cphd file name>', index=0, oversample=1.25)
+    # inspect the derived sicd structure and image size
+    print(processor.sicd.Grid.Row.SS, processor.image_size)
+    processor.form_image('<sicd file name>')
+"""
+
+__classification__ = "UNCLASSIFIED"
+__author__ = "Thomas McCullough"
+
+
+import logging
+import os
+from tempfile import mkstemp
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+from numpy.polynomial import polynomial
+from scipy.constants import speed_of_light
+
+from sarpy.compliance import int_func
+from sarpy.geometry.geocoords import wgs_84_norm
+from sarpy.io.complex.sicd import SICDWriter
+from sarpy.io.complex.sicd_elements.blocks import Poly1DType, Poly2DType
+from sarpy.io.complex.sicd_elements.Grid import GridType, DirParamType, WgtTypeType
+from sarpy.io.complex.sicd_elements.PFA import PFAType
+from sarpy.processing.fft_base import ifft_sicd, fftshift, ifftshift
+# noinspection PyProtectedMember
+from sarpy.processing.image_formation import CPHDImageFormation, _get_slant_plane_normal
+
+
+class PolyphaseInterpolator(object):
+    """
+    Vectorized interpolation of uniformly sampled (band limited) complex data at
+    arbitrary positions, using a tabulated Kaiser windowed sinc kernel. The kernel
+    is tabulated at `phases` fractional offsets, and the nearest tabulated offset
+    is used for each position.
+    """
+
+    __slots__ = ('_taps', '_phases', '_offsets', '_table')
+
+    def __init__(self, taps=8, phases=256, beta=5.0):
+        """
+
+        Parameters
+        ----------
+        taps : int
+            The (even) number of input samples contributing to each output sample.
+        phases : int
+            The number of tabulated fractional offsets.
+        beta : float
+            The Kaiser window shape parameter.
+        """
+
+        taps = int_func(taps)
+        if taps < 2 or (taps % 2) != 0:
+            raise ValueError('taps must be a positive even integer, got {}'.format(taps))
+        self._taps = taps
+        self._phases = int_func(phases)
+        self._offsets = numpy.arange(1 - taps//2, taps//2 + 1, dtype='int64')
+        # the kernel weight for input sample base + offset, at position base + fraction
+        fractions = numpy.arange(self._phases + 1, dtype='float64')/self._phases
+        arg = self._offsets[numpy.newaxis, :] - fractions[:, numpy.newaxis]
+        window = numpy.i0(beta*numpy.sqrt(numpy.clip(1 - (2*arg/taps)**2, 0, None)))/numpy.i0(beta)
+        table = numpy.sinc(arg)*window
+        self._table = (table/numpy.sum(table, axis=1)[:, numpy.newaxis]).astype('float32')
+
+    @property
+    def taps(self):
+        """
+        int: The number of input samples contributing to each output sample.
+        """
+
+        return self._taps
+
+    def __call__(self, data, positions):
+        """
+        Interpolate each row of `data` at the corresponding row of (fractional
+        sample) `positions`. Input samples outside of the array are treated as 0.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            Of shape `(lines, input_samples)`.
+        positions : numpy.ndarray
+            Of shape `(lines, output_samples)`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Of shape `(lines, output_samples)`.
+        """
+
+        lines, input_samples = data.shape
+        if positions.ndim != 2 or positions.shape[0] != lines:
+            raise ValueError(
+                'positions must be of shape ({}, N), got {}'.format(lines, positions.shape))
+        base = numpy.floor(positions)
+        phase = numpy.rint((positions - base)*self._phases).astype('int64')
+        indices = base.astype('int64')[:, :, numpy.newaxis] + self._offsets
+        weights = self._table[phase]
+        weights[(indices < 0) | (indices >= input_samples)] = 0
+        numpy.clip(indices, 0, input_samples - 1, out=indices)
+        indices += (numpy.arange(lines, dtype='int64')*input_samples)[:, numpy.newaxis, numpy.newaxis]
+        samples = numpy.take(numpy.reshape(data, (-1, )), indices)
+        return numpy.einsum('ijk,ijk->ij', samples, weights)
+
+
+def _get_uniform_count(lower, upper, spacing):
+    # the (odd) number of samples with the given spacing, fitting in [lower, upper]
+    count = int_func(numpy.floor((upper - lower)/spacing)) + 1
+    return count if (count % 2) == 1 else count - 1
+
+
+class PFAProcessor(CPHDImageFormation):
+    """
+    Polar format image formation for a single channel of a CPHD version 1.0
+    file, with signal in the transmit frequency (FX) domain. The resulting SICD
+    structure is determined on construction, and the image is formed and
+    written by :meth:`form_image`.
+
+    This uses the monostatic equivalent aperture reference point (the midpoint
+    of the transmit and receive positions). The inscribed rectangle of the polar
+    spatial frequency support is resampled with uniform weighting.
+    """
+
+    __slots__ = ('_polar_angle', '_krg_per_hz', '_sizes', '_spacing', '_bounds', '_interpolator')
+
+    def __init__(self, reader, index=0, image_plane='SLANT', oversample=1.25, taps=8,
+                 block_size=64, max_workers=None, temp_directory=None):
+        """
+
+        Parameters
+        ----------
+        reader : str|CPHDReader
+            The CPHD file name or reader.
+        index : int|str
+            The CPHD channel index or identifier.
+        image_plane : str
+            One of 'SLANT' or 'GROUND'.
+        oversample : float|Tuple[float, float]
+            The (row, column) ratio of the image size to the number of spatial
+            frequency samples, which must be at least 1.
+        taps : int
+            The number of taps for the interpolation kernel.
+        block_size : int|float
+            The approximate processing block size, given in MB.
+        max_workers : None|int
+            The number of threads used for interpolation, where `None` uses the
+            number of cpus.
+        temp_directory : None|str
+            The directory for the temporary working files, which defaults to the
+            directory of the output file.
+        """
+
+        image_plane = image_plane.upper()
+        if image_plane not in ['SLANT', 'GROUND']:
+            raise ValueError('image_plane must be one of "SLANT" or "GROUND", got {}'.format(image_plane))
+        if not isinstance(oversample, (list, tuple)):
+            oversample = (oversample, oversample)
+        if min(oversample) < 1:
+            raise ValueError('oversample must be at least 1, got {}'.format(oversample))
+
+        self._interpolator = PolyphaseInterpolator(taps=taps)
+        super(PFAProcessor, self).__init__(
+            reader, index=index, block_size=block_size, max_workers=max_workers, temp_directory=temp_directory)
+        self._initialize_sicd(image_plane, oversample)
+
+    def _initialize_sicd(self, image_plane, oversample):
+        """
+        Determine the polar format geometry, the resampling grids, and the SICD structure.
+
+        Parameters
+        ----------
+        image_plane : str
+        oversample : Tuple[float, float]
+
+        Returns
+        -------
+        None
+        """
+
+        pvp = self._pvp
+        num_vectors = self._vectors.size
+        times, position = self._get_position()
+
+        ref_time = times[num_vectors//2]
+        ref_arp = position.ARPPoly(ref_time)
+        fpn = wgs_84_norm(self._scp)
+        ipn = _get_slant_plane_normal(self._scp, ref_arp, position.ARPPoly.derivative_eval(ref_time, der_order=1)) \
+            if image_plane == 'SLANT' else fpn
+        pfa = PFAType(FPN=fpn, IPN=ipn, PolarAngRefTime=ref_time)
+
+        # the unit vectors, following the sicd derivation for PFA
+        dist = (self._scp - ref_arp).dot(ipn)/fpn.dot(ipn)
+        u_row = self._scp - (ref_arp + dist*fpn)
+        u_row /= numpy.linalg.norm(u_row)
+        u_col = numpy.cross(ipn, u_row)
+
+        polar_angle, scale_factor = pfa.pfa_polar_coords(position, self._scp, times)
+        tan_angle = numpy.tan(polar_angle)
+        diffs = numpy.diff(tan_angle)
+        if not (numpy.all(diffs > 0) or numpy.all(diffs < 0)):
+            raise ValueError('The polar angle is required to be strictly monotonic in vector index')
+        self._polar_angle = polar_angle
+        self._krg_per_hz = 2*scale_factor*numpy.cos(polar_angle)/speed_of_light
+
+        # the inscribed rectangle in spatial frequency
+        krg1 = float(numpy.max(pvp['FX1']*self._krg_per_hz))
+        krg2 = float(numpy.min(pvp['FX2']*self._krg_per_hz))
+        if krg2 <= krg1:
+            raise ValueError('The range spatial frequency support is empty')
+        tan_min, tan_max = float(numpy.min(tan_angle)), float(numpy.max(tan_angle))
+        kaz1 = max(krg1*tan_min, krg2*tan_min)
+        kaz2 = min(krg1*tan_max, krg2*tan_max)
+        if kaz2 <= kaz1:
+            raise ValueError('The azimuth spatial frequency support is empty')
+
+        # the native sample spacing, and resulting uniform grids
+        krg_spacing = float(numpy.min(pvp['SCSS']*self._krg_per_hz))
+        kaz_spacing = krg2*(tan_max - tan_min)/float(num_vectors - 1)
+        rg_count = _get_uniform_count(krg1, krg2, krg_spacing)
+        az_count = _get_uniform_count(kaz1, kaz2, kaz_spacing)
+        if rg_count < 3 or az_count < 3:
+            raise ValueError('The spatial frequency support is too small to form an image')
+        krg2 = krg1 + (rg_count - 1)*krg_spacing
+        kaz2 = kaz1 + (az_count - 1)*kaz_spacing
+        rows = int_func(numpy.ceil(rg_count*oversample[0]))
+        cols = int_func(numpy.ceil(az_count*oversample[1]))
+        self._sizes = (rg_count, az_count, rows, cols)
+        self._spacing = (krg_spacing, kaz_spacing)
+        self._bounds = (krg1, krg2, kaz1, kaz2)
+
+        pfa.Krg1, pfa.Krg2, pfa.Kaz1, pfa.Kaz2 = krg1, krg2, kaz1, kaz2
+        degree = min(5, num_vectors - 1)
+        pfa.PolarAngPoly = Poly1DType(Coefs=polynomial.polyfit(times, polar_angle, degree))
+        pfa.SpatialFreqSFPoly = Poly1DType(Coefs=polynomial.polyfit(polar_angle, scale_factor, min(2, degree)))
+
+        row_bw, col_bw = krg2 - krg1, kaz2 - kaz1
+        grid = GridType(
+            ImagePlane=image_plane, Type='RGAZIM', TimeCOAPoly=Poly2DType(Coefs=[[ref_time, ], ]),
+            Row=DirParamType(
+                UVectECF=u_row, SS=1./(rows*krg_spacing), ImpRespWid=0.886/row_bw, Sgn=self._sgn,
+                ImpRespBW=row_bw, KCtr=0.5*(krg1 + krg2), DeltaK1=-0.5*row_bw, DeltaK2=0.5*row_bw,
+                DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')),
+            Col=DirParamType(
+                UVectECF=u_col, SS=1./(cols*kaz_spacing), ImpRespWid=0.886/col_bw, Sgn=self._sgn,
+                ImpRespBW=col_bw, KCtr=0.5*(kaz1 + kaz2), DeltaK1=-0.5*col_bw, DeltaK2=0.5*col_bw,
+                DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')))
+
+        self._sicd = self._create_sicd((rows, cols), position, grid, 'PFA', PFA=pfa)
+
+    def _get_executor(self):
+        return None if self._max_workers == 1 else ThreadPoolExecutor(max_workers=self._max_workers)
+
+    def _interpolate(self, executor, data, positions):
+        """
+        Interpolate, splitting the lines among the workers.
+
+        Parameters
+        ----------
+        executor : None|ThreadPoolExecutor
+        data : numpy.ndarray
+        positions : numpy.ndarray
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+
+        lines = data.shape[0]
+        if executor is None or lines < 2:
+            return self._interpolator(data, positions)
+        edges = numpy.linspace(0, lines, min(lines, self._max_workers) + 1).astype('int64')
+        pieces = executor.map(
+            lambda args: self._interpolator(data[args[0]:args[1]], positions[args[0]:args[1]]),
+            zip(edges[:-1], edges[1:]))
+        return numpy.concatenate(list(pieces), axis=0)
+
+    def _lines_per_block(self, samples_per_line):
+        # the interpolation gathers, weights, and indices dominate the memory usage
+        return max(1, int_func(self._block_size//(samples_per_line*(8 + 4 + 8)*self._interpolator.taps)))
+
+    def _range_interpolate(self, executor, range_data):
+        """
+        Read the signal vectors, and resample each to the uniform grid in Krg.
+
+        Parameters
+        ----------
+        executor : None|ThreadPoolExecutor
+        range_data : numpy.memmap
+            Of shape `(vectors, range samples)`.
+
+        Returns
+        -------
+        None
+        """
+
+        rg_count = self._sizes[0]
+        krg = self._bounds[0] + self._spacing[0]*numpy.arange(rg_count)
+        step = self._lines_per_block(max(rg_count, self._reader.cphd_meta.Data.Channels[self._index].NumSamples))
+        # read contiguous runs of vectors
+        breaks = numpy.nonzero(numpy.diff(self._vectors) != 1)[0] + 1
+        run_starts = numpy.concatenate(([0, ], breaks))
+        run_ends = numpy.concatenate((breaks, [self._vectors.size, ]))
+        for run_start, run_end in zip(run_starts, run_ends):
+            for start in range(run_start, run_end, step):
+                end = min(start + step, run_end)
+                data = self._reader.read_chip(
+                    (int_func(self._vectors[start]), int_func(self._vectors[end-1]) + 1, 1), None, index=self._index)
+                sc0 = self._pvp['SC0'][start:end, numpy.newaxis]
+                scss = self._pvp['SCSS'][start:end, numpy.newaxis]
+                if self._range_correction is not None:
+                    frequencies = sc0 + scss*numpy.arange(data.shape[1])
+                    correction = self._range_correction[start:end, numpy.newaxis]
+                    data = data*numpy.exp((self._sgn*2j*numpy.pi/speed_of_light)*frequencies*correction)
+                positions = (krg[numpy.newaxis, :]/self._krg_per_hz[start:end, numpy.newaxis] - sc0)/scss
+                range_data[start:end, :] = self._interpolate(executor, data, positions)
+
+    def _azimuth_process(self, executor, range_data, azimuth_data):
+        """
+        Resample each Krg column to the uniform grid in Kaz, and transform to the
+        image domain in azimuth.
+
+        Parameters
+        ----------
+        executor : None|ThreadPoolExecutor
+        range_data : numpy.memmap
+            Of shape `(vectors, range samples)`.
+        azimuth_data : numpy.memmap
+            Of shape `(range samples, image columns)`.
+
+        Returns
+        -------
+        None
+        """
+
+        rg_count, az_count, _, cols = self._sizes
+        krg = self._bounds[0] + self._spacing[0]*numpy.arange(rg_count)
+        kaz = self._bounds[2] + self._spacing[1]*numpy.arange(az_count)
+        tan_angle = numpy.tan(self._polar_angle)
+        vector_index = numpy.arange(tan_angle.size, dtype='float64')
+        if tan_angle[0] > tan_angle[-1]:
+            tan_angle, vector_index = tan_angle[::-1], vector_index[::-1]
+        offset = cols//2 - (az_count - 1)//2
+        step = self._lines_per_block(max(cols, tan_angle.size))
+        for start in range(0, rg_count, step):
+            end = min(start + step, rg_count)
+            data = numpy.ascontiguousarray(range_data[:, start:end].T)
+            positions = numpy.interp(kaz[numpy.newaxis, :]/krg[start:end, numpy.newaxis], tan_angle, vector_index)
+            padded = numpy.zeros((end - start, cols), dtype='complex64')
+            padded[:, offset:offset+az_count] = self._interpolate(executor, data, positions)
+            azimuth_data[start:end, :] = fftshift(ifft_sicd(ifftshift(padded, axes=1), 1, self._sicd), axes=1)
+
+    def _range_process(self, azimuth_data, writer):
+        """
+        Transform to the image domain in range, and write the image.
+
+        Parameters
+        ----------
+        azimuth_data : numpy.memmap
+            Of shape `(range samples, image columns)`.
+        writer : SICDWriter
+
+        Returns
+        -------
+        None
+        """
+
+        rg_count, _, rows, cols = self._sizes
+        offset = rows//2 - (rg_count - 1)//2
+        step = max(1, int_func(self._block_size//(rows*16)))
+        for start in range(0, cols, step):
+            end = min(start + step, cols)
+            padded = numpy.zeros((rows, end - start), dtype='complex64')
+            padded[offset:offset+rg_count, :] = azimuth_data[:, start:end]
+            image = fftshift(ifft_sicd(ifftshift(padded, axes=0), 0, self._sicd), axes=0)
+            writer.write_chip(image.astype('complex64'), start_indices=(0, start))
+
+    def form_image(self, output_file, check_existence=True):
+        """
+        Form the image, and write the SICD file.
+
+        Parameters
+        ----------
+        output_file : str
+        check_existence : bool
+            Should we check if the given file already exists, and raises an exception if so?
+
+        Returns
+        -------
+        None
+        """
+
+        rg_count, az_count, rows, cols = self._sizes
+        directory = self._get_temp_directory(output_file)
+        logging.info(
+            'Forming PFA image of size {} from {} vectors of CPHD channel {}'.format(
+                (rows, cols), self._vectors.size, self._identifier))
+
+        temp_files = []
+        executor = self._get_executor()
+        writer = SICDWriter(output_file, self._sicd, check_existence=check_existence)
+        try:
+            for _ in range(2):
+                fd, temp_file = mkstemp(suffix='.pfa', dir=directory)
+                os.close(fd)
+                temp_files.append(temp_file)
+            range_data = numpy.memmap(
+                temp_files[0], dtype='complex64', mode='w+', shape=(self._vectors.size, rg_count))
+            self._range_interpolate(executor, range_data)
+            azimuth_data = numpy.memmap(temp_files[1], dtype='complex64', mode='w+', shape=(rg_count, cols))
+            self._azimuth_process(executor, range_data, azimuth_data)
+            del range_data
+            self._range_process(azimuth_data, writer)
+            del azimuth_data
+        finally:
+            writer.close()
+            if executor is not None:
+                executor.shutdown()
+            for temp_file in temp_files:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
@@ -13,7 +13,8 @@ from sarpy.processing.fft_base import FFTCalculator, fft, ifft, fftshift
 from sarpy.io.general.slice_parsing import validate_slice, validate_slice_int
 from sarpy.io.product.sidd_structure_creation import create_sidd_structure
 from sarpy.io.product.sidd import SIDDWriter
-from sarpy.processing.ortho_rectify import OrthorectificationHelper, OrthorectificationIterator
+from sarpy.processing.ortho_rectify import OrthorectificationHelper, OrthorectificationIterator, \
+    _validate_output
 
 
 ####################
@@ -363,25 +364,28 @@ class SubapertureCalculator(FFTCalculator):
             else:
                 yield this_subap_data[:, ::step]
 
-    def _prepare_output(self, row_range, col_range, frames=None):
-        row_count = int_func((row_range[1] - row_range[0]) / float(row_range[2]))
-        col_count = int_func((col_range[1] - col_range[0]) / float(col_range[2]))
-        if frames is None or len(frames) == 1:
-            out_size = (row_count, col_count)
-        else:
-            out_size = (row_count, col_count, len(frames))
+    def _prepare_output(self, row_range, col_range, frames=None, out=None):
+        out_size = self._get_output_size(row_range, col_range)
+        if frames is not None and len(frames) != 1:
+            out_size += (len(frames), )
+        if out is not None:
+            return _validate_output(out, out_size)
         return numpy.zeros(out_size, dtype=numpy.complex64)
 
-    def __getitem__(self, item):
+    def fetch(self, item, out=None):
         """
         Fetches the csi data based on the input slice. Slicing in the final
         dimension using an integer, slice, or integer array is supported. Note
         that this could easily be memory intensive, and should be used with
-        some care.
+        some care. Note that :code:`calculator[item]` is equivalent to
+        :code:`calculator.fetch(item)`.
 
         Parameters
         ----------
         item
+        out : None|numpy.ndarray
+            If provided, the result is written into this array, which is
+            returned. This permits reuse of output buffers.
 
         Returns
         -------
@@ -400,11 +404,11 @@ class SubapertureCalculator(FFTCalculator):
             column_block_size = self.get_fetch_block_size(row_range[0], row_range[1])
             # get our block definitions
             column_blocks, result_blocks = self.extract_blocks(col_range, column_block_size)
-            if column_blocks == 1 and len(frames) == 1:
+            if len(column_blocks) == 1 and len(frames) == 1 and out is None:
                 # no need to prepare output, which will take twice the memory, so just return
                 out = self.subaperture_generator(row_range, col_range, frames).__next__()
             else:
-                out = self._prepare_output(row_range, col_range, frames=frames)
+                out = self._prepare_output(row_range, col_range, frames=frames, out=out)
                 for this_column_range, result_range in zip(column_blocks, result_blocks):
                     generator = self.subaperture_generator(row_range, this_column_range, frames)
                     if len(frames) == 1:
@@ -416,10 +420,10 @@ class SubapertureCalculator(FFTCalculator):
             row_block_size = self.get_fetch_block_size(col_range[0], col_range[1])
             # get our block definitions
             row_blocks, result_blocks = self.extract_blocks(row_range, row_block_size)
-            if row_blocks == 1 and len(frames) == 1:
+            if len(row_blocks) == 1 and len(frames) == 1 and out is None:
                 out = self.subaperture_generator(row_range, col_range, frames).__next__()
             else:
-                out = self._prepare_output(row_range, col_range, frames=frames)
+                out = self._prepare_output(row_range, col_range, frames=frames, out=out)
                 for this_row_range, result_range in zip(row_blocks, result_blocks):
                     generator = self.subaperture_generator(this_row_range, col_range, frames)
                     if len(frames) == 1:
@@ -547,10 +551,7 @@ class SubapertureOrthoIterator(OrthorectificationIterator):
                 self._this_frame))
 
 
-        data = self.calculator[
-               this_pixel_bounds[0]:this_pixel_bounds[1],
-               this_pixel_bounds[2]:this_pixel_bounds[3],
-               self._this_frame]
+        data = self._fetch_data(this_pixel_bounds, frame=self._this_frame)
         ortho_data = self._get_orthorectified_version(this_ortho_bounds, this_pixel_bounds,data)
         start_indices = (this_ortho_bounds[0] - self.ortho_bounds[0],
                          this_ortho_bounds[2] - self.ortho_bounds[2])
@@ -58,7 +58,7 @@ setup(name=parameters['__title__'],
       url=parameters['__url__'],
       author=parameters['__author__'],
       author_email=parameters['__email__'],  # The primary POC
-      install_requires=['numpy>=1.11.0', 'scipy', 'typing;python_version<"3.4"'],
+      install_requires=['numpy>=1.11.0', 'scipy', 'typing;python_version<"3.4"', 'futures;python_version<"3"'],
       zip_safe=False,  # Use of __file__ and __path__ in some code makes it unusable from zip
       test_suite="setup.my_test_suite",
       tests_require=["unittest2;python_version<'3.4'", ],
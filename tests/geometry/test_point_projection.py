@@ -0,0 +1,191 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from sarpy.geometry.geocoords import ecf_to_geodetic
+from sarpy.geometry.point_projection import ground_to_image, image_to_ground_hae, image_to_ground_dem, \
+    image_to_ground_plane, _DEMMaxPyramid
+from sarpy.io.DEM.DEM import DEMInterpolator
+from sarpy.io.DEM.DTED import DTEDInterpolator
+
+from tests import unittest
+from tests.helpers import make_sicd, write_dted, write_geoid
+
+
+class _HillInterpolator(DEMInterpolator):
+    """
+    A gaussian hill, which counts the number of elevation evaluations.
+    """
+
+    def __init__(self, lat, lon, sigma, height):
+        self.center = numpy.array([lat, lon])
+        self.sigma = sigma
+        self.height = height
+        self.evaluations = 0
+
+    def get_elevation_hae(self, lat, lon, block_size=50000):
+        self.evaluations += numpy.size(lat)
+        distance2 = (lat - self.center[0])**2 + (lon - self.center[1])**2
+        return self.height*numpy.exp(-distance2/(self.sigma*self.sigma))
+
+    def get_elevation_geoid(self, lat, lon, block_size=50000):
+        return self.get_elevation_hae(lat, lon, block_size=block_size)
+
+    def _get_value(self, lat_lon_box, nearest):
+        lats = numpy.clip(self.center[0], lat_lon_box[0], lat_lon_box[1]) if nearest else \
+            numpy.array(lat_lon_box[:2])[:, numpy.newaxis]
+        lons = numpy.clip(self.center[1], lat_lon_box[2], lat_lon_box[3]) if nearest else \
+            numpy.array(lat_lon_box[2:])[numpy.newaxis, :]
+        distance2 = (lats - self.center[0])**2 + (lons - self.center[1])**2
+        return float(numpy.min(self.height*numpy.exp(-distance2/(self.sigma*self.sigma))))
+
+    def get_max_hae(self, lat_lon_box=None):
+        return self._get_value(lat_lon_box, True)
+
+    def get_min_hae(self, lat_lon_box=None):
+        return self._get_value(lat_lon_box, False)
+
+    def get_interpolation_support(self):
+        return numpy.zeros((2, )), 0.0  # the values over a box are exact
+
+
+class TestPointProjection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sicd = make_sicd()
+
+    def test_round_trip(self):
+        rows, cols = numpy.mgrid[-100:101:20, -100:101:20]
+        im_points = numpy.stack([rows.flatten(), cols.flatten()], axis=1) + self.sicd.ImageData.SCPPixel.get_array()
+        coords = image_to_ground_hae(im_points, self.sicd, block_size=17)
+        image_points, delta_gpn, iterations = ground_to_image(coords, self.sicd, tolerance=1e-6, block_size=17)
+        numpy.testing.assert_allclose(image_points, im_points, atol=1e-4)
+        self.assertEqual(iterations.shape, (im_points.shape[0], ))
+        self.assertTrue(numpy.all(delta_gpn <= 1e-6))
+        # each point is only iterated until it converges
+        self.assertTrue(numpy.all((iterations >= 1) & (iterations < 10)))
+        self.assertGreater(numpy.ptp(iterations), 0)
+
+    def test_single_pass(self):
+        im_points = numpy.array([[3.5, 10.25], [40., 60.], [63., 1.]])
+        coords = image_to_ground_hae(im_points, self.sicd, hae0=200.)
+        with self.subTest(msg='ground to image'):
+            expected = ground_to_image(coords, self.sicd, max_iterations=1)
+            self.assertTrue(numpy.all(expected[2] == 1))
+            # at least one pass is always performed
+            for result, expected_result in zip(ground_to_image(coords, self.sicd, max_iterations=0), expected):
+                numpy.testing.assert_array_equal(result, expected_result)
+        with self.subTest(msg='image to ground hae'):
+            numpy.testing.assert_array_equal(
+                image_to_ground_hae(im_points, self.sicd, hae0=200., max_iterations=0),
+                image_to_ground_hae(im_points, self.sicd, hae0=200., max_iterations=1))
+
+    def test_process_pool(self):
+        im_points = numpy.random.uniform(0, 64, size=(5, 40, 2))
+        coords = image_to_ground_hae(im_points, self.sicd, block_size=50)
+        pool_coords = image_to_ground_hae(im_points, self.sicd, block_size=50, max_workers=2)
+        numpy.testing.assert_array_equal(pool_coords, coords)
+        results = ground_to_image(coords, self.sicd, block_size=50)
+        pool_results = ground_to_image(coords, self.sicd, block_size=50, max_workers=2, max_worker_memory=0.01)
+        for result, pool_result in zip(results, pool_results):
+            self.assertEqual(pool_result.shape, result.shape)
+            numpy.testing.assert_array_equal(pool_result, result)
+
+    def test_plane_grid(self):
+        sicd = self.sicd.copy()
+        sicd.Grid.Type = 'PLANE'
+        u_row = sicd.Grid.Row.UVectECF.get_array()
+        u_col = sicd.Grid.Col.UVectECF.get_array()
+        normal = numpy.cross(u_row, u_col)
+        normal /= numpy.linalg.norm(normal)
+        # a column direction in the image plane which is not orthogonal to the row direction
+        u_col = numpy.cos(numpy.deg2rad(60))*u_row + numpy.sin(numpy.deg2rad(60))*numpy.cross(normal, u_row)
+        sicd.Grid.Col.UVectECF = u_col
+        sicd.define_coa_projection(overide=True)
+
+        scp_pixel = sicd.ImageData.SCPPixel.get_array()
+        im_points = scp_pixel + numpy.array([[0, 0], [0, 10], [0, -7], [5, 3]], dtype='float64')
+        # the image plane points
+        expected = sicd.GeoData.SCP.ECF.get_array() + \
+            numpy.outer((im_points[:, 0] - scp_pixel[0])*sicd.Grid.Row.SS, u_row) + \
+            numpy.outer((im_points[:, 1] - scp_pixel[1])*sicd.Grid.Col.SS, u_col)
+        numpy.testing.assert_allclose(image_to_ground_plane(im_points, sicd, ugpn=normal), expected, atol=1e-6)
+        numpy.testing.assert_allclose(ground_to_image(expected, sicd)[0], im_points, atol=1e-6)
+
+    def test_dem(self):
+        im_points = numpy.stack(numpy.meshgrid(numpy.arange(0, 64, 7.), numpy.arange(0, 64, 7.)), axis=-1)
+        scp_llh = ecf_to_geodetic(self.sicd.GeoData.SCP.ECF.get_array())
+        dem = _HillInterpolator(scp_llh[0] + 1e-4, scp_llh[1], 2e-4, 1000.)
+        coords = image_to_ground_dem(im_points, self.sicd, dem_interpolator=dem, vertical_step_size=10)
+        self.assertEqual(coords.shape, im_points.shape[:-1] + (3, ))
+        llh = ecf_to_geodetic(coords)
+        numpy.testing.assert_allclose(llh[..., 2], dem.get_elevation_hae(llh[..., 0], llh[..., 1]), atol=0.01)
+        # a fixed step search would require more than 100 evaluations per point
+        self.assertLess(dem.evaluations, 30*llh[..., 0].size)
+
+
+class TestSteepDEM(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        # NB: the center column is then not on the tile boundary at longitude 0
+        cls.sicd = make_sicd(rows=79, cols=77)
+        cls.geoid_file = os.path.join(cls.directory, 'geoid.pgm')
+        write_geoid(cls.geoid_file)
+        # flat tiles around the scene, with a single 300m spike at the post on the
+        #   last longitude of the western tiles, which is only a few meters across
+        cls.files = []
+        for lat in [-1, 0]:
+            for lon in [-1, 0]:
+                values = numpy.zeros((1201, 1201), dtype='int64')
+                if (lat, lon) == (0, -1):
+                    values[1200, 1] = 300
+                file_name = os.path.join(cls.directory, 'tile_{}_{}.dt1'.format(lat, lon))
+                write_dted(file_name, lat, lon, values)
+                cls.files.append(file_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_pyramid_bound(self):
+        numpy.random.seed(11)
+        spacing = 1./1200
+        box = numpy.array([-spacing, 3*spacing, -2*spacing, 2*spacing])
+        for cubic in [False, True]:
+            dem = DTEDInterpolator(self.files, self.geoid_file, cubic=cubic)
+            pyramid = _DEMMaxPyramid(dem, box, 1000., cells=8)
+            with self.subTest(msg='cubic={}'.format(cubic)):
+                # small boxes, which lie between the posts
+                for _ in range(25):
+                    lats = numpy.random.uniform(box[0], box[1] - 0.4*spacing) + numpy.array([0, 0.4*spacing])
+                    lons = numpy.random.uniform(box[2], box[3] - 0.4*spacing) + numpy.array([0, 0.4*spacing])
+                    grid_lats, grid_lons = numpy.meshgrid(
+                        numpy.linspace(lats[0], lats[1], 20), numpy.linspace(lons[0], lons[1], 20))
+                    bound = pyramid.get_max(lats[numpy.newaxis, :], lons[numpy.newaxis, :])[0]
+                    self.assertGreaterEqual(bound, numpy.max(dem.get_elevation_hae(grid_lats, grid_lons)))
+
+    def test_fixed_step(self):
+        # the columns west of the spike
+        im_points = numpy.stack(
+            numpy.meshgrid(numpy.arange(0, 79, 4.), numpy.arange(40, 77, 4.)), axis=-1).reshape((-1, 2))
+        for cubic in [False, True]:
+            dem = DTEDInterpolator(self.files, self.geoid_file, cubic=cubic)
+            coords = image_to_ground_dem(im_points, self.sicd, dem_interpolator=dem, vertical_step_size=10)
+            # the first intersection from above, by a fixed step search
+            expected = numpy.zeros(coords.shape, dtype='float64')
+            found = numpy.zeros((im_points.shape[0], ), dtype='bool')
+            for hae in numpy.arange(310., -20., -1.):
+                step_coords = image_to_ground_hae(im_points, self.sicd, hae0=hae)
+                llh = ecf_to_geodetic(step_coords)
+                below = ~found & (llh[:, 2] <= dem.get_elevation_hae(llh[:, 0], llh[:, 1]))
+                expected[below] = step_coords[below]
+                found |= below
+                if numpy.all(found):
+                    break
+            with self.subTest(msg='cubic={}'.format(cubic)):
+                self.assertTrue(numpy.all(found))
+                # the fixed step of 1m is roughly 2m along the contour
+                self.assertLess(numpy.max(numpy.linalg.norm(coords - expected, axis=1)), 2.5)
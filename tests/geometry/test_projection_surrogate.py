@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from sarpy.geometry.point_projection import ground_to_image, image_to_ground_hae, image_to_ground_plane
+from sarpy.geometry.projection_surrogate import ProjectionSurrogate
+from sarpy.processing.ortho_rectify import PGProjection
+
+from tests import unittest
+from tests.helpers import make_sicd
+
+
+class TestProjectionSurrogate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.sicd = make_sicd()
+        cls.surrogate = ProjectionSurrogate.from_structure(cls.sicd)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_errors(self):
+        errors = self.surrogate.errors
+        self.assertLess(errors['ground_to_image_max'], 0.05)
+        self.assertLess(errors['image_to_ground_max'], 0.05)
+
+    def test_tolerance(self):
+        # a polynomial fit on a coarse grid over a large range of HAE is poor
+        with self.assertRaises(ValueError):
+            ProjectionSurrogate.from_structure(
+                self.sicd, hae_range=(-5000, 5000), grid_size=(5, 5, 4), rational=False)
+        surrogate = ProjectionSurrogate.from_structure(
+            self.sicd, hae_range=(-5000, 5000), grid_size=(5, 5, 4), rational=False,
+            max_image_error=None, max_ground_error=None)
+        self.assertGreater(surrogate.errors['ground_to_image_max'], 0.1)
+
+    def test_plane(self):
+        im_points = numpy.array([[3.5, 10.25], [40., 60.], [63., 1.], [79., 79.]])
+        gref = image_to_ground_hae([20., 30.], self.sicd, hae0=50.)
+        ugpn = gref/numpy.linalg.norm(gref) + numpy.array([0.05, 0.1, 0.])
+        coords = image_to_ground_plane(im_points, self.sicd, gref=gref, ugpn=ugpn)
+        fast_coords = image_to_ground_plane(im_points, self.sicd, gref=gref, ugpn=ugpn, surrogate=self.surrogate)
+        numpy.testing.assert_allclose(fast_coords, coords, atol=0.05)
+
+        with self.subTest(msg='ortho-rectification projection'):
+            helper = PGProjection(self.sicd)
+            fast_helper = PGProjection(self.sicd, surrogate=self.surrogate)
+            numpy.testing.assert_allclose(
+                fast_helper.pixel_to_ecf(im_points), helper.pixel_to_ecf(im_points), atol=0.05)
+            ortho = fast_helper.pixel_to_ortho(im_points)
+            numpy.testing.assert_allclose(fast_helper.ortho_to_pixel(ortho), im_points, atol=0.05)
+
+    def test_fast_path(self):
+        im_points = numpy.array([[3.5, 10.25], [40., 60.], [63., 1.]])
+        coords = image_to_ground_hae(im_points, self.sicd)
+        fast_coords = image_to_ground_hae(im_points, self.sicd, surrogate=self.surrogate)
+        numpy.testing.assert_allclose(fast_coords, coords, atol=0.05)
+        image_points, delta_gpn, iterations = ground_to_image(coords, self.sicd, surrogate=self.surrogate)
+        numpy.testing.assert_allclose(image_points, im_points, atol=0.05)
+        self.assertTrue(numpy.all(iterations == 0))
+
+    def test_sidecar(self):
+        sidecar = os.path.join(self.directory, 'surrogate.json')
+        self.surrogate.to_file(sidecar)
+        surrogate = ProjectionSurrogate.from_file(sidecar)
+        coords = image_to_ground_hae([[10., 20.], [50., 30.]], self.sicd)
+        numpy.testing.assert_array_equal(surrogate.ground_to_image(coords), self.surrogate.ground_to_image(coords))
+        self.assertEqual(surrogate.errors, self.surrogate.errors)
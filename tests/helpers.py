@@ -0,0 +1,283 @@
+"""
+Helpers shared by the unit tests, for constructing small synthetic data sets.
+"""
+
+from io import BytesIO
+
+import numpy
+from numpy.polynomial import polynomial
+from scipy.constants import speed_of_light
+
+from sarpy.io.complex.sicd_elements.SICD import SICDType
+from sarpy.io.complex.sicd_elements.blocks import Poly1DType, Poly2DType, XYZPolyType
+from sarpy.io.complex.sicd_elements.CollectionInfo import CollectionInfoType
+from sarpy.io.complex.sicd_elements.ImageData import ImageDataType
+from sarpy.io.complex.sicd_elements.GeoData import GeoDataType, SCPType
+from sarpy.io.complex.sicd_elements.Grid import GridType, DirParamType, WgtTypeType
+from sarpy.io.complex.sicd_elements.Position import PositionType
+from sarpy.io.complex.sicd_elements.RadarCollection import RadarCollectionType, TxFrequencyType, \
+    ChanParametersType
+from sarpy.io.complex.sicd_elements.Timeline import TimelineType, IPPSetType
+from sarpy.io.complex.sicd_elements.ImageFormation import ImageFormationType, RcvChanProcType, \
+    TxFrequencyProcType
+from sarpy.io.complex.sicd_elements.PFA import PFAType
+from sarpy.io.phase_history.cphd import CPHDAppendWriter1_0
+from sarpy.io.phase_history.cphd1_elements.CPHD import CPHDType
+from sarpy.io.phase_history.cphd1_elements.CollectionID import CollectionIDType
+from sarpy.io.phase_history.cphd1_elements.Data import DataType, ChannelSizeType
+from sarpy.io.phase_history.cphd1_elements.Global import GlobalType, TimelineType as CPHDTimelineType, \
+    FxBandType, TOASwathType
+from sarpy.io.phase_history.cphd1_elements.PVP import PVPType, PerVectorParameterXYZ, PerVectorParameterF8
+
+
+#####
+# the synthetic collection geometry - a straight line spotlight collection with
+#   X-band 200 MHz bandwidth, about the SRP at (lat, lon) = (0, 0), where in ECF
+#   up = +x, east = +y, north = +z
+
+SRP = numpy.array([6378137., 0, 0])
+FX_MIN, BANDWIDTH = 9.9e9, 200e6
+DURATION = 2.24
+VELOCITY = numpy.array([0, 100., 0])
+ARP_START = SRP + numpy.array([5000., -112., -10000.])
+
+
+class UnmappedStream(object):
+    """
+    A seekable file like object, without a file descriptor or buffer access.
+    """
+
+    def __init__(self, the_bytes):
+        self._buffer = BytesIO(the_bytes)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def readline(self, size=-1):
+        return self._buffer.readline(size)
+
+    def write(self, the_bytes):
+        raise IOError('read only')
+
+    def seek(self, offset, whence=0):
+        return self._buffer.seek(offset, whence)
+
+    def tell(self):
+        return self._buffer.tell()
+
+
+def make_cphd_meta(channels, num_samples, compression=None):
+    """
+    A minimal CPHD structure, with only the required per vector parameters.
+
+    Parameters
+    ----------
+    channels : List[str]
+        The channel identifiers.
+    num_samples : int
+    compression : None|str
+        The signal compression id.
+
+    Returns
+    -------
+    CPHDType
+    """
+
+    pvp_parameters = {}
+    offset = 0
+    for name in PVPType._required:
+        if name in ('TxPos', 'TxVel', 'RcvPos', 'RcvVel', 'SRPPos'):
+            pvp_parameters[name] = PerVectorParameterXYZ(Offset=offset)
+            offset += 3
+        else:
+            pvp_parameters[name] = PerVectorParameterF8(Offset=offset)
+            offset += 1
+    return CPHDType(
+        CollectionID=CollectionIDType(
+            CollectorName='TEST', CoreName='TEST', CollectType='MONOSTATIC', RadarMode={'ModeType': 'SPOTLIGHT'},
+            Classification='UNCLASSIFIED', ReleaseInfo='UNRESTRICTED'),
+        Data=DataType(
+            SignalArrayFormat='CF8', NumBytesPVP=8*offset, SignalCompressionID=compression,
+            Channels=[ChannelSizeType(Identifier=entry, NumSamples=num_samples) for entry in channels]),
+        PVP=PVPType(**pvp_parameters))
+
+
+def write_point_targets(file_name, targets, vectors=64, samples=64):
+    """
+    Simulate the FX domain phase history for unit point targets, for the synthetic
+    collection geometry.
+
+    Parameters
+    ----------
+    file_name : str
+        The CPHD file name.
+    targets : List[numpy.ndarray]
+        The ECF target locations.
+    vectors : int
+    samples : int
+
+    Returns
+    -------
+    None
+    """
+
+    meta = make_cphd_meta(['A', ], samples)
+    meta.Global = GlobalType(
+        DomainType='FX', SGN=-1,
+        Timeline=CPHDTimelineType(CollectionStart=numpy.datetime64('2020-01-01T00:00:00')),
+        FxBand=FxBandType(FxMin=FX_MIN, FxMax=FX_MIN + BANDWIDTH), TOASwath=TOASwathType(TOAMin=-1e-6, TOAMax=1e-6))
+
+    times = numpy.linspace(0, DURATION, vectors)
+    arp = ARP_START + times[:, numpy.newaxis]*VELOCITY
+    pvp = numpy.zeros((vectors, ), dtype=meta.PVP.get_vector_dtype())
+    pvp['TxTime'] = times
+    pvp['RcvTime'] = times
+    pvp['TxPos'] = arp
+    pvp['RcvPos'] = arp
+    pvp['TxVel'] = VELOCITY
+    pvp['RcvVel'] = VELOCITY
+    pvp['SRPPos'] = SRP
+    pvp['SC0'] = FX_MIN
+    pvp['SCSS'] = BANDWIDTH/(samples - 1)
+    pvp['FX1'] = FX_MIN
+    pvp['FX2'] = FX_MIN + BANDWIDTH
+
+    frequencies = FX_MIN + numpy.arange(samples)*BANDWIDTH/(samples - 1)
+    srp_range = numpy.linalg.norm(arp - SRP, axis=1)
+    signal = numpy.zeros((vectors, samples), dtype='complex128')
+    for target in targets:
+        delta_toa = 2*(numpy.linalg.norm(arp - target, axis=1) - srp_range)/speed_of_light
+        signal += numpy.exp(-2j*numpy.pi*delta_toa[:, numpy.newaxis]*frequencies)
+    with CPHDAppendWriter1_0(file_name, meta) as writer:
+        writer.append_vectors('A', pvp, signal.astype('complex64'))
+
+
+def make_sicd(rows=80, cols=80, sample_spacing=0.6):
+    """
+    A ground plane PFA SICD structure for the synthetic collection geometry,
+    with the SCP at the SRP and the center of the image.
+
+    Parameters
+    ----------
+    rows : int
+    cols : int
+    sample_spacing : float
+        The row and column sample spacing, in meters.
+
+    Returns
+    -------
+    SICDType
+    """
+
+    times = numpy.linspace(0, DURATION, 33)
+    ref_time = 0.5*DURATION
+    position = PositionType(ARPPoly=XYZPolyType(
+        X=[ARP_START[0], VELOCITY[0]], Y=[ARP_START[1], VELOCITY[1]], Z=[ARP_START[2], VELOCITY[2]]))
+    ref_arp = position.ARPPoly(ref_time)
+
+    fpn = numpy.array([1., 0, 0])
+    u_row = SRP - (ref_arp + (SRP - ref_arp).dot(fpn)*fpn)
+    u_row /= numpy.linalg.norm(u_row)
+    u_col = numpy.cross(fpn, u_row)
+    pfa = PFAType(FPN=fpn, IPN=fpn, PolarAngRefTime=ref_time)
+    polar_angle, scale_factor = pfa.pfa_polar_coords(position, SRP, times)
+    pfa.PolarAngPoly = Poly1DType(Coefs=polynomial.polyfit(times, polar_angle, 5))
+    pfa.SpatialFreqSFPoly = Poly1DType(Coefs=polynomial.polyfit(polar_angle, scale_factor, 2))
+    krg_per_hz = 2*scale_factor*numpy.cos(polar_angle)/speed_of_light
+    krg1, krg2 = float(numpy.max(FX_MIN*krg_per_hz)), float(numpy.min((FX_MIN + BANDWIDTH)*krg_per_hz))
+    kaz = 0.5/sample_spacing
+    pfa.Krg1, pfa.Krg2, pfa.Kaz1, pfa.Kaz2 = krg1, krg2, -0.5*kaz, 0.5*kaz
+
+    row_bw, col_bw = krg2 - krg1, kaz
+    grid = GridType(
+        ImagePlane='GROUND', Type='RGAZIM', TimeCOAPoly=Poly2DType(Coefs=[[ref_time, ], ]),
+        Row=DirParamType(
+            UVectECF=u_row, SS=sample_spacing, ImpRespWid=0.886/row_bw, Sgn=-1,
+            ImpRespBW=row_bw, KCtr=0.5*(krg1 + krg2), DeltaK1=-0.5*row_bw, DeltaK2=0.5*row_bw,
+            DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')),
+        Col=DirParamType(
+            UVectECF=u_col, SS=sample_spacing, ImpRespWid=0.886/col_bw, Sgn=-1,
+            ImpRespBW=col_bw, KCtr=0, DeltaK1=-0.5*col_bw, DeltaK2=0.5*col_bw,
+            DeltaKCOAPoly=[[0, ], ], WgtType=WgtTypeType(WindowName='UNIFORM')))
+
+    sicd = SICDType(
+        CollectionInfo=CollectionInfoType(
+            CollectorName='TEST', CoreName='TEST', CollectType='MONOSTATIC',
+            RadarMode={'ModeType': 'SPOTLIGHT'}, Classification='UNCLASSIFIED'),
+        ImageData=ImageDataType(
+            NumRows=rows, NumCols=cols, FirstRow=0, FirstCol=0, PixelType='RE32F_IM32F',
+            FullImage=(rows, cols), SCPPixel=(rows//2, cols//2)),
+        GeoData=GeoDataType(SCP=SCPType(ECF=SRP)),
+        Position=position,
+        Grid=grid,
+        RadarCollection=RadarCollectionType(
+            TxFrequency=TxFrequencyType(Min=FX_MIN, Max=FX_MIN + BANDWIDTH), TxPolarization='V',
+            RcvChannels=[ChanParametersType(TxRcvPolarization='V:V', index=1), ]),
+        Timeline=TimelineType(
+            CollectStart=numpy.datetime64('2020-01-01T00:00:00'), CollectDuration=DURATION,
+            IPP=[IPPSetType(
+                TStart=0, TEnd=DURATION, IPPStart=0, IPPEnd=63, IPPPoly=[0, 63/DURATION], index=1), ]),
+        ImageFormation=ImageFormationType(
+            RcvChanProc=RcvChanProcType(NumChanProc=1, PRFScaleFactor=1, ChanIndices=[1, ]),
+            TxRcvPolarizationProc='V:V', TStartProc=0, TEndProc=DURATION,
+            TxFrequencyProc=TxFrequencyProcType(MinProc=FX_MIN, MaxProc=FX_MIN + BANDWIDTH),
+            ImageFormAlgo='PFA', STBeamComp='NO', ImageBeamComp='NO', AzAutofocus='NO', RgAutofocus='NO'),
+        PFA=pfa)
+    sicd.derive()
+    return sicd
+
+
+def write_dted(file_name, lat, lon, values):
+    """
+    Write a minimal DTED file with three arc second spacing.
+
+    Parameters
+    ----------
+    file_name : str
+    lat : int
+        The latitude of the lower left corner.
+    lon : int
+        The longitude of the lower left corner.
+    values : numpy.ndarray
+        The integer elevation values, indexed as `[longitude index, latitude index]`.
+
+    Returns
+    -------
+    None
+    """
+
+    num_lon, num_lat = values.shape
+    header = 'UHL1{:03d}0000{}{:03d}0000{}00300030'.format(
+        abs(lon), 'W' if lon < 0 else 'E', abs(lat), 'S' if lat < 0 else 'N')
+    header = (header.ljust(47) + '{:04d}{:04d}'.format(num_lon, num_lat)).ljust(80).encode('utf-8')
+    # DTED uses signed magnitude big-endian values
+    raw = numpy.abs(values).astype('>u2')
+    raw[values < 0] |= 0x8000
+    with open(file_name, 'wb') as fi:
+        fi.write(header)
+        fi.write(b'\x00'*(3428 - 80))
+        for row in raw:
+            fi.write(b'\xaa' + b'\x00'*7)
+            fi.write(row.tobytes())
+            fi.write(b'\x00'*4)
+
+
+def write_geoid(file_name, value=0.):
+    """
+    Write a minimal egm (pgm format) geoid file, with constant geoid height.
+
+    Parameters
+    ----------
+    file_name : str
+    value : float
+        The geoid height.
+
+    Returns
+    -------
+    None
+    """
+
+    header = b'P5\n# Offset -100\n# Scale 0.01\n4 3\n65535\n'
+    with open(file_name, 'wb') as fi:
+        fi.write(header)
+        fi.write(numpy.full((3, 4), int((value + 100)/0.01), dtype='>u2').tobytes())
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from sarpy.io.DEM.DTED import DTEDReader, DTEDInterpolator, get_tile_cache, set_tile_cache_size
+
+from tests import unittest
+from tests.helpers import write_dted, write_geoid
+
+
+class TestDTED(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.geoid_file = os.path.join(cls.directory, 'geoid.pgm')
+        write_geoid(cls.geoid_file, value=10.)
+        # two adjacent tiles, with the elevation linear in longitude and latitude
+        cls.files = []
+        for lon in [10, 11]:
+            indices = numpy.mgrid[0:1201, 0:1201]
+            values = (lon - 10)*1200 + indices[0] - 2*indices[1]
+            file_name = os.path.join(cls.directory, 'e{:03d}n35.dt1'.format(lon))
+            write_dted(file_name, 35, lon, values)
+            cls.files.append(file_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def test_reader(self):
+        reader = DTEDReader(self.files[0])
+        tile = reader.get_tile()
+        self.assertEqual(tile.dtype, numpy.float32)
+        self.assertEqual(tile.shape, (1201, 1201))
+        self.assertEqual(tile[0, 1200], -2400)  # the signed magnitude is repaired
+        numpy.testing.assert_array_equal(reader[10:20, 30:40], tile[10:20, 30:40])
+        self.assertIs(reader.get_tile(), tile)  # the decoded tile is cached
+        self.assertEqual(reader.get_min(), -2400)
+        self.assertEqual(reader.get_max(), 1200)
+
+    def test_interpolator(self):
+        interpolator = DTEDInterpolator(self.files, self.geoid_file)
+        lat = 35 + numpy.array([0.5, 0.25, 0.999, 0.1])
+        lon = numpy.array([10.5, 11.75, 10.001, 12.5])
+        expected = (lon - 10)*1200 - (lat - 35)*2400
+        values = interpolator.get_elevation_geoid(lat, lon)
+        numpy.testing.assert_allclose(values[:3], expected[:3], atol=1e-6)
+        self.assertEqual(values[3], 0)  # no tile is MSL
+        numpy.testing.assert_allclose(interpolator.get_elevation_hae(lat, lon), values + 10, atol=0.01)
+        cubic = DTEDInterpolator(self.files, self.geoid_file, cubic=True)
+        numpy.testing.assert_allclose(cubic.get_elevation_geoid(lat, lon), values, atol=1e-6)
+
+    def test_pinned_tiles(self):
+        lat = 35 + numpy.array([0.5, 0.25])
+        lon = numpy.array([10.5, 11.75])
+        # room for only one tile, while the points span two tiles
+        set_tile_cache_size(1)
+        try:
+            with self.subTest(msg='not pinned by default'):
+                interpolator = DTEDInterpolator(self.files, self.geoid_file)
+                self.assertFalse(any(reader.pin for reader in interpolator._readers))
+            for pin_tiles in [True, False]:
+                interpolator = DTEDInterpolator(self.files, self.geoid_file, pin_tiles=pin_tiles)
+                expected = interpolator.get_elevation_geoid(lat, lon)
+                misses = get_tile_cache().misses
+                for _ in range(3):
+                    numpy.testing.assert_allclose(interpolator.get_elevation_geoid(lat, lon), expected)
+                with self.subTest(msg='pin_tiles={}'.format(pin_tiles)):
+                    if pin_tiles:
+                        self.assertEqual(get_tile_cache().misses, misses)
+                    else:
+                        self.assertEqual(get_tile_cache().misses, misses + 6)
+        finally:
+            set_tile_cache_size(268435456)
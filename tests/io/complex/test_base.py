@@ -0,0 +1,56 @@
+import os
+import tempfile
+import shutil
+
+import numpy
+
+from sarpy.io.complex.base import H5Chipper, H5HandlePool, h5py
+
+from tests import unittest
+
+
+@unittest.skipIf(h5py is None, 'h5py is not installed')
+class TestH5HandlePool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_directory = tempfile.mkdtemp()
+        cls.file_names = []
+        for i in range(3):
+            file_name = os.path.join(cls.temp_directory, 'test{}.h5'.format(i))
+            with h5py.File(file_name, 'w') as hf:
+                hf.create_dataset('data', data=numpy.arange(20*30*2, dtype='float32').reshape((20, 30, 2)) + i)
+            cls.file_names.append(file_name)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_directory)
+
+    def test_eviction(self):
+        pool = H5HandlePool(max_open_files=2)
+        for file_name in self.file_names:
+            with pool.open_file(file_name) as hf:
+                self.assertEqual(hf['data'].shape, (20, 30, 2))
+        self.assertEqual(pool.open_count, 2)
+
+        with pool.open_file(self.file_names[0]) as hf0:
+            pool.release(self.file_names[0])
+            # still usable while in use
+            self.assertEqual(hf0['data'].shape[0], 20)
+        self.assertFalse(bool(hf0))
+        pool.close()
+        self.assertEqual(pool.open_count, 0)
+
+    def test_chipper(self):
+        pool = H5HandlePool(max_open_files=1, rdcc_nbytes=1024*1024)
+        chipper = H5Chipper(self.file_names[1], 'data', (20, 30), (False, True, False), h5_pool=pool)
+        raw = numpy.arange(20*30*2, dtype='float32').reshape((20, 30, 2)) + 1
+        expected = (raw[:, :, 0] + 1j*raw[:, :, 1])[:, ::-1]
+        with self.subTest(msg='full read'):
+            self.assertTrue(numpy.all(chipper[:, :] == expected))
+        with self.subTest(msg='repeated chip read'):
+            self.assertTrue(numpy.all(chipper[2:10, 5:12] == expected[2:10, 5:12]))
+            self.assertEqual(pool.open_count, 1)
+        with self.subTest(msg='strided reversed read'):
+            self.assertTrue(numpy.all(chipper[1:17:3, 3:29:4] == expected[1:17:3, 3:29:4]))
+        chipper.close()
+        self.assertEqual(pool.open_count, 0)
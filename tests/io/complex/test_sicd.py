@@ -2,13 +2,18 @@ import os
 import json
 import tempfile
 import shutil
+import time
+from io import BytesIO
+
+import numpy
 
 from sarpy.io.complex.converter import open_complex, conversion_utility
+from sarpy.io.complex.aggregate import AggregateComplexReader
 import sarpy.io.complex.sicd
-from sarpy.io.complex.sicd import SICDReader
-
+from sarpy.io.complex.sicd import SICDReader, SICDWriter, AmpPhaseCodec
 
 from tests import unittest, parse_file_entry
+from tests.helpers import make_sicd
 
 try:
     from lxml import etree
@@ -63,3 +68,80 @@ class TestSICDWriting(unittest.TestCase):
 
             # clean up the temporary directory
             shutil.rmtree(temp_directory)
+
+
+class _UnmappedStream(BytesIO):
+    # a file like object which cannot be memory mapped, and which yields to the
+    # other threads between the seek and the read
+    def fileno(self):
+        raise IOError('no file descriptor')
+
+    def seek(self, *args):
+        out = BytesIO.seek(self, *args)
+        time.sleep(0.0002)
+        return out
+
+
+class TestConversionFromFileObject(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # large enough for several 1MB blocks
+        sicd = make_sicd(rows=4000, cols=100)
+        numpy.random.seed(5)
+        self.data = (numpy.random.randn(4000, 100) + 1j*numpy.random.randn(4000, 100)).astype('complex64')
+        sicd_file = os.path.join(self.directory, 'test.nitf')
+        writer = SICDWriter(sicd_file, sicd)
+        writer(self.data, (0, 0))
+        writer.close()
+        with open(sicd_file, 'rb') as fi:
+            self.the_bytes = fi.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_concurrent_reads(self):
+        # both frames read through the one shared file object
+        stream = _UnmappedStream(self.the_bytes)
+        reader = AggregateComplexReader([SICDReader(stream), SICDReader(stream)])
+        conversion_utility(
+            reader, self.directory, output_files=['out0.nitf', 'out1.nitf'], max_block_size=2**20,
+            frame_workers=2, read_workers=2)
+        for name in ['out0.nitf', 'out1.nitf']:
+            with self.subTest(msg='converted frame {}'.format(name)):
+                result = SICDReader(os.path.join(self.directory, name))[:, :]
+                self.assertTrue(numpy.all(result == self.data))
+
+
+class TestAmpPhaseCodec(unittest.TestCase):
+    def setUp(self):
+        numpy.random.seed(3)
+        self.data = ((numpy.random.randn(50, 30) + 1j*numpy.random.randn(50, 30))*20).astype('complex64')
+
+    def _check(self, lookup_table):
+        codec = AmpPhaseCodec(lookup_table, chunk_size=100)
+        encoded = codec.encode(self.data)
+        self.assertEqual(encoded.dtype.name, 'uint8')
+        # the amplitude is the nearest table entry
+        amplitude = numpy.abs(self.data)
+        distance = numpy.abs(amplitude[:, :, numpy.newaxis] - lookup_table)
+        self.assertTrue(numpy.allclose(
+            numpy.abs(amplitude - lookup_table[encoded[:, :, 0]]), numpy.min(distance, axis=2)))
+        # the phase is the nearest phase
+        phase = encoded[:, :, 1]*(2*numpy.pi/256)
+        self.assertTrue(numpy.all(numpy.abs(numpy.angle(self.data*numpy.exp(-1j*phase))) <= numpy.pi/256 + 1e-6))
+
+        decoded = codec.decode(numpy.concatenate([encoded, encoded[:, :, ::-1]], axis=2))
+        self.assertEqual(decoded.shape, (50, 30, 2))
+        amp, phase = lookup_table[encoded[:, :, 0]], encoded[:, :, 1]*(2*numpy.pi/256)
+        self.assertTrue(numpy.allclose(decoded[:, :, 0], amp*numpy.exp(1j*phase), atol=1e-4))
+        amp, phase = lookup_table[encoded[:, :, 1]], encoded[:, :, 0]*(2*numpy.pi/256)
+        self.assertTrue(numpy.allclose(decoded[:, :, 1], amp*numpy.exp(1j*phase), atol=1e-4))
+
+    def test_uniform(self):
+        self._check(numpy.arange(256, dtype='float64')*0.3)
+
+    def test_nonuniform(self):
+        self._check(numpy.arange(256, dtype='float64')**1.5/20.)
+
+    def test_unsorted(self):
+        self._check(numpy.random.permutation(256).astype('float64')*0.3)
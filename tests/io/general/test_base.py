@@ -0,0 +1,224 @@
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+import numpy
+
+from sarpy.io.general.base import BIPChipper, AggregateChipper, ParallelChipper, TileCacheChipper, \
+    FlatReader, BIPWriter
+
+from tests import unittest
+
+
+def _get_aggregate(data):
+    bounds = numpy.array([[0, 70, 0, 45], [0, 70, 45, 90], [70, 130, 0, 90]], dtype='int64')
+    chippers = []
+    for entry in bounds:
+        chippers.append(
+            BIPChipper(
+                numpy.copy(data[entry[0]:entry[1], entry[2]:entry[3]]), data.dtype,
+                (entry[1]-entry[0], entry[3]-entry[2]), 1, 1, data.dtype))
+    return AggregateChipper(bounds, data.dtype, chippers)
+
+
+class TestParallelRead(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.reshape(numpy.arange(130*90, dtype='float32'), (130, 90))
+
+    def test_aggregate(self):
+        chipper = _get_aggregate(self.data)
+        with self.subTest(msg='serial aggregate read'):
+            self.assertTrue(numpy.all(chipper[:, :] == self.data))
+            self.assertTrue(numpy.all(chipper[1:129:3, 2:88:7] == self.data[1:129:3, 2:88:7]))
+
+        parallel = ParallelChipper(chipper, max_workers=4, band_rows=16, min_parallel_pixels=0)
+        with self.subTest(msg='parallel aggregate read'):
+            self.assertTrue(numpy.all(parallel[:, :] == self.data))
+            self.assertTrue(numpy.all(parallel[5:111:2, 3:89:4] == self.data[5:111:2, 3:89:4]))
+            self.assertTrue(numpy.all(parallel[60:80, 40:50] == self.data[60:80, 40:50]))
+        parallel.close()
+
+    def test_aggregate_out(self):
+        chipper = _get_aggregate(self.data)
+        out = numpy.full((43, 13), -1, dtype='float32')
+        result = chipper((1, 129, 3), (2, 88, 7), out=out)
+        self.assertTrue(result is out)
+        self.assertTrue(numpy.all(out == self.data[1:129:3, 2:88:7]))
+        with self.assertRaises(ValueError):
+            chipper((1, 129, 3), (2, 88, 7), out=numpy.empty((10, 10), dtype='float32'))
+
+    def test_reader(self):
+        reader = FlatReader(self.data, symmetry=(True, False, True))
+        expected = reader[:, :]
+        reader.enable_parallel_read(max_workers=3, min_parallel_pixels=0)
+        with self.subTest(msg='parallel flat read'):
+            self.assertTrue(isinstance(reader._chipper, ParallelChipper))
+            self.assertTrue(numpy.all(reader[:, :] == expected))
+            self.assertTrue(numpy.all(reader[2:70:3, 10:100] == expected[2:70:3, 10:100]))
+        reader.disable_parallel_read()
+        self.assertTrue(isinstance(reader._chipper, BIPChipper))
+
+
+class TestBIPChipperRead(unittest.TestCase):
+    def setUp(self):
+        self.raw = numpy.reshape(numpy.arange(40*30*2, dtype='>f4'), (40, 30, 2))
+        self.complex = (self.raw[:, :, 0] + 1j*self.raw[:, :, 1]).astype('complex64')
+
+    def test_complex(self):
+        for symmetry in [(False, False, False), (True, False, False), (False, True, True)]:
+            chipper = BIPChipper(
+                self.raw, '>f4', (40, 30), 2, 1, 'complex64', symmetry=symmetry, transform_data='COMPLEX')
+            expected = self.complex
+            if symmetry[0]:
+                expected = expected[::-1, :]
+            if symmetry[1]:
+                expected = expected[:, ::-1]
+            if symmetry[2]:
+                expected = expected.T
+            with self.subTest(msg='read with symmetry {}'.format(symmetry)):
+                data = chipper[:, :]
+                self.assertEqual(data.dtype.name, 'complex64')
+                self.assertTrue(numpy.all(data == expected))
+            with self.subTest(msg='read into output with symmetry {}'.format(symmetry)):
+                out = numpy.zeros((10, 12), dtype='complex64')
+                result = chipper((2, 22, 2), (3, 15, 1), out=out)
+                self.assertTrue(result is out)
+                self.assertTrue(numpy.all(out == expected[2:22:2, 3:15]))
+
+    def test_views(self):
+        data = numpy.reshape(numpy.arange(40*30, dtype='float32'), (40, 30))
+        chipper = BIPChipper(data, 'float32', (40, 30), 1, 1, 'float32')
+        with self.subTest(msg='copy by default'):
+            self.assertFalse(numpy.may_share_memory(chipper[5:10, :], data))
+        chipper.return_views = True
+        with self.subTest(msg='view when permitted'):
+            result = chipper[5:10, 2:8]
+            self.assertTrue(numpy.may_share_memory(result, data))
+            self.assertTrue(numpy.all(result == data[5:10, 2:8]))
+
+    def test_file_object(self):
+        # a file object without fileno, so there is no memory map
+        chipper = BIPChipper(
+            BytesIO(b'\x00'*16 + self.raw.tobytes()), '>f4', (40, 30), 2, 1, 'complex64',
+            transform_data='COMPLEX', data_offset=16)
+        with self.subTest(msg='wide window'):
+            self.assertTrue(numpy.all(chipper[:, :] == self.complex))
+            self.assertTrue(numpy.all(chipper[35:3:-3, 2:29:2] == self.complex[35:3:-3, 2:29:2]))
+        with self.subTest(msg='narrow window'):
+            self.assertTrue(numpy.all(chipper[5:30:2, 10:14] == self.complex[5:30:2, 10:14]))
+            self.assertTrue(numpy.all(chipper[30:5:-1, 14:10:-1] == self.complex[30:5:-1, 14:10:-1]))
+
+    def test_parallel_file_object(self):
+        class _SlowSeek(BytesIO):
+            # yield to the other threads between the seek and the read
+            def seek(self, *args):
+                out = BytesIO.seek(self, *args)
+                time.sleep(0.0005)
+                return out
+
+        chipper = BIPChipper(
+            _SlowSeek(b'\x00'*16 + self.raw.tobytes()), '>f4', (40, 30), 2, 1, 'complex64',
+            transform_data='COMPLEX', data_offset=16)
+        parallel = ParallelChipper(chipper, max_workers=8, band_rows=2, min_parallel_pixels=0)
+        for _ in range(5):
+            self.assertTrue(numpy.all(parallel[:, :] == self.complex))
+            self.assertTrue(numpy.all(parallel[35:3:-3, 10:14] == self.complex[35:3:-3, 10:14]))
+        parallel.close()
+
+
+class TestBIPWriterFallback(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'test.bin')
+        self.data = numpy.reshape(numpy.arange(20*30, dtype='uint8'), (20, 30))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _get_writer(self, **kwargs):
+        with open(self.file_name, 'wb') as fi:
+            fi.write(b'\x00'*10)
+        writer = BIPWriter(self.file_name, (20, 30), 'uint8', 1, None, data_offset=10, **kwargs)
+        # force the fallback to writing the file manually
+        writer._memory_map = None
+        writer._fid = open(self.file_name, 'r+b')
+        return writer
+
+    def _get_result(self):
+        with open(self.file_name, 'rb') as fi:
+            fi.seek(10)
+            return numpy.reshape(numpy.frombuffer(fi.read(), dtype='uint8'), (20, 30))
+
+    def test_columns(self):
+        writer = self._get_writer()
+        writer(self.data[:, :12], (0, 0))
+        self.assertTrue(numpy.all(self._get_result() == 0))  # buffered
+        writer(self.data[:, 12:], (0, 12))
+        writer.close()
+        self.assertTrue(numpy.all(self._get_result() == self.data))
+
+    def test_memory_cap(self):
+        # bands of 4 rows, with room for only two buffered bands
+        writer = self._get_writer(max_buffer_bytes=480)
+        for start in range(0, 30, 7):
+            writer(self.data[:, start:start+7], (0, start))
+        writer(self.data[3:9, :], (3, 0))
+        writer.close()
+        self.assertTrue(numpy.all(self._get_result() == self.data))
+
+
+class TestTileCache(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.reshape(numpy.arange(130*90, dtype='float32'), (130, 90))
+
+    def test_chipper(self):
+        chipper = TileCacheChipper(_get_aggregate(self.data), max_bytes=25*32*20*8, tile_shape=(32, 20))
+        for item in [
+                (slice(None), slice(None)), (slice(1, 129, 3), slice(2, 88, 7)),
+                (slice(100, 10, -3), slice(80, 0, -7)), (slice(5, 6), slice(89, 0, -1)),
+                (slice(31, 33), slice(19, 61))]:
+            with self.subTest(msg='cached read {}'.format(item)):
+                self.assertTrue(numpy.all(chipper[item] == self.data[item]))
+        with self.subTest(msg='counters'):
+            self.assertEqual(chipper.misses, 5*5)
+            self.assertTrue(chipper.hits > 0)
+            self.assertEqual(chipper.cached_bytes, 130*90*4)
+        out = numpy.zeros((20, 10), dtype='float32')
+        with self.subTest(msg='read into out'):
+            self.assertTrue(chipper((10, 30, 1), (85, 75, -1), out=out) is out)
+            self.assertTrue(numpy.all(out == self.data[10:30, 85:75:-1]))
+
+    def test_eviction(self):
+        chipper = TileCacheChipper(_get_aggregate(self.data), max_bytes=3*32*20*4, tile_shape=(32, 20))
+        for item in [
+                (slice(0, 32), slice(0, 20)), (slice(0, 32), slice(20, 40)),
+                (slice(32, 64), slice(0, 20)), (slice(32, 64), slice(20, 40))]:
+            self.assertTrue(numpy.all(chipper[item] == self.data[item]))
+        self.assertEqual(chipper.tile_count, 3)
+        self.assertEqual(chipper.misses, 4)
+        # the least recently used tile has been evicted
+        self.assertTrue(numpy.all(chipper[:32, :20] == self.data[:32, :20]))
+        self.assertEqual(chipper.misses, 5)
+        self.assertTrue(numpy.all(chipper[32:64, 20:40] == self.data[32:64, 20:40]))
+        self.assertEqual(chipper.hits, 1)
+        # too large to cache, so read directly
+        self.assertTrue(numpy.all(chipper[:, :] == self.data))
+        self.assertEqual(chipper.misses, 5)
+
+    def test_reader(self):
+        reader = FlatReader(self.data, symmetry=(True, False, True))
+        expected = reader[:, :]
+        self.assertTrue(reader.get_tile_cache_statistics() is None)
+        reader.enable_tile_cache(max_bytes=2**20, tile_shape=16)
+        reader.enable_parallel_read(max_workers=2, min_parallel_pixels=0)
+        self.assertTrue(numpy.all(reader[2:70:3, 10:100] == expected[2:70:3, 10:100]))
+        self.assertTrue(numpy.all(reader[2:70:3, 10:100] == expected[2:70:3, 10:100]))
+        stats = reader.get_tile_cache_statistics()
+        self.assertEqual(stats['misses'], stats['tiles'])
+        self.assertEqual(stats['hits'], stats['misses'])
+        reader.disable_parallel_read()
+        self.assertTrue(isinstance(reader._chipper.parent_chipper, BIPChipper))
+        reader.disable_tile_cache()
+        self.assertTrue(isinstance(reader._chipper, BIPChipper))
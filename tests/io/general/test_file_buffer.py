@@ -0,0 +1,34 @@
+from io import BytesIO
+
+import numpy
+
+from sarpy.io.general.file_buffer import FileBuffer
+
+from tests import unittest
+from tests.helpers import UnmappedStream
+
+
+class TestFileBuffer(unittest.TestCase):
+    def setUp(self):
+        self.data = numpy.reshape(numpy.arange(50*7, dtype='>i4'), (50, 7))
+        self.the_bytes = b'\x01'*13 + self.data.tobytes()
+
+    def test_buffers(self):
+        mapped = FileBuffer(BytesIO(self.the_bytes))
+        self.assertIsNotNone(mapped.memory_map)
+        unmapped = FileBuffer(UnmappedStream(self.the_bytes), block_size=64, max_bytes=1024)
+        self.assertIsNone(unmapped.memory_map)
+        for the_buffer in [mapped, unmapped]:
+            self.assertEqual(the_buffer.size, len(self.the_bytes))
+            self.assertEqual(the_buffer.read(10, 100).tobytes(), self.the_bytes[10:110])
+            array = the_buffer.get_array(13, '>i4', (50, 7))
+            numpy.testing.assert_equal(numpy.asarray(array), self.data)
+            numpy.testing.assert_equal(array[3:40:4, 2:5], self.data[3:40:4, 2:5])
+            numpy.testing.assert_equal(array[-1, ::-2], self.data[-1, ::-2])
+            numpy.testing.assert_equal(array[45:2:-3], self.data[45:2:-3])
+            self.assertEqual(array[10:10].shape, (0, 7))
+            stream = the_buffer.open_stream()
+            stream.seek(20)
+            self.assertEqual(stream.read(5), self.the_bytes[20:25])
+            self.assertEqual(stream.tell(), 25)
+        self.assertGreater(unmapped.cache.hits, 0)
@@ -0,0 +1,91 @@
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+from sarpy.io.general import format_detection
+from sarpy.io.general.base import SarpyIOError
+from sarpy.io.complex.converter import open_complex
+from sarpy.compliance import BytesIO
+
+from tests import unittest
+
+
+class TestFormatDetection(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, header):
+        file_name = os.path.join(self.directory, name)
+        with open(file_name, 'wb') as fi:
+            fi.write(header)
+        return file_name
+
+    def test_header(self):
+        for name, header, expected in [
+                ('test.ntf', b'NITF02.10' + b' '*100, (format_detection.NITF, )),
+                ('test.h5', b'\x89HDF\r\n\x1a\n' + b'\x00'*100, (format_detection.HDF5, )),
+                ('user_block.h5', b'\x00'*512 + b'\x89HDF\r\n\x1a\n' + b'\x00'*100, (format_detection.HDF5, )),
+                ('test.tif', b'II*\x00' + b'\x00'*100, (format_detection.TIFF, )),
+                ('test.cphd', b'CPHD/1.0.1\n' + b'\x00'*100, (format_detection.CPHD, )),
+                ('test.sio', struct.pack('>5I', 0xFF017FFE, 10, 10, 13, 8), (format_detection.SIO, )),
+                ('IMG-HH-test', struct.pack('>IBBBBI', 1, 50, 192, 18, 18, 720) + b' '*100, (format_detection.CEOS, )),
+                ('manifest.safe', b'<?xml version="1.0"?>', (format_detection.SAFE_MANIFEST, )),
+                ('product.xml', b'<?xml version="1.0"?>', (format_detection.RADARSAT_PRODUCT, )),
+                ('other.bin', b'nothing to see here', ())]:
+            with self.subTest(msg=name):
+                self.assertEqual(format_detection.detect_format_types(self._write(name, header)), expected)
+
+        with self.subTest(msg='file-like'):
+            file_obj = BytesIO(b'NITF02.10' + b' '*100)
+            file_obj.seek(5)
+            self.assertEqual(format_detection.detect_format_types(file_obj), (format_detection.NITF, ))
+            self.assertEqual(file_obj.tell(), 5)
+
+    def test_directory(self):
+        self._write('manifest.safe', b'<?xml version="1.0"?>')
+        self._write('LED-test', b'')
+        self.assertEqual(
+            format_detection.detect_format_types(self.directory),
+            (format_detection.SAFE_MANIFEST, format_detection.CEOS))
+
+    def test_plausible(self):
+        def opener1(file_name):
+            return None
+
+        def opener2(file_name):
+            return None
+
+        def opener3(file_name):
+            return None
+
+        openers = [(opener1, (format_detection.NITF, )), (opener2, (format_detection.HDF5, )), (opener3, None)]
+        self.assertEqual(
+            format_detection.get_plausible_openers(openers, (format_detection.HDF5, )), [opener2, opener3])
+        self.assertEqual(
+            format_detection.get_plausible_openers(openers, ()), [opener1, opener2, opener3])
+
+    def test_lazy_opener(self):
+        opener = format_detection.LazyOpener('sarpy.io.general.nitf', 'is_a')
+        self.assertEqual(opener, format_detection.LazyOpener('sarpy.io.general.nitf'))
+        self.assertEqual(len({opener, format_detection.LazyOpener('sarpy.io.general.nitf')}), 1)
+        self.assertFalse(opener.is_loaded)
+        self.assertTrue(opener(self._write('other.bin', b'nothing to see here')) is None)
+        self.assertTrue(opener.is_loaded)
+
+    def test_lazy_registry(self):
+        code = 'import sys\n' \
+               'from sarpy.io.complex.converter import parse_openers\n' \
+               'parse_openers()\n' \
+               'assert "sarpy.io.complex.sicd" not in sys.modules\n' \
+               'assert "sarpy.io.complex.sicd_elements.SICD" not in sys.modules'
+        subprocess.check_call([sys.executable, '-c', code])
+
+    def test_open_complex(self):
+        with self.assertRaises(SarpyIOError):
+            open_complex(self._write('test.bin', b'nothing to see here'*10))
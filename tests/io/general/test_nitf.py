@@ -0,0 +1,271 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from sarpy.io.general.nitf import CompressedBlockChipper, NITFReader, NITFWriter, ImageDetails, \
+    get_npp_block, _find_jpeg_end
+from sarpy.io.general.nitf_elements.nitf_head import NITFHeader, ImageSegmentsType, DataExtensionsType
+from sarpy.io.general.nitf_elements.image import ImageSegmentHeader, ImageBands, ImageBand
+from sarpy.io.general.nitf_elements.security import NITFSecurityTags
+
+from tests import unittest
+
+try:
+    import PIL
+    import PIL.Image
+except ImportError:
+    PIL = None
+
+
+def _get_jpeg_blocks(data, block_shape):
+    blocks = []
+    for row in range(0, data.shape[0], block_shape[0]):
+        for col in range(0, data.shape[1], block_shape[1]):
+            block = numpy.zeros(block_shape + data.shape[2:], dtype='uint8')
+            part = data[row:row+block_shape[0], col:col+block_shape[1]]
+            block[:part.shape[0], :part.shape[1]] = part
+            fi = BytesIO()
+            PIL.Image.fromarray(block).save(fi, format='JPEG', quality=95)
+            blocks.append(fi.getvalue())
+    return blocks
+
+
+def _decode_blocks(blocks, data_shape, block_shape):
+    out = numpy.zeros(
+        (data_shape[0] + block_shape[0], data_shape[1] + block_shape[1]) + tuple(data_shape[2:]), dtype='uint8')
+    blocks_across = int(numpy.ceil(data_shape[1]/float(block_shape[1])))
+    for i, entry in enumerate(blocks):
+        row, col = (i // blocks_across)*block_shape[0], (i % blocks_across)*block_shape[1]
+        if entry is not None:
+            out[row:row+block_shape[0], col:col+block_shape[1]] = numpy.asarray(PIL.Image.open(BytesIO(entry)))
+    return out[:data_shape[0], :data_shape[1]]
+
+
+def _write_jpeg_nitf(file_name, blocks, data_shape, block_shape):
+    # a single RGB image segment of concatenated jpeg blocks
+    security = NITFSecurityTags(CLAS='U')
+    subheader = ImageSegmentHeader(
+        IID1='TEST001', IREP='RGB', ICAT='VIS', NROWS=data_shape[0], NCOLS=data_shape[1],
+        PVTYPE='INT', ABPP=8, IC='C3', COMRAT='00.0', IMODE='P',
+        NBPR=int(numpy.ceil(data_shape[1]/float(block_shape[1]))), NPPBH=block_shape[1],
+        NBPC=int(numpy.ceil(data_shape[0]/float(block_shape[0]))), NPPBV=block_shape[0],
+        NBPP=8, IDLVL=1, IALVL=0, ILOC='0000000000',
+        Bands=ImageBands(values=[ImageBand(ISUBCAT='', IREPBAND=entry) for entry in 'RGB']),
+        Security=security)
+    subheader_bytes = subheader.to_bytes()
+    image_bytes = b''.join(blocks)
+    header = NITFHeader(
+        Security=security, CLEVEL=3, OSTAID='TEST', FDT='20200101000000', FTITLE='TEST', FL=0,
+        ImageSegments=ImageSegmentsType(
+            subhead_sizes=numpy.array([len(subheader_bytes), ], dtype='int64'),
+            item_sizes=numpy.array([len(image_bytes), ], dtype='int64')),
+        DataExtensions=DataExtensionsType(subhead_sizes=None, item_sizes=None))
+    header.FL = header.get_bytes_length() + len(subheader_bytes) + len(image_bytes)
+    with open(file_name, 'wb') as fi:
+        fi.write(header.to_bytes())
+        fi.write(subheader_bytes)
+        fi.write(image_bytes)
+
+
+class _ComplexBandsReader(NITFReader):
+    # interprets a pair of bands as the real and imaginary components
+    def _construct_chipper(self, segment, index):
+        return self._define_chipper(
+            segment[0], raw_dtype='uint8', raw_bands=3, transform_data='COMPLEX',
+            output_bands=1, output_dtype='complex64', limit_to_raw_bands=numpy.array([1, 2], dtype='int32'))
+
+
+@unittest.skipIf(PIL is None, 'PIL is not installed')
+class TestCompressedBlockChipper(unittest.TestCase):
+    def setUp(self):
+        rows, cols = numpy.mgrid[:100, :75]
+        self.data = ((rows*3 + cols*2) % 256).astype('uint8')
+        self.block_shape = (32, 32)
+        self.blocks = _get_jpeg_blocks(self.data, self.block_shape)
+
+    def test_find_jpeg_end(self):
+        the_bytes = b''.join(self.blocks)
+        fi = BytesIO(the_bytes)
+        start = 0
+        for entry in self.blocks:
+            end = _find_jpeg_end(fi, start, len(the_bytes), chunk_size=97)
+            self.assertEqual(end - start, len(entry))
+            start = end
+
+    def test_concatenated(self):
+        the_bytes = b'\x00'*10 + b''.join(self.blocks)
+        expected = _decode_blocks(self.blocks, self.data.shape, self.block_shape)
+        chipper = CompressedBlockChipper(
+            BytesIO(the_bytes), self.data.shape, self.block_shape, 'uint8', 1,
+            segment_location=(10, len(the_bytes) - 10))
+        self.assertTrue(numpy.all(chipper[:30, :40] == expected[:30, :40]))
+        self.assertEqual(len(chipper._block_locations), 2)  # only as far as required
+        self.assertTrue(numpy.all(chipper[:, :] == expected))
+        self.assertTrue(numpy.all(chipper[90:5:-3, 70:1:-2] == expected[90:5:-3, 70:1:-2]))
+        chipper.close()
+
+    def test_masked(self):
+        blocks = list(self.blocks)
+        blocks[1] = None
+        blocks[5] = None
+        block_locations = []
+        offset = 0
+        for entry in blocks:
+            if entry is None:
+                block_locations.append(None)
+            else:
+                block_locations.append((offset, len(entry)))
+                offset += len(entry)
+        expected = _decode_blocks(blocks, self.data.shape, self.block_shape)
+        chipper = CompressedBlockChipper(
+            BytesIO(b''.join(entry for entry in blocks if entry is not None)), self.data.shape,
+            self.block_shape, 'uint8', 1, block_locations=block_locations, max_workers=2)
+        self.assertTrue(numpy.all(chipper[:, :] == expected))
+        self.assertTrue(numpy.all(chipper[:32, 32:64] == 0))
+        chipper.close()
+
+
+@unittest.skipIf(PIL is None, 'PIL is not installed')
+class TestCompressedNITFRead(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.directory, 'test.nitf')
+        rows, cols = numpy.mgrid[:100, :75]
+        data = numpy.stack(
+            [(rows*3 + cols*2) % 256, (rows + cols*5) % 256, (rows*7 + cols) % 256], axis=2).astype('uint8')
+        block_shape = (32, 32)
+        blocks = _get_jpeg_blocks(data, block_shape)
+        self.expected = _decode_blocks(blocks, data.shape, block_shape)
+        _write_jpeg_nitf(self.file_name, blocks, data.shape, block_shape)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read(self):
+        reader = NITFReader(self.file_name)
+        self.assertTrue(isinstance(reader._chipper[0], CompressedBlockChipper))
+        self.assertEqual(reader.get_data_size_as_tuple(), ((100, 75), ))
+        self.assertTrue(numpy.all(reader[:, :] == self.expected))
+        self.assertTrue(numpy.all(reader[90:5:-3, 70:1:-2] == self.expected[90:5:-3, 70:1:-2]))
+
+    def test_limit_to_raw_bands(self):
+        reader = _ComplexBandsReader(self.file_name)
+        expected = self.expected[:, :, 1] + 1j*self.expected[:, :, 2].astype('float32')
+        data = reader[:, :]
+        self.assertEqual(data.dtype.name, 'complex64')
+        self.assertTrue(numpy.all(data == expected))
+        self.assertTrue(numpy.all(reader[10:80:4, 60:3:-5] == expected[10:80:4, 60:3:-5]))
+
+
+class _SimpleNITFWriter(NITFWriter):
+    # a minimal single band uint8 writer, with the image split into the given segments
+    __slots__ = ('_segment_limits', )
+
+    def __init__(self, file_name, segment_limits):
+        self._segment_limits = segment_limits
+        super(_SimpleNITFWriter, self).__init__(file_name)
+
+    def _create_security_tags(self):
+        self._security_tags = NITFSecurityTags(CLAS='U')
+
+    def _get_ftitle(self):
+        return 'TEST'
+
+    def _get_fdt(self):
+        return '20200101000000'
+
+    def _get_ostaid(self):
+        return 'TEST'
+
+    def _create_image_segment_details(self):
+        super(_SimpleNITFWriter, self)._create_image_segment_details()
+        self._img_groups = (tuple(range(len(self._segment_limits))), )
+        self._shapes = ((self._segment_limits[-1][1], self._segment_limits[-1][3]), )
+        img_details = []
+        for i, entry in enumerate(self._segment_limits):
+            rows, cols = entry[1] - entry[0], entry[3] - entry[2]
+            subhead = ImageSegmentHeader(
+                IID1='TEST{0:03d}'.format(i+1), IREP='MONO', ICAT='VIS', NROWS=rows, NCOLS=cols,
+                PVTYPE='INT', ABPP=8, NBPC=1, NPPBH=get_npp_block(cols), NBPR=1, NPPBV=get_npp_block(rows),
+                NBPP=8, IDLVL=i+1, IALVL=i, ILOC='{0:05d}{1:05d}'.format(entry[0], entry[2]),
+                Bands=ImageBands(values=[ImageBand(ISUBCAT='', IREPBAND='M'), ]), Security=self._security_tags)
+            img_details.append(ImageDetails(1, 'uint8', None, entry, subhead))
+        self._img_details = tuple(img_details)
+
+    def _create_data_extension_details(self):
+        super(_SimpleNITFWriter, self)._create_data_extension_details()
+        self._des_details = None
+
+
+class TestParallelNITFWrite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        data = numpy.reshape(numpy.arange(120*50, dtype='int64') % 253, (120, 50)).astype('uint8')
+        segment_limits = ((0, 40, 0, 50), (40, 80, 0, 50), (80, 120, 0, 50))
+        file_name = os.path.join(self.directory, 'test.nitf')
+        writer = _SimpleNITFWriter(file_name, segment_limits)
+        writer.enable_parallel_write(max_workers=3)
+
+        def write_band(start):
+            writer.write_chip(data[start:start+30, :], start_indices=(start, 0))
+
+        # concurrent producers, with each chip overlapping two segments
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(write_band, range(0, 120, 30)))
+        self.assertEqual([entry.pixels_written for entry in writer.image_details], [2000, 2000, 2000])
+        writer.close()
+
+        reader = NITFReader(file_name)
+        for i, entry in enumerate(segment_limits):
+            self.assertTrue(numpy.all(reader[:, :, i] == data[entry[0]:entry[1], entry[2]:entry[3]]))
+
+
+class _WriteOnlyStream(object):
+    # a non-seekable output stream
+    def __init__(self):
+        self._buffer = BytesIO()
+
+    def write(self, the_bytes):
+        return self._buffer.write(the_bytes)
+
+    def getvalue(self):
+        return self._buffer.getvalue()
+
+
+class TestStreamingNITFWrite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        data = numpy.reshape(numpy.arange(120*50, dtype='int64') % 251, (120, 50)).astype('uint8')
+        segment_limits = ((0, 40, 0, 50), (40, 80, 0, 50), (80, 120, 0, 50))
+        stream = _WriteOnlyStream()
+        writer = _SimpleNITFWriter(stream, segment_limits)
+        self.assertTrue(writer.is_streaming)
+        # somewhat out of order, and partial width chips
+        writer.write_chip(data[10:30, :], start_indices=(10, 0))
+        writer.write_chip(data[0:10, 25:], start_indices=(0, 25))
+        writer.write_chip(data[0:10, :25], start_indices=(0, 0))
+        writer.write_chip(data[30:120, :], start_indices=(30, 0))
+        with self.assertRaises(ValueError):
+            writer.write_chip(data[:10, :], start_indices=(0, 0))
+        writer.close()
+
+        file_name = os.path.join(self.directory, 'test.nitf')
+        with open(file_name, 'wb') as fi:
+            fi.write(stream.getvalue())
+        reader = NITFReader(file_name)
+        for i, entry in enumerate(segment_limits):
+            self.assertTrue(numpy.all(reader[:, :, i] == data[entry[0]:entry[1], entry[2]:entry[3]]))
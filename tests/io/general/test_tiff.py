@@ -0,0 +1,181 @@
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+import numpy
+
+from sarpy.io.general.tiff import TiffDetails, TiffReader, NativeTiffChipper, TiledTiffChipper, \
+    decode_packbits, decode_lzw, _decode_lzw_python
+
+from tests import unittest
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def _encode_packbits(data):
+    # literal runs only, which is valid (if inefficient) PackBits
+    out = bytearray()
+    for start in range(0, len(data), 128):
+        chunk = data[start:start+128]
+        out.append(len(chunk) - 1)
+        out += chunk
+    return bytes(out)
+
+
+def _encode_block(block, compression, predictor):
+    if predictor == 2:
+        block = numpy.diff(block, axis=1, prepend=numpy.zeros((block.shape[0], 1, block.shape[2]), dtype=block.dtype))
+        data = block.tobytes()
+    elif predictor == 3:
+        rows = block.shape[0]
+        the_bytes = numpy.reshape(block.astype('>{}'.format(block.dtype.str[1:])).view('u1'), (rows, -1, block.dtype.itemsize))
+        the_bytes = numpy.reshape(the_bytes.transpose((0, 2, 1)), (rows, -1))
+        data = numpy.diff(the_bytes, axis=1, prepend=numpy.zeros((rows, 1), dtype='u1')).tobytes()
+    else:
+        data = block.tobytes()
+    if compression == 8:
+        return zlib.compress(data)
+    elif compression == 32773:
+        return _encode_packbits(data)
+    return data
+
+
+def _write_tiff(file_name, data, compression=1, predictor=1, tile_shape=None, rows_per_strip=None):
+    """
+    Writes a minimal little endian single band tiff file, either tiled or stripped.
+    """
+
+    rows, cols = data.shape
+    block = data[:, :, numpy.newaxis]
+    blocks = []
+    if tile_shape is not None:
+        for row in range(0, rows, tile_shape[0]):
+            for col in range(0, cols, tile_shape[1]):
+                tile = numpy.zeros(tile_shape + (1, ), dtype=data.dtype)
+                part = block[row:row+tile_shape[0], col:col+tile_shape[1]]
+                tile[:part.shape[0], :part.shape[1]] = part
+                blocks.append(_encode_block(tile, compression, predictor))
+    else:
+        for row in range(0, rows, rows_per_strip):
+            blocks.append(_encode_block(block[row:row+rows_per_strip], compression, predictor))
+
+    offsets = []
+    location = 8
+    for entry in blocks:
+        offsets.append(location)
+        location += len(entry)
+    counts = [len(entry) for entry in blocks]
+
+    sample_format = {'u': 1, 'i': 2, 'f': 3}[data.dtype.kind]
+    entries = [
+        (256, 4, [cols, ]), (257, 4, [rows, ]), (258, 3, [8*data.dtype.itemsize, ]),
+        (259, 3, [compression, ]), (262, 3, [1, ]), (277, 3, [1, ]), (317, 3, [predictor, ]),
+        (339, 3, [sample_format, ])]
+    if tile_shape is not None:
+        entries.extend([(322, 4, [tile_shape[1], ]), (323, 4, [tile_shape[0], ]),
+                        (324, 4, offsets), (325, 4, counts)])
+    else:
+        entries.extend([(273, 4, offsets), (278, 4, [rows_per_strip, ]), (279, 4, counts)])
+    entries.sort()
+
+    ifd_location = location
+    extra_location = ifd_location + 2 + 12*len(entries) + 4
+    ifd = struct.pack('<H', len(entries))
+    extra = b''
+    for tag, tiff_type, values in entries:
+        the_format = '<{}{}'.format(len(values), 'H' if tiff_type == 3 else 'I')
+        the_bytes = struct.pack(the_format, *values)
+        if len(the_bytes) <= 4:
+            ifd += struct.pack('<HHI', tag, tiff_type, len(values)) + the_bytes + b'\x00'*(4 - len(the_bytes))
+        else:
+            ifd += struct.pack('<HHII', tag, tiff_type, len(values), extra_location + len(extra))
+            extra += the_bytes
+    ifd += struct.pack('<I', 0)
+
+    with open(file_name, 'wb') as fi:
+        fi.write(struct.pack('<2sHI', b'II', 42, ifd_location))
+        for entry in blocks:
+            fi.write(entry)
+        fi.write(ifd)
+        fi.write(extra)
+
+
+class TestTiledTiff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.data = numpy.reshape(numpy.arange(70*53, dtype='uint16') % 251, (70, 53))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def _check_reader(self, reader, data):
+        self.assertTrue(numpy.all(reader[:, :] == data))
+        self.assertTrue(numpy.all(reader[5:60:3, 50:2:-2] == data[5:60:3, 50:2:-2]))
+        self.assertTrue(numpy.all(reader[17:33, 20:41] == data[17:33, 20:41]))
+
+    def test_packbits(self):
+        data = b'\xfe\xaa\x02\x80\x00\x2a'
+        self.assertEqual(decode_packbits(data), b'\xaa\xaa\xaa\x80\x00\x2a')
+
+    def test_uncompressed(self):
+        file_name = os.path.join(self.directory, 'uncompressed.tif')
+        _write_tiff(file_name, self.data, rows_per_strip=8)
+        reader = TiffReader(file_name)
+        self.assertIsInstance(reader._chipper, NativeTiffChipper)
+        self._check_reader(reader, self.data)
+
+    def test_tiled(self):
+        for compression in [1, 8, 32773]:
+            for predictor in [1, 2]:
+                with self.subTest(msg='compression {}, predictor {}'.format(compression, predictor)):
+                    file_name = os.path.join(self.directory, 'tiled_{}_{}.tif'.format(compression, predictor))
+                    _write_tiff(file_name, self.data, compression=compression, predictor=predictor, tile_shape=(16, 32))
+                    reader = TiffReader(file_name)
+                    self.assertIsInstance(reader._chipper, TiledTiffChipper)
+                    self._check_reader(reader, self.data)
+
+    def test_strips(self):
+        data = numpy.reshape(numpy.linspace(-1, 1, 70*53, dtype='float32'), (70, 53))
+        file_name = os.path.join(self.directory, 'strips.tif')
+        _write_tiff(file_name, data, compression=8, predictor=3, rows_per_strip=9)
+        chipper = TiledTiffChipper(TiffDetails(file_name), symmetry=(False, False, False), max_workers=2)
+        self.assertTrue(numpy.all(chipper[:, :] == data))
+        self.assertTrue(numpy.all(chipper[10:20, :] == data[10:20, :]))
+        self.assertEqual(chipper.cache.misses, 8)
+        chipper.close()
+
+    @unittest.skipIf(Image is None, 'PIL is not installed')
+    def test_lzw(self):
+        file_name = os.path.join(self.directory, 'lzw.tif')
+        Image.fromarray(self.data).save(file_name, compression='tiff_lzw')
+        self._check_reader(TiffReader(file_name), self.data)
+
+    @unittest.skipIf(Image is None, 'PIL is not installed')
+    def test_lzw_decoders(self):
+        file_name = os.path.join(self.directory, 'lzw_strips.tif')
+        data = numpy.reshape(numpy.arange(70*53, dtype='uint16') % 97, (70, 53)).astype('uint8')
+        Image.fromarray(data).save(file_name, compression='tiff_lzw')
+        details = TiffDetails(file_name)
+        offsets = numpy.atleast_1d(details.tags['StripOffsets'])
+        counts = numpy.atleast_1d(details.tags['StripByteCounts'])
+        rows = int(details.tags.get('RowsPerStrip', 70))
+        with open(file_name, 'rb') as fi:
+            fi.seek(int(offsets[0]))
+            strip = fi.read(int(counts[0]))
+        expected = data[:rows, :].tobytes()
+        with self.subTest(msg='pure python'):
+            self.assertEqual(_decode_lzw_python(strip), expected)
+        with self.subTest(msg='default'):
+            self.assertEqual(decode_lzw(strip, len(expected)), expected)
+            self.assertEqual(decode_lzw(strip), expected)
+        with self.subTest(msg='truncated'):
+            # falls back to the pure python decoding of the partial data
+            result = decode_lzw(strip[:len(strip)//2], len(expected))
+            self.assertEqual(result, expected[:len(result)])
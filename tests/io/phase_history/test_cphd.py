@@ -1,15 +1,19 @@
 import logging
 import os
 import json
+import shutil
 import tempfile
+from io import BytesIO
 
 import numpy.testing
-from sarpy.io.phase_history.cphd import CPHDReader, CPHDReader0_3, CPHDReader1_0, CPHDWriter1_0
+from sarpy.io.phase_history.cphd import CPHDReader, CPHDReader0_3, CPHDReader1_0, CPHDWriter1_0, \
+    CPHDAppendWriter1_0
 from sarpy.io.phase_history.converter import open_phase_history
 import sarpy.consistency.cphd_consistency
 from sarpy.io.phase_history.cphd_schema import get_schema_path
 
 from tests import unittest, parse_file_entry
+from tests.helpers import make_cphd_meta, UnmappedStream
 
 DEFAULT_SCHEMA = get_schema_path(version='1.0.1')
 
@@ -128,9 +132,135 @@ def generic_writer_test(cphd_reader):
 
         assert not sarpy.consistency.cphd_consistency.main([written_cphd.name, '--schema', DEFAULT_SCHEMA, '--signal-data'])
 
+        # write the cphd file by appending vectors in batches
+        with CPHDAppendWriter1_0(written_cphd.name, cphd_reader.cphd_meta, check_existence=False) as writer:
+            for identifier in read_pvp:
+                for start in range(0, read_pvp[identifier].shape[0], 1000):
+                    writer.append_vectors(
+                        identifier, read_pvp[identifier][start:start+1000], read_signal[identifier][start:start+1000])
+            if read_support:
+                writer.write_support_block(read_support)
+
+        rereader = CPHDReader(written_cphd.name)
+        numpy.testing.assert_equal(read_pvp, rereader.read_pvp_block())
+        numpy.testing.assert_equal(read_signal, rereader.read_signal_block())
+
 
 class TestCPHD(unittest.TestCase):
     @unittest.skipIf(len(cphd_file_types.get('CPHD', [])) == 0, 'No CPHD files specified or found')
     def test_cphd_io(self):
         for test_file in cphd_file_types['CPHD']:
             generic_io_test(self, test_file, 'CPHD', CPHDReader)
+
+
+class TestCPHDAppendWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_append(self):
+        meta = make_cphd_meta(['A', 'B'], 11)
+        pvp_dtype = meta.PVP.get_vector_dtype()
+        vectors = {'A': 37, 'B': 23}
+        pvp, signal = {}, {}
+        for i, identifier in enumerate(['A', 'B']):
+            pvp[identifier] = numpy.zeros((vectors[identifier], ), dtype=pvp_dtype)
+            pvp[identifier]['TxTime'] = numpy.arange(vectors[identifier]) + 100*i
+            signal[identifier] = (numpy.random.randn(vectors[identifier], 11) +
+                                  1j*numpy.random.randn(vectors[identifier], 11)).astype('complex64')
+
+        file_name = os.path.join(self.directory, 'test.cphd')
+        writer = CPHDAppendWriter1_0(file_name, meta, max_buffer_bytes=2000)
+        # interleave the channels, in batches of varying size
+        for start, stop in [(0, 5), (5, 6), (6, 20), (20, 37)]:
+            for identifier in ['A', 'B']:
+                the_slice = slice(start, min(stop, vectors[identifier]))
+                if the_slice.start < the_slice.stop:
+                    writer.append_vectors(identifier, pvp[identifier][the_slice], signal[identifier][the_slice])
+        with self.assertRaises(ValueError):
+            writer.write_pvp_array('A', pvp['A'][:2], start_index=0)
+        self.assertEqual(writer.vectors_written, {'A': 37, 'B': 23})
+        writer.close()
+        self.assertEqual(os.listdir(self.directory), ['test.cphd'])
+        self.assertIsNone(meta.Data.Channels[0].NumVectors)
+
+        reader = CPHDReader(file_name)
+        self.assertEqual([entry.NumVectors for entry in reader.cphd_meta.Data.Channels], [37, 23])
+        for i, identifier in enumerate(['A', 'B']):
+            numpy.testing.assert_equal(reader[:, :, i], signal[identifier])
+            numpy.testing.assert_equal(reader.read_pvp_variable('TxTime', i), pvp[identifier]['TxTime'])
+
+    def test_exception(self):
+        meta = make_cphd_meta(['A', ], 11)
+        pvp = numpy.zeros((10, ), dtype=meta.PVP.get_vector_dtype())
+        signal = numpy.zeros((10, 11), dtype='complex64')
+        file_name = os.path.join(self.directory, 'test.cphd')
+        with self.subTest(msg='exception in with block'):
+            with self.assertRaises(KeyError):
+                with CPHDAppendWriter1_0(file_name, meta, max_buffer_bytes=100) as writer:
+                    writer.append_vectors('A', pvp, signal)
+                    raise KeyError('failed processing')
+            self.assertEqual(os.listdir(self.directory), [])
+            writer.close()  # nothing to do
+            del writer
+            self.assertEqual(os.listdir(self.directory), [])
+
+        with self.subTest(msg='incomplete writer garbage collected'):
+            writer = CPHDAppendWriter1_0(file_name, meta, max_buffer_bytes=100)
+            writer.write_pvp_array('A', pvp)
+            writer.__del__()
+            self.assertEqual(os.listdir(self.directory), [])
+
+    def test_compressed(self):
+        vectors, samples = 45, 13
+        signal = ((numpy.random.randn(vectors, samples) + 1j*numpy.random.randn(vectors, samples))*
+                  numpy.arange(1, vectors+1)[:, numpy.newaxis]).astype('complex64')
+        for compression in ['SARPY_ZLIB', 'SARPY_BFP16']:
+            meta = make_cphd_meta(['A', ], samples, compression=compression)
+            pvp = numpy.zeros((vectors, ), dtype=meta.PVP.get_vector_dtype())
+            file_name = os.path.join(self.directory, '{}.cphd'.format(compression))
+            with CPHDAppendWriter1_0(file_name, meta, block_vectors=4) as writer:
+                for start in range(0, vectors, 7):
+                    writer.append_vectors('A', pvp[start:start+7], signal[start:start+7])
+
+            reader = CPHDReader(file_name)
+            channel = reader.cphd_meta.Data.Channels[0]
+            self.assertEqual(reader.cphd_meta.Data.SignalCompressionID, compression)
+            self.assertEqual(reader.cphd_header.SIGNAL_BLOCK_SIZE, channel.CompressedSignalSize)
+            # the quantization error is relative to the largest magnitude component of the vector
+            tolerance = numpy.max(numpy.abs(signal.view('float32')), axis=1)[:, numpy.newaxis]*2.**-15
+            if compression == 'SARPY_ZLIB':
+                tolerance[:] = 0
+            self.assertTrue(numpy.all(numpy.abs(reader[:, :, 0] - signal) <= 2*tolerance))
+            self.assertTrue(numpy.all(
+                numpy.abs(reader[10:30:3, 2:9, 0] - signal[10:30:3, 2:9]) <= 2*tolerance[10:30:3]))
+
+
+class TestCPHDFileLike(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read(self):
+        vectors, samples = 40, 9
+        signal = (numpy.random.randn(vectors, samples) + 1j*numpy.random.randn(vectors, samples)).astype('complex64')
+        for compression in [None, 'SARPY_ZLIB']:
+            meta = make_cphd_meta(['A', ], samples, compression=compression)
+            pvp = numpy.zeros((vectors, ), dtype=meta.PVP.get_vector_dtype())
+            pvp['TxTime'] = numpy.arange(vectors)
+            file_name = os.path.join(self.directory, '{}.cphd'.format(compression))
+            with CPHDAppendWriter1_0(file_name, meta, block_vectors=8) as writer:
+                writer.append_vectors('A', pvp, signal)
+            with open(file_name, 'rb') as fi:
+                the_bytes = fi.read()
+
+            for file_object in [BytesIO(the_bytes), UnmappedStream(the_bytes)]:
+                reader = CPHDReader(file_object)
+                numpy.testing.assert_equal(reader[:, :, 0], signal)
+                numpy.testing.assert_equal(reader[30:5:-2, 1:7, 0], signal[30:5:-2, 1:7])
+                numpy.testing.assert_equal(reader.read_pvp_variable('TxTime', 0, (5, 20, 3)), pvp['TxTime'][5:20:3])
+                numpy.testing.assert_equal(reader.read_pvp_array(0), pvp)
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from sarpy.io.phase_history.cphd import CPHDReader, CPHDAppendWriter1_0
+from sarpy.io.phase_history.pvp_index import PVPIndex
+
+from tests import unittest
+from tests.helpers import make_cphd_meta
+
+
+def _circular_pvp(pvp_dtype, azimuths, graze=30., slant_range=1e4):
+    # a collection in a circle about the SRP at (lat, lon) = (0, 0),
+    # where North = +z, East = +y, and Up = +x
+    pvp = numpy.zeros((azimuths.size, ), dtype=pvp_dtype)
+    srp = numpy.array([6378137., 0, 0])
+    az, gr = numpy.deg2rad(azimuths), numpy.deg2rad(graze)
+    arp = srp + slant_range*numpy.stack(
+        [numpy.full(az.shape, numpy.sin(gr)), numpy.cos(gr)*numpy.sin(az), numpy.cos(gr)*numpy.cos(az)], axis=1)
+    pvp['TxTime'] = numpy.arange(azimuths.size)*0.1
+    pvp['TxPos'] = arp
+    pvp['RcvPos'] = arp
+    pvp['SRPPos'] = srp
+    return pvp
+
+
+class TestPVPIndex(unittest.TestCase):
+    def test_queries(self):
+        pvp_dtype = numpy.dtype(
+            [('TxTime', '>f8'), ('TxPos', '>f8', (3, )), ('RcvPos', '>f8', (3, )),
+             ('SRPPos', '>f8', (3, )), ('SIGNAL', '>i8')])
+        pvp = _circular_pvp(pvp_dtype, numpy.linspace(170, 190, 41))  # azimuth step 0.5
+        pvp['SIGNAL'] = 1
+        pvp['SIGNAL'][10:13] = 0
+        index = PVPIndex(pvp)
+
+        self.assertEqual(index.valid_runs, [(0, 10, 1), (13, 41, 1)])
+        numpy.testing.assert_allclose(index.slant_range, 1e4)
+        numpy.testing.assert_allclose(index.graze, 30., atol=1e-6)
+        self.assertEqual(index.time_range(0.45, 2.0), [(5, 21, 1)])
+        self.assertEqual(index.time_range(0.45, 2.0, valid_only=True), [(5, 10, 1), (13, 21, 1)])
+        self.assertEqual(index.time_range(10, 11), [])
+        self.assertEqual(index.nearest_time(1.26), 13)
+        self.assertEqual(index.nearest_time(-5), 0)
+        self.assertEqual(index.range_interval(9999, 10001), [(0, 41, 1)])
+        # the azimuth wraps from 180 to -180 at vector 20
+        self.assertEqual(index.sector(175.2, -175.2), [(11, 30, 1)])
+        self.assertEqual(index.sector(175.2, -175.2, valid_only=True), [(13, 30, 1)])
+        self.assertEqual(index.sector(-179.9, -175.2), [(21, 30, 1)])
+        self.assertEqual(index.sector(175.2, -175.2, min_graze=40), [])
+
+
+class TestReaderPVPIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reader(self):
+        meta = make_cphd_meta(['A', ], 5)
+        pvp = _circular_pvp(meta.PVP.get_vector_dtype(), numpy.linspace(0, 20, 21))
+        signal = numpy.reshape(numpy.arange(21*5), (21, 5)).astype('complex64')
+        file_name = os.path.join(self.directory, 'test.cphd')
+        with CPHDAppendWriter1_0(file_name, meta) as writer:
+            writer.append_vectors('A', pvp, signal)
+
+        reader = CPHDReader(file_name)
+        index = reader.get_pvp_index('A')
+        self.assertIs(index, reader.get_pvp_index(0))
+        runs = index.sector(4.5, 9.5)
+        self.assertEqual(runs, [(5, 10, 1)])
+        numpy.testing.assert_equal(reader.read_chip(runs[0], None, index='A'), signal[5:10])
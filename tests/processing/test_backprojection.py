@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from sarpy.io.complex.sicd import SICDReader
+from sarpy.processing.backprojection import BackProjectionProcessor
+
+from tests import unittest
+from tests.helpers import write_point_targets
+
+
+class TestBackProjectionProcessor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        srp = numpy.array([6378137., 0, 0])
+        self.targets = [srp, srp + numpy.array([0, 6., -8.])]
+        self.cphd_file = os.path.join(self.directory, 'test.cphd')
+        write_point_targets(self.cphd_file, self.targets)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _check_targets(self, sicd_file):
+        reader = SICDReader(sicd_file)
+        sicd = reader.sicd_meta
+        self.assertEqual(sicd.Grid.Type, 'PLANE')
+        self.assertEqual(sicd.ImageFormation.ImageFormAlgo, 'OTHER')
+        image = numpy.abs(reader[:, :])
+        peaks = []
+        for target in self.targets:
+            expected = sicd.project_ground_to_image(target)[0]
+            row, col = int(round(expected[0])), int(round(expected[1]))
+            window = image[row-3:row+4, col-3:col+4]
+            peak = numpy.unravel_index(numpy.argmax(window), window.shape)
+            self.assertEqual(peak, (3, 3), msg='target {}'.format(target))
+            peaks.append(window[3, 3])
+        return peaks
+
+    def test_direct(self):
+        sicd_file = os.path.join(self.directory, 'test.nitf')
+        processor = BackProjectionProcessor(self.cphd_file, image_plane='GROUND', tile_size=32, max_workers=2)
+        processor.form_image(sicd_file)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['test.cphd', 'test.nitf'])
+        peaks = self._check_targets(sicd_file)
+        # coherent sum of 64 pulses with 64 samples
+        numpy.testing.assert_allclose(peaks, 64*64, rtol=0.05)
+
+    def test_parallel(self):
+        # many more tiles than are permitted in flight
+        images = []
+        for max_workers in [1, 3]:
+            sicd_file = os.path.join(self.directory, 'test_{}.nitf'.format(max_workers))
+            processor = BackProjectionProcessor(self.cphd_file, tile_size=8, max_workers=max_workers)
+            processor.form_image(sicd_file)
+            images.append(SICDReader(sicd_file)[:, :])
+        numpy.testing.assert_equal(images[1], images[0])
+        self.assertTrue(numpy.any(images[0] != 0))
+
+    def test_factorized(self):
+        sicd_file = os.path.join(self.directory, 'test.nitf')
+        processor = BackProjectionProcessor(self.cphd_file, tile_size=8, subaperture_size=2, max_workers=1)
+        self.assertEqual(processor.sicd.ImageFormation.Processings[0].Parameters['Method'], 'FACTORIZED')
+        processor.form_image(sicd_file)
+        peaks = self._check_targets(sicd_file)
+        numpy.testing.assert_allclose(peaks, 64*64, rtol=0.1)
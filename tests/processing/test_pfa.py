@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+
+import numpy
+from scipy.constants import speed_of_light
+
+from sarpy.io.complex.sicd import SICDReader
+from sarpy.processing.pfa import PFAProcessor, PolyphaseInterpolator
+
+from tests import unittest
+from tests.helpers import write_point_targets
+
+
+class TestPolyphaseInterpolator(unittest.TestCase):
+    def test_interpolate(self):
+        interpolator = PolyphaseInterpolator(taps=8)
+        samples = numpy.arange(64)
+        data = numpy.exp(0.3j*samples)[numpy.newaxis, :]
+        positions = numpy.linspace(10, 50, 97)[numpy.newaxis, :]
+        result = interpolator(data, positions)
+        self.assertLess(numpy.max(numpy.abs(result - numpy.exp(0.3j*positions))), 5e-3)
+        # outside of the array is zero
+        self.assertEqual(interpolator(data, numpy.array([[-10., 80.]]))[0, 0], 0)
+
+
+class TestPFAProcessor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_point_targets(self):
+        srp = numpy.array([6378137., 0, 0])
+        targets = [srp, srp + numpy.array([0, 6., -8.])]
+        cphd_file = os.path.join(self.directory, 'test.cphd')
+        write_point_targets(cphd_file, targets)
+        sicd_file = os.path.join(self.directory, 'test.nitf')
+
+        processor = PFAProcessor(cphd_file, block_size=0.05, max_workers=2)
+        processor.form_image(sicd_file)
+        self.assertEqual(sorted(os.listdir(self.directory)), ['test.cphd', 'test.nitf'])
+
+        reader = SICDReader(sicd_file)
+        sicd = reader.sicd_meta
+        self.assertEqual(sicd.ImageFormation.ImageFormAlgo, 'PFA')
+        self.assertEqual((sicd.ImageData.NumRows, sicd.ImageData.NumCols), processor.image_size)
+        self.assertAlmostEqual(sicd.Grid.Row.ImpRespWid, 0.886*speed_of_light/400e6, delta=0.02)
+        image = numpy.abs(reader[:, :])
+        for target in targets:
+            expected = sicd.project_ground_to_image(target)[0]
+            row, col = int(round(expected[0])), int(round(expected[1]))
+            window = image[row-3:row+4, col-3:col+4]
+            peak = numpy.unravel_index(numpy.argmax(window), window.shape)
+            self.assertEqual(peak, (3, 3), msg='target {}'.format(target))
+            self.assertGreater(window[3, 3], 0.5*numpy.max(image))